@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import hashlib
 import hmac
 import secrets
+import threading
+import time
 import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect as sa_inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from .config import settings
 from .database import get_db
 from .models import SessionToken, User
 
@@ -18,6 +27,13 @@ _PBKDF2_ITERATIONS = 120_000
 _TOKEN_TTL_HOURS = 24
 _AUTH_SCHEME = HTTPBearer(auto_error=False)
 _TOKEN_HASH_ALGORITHM = hashlib.sha256().name
+# The avatar blob stays out of the cache; it loads on first access like any expired attribute.
+_SNAPSHOT_EXCLUDED_FIELDS = frozenset({"avatar_image"})
+_SESSION_CHANGES_KEY = "session_cache_changes"
+_SESSION_CACHE_LOCK = threading.Lock()
+_SESSION_CACHE: OrderedDict[str, "_CachedSession"] = OrderedDict()
+_KDF_EXECUTOR_LOCK = threading.Lock()
+_KDF_EXECUTOR: ThreadPoolExecutor | None = None
 
 
 def _utcnow() -> datetime:
@@ -60,6 +76,33 @@ def verify_password(password: str, encoded: str) -> bool:
     return hmac.compare_digest(derived, digest_hex)
 
 
+def _kdf_executor() -> ThreadPoolExecutor:
+    global _KDF_EXECUTOR
+    with _KDF_EXECUTOR_LOCK:
+        if _KDF_EXECUTOR is None:
+            _KDF_EXECUTOR = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers, thread_name_prefix="password-kdf"
+            )
+        return _KDF_EXECUTOR
+
+
+async def hash_password_async(password: str) -> str:
+    """Run :func:`hash_password` on the dedicated KDF pool.
+
+    PBKDF2 releases the GIL, so the pool threads hash in parallel while the
+    request threadpool stays free for other endpoints. The pool size caps how
+    many cores sign-in bursts can take.
+    """
+
+    return await asyncio.get_running_loop().run_in_executor(_kdf_executor(), hash_password, password)
+
+
+async def verify_password_async(password: str, encoded: str) -> bool:
+    """Run :func:`verify_password` on the dedicated KDF pool."""
+
+    return await asyncio.get_running_loop().run_in_executor(_kdf_executor(), verify_password, password, encoded)
+
+
 def _hash_token(value: str) -> str:
     digest = hashlib.new(_TOKEN_HASH_ALGORITHM, value.encode("utf-8"))
     return digest.hexdigest()
@@ -74,6 +117,136 @@ def create_session_token(db: Session, user: User) -> str:
     return token_value
 
 
+@dataclass(frozen=True)
+class _CachedSession:
+    user_id: str
+    expires_at: datetime | None
+    user_version: datetime | None
+    snapshot: dict[str, Any]
+    verified_at: float
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _token_expired(expires_at: datetime | None) -> bool:
+    expires_at = _as_utc(expires_at)
+    return expires_at is not None and expires_at < _utcnow()
+
+
+def invalidate_session_cache(*, token_hash: str | None = None, user_id: str | None = None) -> None:
+    """Drop cached sessions for a token, for every token of a user, or all of them."""
+
+    with _SESSION_CACHE_LOCK:
+        if token_hash is None and user_id is None:
+            _SESSION_CACHE.clear()
+            return
+        if token_hash is not None:
+            _SESSION_CACHE.pop(token_hash, None)
+        if user_id is not None:
+            for key in [key for key, entry in _SESSION_CACHE.items() if entry.user_id == user_id]:
+                del _SESSION_CACHE[key]
+
+
+def _cache_session(token_hash: str, token: SessionToken, user: User) -> None:
+    if settings.session_cache_ttl_seconds <= 0:
+        return
+    snapshot = {
+        attr.key: copy.deepcopy(getattr(user, attr.key))
+        for attr in sa_inspect(User).column_attrs
+        if attr.key not in _SNAPSHOT_EXCLUDED_FIELDS
+    }
+    entry = _CachedSession(
+        user_id=user.id,
+        expires_at=token.expires_at,
+        user_version=user.updated_at,
+        snapshot=snapshot,
+        verified_at=time.monotonic(),
+    )
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE[token_hash] = entry
+        _SESSION_CACHE.move_to_end(token_hash)
+        while len(_SESSION_CACHE) > settings.session_cache_max_entries:
+            _SESSION_CACHE.popitem(last=False)
+
+
+def _lookup_cached_session(db: Session, token_hash: str) -> _CachedSession | None:
+    """Return a still-valid cache entry, re-verifying it against the database once its TTL lapses.
+
+    Verification is one narrow query over the token and its user. A missing token
+    (revoked by another worker), an inactive user, or a changed ``users.updated_at``
+    drops the entry so the caller reloads from the database.
+    """
+
+    with _SESSION_CACHE_LOCK:
+        entry = _SESSION_CACHE.get(token_hash)
+        if entry is not None:
+            _SESSION_CACHE.move_to_end(token_hash)
+    if entry is None:
+        return None
+    if _token_expired(entry.expires_at):
+        invalidate_session_cache(token_hash=token_hash)
+        return None
+    if time.monotonic() - entry.verified_at < settings.session_cache_ttl_seconds:
+        return entry
+
+    row = db.execute(
+        select(User.updated_at, User.is_active, SessionToken.expires_at)
+        .join(User, User.id == SessionToken.user_id)
+        .where(SessionToken.token == token_hash)
+    ).one_or_none()
+    if row is None or not row.is_active or row.updated_at != entry.user_version:
+        invalidate_session_cache(token_hash=token_hash)
+        return None
+
+    refreshed = _CachedSession(
+        user_id=entry.user_id,
+        expires_at=row.expires_at,
+        user_version=entry.user_version,
+        snapshot=entry.snapshot,
+        verified_at=time.monotonic(),
+    )
+    with _SESSION_CACHE_LOCK:
+        if token_hash in _SESSION_CACHE:
+            _SESSION_CACHE[token_hash] = refreshed
+    return refreshed if not _token_expired(refreshed.expires_at) else None
+
+
+def _attach_cached_user(db: Session, entry: _CachedSession) -> User:
+    """Attach the cached user to ``db`` without a SELECT."""
+
+    user = User(**copy.deepcopy(entry.snapshot))
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_session_changes(session: Session, flush_context: Any) -> None:
+    changes = session.info.setdefault(_SESSION_CHANGES_KEY, set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            changes.add(("user", instance.id))
+        elif isinstance(instance, SessionToken):
+            changes.add(("token", instance.token))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_session_changes(session: Session) -> None:
+    for kind, key in session.info.pop(_SESSION_CHANGES_KEY, ()):
+        if kind == "user":
+            invalidate_session_cache(user_id=key)
+        else:
+            invalidate_session_cache(token_hash=key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_session_changes(session: Session) -> None:
+    session.info.pop(_SESSION_CHANGES_KEY, None)
+
+
 def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(_AUTH_SCHEME),
     db: Session = Depends(get_db),
@@ -86,6 +259,10 @@ def get_current_user(
 
     raw_token = credentials.credentials
     token_hash = _hash_token(raw_token)
+    cached = _lookup_cached_session(db, token_hash)
+    if cached is not None:
+        return _attach_cached_user(db, cached)
+
     token: SessionToken | None = db.get(SessionToken, token_hash)
 
     if token is None:
@@ -103,15 +280,11 @@ def get_current_user(
             detail="Invalid or expired authentication token.",
         )
 
-    if token.expires_at:
-        expires_at = token.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-        if expires_at < _utcnow():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired authentication token.",
-            )
+    if _token_expired(token.expires_at):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired authentication token.",
+        )
 
     user = db.get(User, token.user_id)
     if not user or not user.is_active:
@@ -120,6 +293,7 @@ def get_current_user(
             detail="User is inactive or does not exist.",
         )
 
+    _cache_session(token_hash, token, user)
     return user
 
 
@@ -128,6 +302,9 @@ __all__ = [
     "get_current_user",
     "get_email_lookup_candidates",
     "hash_password",
+    "hash_password_async",
+    "invalidate_session_cache",
     "normalize_email",
     "verify_password",
+    "verify_password_async",
 ]
@@ -1,5 +1,5 @@
 import json
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +22,34 @@ class Settings(BaseSettings):
         default=DEFAULT_DATABASE_URL,
         validation_alias=AliasChoices("DATABASE_URL", "database_url"),
     )
+    deployment_mode: Literal["serverless", "server"] = Field(
+        default="serverless",
+        validation_alias=AliasChoices("DEPLOYMENT_MODE", "deployment_mode"),
+    )
+    db_pool_size: int = Field(
+        default=5,
+        ge=1,
+        validation_alias=AliasChoices("DB_POOL_SIZE", "db_pool_size"),
+    )
+    db_max_overflow: int = Field(
+        default=10,
+        ge=0,
+        validation_alias=AliasChoices("DB_MAX_OVERFLOW", "db_max_overflow"),
+    )
+    db_pool_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        validation_alias=AliasChoices("DB_POOL_TIMEOUT_SECONDS", "db_pool_timeout_seconds"),
+    )
+    db_pool_recycle_seconds: int = Field(
+        default=1800,
+        ge=-1,
+        validation_alias=AliasChoices("DB_POOL_RECYCLE_SECONDS", "db_pool_recycle_seconds"),
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("DB_POOL_PRE_PING", "db_pool_pre_ping"),
+    )
     debug: bool = Field(
         default=False,
         validation_alias=AliasChoices("DEBUG", "debug"),
@@ -50,6 +78,256 @@ class Settings(BaseSettings):
             "gemini_request_timeout_seconds",
         ),
     )
+    gemini_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        validation_alias=AliasChoices(
+            "GEMINI_MAX_CONCURRENCY",
+            "gemini_max_concurrency",
+        ),
+    )
+    gemini_model_catalog_ttl_seconds: int = Field(
+        default=600,
+        ge=0,
+        validation_alias=AliasChoices(
+            "GEMINI_MODEL_CATALOG_TTL_SECONDS",
+            "gemini_model_catalog_ttl_seconds",
+        ),
+    )
+    gemini_response_cache_enabled: bool = Field(
+        default=True,
+        validation_alias=AliasChoices(
+            "GEMINI_RESPONSE_CACHE_ENABLED",
+            "gemini_response_cache_enabled",
+        ),
+    )
+    gemini_response_cache_ttl_seconds: int = Field(
+        default=86_400,
+        ge=1,
+        validation_alias=AliasChoices(
+            "GEMINI_RESPONSE_CACHE_TTL_SECONDS",
+            "gemini_response_cache_ttl_seconds",
+        ),
+    )
+    gemini_response_cache_max_entries: int = Field(
+        default=5_000,
+        ge=1,
+        validation_alias=AliasChoices(
+            "GEMINI_RESPONSE_CACHE_MAX_ENTRIES",
+            "gemini_response_cache_max_entries",
+        ),
+    )
+    gemini_response_cache_memory_entries: int = Field(
+        default=256,
+        ge=0,
+        validation_alias=AliasChoices(
+            "GEMINI_RESPONSE_CACHE_MEMORY_ENTRIES",
+            "gemini_response_cache_memory_entries",
+        ),
+    )
+    gemini_response_cache_disabled_endpoints: str | list[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices(
+            "GEMINI_RESPONSE_CACHE_DISABLED_ENDPOINTS",
+            "gemini_response_cache_disabled_endpoints",
+        ),
+    )
+    status_report_worker_count: int | None = Field(
+        default=None,
+        ge=0,
+        validation_alias=AliasChoices(
+            "STATUS_REPORT_WORKER_COUNT",
+            "status_report_worker_count",
+        ),
+    )
+    status_report_job_poll_interval_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        validation_alias=AliasChoices(
+            "STATUS_REPORT_JOB_POLL_INTERVAL_SECONDS",
+            "status_report_job_poll_interval_seconds",
+        ),
+    )
+    status_report_job_lease_seconds: int = Field(
+        default=600,
+        ge=1,
+        validation_alias=AliasChoices(
+            "STATUS_REPORT_JOB_LEASE_SECONDS",
+            "status_report_job_lease_seconds",
+        ),
+    )
+    similarity_engine: Literal["embedding", "lexical"] = Field(
+        default="embedding",
+        validation_alias=AliasChoices(
+            "SIMILARITY_ENGINE",
+            "similarity_engine",
+        ),
+    )
+    analysis_duplicate_threshold: float = Field(
+        default=0.8,
+        gt=0,
+        le=1,
+        validation_alias=AliasChoices(
+            "ANALYSIS_DUPLICATE_THRESHOLD",
+            "analysis_duplicate_threshold",
+        ),
+    )
+    quota_limits_cache_ttl_seconds: int = Field(
+        default=30,
+        ge=0,
+        validation_alias=AliasChoices(
+            "QUOTA_LIMITS_CACHE_TTL_SECONDS",
+            "quota_limits_cache_ttl_seconds",
+        ),
+    )
+    password_hash_workers: int = Field(
+        default=2,
+        ge=1,
+        validation_alias=AliasChoices(
+            "PASSWORD_HASH_WORKERS",
+            "password_hash_workers",
+        ),
+    )
+    auth_max_concurrent_requests_per_ip: int | None = Field(
+        default=None,
+        ge=0,
+        validation_alias=AliasChoices(
+            "AUTH_MAX_CONCURRENT_REQUESTS_PER_IP",
+            "auth_max_concurrent_requests_per_ip",
+        ),
+    )
+    auth_trusted_proxy_hops: int = Field(
+        default=0,
+        ge=0,
+        validation_alias=AliasChoices(
+            "AUTH_TRUSTED_PROXY_HOPS",
+            "auth_trusted_proxy_hops",
+        ),
+    )
+    session_cache_ttl_seconds: int = Field(
+        default=30,
+        ge=0,
+        validation_alias=AliasChoices(
+            "SESSION_CACHE_TTL_SECONDS",
+            "session_cache_ttl_seconds",
+        ),
+    )
+    session_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        validation_alias=AliasChoices(
+            "SESSION_CACHE_MAX_ENTRIES",
+            "session_cache_max_entries",
+        ),
+    )
+    session_token_sweep_interval_seconds: int = Field(
+        default=3600,
+        ge=0,
+        validation_alias=AliasChoices(
+            "SESSION_TOKEN_SWEEP_INTERVAL_SECONDS",
+            "session_token_sweep_interval_seconds",
+        ),
+    )
+    session_token_sweep_batch_size: int = Field(
+        default=1000,
+        ge=1,
+        validation_alias=AliasChoices(
+            "SESSION_TOKEN_SWEEP_BATCH_SIZE",
+            "session_token_sweep_batch_size",
+        ),
+    )
+    quota_engine_mode: Literal["sync", "memory", "shared"] = Field(
+        default="sync",
+        validation_alias=AliasChoices(
+            "QUOTA_ENGINE_MODE",
+            "quota_engine_mode",
+        ),
+    )
+    quota_flush_interval_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        validation_alias=AliasChoices(
+            "QUOTA_FLUSH_INTERVAL_SECONDS",
+            "quota_flush_interval_seconds",
+        ),
+    )
+    quota_shared_store_path: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices(
+            "QUOTA_SHARED_STORE_PATH",
+            "quota_shared_store_path",
+        ),
+    )
+    card_changes_overlap_seconds: float = Field(
+        default=10.0,
+        ge=0,
+        validation_alias=AliasChoices(
+            "CARD_CHANGES_OVERLAP_SECONDS",
+            "card_changes_overlap_seconds",
+        ),
+    )
+    card_tombstone_retention_seconds: int = Field(
+        default=30 * 24 * 3600,
+        ge=1,
+        validation_alias=AliasChoices(
+            "CARD_TOMBSTONE_RETENTION_SECONDS",
+            "card_tombstone_retention_seconds",
+        ),
+    )
+    card_tombstone_sweep_interval_seconds: int = Field(
+        default=3600,
+        ge=0,
+        validation_alias=AliasChoices(
+            "CARD_TOMBSTONE_SWEEP_INTERVAL_SECONDS",
+            "card_tombstone_sweep_interval_seconds",
+        ),
+    )
+    card_aggregates_cache_ttl_seconds: float = Field(
+        default=10.0,
+        ge=0,
+        validation_alias=AliasChoices(
+            "CARD_AGGREGATES_CACHE_TTL_SECONDS",
+            "card_aggregates_cache_ttl_seconds",
+        ),
+    )
+    board_events_transport: Literal["memory", "postgres"] = Field(
+        default="memory",
+        validation_alias=AliasChoices(
+            "BOARD_EVENTS_TRANSPORT",
+            "board_events_transport",
+        ),
+    )
+    board_events_heartbeat_seconds: float = Field(
+        default=15.0,
+        gt=0,
+        validation_alias=AliasChoices(
+            "BOARD_EVENTS_HEARTBEAT_SECONDS",
+            "board_events_heartbeat_seconds",
+        ),
+    )
+    board_events_queue_size: int = Field(
+        default=64,
+        ge=1,
+        validation_alias=AliasChoices(
+            "BOARD_EVENTS_QUEUE_SIZE",
+            "board_events_queue_size",
+        ),
+    )
+    sql_instrumentation_enabled: bool = Field(
+        default=True,
+        validation_alias=AliasChoices(
+            "SQL_INSTRUMENTATION_ENABLED",
+            "sql_instrumentation_enabled",
+        ),
+    )
+    sql_repeated_statement_threshold: int = Field(
+        default=10,
+        ge=2,
+        validation_alias=AliasChoices(
+            "SQL_REPEATED_STATEMENT_THRESHOLD",
+            "sql_repeated_statement_threshold",
+        ),
+    )
     secret_encryption_key: str | None = Field(
         default=DEFAULT_SECRET_ENCRYPTION_KEY,
         validation_alias=AliasChoices("SECRET_ENCRYPTION_KEY", "secret_encryption_key"),
@@ -139,6 +417,16 @@ class Settings(BaseSettings):
 
         return parsed
 
+    @field_validator("gemini_response_cache_disabled_endpoints", mode="before")
+    @classmethod
+    def split_disabled_cache_endpoints(cls, value: Any) -> list[str]:
+        """Parse the comma-separated list of endpoints that bypass the response cache."""
+
+        if value is None:
+            return []
+        candidates = value.split(",") if isinstance(value, str) else list(value)
+        return [str(item).strip() for item in candidates if str(item).strip()]
+
     @staticmethod
     def _normalize_origin(origin: str) -> str:
         """Trim whitespace and trailing slashes from a CORS origin string."""
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from typing import Iterator, Optional
+from typing import Any, Iterator, Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
-from sqlalchemy.pool import NullPool
 
 from .config import settings
+from .utils.pool_metrics import TimedNullPool, TimedQueuePool
+from .utils.sql_metrics import instrument_engine
 
 Base = declarative_base()
 
@@ -23,13 +24,33 @@ def _normalized_url(url: str) -> str:
     return url
 
 
+def _pool_options(url: str) -> dict[str, Any]:
+    """Pool arguments for ``DEPLOYMENT_MODE``.
+
+    ``serverless`` (Vercel) opens a connection per checkout, since frozen
+    instances cannot keep pooled connections alive. ``server`` keeps a
+    ``QueuePool`` so long-running workers reuse connections instead of paying
+    the connect and TLS handshake on every request.
+    """
+
+    parsed = make_url(url)
+    in_memory_sqlite = parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+    if settings.deployment_mode != "server" or in_memory_sqlite:
+        return {"poolclass": TimedNullPool, "pool_pre_ping": True}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
 def _create_engine() -> Engine:
-    return create_engine(
-        _normalized_url(settings.database_url),
-        pool_pre_ping=True,
-        poolclass=NullPool,  # serverless-friendly
-        future=True,
-    )
+    url = _normalized_url(settings.database_url)
+    engine = create_engine(url, future=True, **_pool_options(url))
+    return instrument_engine(engine)
 
 
 def get_engine() -> Engine:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
 from logging.handlers import TimedRotatingFileHandler
@@ -14,8 +15,15 @@ from fastapi.requests import Request
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response
 
 from .config import settings
-from .database import Base, get_engine
-from .migrations import run_startup_migrations
+from .database import get_engine
+from .migrations import apply_pending_migrations
+from .services.board_events import start_board_events, stop_board_events
+from .services.card_changes import start_card_tombstone_sweeper, stop_card_tombstone_sweeper
+from .services.session_tokens import start_session_token_sweeper, stop_session_token_sweeper
+from .services.status_report_jobs import start_status_report_workers, stop_status_report_workers
+from .utils.pagination import NEXT_CURSOR_HEADER
+from .utils.quota_engine import start_quota_flusher, stop_quota_flusher
+from .utils.sql_metrics import SERVER_TIMING_HEADER, track_sql
 from .routers import (
     activity,
     admin_settings,
@@ -82,6 +90,7 @@ def _configure_logging() -> None:
 
 _configure_logging()
 logger = logging.getLogger(__name__)
+sql_logger = logging.getLogger("app.sql")
 
 
 def _find_favicon() -> Optional[Path]:
@@ -101,14 +110,9 @@ FAVICON_PATH = _find_favicon()
 
 def run_migrations() -> None:
     try:
-        logger.info("Running startup migrations...")
-        run_startup_migrations(get_engine())
-        logger.info("Startup migrations completed.")
-        logger.info("Ensuring database schema is up to date...")
-        from . import models  # noqa: F401
-
-        Base.metadata.create_all(bind=get_engine(), checkfirst=True)
-        logger.info("Database schema ensured.")
+        applied = apply_pending_migrations(get_engine())
+        if applied:
+            logger.info("Applied migration steps: %s", ", ".join(applied))
     except Exception:
         logger.exception("Database initialization failed")
         raise
@@ -129,7 +133,20 @@ async def lifespan(app: FastAPI):
                 logger.info("route: %-28s methods=%s", r.path, sorted(m for m in methods if m != "HEAD"))
     except Exception:
         logger.exception("Route logging failed")
-    yield
+    if app.state.startup_error is None:
+        start_status_report_workers(get_engine())
+        start_quota_flusher(get_engine())
+        start_session_token_sweeper(get_engine())
+        start_card_tombstone_sweeper(get_engine())
+        start_board_events(get_engine())
+    try:
+        yield
+    finally:
+        stop_status_report_workers()
+        stop_quota_flusher()
+        stop_session_token_sweeper()
+        stop_card_tombstone_sweeper()
+        stop_board_events()
 
 
 app = FastAPI(
@@ -148,6 +165,7 @@ app.add_middleware(
     allow_credentials=_cors_allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, SERVER_TIMING_HEADER],
 )
 
 
@@ -241,6 +259,28 @@ async def security_headers_middleware(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def sql_instrumentation_middleware(request: Request, call_next):
+    if not settings.sql_instrumentation_enabled or request.method == "OPTIONS":
+        return await call_next(request)
+
+    with track_sql() as metrics:
+        response = await call_next(request)
+
+    response.headers.append(SERVER_TIMING_HEADER, metrics.server_timing())
+    repeated = metrics.repeated(settings.sql_repeated_statement_threshold)
+    record = {
+        "method": request.method,
+        "path": request.url.path,
+        "status": response.status_code,
+        "statements": metrics.statement_count,
+        "db_ms": round(metrics.total_milliseconds, 2),
+        "repeated": [{"statement": statement, "count": count} for statement, count in repeated],
+    }
+    sql_logger.log(logging.WARNING if repeated else logging.INFO, "sql_metrics %s", json.dumps(record))
+    return response
+
+
 @app.get("/", include_in_schema=False)
 def root() -> Response:
     return RedirectResponse(url="/health")
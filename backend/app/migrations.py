@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import argparse
+import hashlib
 import logging
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import JSON, bindparam, inspect, text
+from sqlalchemy import JSON, bindparam, insert, inspect, text
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError, SQLAlchemyError
 
 from .config import settings
+from .services.card_assignees import sync_card_assignees
 from .services.workspace_template_defaults import (
     DEFAULT_TEMPLATE_CONFIDENCE_THRESHOLD,
     DEFAULT_TEMPLATE_DESCRIPTION,
@@ -1079,6 +1082,7 @@ def _normalize_assignees_to_user_ids(engine: Engine) -> None:
             return
         cards_exists = _table_exists(inspector, "cards")
         subtasks_exists = _table_exists(inspector, "subtasks")
+        card_assignees_exists = _table_exists(inspector, "card_assignees")
         if not cards_exists and not subtasks_exists:
             return
 
@@ -1127,6 +1131,8 @@ def _normalize_assignees_to_user_ids(engine: Engine) -> None:
                             ),
                             {"vals": mapped, "id": row.id},
                         )
+                        if card_assignees_exists:
+                            sync_card_assignees(connection, {row.id: mapped})
                 except Exception:  # pragma: no cover - best effort fallback
                     logger.exception("Skipping card %s while normalizing assignees", getattr(row, "id", "<unknown>"))
                     continue
@@ -1150,34 +1156,251 @@ def _normalize_assignees_to_user_ids(engine: Engine) -> None:
                     continue
 
 
+def _invalid_postgres_indexes(engine: Engine, table: str) -> set[str]:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT index_class.relname FROM pg_index"
+                " JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid"
+                " JOIN pg_class AS table_class ON table_class.oid = pg_index.indrelid"
+                " WHERE table_class.relname = :table AND pg_table_is_visible(table_class.oid)"
+                " AND NOT pg_index.indisvalid"
+            ),
+            {"table": table},
+        )
+        return set(rows.scalars())
+
+
+def _create_missing_indexes(engine: Engine, table: str, indexes: Iterable[tuple[str, tuple[str, ...]]]) -> None:
+    """Create each ``(name, columns)`` index on ``table`` unless it already exists.
+
+    PostgreSQL builds them ``CONCURRENTLY`` so writes to a large table are not
+    blocked while the index is built. A failed concurrent build leaves an
+    ``INVALID`` index behind under the same name, so those are dropped and
+    built again instead of being counted as existing.
+    """
+
+    inspector = inspect(engine)
+    if not _table_exists(inspector, table):
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes(table)}
+    concurrently = " CONCURRENTLY" if engine.dialect.name == "postgresql" else ""
+    statements: list[str] = []
+    if concurrently:
+        invalid = _invalid_postgres_indexes(engine, table)
+        statements.extend(f"DROP INDEX CONCURRENTLY IF EXISTS {name}" for name, _ in indexes if name in invalid)
+        existing -= invalid
+    statements.extend(
+        f"CREATE INDEX{concurrently} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        for name, columns in indexes
+        if name not in existing
+    )
+    if not statements:
+        return
+
+    if concurrently:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+        return
+
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def _ensure_session_token_indexes(engine: Engine) -> None:
+    """Index ``session_tokens`` for the expiry sweeper and per-user revocation."""
+
+    _create_missing_indexes(
+        engine,
+        "session_tokens",
+        (
+            ("ix_session_tokens_expires_at", ("expires_at",)),
+            ("ix_session_tokens_user_id", ("user_id",)),
+        ),
+    )
+
+
+# Filter and sort columns of the card list, card creation quota check, immunity map
+# context, comment and activity feeds, channel membership lookups and report detail.
+_HOT_QUERY_INDEXES: dict[str, tuple[tuple[str, tuple[str, ...]], ...]] = {
+    "cards": (
+        ("ix_cards_channel_id_created_at", ("channel_id", "created_at")),
+        ("ix_cards_owner_id_created_at", ("owner_id", "created_at")),
+        ("ix_cards_owner_id_updated_at", ("owner_id", "updated_at")),
+        ("ix_cards_owner_id_completed_at", ("owner_id", "completed_at")),
+    ),
+    "comments": (("ix_comments_card_id_created_at", ("card_id", "created_at")),),
+    "activity_logs": (("ix_activity_logs_card_id_created_at", ("card_id", "created_at")),),
+    "channel_members": (("ix_channel_members_user_id", ("user_id",)),),
+    "status_report_events": (("ix_status_report_events_report_id", ("report_id",)),),
+}
+
+
+def _ensure_hot_query_indexes(engine: Engine) -> None:
+    for table, indexes in _HOT_QUERY_INDEXES.items():
+        _create_missing_indexes(engine, table, indexes)
+
+
+# ``GET /cards/changes`` scans recently updated cards and subtasks.
+_CARD_CHANGE_INDEXES: dict[str, tuple[tuple[str, tuple[str, ...]], ...]] = {
+    "cards": (("ix_cards_channel_id_updated_at", ("channel_id", "updated_at")),),
+    "subtasks": (("ix_subtasks_updated_at", ("updated_at",)),),
+}
+
+
+def _ensure_card_change_indexes(engine: Engine) -> None:
+    for table, indexes in _CARD_CHANGE_INDEXES.items():
+        _create_missing_indexes(engine, table, indexes)
+
+
+MigrationStep = tuple[str, Callable[[Engine], None]]
+
+# Append new steps at the end. Step IDs are stored in ``schema_migrations`` and must never be renamed.
+MIGRATION_STEPS: tuple[MigrationStep, ...] = (
+    ("users_is_admin_column", _ensure_users_is_admin_column),
+    ("user_profile_columns", _ensure_user_profile_columns),
+    ("backfill_user_nickname", _backfill_user_nickname),
+    ("promote_first_user_to_admin", _promote_first_user_to_admin),
+    ("completion_timestamps", _ensure_completion_timestamps),
+    ("card_error_category_column", _ensure_card_error_category_column),
+    ("card_ai_failure_reason_column", _ensure_card_ai_failure_reason_column),
+    ("card_ai_similarity_vector_column", _ensure_card_ai_similarity_vector_column),
+    ("comment_subtask_column", _ensure_comment_subtask_column),
+    ("card_owner_column", _ensure_card_owner_column),
+    ("status_owner_column", _ensure_status_owner_column),
+    ("label_owner_column", _ensure_label_owner_column),
+    ("card_initiative_column", _ensure_card_initiative_column),
+    ("rename_daily_report_tables", _rename_daily_report_tables),
+    ("drop_status_report_report_date", _drop_status_report_report_date),
+    ("workspace_template_default_flag", _ensure_workspace_template_default_flag),
+    ("workspace_default_templates", _ensure_workspace_default_templates),
+    ("api_credentials_model_column", _ensure_api_credentials_model_column),
+    ("remove_deprecated_gemini_models", _remove_deprecated_gemini_models),
+    ("quota_defaults_ai_columns", _ensure_quota_defaults_ai_columns),
+    ("user_quota_override_ai_columns", _ensure_user_quota_override_ai_columns),
+    ("channel_tables", _ensure_channel_tables),
+    ("card_channel_column", _ensure_card_channel_column),
+    ("private_channels_and_backfill", _ensure_private_channels_and_backfill),
+    ("normalize_assignees_to_user_ids", _normalize_assignees_to_user_ids),
+    ("session_token_indexes", _ensure_session_token_indexes),
+    ("hot_query_indexes", _ensure_hot_query_indexes),
+    ("card_change_indexes", _ensure_card_change_indexes),
+)
+
+
+def _run_steps(engine: Engine, steps: Iterable[MigrationStep]) -> None:
+    for step_id, apply in steps:
+        logger.debug("Applying migration step %s", step_id)
+        apply(engine)
+
+
 def run_startup_migrations(engine: Engine) -> None:
     """Ensure database upgrades that rely on application startup are applied."""
 
-    _ensure_users_is_admin_column(engine)
-    _ensure_user_profile_columns(engine)
-    _backfill_user_nickname(engine)
-    _promote_first_user_to_admin(engine)
-    _ensure_completion_timestamps(engine)
-    _ensure_card_error_category_column(engine)
-    _ensure_card_ai_failure_reason_column(engine)
-    _ensure_card_ai_similarity_vector_column(engine)
-    _ensure_comment_subtask_column(engine)
-    _ensure_card_owner_column(engine)
-    _ensure_status_owner_column(engine)
-    _ensure_label_owner_column(engine)
-    _ensure_card_initiative_column(engine)
-    _rename_daily_report_tables(engine)
-    _drop_status_report_report_date(engine)
-    _ensure_workspace_template_default_flag(engine)
-    _ensure_workspace_default_templates(engine)
-    _ensure_api_credentials_model_column(engine)
-    _remove_deprecated_gemini_models(engine)
-    _ensure_quota_defaults_ai_columns(engine)
-    _ensure_user_quota_override_ai_columns(engine)
-    _ensure_channel_tables(engine)
-    _ensure_card_channel_column(engine)
-    _ensure_private_channels_and_backfill(engine)
-    _normalize_assignees_to_user_ids(engine)
-
-
-__all__: Iterable[str] = ["run_startup_migrations"]
+    _run_steps(engine, MIGRATION_STEPS)
+
+
+def _schema_step_id() -> str:
+    """Ledger ID of ``Base.metadata.create_all`` for the current set of tables.
+
+    ``create_all`` only adds missing tables, so the ID changes exactly when a
+    model adds a table and the next run has something to create.
+    """
+
+    from . import models  # noqa: F401 - registers every table on Base.metadata
+    from .database import Base
+
+    tables = ",".join(sorted(Base.metadata.tables))
+    return f"create_all:{hashlib.sha256(tables.encode()).hexdigest()[:12]}"
+
+
+def get_applied_migrations(engine: Engine) -> set[str]:
+    """Step IDs recorded in ``schema_migrations``, or nothing before the ledger exists."""
+
+    try:
+        with engine.connect() as connection:
+            return set(connection.execute(text("SELECT step_id FROM schema_migrations")).scalars())
+    except (OperationalError, ProgrammingError):
+        return set()
+
+
+def _all_step_ids() -> list[str]:
+    return [step_id for step_id, _ in MIGRATION_STEPS] + [_schema_step_id()]
+
+
+def get_pending_migrations(engine: Engine) -> list[str]:
+    applied = get_applied_migrations(engine)
+    return [step_id for step_id in _all_step_ids() if step_id not in applied]
+
+
+def _record_applied(engine: Engine, step_ids: Iterable[str]) -> None:
+    from .models import SchemaMigration
+
+    applied_at = datetime.now(timezone.utc)
+    with engine.begin() as connection:
+        for step_id in step_ids:
+            try:
+                with connection.begin_nested():
+                    connection.execute(insert(SchemaMigration).values(step_id=step_id, applied_at=applied_at))
+            except IntegrityError:
+                # Another process starting at the same time recorded it first.
+                continue
+
+
+def apply_pending_migrations(engine: Engine, *, rerun_all: bool = False) -> list[str]:
+    """Apply steps missing from ``schema_migrations`` and return their IDs.
+
+    When nothing is pending this costs a single ``SELECT``. Otherwise the
+    pending steps run once against the existing tables, ``create_all`` adds any
+    missing tables, and the steps run again so that those waiting for a table
+    (for example ``cards.error_category_id`` for ``error_categories``) are
+    applied before they are recorded. Every step is idempotent, so concurrent
+    cold starts may repeat work but never conflict.
+    """
+
+    from .database import Base
+
+    pending = _all_step_ids() if rerun_all else get_pending_migrations(engine)
+    if not pending:
+        return []
+
+    steps = [step for step in MIGRATION_STEPS if step[0] in pending]
+    _run_steps(engine, steps)
+    Base.metadata.create_all(bind=engine, checkfirst=True)
+    _run_steps(engine, steps)
+    _record_applied(engine, pending)
+    return pending
+
+
+def main(argv: list[str] | None = None) -> None:
+    from .database import get_engine
+
+    parser = argparse.ArgumentParser(description="Apply pending database migrations.")
+    parser.add_argument("--list", action="store_true", help="Print pending step IDs without applying them.")
+    parser.add_argument("--all", action="store_true", help="Re-run every step, including applied ones.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    engine = get_engine()
+    if args.list:
+        for step_id in get_pending_migrations(engine):
+            print(step_id)
+        return
+    applied = apply_pending_migrations(engine, rerun_all=args.all)
+    logger.info("Applied %d migration step(s): %s", len(applied), ", ".join(applied) or "none pending")
+
+
+__all__: Iterable[str] = [
+    "MIGRATION_STEPS",
+    "apply_pending_migrations",
+    "get_applied_migrations",
+    "get_pending_migrations",
+    "run_startup_migrations",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual migration entry point
+    main()
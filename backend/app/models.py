@@ -12,6 +12,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
@@ -30,6 +31,29 @@ card_labels = Table(
     Column("label_id", String, ForeignKey("labels.id", ondelete="CASCADE"), primary_key=True),
 )
 
+# Normalized copy of ``Card.assignees`` so assignee filters can use an index.
+# Maintained by ``app.services.card_assignees``.
+card_assignees = Table(
+    "card_assignees",
+    Base.metadata,
+    Column("card_id", String, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True),
+    Column("assignee", String, primary_key=True),
+    Index("ix_card_assignees_assignee_card_id", "assignee", "card_id"),
+)
+
+# Inverted word postings for cards and their subtasks, used to find
+# ``/cards/{id}/similar`` candidates without scanning every card.
+# Maintained by ``app.services.card_similarity``.
+similarity_postings = Table(
+    "similarity_postings",
+    Base.metadata,
+    Column("token", String, primary_key=True),
+    Column("source_type", String, primary_key=True),
+    Column("source_id", String, primary_key=True),
+    Column("card_id", String, ForeignKey("cards.id", ondelete="CASCADE"), nullable=False),
+    Index("ix_similarity_postings_card_id", "card_id"),
+)
+
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -114,9 +138,21 @@ class SessionToken(Base, TimestampMixin):
 
     user: Mapped[User] = relationship("User", back_populates="tokens")
 
+    __table_args__ = (
+        Index("ix_session_tokens_expires_at", "expires_at"),
+        Index("ix_session_tokens_user_id", "user_id"),
+    )
+
 
 class Card(Base, TimestampMixin):
     __tablename__ = "cards"
+    __table_args__ = (
+        Index("ix_cards_channel_id_created_at", "channel_id", "created_at"),
+        Index("ix_cards_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_cards_owner_id_updated_at", "owner_id", "updated_at"),
+        Index("ix_cards_owner_id_completed_at", "owner_id", "completed_at"),
+        Index("ix_cards_channel_id_updated_at", "channel_id", "updated_at"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -226,6 +262,7 @@ class WorkspaceTemplate(Base, TimestampMixin):
 
 class Subtask(Base, TimestampMixin):
     __tablename__ = "subtasks"
+    __table_args__ = (Index("ix_subtasks_updated_at", "updated_at"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     card_id: Mapped[str] = mapped_column(String, ForeignKey("cards.id", ondelete="CASCADE"))
@@ -282,7 +319,10 @@ class Channel(Base, TimestampMixin):
 
 class ChannelMember(Base, TimestampMixin):
     __tablename__ = "channel_members"
-    __table_args__ = (UniqueConstraint("channel_id", "user_id", name="uq_channel_user"),)
+    __table_args__ = (
+        UniqueConstraint("channel_id", "user_id", name="uq_channel_user"),
+        Index("ix_channel_members_user_id", "user_id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     channel_id: Mapped[str] = mapped_column(String, ForeignKey("channels.id", ondelete="CASCADE"), nullable=False)
@@ -322,6 +362,7 @@ class UserPreference(Base, TimestampMixin):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (Index("ix_comments_card_id_created_at", "card_id", "created_at"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     card_id: Mapped[str] = mapped_column(String, ForeignKey("cards.id", ondelete="CASCADE"))
@@ -337,7 +378,10 @@ class Comment(Base):
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
-    __table_args__ = (UniqueConstraint("id", name="uq_activity_id"),)
+    __table_args__ = (
+        UniqueConstraint("id", name="uq_activity_id"),
+        Index("ix_activity_logs_card_id_created_at", "card_id", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     card_id: Mapped[str | None] = mapped_column(String, ForeignKey("cards.id", ondelete="CASCADE"), nullable=True)
@@ -453,6 +497,7 @@ class StatusReportCardLink(Base, TimestampMixin):
 
 class StatusReportEvent(Base, TimestampMixin):
     __tablename__ = "status_report_events"
+    __table_args__ = (Index("ix_status_report_events_report_id", "report_id"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     report_id: Mapped[str] = mapped_column(String, ForeignKey("status_reports.id", ondelete="CASCADE"), nullable=False)
@@ -462,6 +507,30 @@ class StatusReportEvent(Base, TimestampMixin):
     report: Mapped[StatusReport] = relationship("StatusReport", back_populates="events")
 
 
+class StatusReportJob(Base, TimestampMixin):
+    """Queued analysis run for a submitted status report."""
+
+    __tablename__ = "status_report_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
+    report_id: Mapped[str] = mapped_column(String, ForeignKey("status_reports.id", ondelete="CASCADE"), nullable=False)
+    owner_id: Mapped[str] = mapped_column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
+    max_cards: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    locked_by: Mapped[str | None] = mapped_column(String)
+    error: Mapped[str | None] = mapped_column(Text)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    report: Mapped[StatusReport] = relationship("StatusReport")
+
+    __table_args__ = (
+        Index("ix_status_report_jobs_status_created_at", "status", "created_at"),
+        Index("ix_status_report_jobs_report_id", "report_id"),
+    )
+
+
 class ReportTemplate(Base, TimestampMixin):
     __tablename__ = "report_templates"
 
@@ -778,3 +847,72 @@ class ApiCredential(Base, TimestampMixin):
     created_by_id: Mapped[str | None] = mapped_column(String, ForeignKey("users.id", ondelete="SET NULL"))
 
     created_by_user: Mapped[Optional[User]] = relationship("User", back_populates="api_credentials")
+
+
+class CardSearchDocument(Base):
+    """Denormalized, lower-cased text of a card and its comments used by search."""
+
+    __tablename__ = "card_search_documents"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    card_id: Mapped[str] = mapped_column(
+        String, ForeignKey("cards.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    content: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
+
+
+class SimilarityVector(Base):
+    """Float32 text embedding of a card or subtask, referenced by ``ai_similarity_vector_id``."""
+
+    __tablename__ = "similarity_vectors"
+    __table_args__ = (Index("ix_similarity_vectors_card_id", "card_id"),)
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    source_type: Mapped[str] = mapped_column(String, nullable=False)
+    source_id: Mapped[str] = mapped_column(String, nullable=False)
+    card_id: Mapped[str] = mapped_column(String, ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
+
+
+class AiResponseCacheEntry(Base, TimestampMixin):
+    __tablename__ = "ai_response_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str | None] = mapped_column(String)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class SchemaMigration(Base):
+    """One applied step of :data:`app.migrations.MIGRATION_STEPS`."""
+
+    __tablename__ = "schema_migrations"
+
+    step_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    applied_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+
+class ChangeVersion(Base):
+    """Write counter for one change scope; maintained by :mod:`app.services.change_versions`."""
+
+    __tablename__ = "change_versions"
+
+    scope: Mapped[str] = mapped_column(String(128), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class CardTombstone(Base):
+    """A deleted card or subtask, reported to channel members by ``GET /cards/changes``."""
+
+    __tablename__ = "card_tombstones"
+    __table_args__ = (Index("ix_card_tombstones_channel_id_deleted_at", "channel_id", "deleted_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String, nullable=False)
+    card_id: Mapped[str] = mapped_column(String, nullable=False)
+    channel_id: Mapped[str] = mapped_column(String, ForeignKey("channels.id", ondelete="CASCADE"), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
@@ -13,9 +13,11 @@ from ..services.gemini import (
     GeminiClient,
     GeminiConfigurationError,
     GeminiError,
+    invalidate_gemini_client_cache,
     list_gemini_generate_content_models,
 )
 from ..utils.dependencies import require_admin
+from ..utils.pool_metrics import pool_snapshot
 from ..utils.quotas import (
     get_quota_defaults,
     get_user_quota,
@@ -158,6 +160,7 @@ def upsert_api_credential(
     db.add(credential)
     db.commit()
     db.refresh(credential)
+    invalidate_gemini_client_cache()
     return credential
 
 
@@ -174,6 +177,7 @@ def deactivate_api_credential(
     credential.is_active = False
     db.add(credential)
     db.commit()
+    invalidate_gemini_client_cache()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -303,4 +307,12 @@ def update_user_quota_override(
     return override
 
 
+@router.get("/metrics/database-pool", response_model=schemas.DatabasePoolMetrics)
+def get_database_pool_metrics(
+    db: Session = Depends(get_db),
+    _: models.User = Depends(require_admin),
+) -> schemas.DatabasePoolMetrics:
+    return schemas.DatabasePoolMetrics(deployment_mode=settings.deployment_mode, **pool_snapshot(db.get_bind()))
+
+
 __all__ = ["router"]
@@ -2,57 +2,63 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..database import get_db
 from ..utils.dependencies import require_admin
+from ..utils.pagination import NEXT_CURSOR_HEADER, apply_keyset, encode_cursor
 from ..utils.quotas import (
-    get_analysis_daily_limit,
-    get_appeal_daily_limit,
-    get_auto_card_daily_limit,
-    get_card_daily_limit,
-    get_evaluation_daily_limit,
-    get_immunity_map_candidate_daily_limit,
-    get_immunity_map_daily_limit,
-    get_status_report_daily_limit,
+    EffectiveLimits,
+    get_effective_limits,
     get_user_quota,
+    resolve_effective_limits,
     upsert_user_quota,
 )
 
 router = APIRouter(prefix="/admin/users", tags=["admin", "users"])
 
+_MAX_USER_PAGE_SIZE = 500
+
+
+def _admin_user_read(user: models.User, limits: EffectiveLimits) -> schemas.AdminUserRead:
+    return schemas.AdminUserRead(
+        id=user.id,
+        email=user.email,
+        nickname=user.nickname,
+        is_admin=user.is_admin,
+        is_active=user.is_active,
+        **limits.as_dict(),
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
 
 @router.get("", response_model=list[schemas.AdminUserRead])
 def list_users(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=_MAX_USER_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
     db: Session = Depends(get_db),
     _: models.User = Depends(require_admin),
 ) -> list[schemas.AdminUserRead]:
-    users = db.query(models.User).order_by(models.User.created_at.asc()).all()
-
-    response: list[schemas.AdminUserRead] = []
-    for user in users:
-        response.append(
-            schemas.AdminUserRead(
-                id=user.id,
-                email=user.email,
-                nickname=user.nickname,
-                is_admin=user.is_admin,
-                is_active=user.is_active,
-                card_daily_limit=get_card_daily_limit(db, user.id),
-                evaluation_daily_limit=get_evaluation_daily_limit(db, user.id),
-                analysis_daily_limit=get_analysis_daily_limit(db, user.id),
-                status_report_daily_limit=get_status_report_daily_limit(db, user.id),
-                immunity_map_daily_limit=get_immunity_map_daily_limit(db, user.id),
-                immunity_map_candidate_daily_limit=get_immunity_map_candidate_daily_limit(db, user.id),
-                appeal_daily_limit=get_appeal_daily_limit(db, user.id),
-                auto_card_daily_limit=get_auto_card_daily_limit(db, user.id),
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-            )
-        )
-    return response
+    """List users oldest-first with their effective daily limits.
+
+    ``limit``/``cursor`` switch to keyset pagination; the next page's cursor is
+    returned in the ``X-Next-Cursor`` header.
+    """
+
+    query = apply_keyset(db.query(models.User), models.User.created_at, models.User.id, cursor, descending=False)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    users = query.all()
+    if limit is not None and len(users) > limit:
+        users = users[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(users[-1].created_at, users[-1].id)
+
+    limits = resolve_effective_limits(db, (user.id for user in users))
+    return [_admin_user_read(user, limits[user.id]) for user in users]
 
 
 @router.patch("/{user_id}", response_model=schemas.AdminUserRead)
@@ -109,23 +115,7 @@ def update_user(
     db.commit()
     db.refresh(user)
 
-    return schemas.AdminUserRead(
-        id=user.id,
-        email=user.email,
-        nickname=user.nickname,
-        is_admin=user.is_admin,
-        is_active=user.is_active,
-        card_daily_limit=get_card_daily_limit(db, user.id),
-        evaluation_daily_limit=get_evaluation_daily_limit(db, user.id),
-        analysis_daily_limit=get_analysis_daily_limit(db, user.id),
-        status_report_daily_limit=get_status_report_daily_limit(db, user.id),
-        immunity_map_daily_limit=get_immunity_map_daily_limit(db, user.id),
-        immunity_map_candidate_daily_limit=get_immunity_map_candidate_daily_limit(db, user.id),
-        appeal_daily_limit=get_appeal_daily_limit(db, user.id),
-        auto_card_daily_limit=get_auto_card_daily_limit(db, user.id),
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
+    return _admin_user_read(user, get_effective_limits(db, user.id))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
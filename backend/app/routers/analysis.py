@@ -1,15 +1,18 @@
 from copy import deepcopy
+from dataclasses import dataclass
 from datetime import date
 import re
 import unicodedata
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Callable, Iterable, Mapping, Sequence
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..auth import get_current_user
+from ..config import settings
 from ..database import get_db
 from ..schemas import (
     AnalysisCard,
@@ -28,19 +31,33 @@ from ..schemas import (
     ImmunityMapRequest,
     ImmunityMapResponse,
     ImmunityMapSummary,
+    UserProfile,
 )
+from ..services.card_embeddings import find_duplicate_cards
 from ..services.gemini import (
+    AnalysisWorkspaceOptions,
     GeminiClient,
     GeminiError,
     GeminiRateLimitError,
     build_workspace_analysis_options,
+    call_gemini,
     get_gemini_client,
 )
 from ..services.immunity_map import (
     DEFAULT_IMMUNITY_MAP_WINDOW_DAYS,
+    ImmunityMapContext,
     build_immunity_map_context,
 )
 from ..services.profile import build_user_profile
+from ..services.response_cache import (
+    CACHE_ENDPOINT_ANALYSIS,
+    CACHE_ENDPOINT_IMMUNITY_MAP,
+    CACHE_ENDPOINT_IMMUNITY_MAP_CANDIDATES,
+    analysis_response_cache_key,
+    load_cached_response,
+    store_cached_response,
+    structured_response_cache_key,
+)
 from ..utils.quotas import (
     AI_QUOTA_ANALYSIS,
     AI_QUOTA_IMMUNITY_MAP,
@@ -150,32 +167,59 @@ def _ensure_labels_registered(
         proposal.labels = resolved_label_ids
 
 
-@router.post("", response_model=AnalysisResponse)
-def analyze(
-    payload: AnalysisRequest,
-    gemini: GeminiClient = Depends(get_gemini_client),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> AnalysisResponse:
-    """Analyze free-form text and return structured card proposals."""
-
-    today = date.today()
-    limit = get_analysis_daily_limit(db, current_user.id)
-    quota_reserved = reserve_ai_quota(
-        db,
-        owner_id=current_user.id,
-        quota_day=today,
-        limit=limit,
-        quota_key=AI_QUOTA_ANALYSIS,
+def _rate_limited_exception(exc: GeminiRateLimitError) -> HTTPException:
+    headers: dict[str, str] | None = None
+    if exc.retry_after_seconds is not None:
+        headers = {"Retry-After": str(exc.retry_after_seconds)}
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(exc),
+        headers=headers,
     )
-    if not quota_reserved:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Daily analysis limit of {limit} reached.",
-        )
 
+
+@dataclass
+class _PreparedAnalysis:
+    profile: UserProfile
+    workspace_options: AnalysisWorkspaceOptions
+    cache_key: str | None
+    cached_response: AnalysisResponse | None
+    record: models.AnalysisSession
+
+
+def _prepare_analysis(
+    db: Session,
+    gemini: GeminiClient,
+    current_user: models.User,
+    payload: AnalysisRequest,
+) -> _PreparedAnalysis:
     profile = build_user_profile(current_user)
     workspace_options = build_workspace_analysis_options(db, owner_id=current_user.id)
+    cache_key = analysis_response_cache_key(
+        gemini,
+        CACHE_ENDPOINT_ANALYSIS,
+        payload,
+        user_profile=profile,
+        workspace_options=workspace_options,
+    )
+    cached_payload = load_cached_response(db, cache_key)
+
+    if cached_payload is None:
+        today = date.today()
+        limit = get_analysis_daily_limit(db, current_user.id)
+        quota_reserved = reserve_ai_quota(
+            db,
+            owner_id=current_user.id,
+            quota_day=today,
+            limit=limit,
+            quota_key=AI_QUOTA_ANALYSIS,
+        )
+        if not quota_reserved:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Daily analysis limit of {limit} reached.",
+            )
+
     raw_notes = payload.notes if payload.notes is not None else payload.text
     notes = raw_notes.strip() if raw_notes else None
     objective = payload.objective.strip() if payload.objective else None
@@ -188,47 +232,105 @@ def analyze(
         max_cards=payload.max_cards,
     )
     db.add(record)
-    db.flush()
-    try:
-        response = gemini.analyze(
-            payload,
-            user_profile=profile,
-            workspace_options=workspace_options,
-        )
-    except GeminiRateLimitError as exc:
-        record.status = "failed"
-        record.failure_reason = str(exc)
-        db.commit()
-        headers: dict[str, str] | None = None
-        if exc.retry_after_seconds is not None:
-            headers = {"Retry-After": str(exc.retry_after_seconds)}
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(exc),
-            headers=headers,
-        ) from exc
-    except GeminiError as exc:
-        record.status = "failed"
-        record.failure_reason = str(exc)
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=str(exc),
-        ) from exc
+    # Release the write transaction before awaiting the model so concurrent
+    # requests are not blocked on the quota row for the duration of the call.
+    db.commit()
+
+    cached_response = None
+    if cached_payload is not None:
+        cached_response = AnalysisResponse.model_validate(cached_payload).model_copy(update={"cached": True})
+    return _PreparedAnalysis(
+        profile=profile,
+        workspace_options=workspace_options,
+        cache_key=cache_key,
+        cached_response=cached_response,
+        record=record,
+    )
+
+
+def _record_analysis_failure(db: Session, record: models.AnalysisSession, exc: GeminiError) -> None:
+    record.status = "failed"
+    record.failure_reason = str(exc)
+    db.commit()
+
+
+def _complete_analysis(
+    db: Session,
+    current_user: models.User,
+    prepared: _PreparedAnalysis,
+    response: AnalysisResponse,
+) -> AnalysisResponse:
+    if prepared.cached_response is None:
+        store_cached_response(db, prepared.cache_key, response.model_dump(mode="json"), model=response.model)
+
     _ensure_labels_registered(
         db,
         owner_id=current_user.id,
         proposals=response.proposals,
-        workspace_labels=((label.id, label.name) for label in workspace_options.labels),
+        workspace_labels=((label.id, label.name) for label in prepared.workspace_options.labels),
     )
 
+    record = prepared.record
     record.status = "completed"
     record.response_model = response.model
     record.proposals = [proposal.model_dump() for proposal in response.proposals]
     db.commit()
+
+    duplicate_warnings = _duplicate_proposal_warnings(db, owner_id=current_user.id, proposals=response.proposals)
+    if duplicate_warnings:
+        response = response.model_copy(update={"warnings": [*response.warnings, *duplicate_warnings]})
     return response
 
 
+def _duplicate_proposal_warnings(db: Session, *, owner_id: str, proposals: list[AnalysisCard]) -> list[str]:
+    """Flag proposals whose text is close to one of the user's existing cards."""
+
+    matches = find_duplicate_cards(
+        db,
+        owner_id=owner_id,
+        texts=[f"{proposal.title}\n{proposal.summary}" for proposal in proposals],
+        threshold=settings.analysis_duplicate_threshold,
+    )
+    return [
+        f"提案「{proposal.title}」は既存のカード「{match.title}」と重複している可能性があります。"
+        for proposal, match in zip(proposals, matches, strict=True)
+        if match is not None
+    ]
+
+
+@router.post("", response_model=AnalysisResponse)
+async def analyze(
+    payload: AnalysisRequest,
+    gemini: GeminiClient = Depends(get_gemini_client),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> AnalysisResponse:
+    """Analyze free-form text and return structured card proposals."""
+
+    prepared = await run_in_threadpool(_prepare_analysis, db, gemini, current_user, payload)
+    response = prepared.cached_response
+    if response is None:
+        try:
+            response = await call_gemini(
+                gemini,
+                "analyze",
+                payload,
+                user_profile=prepared.profile,
+                workspace_options=prepared.workspace_options,
+            )
+        except GeminiRateLimitError as exc:
+            await run_in_threadpool(_record_analysis_failure, db, prepared.record, exc)
+            raise _rate_limited_exception(exc) from exc
+        except GeminiError as exc:
+            await run_in_threadpool(_record_analysis_failure, db, prepared.record, exc)
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=str(exc),
+            ) from exc
+
+    return await run_in_threadpool(_complete_analysis, db, current_user, prepared, response)
+
+
 _IMMUNITY_MAP_SYSTEM_PROMPT = (
     "You are Verbalize Yourself's reflection assistant."
     " You infer an Immunity Map (A-F) from user-provided statements."
@@ -720,29 +822,100 @@ def _fallback_core_insight(
     return None
 
 
-@router.post("/immunity-map/candidates", response_model=ImmunityMapCandidateResponse)
-def generate_immunity_map_candidates(
-    payload: ImmunityMapCandidateRequest,
-    gemini: GeminiClient = Depends(get_gemini_client),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> ImmunityMapCandidateResponse:
-    today = date.today()
-    limit = get_immunity_map_candidate_daily_limit(db, current_user.id)
+def _load_cached_or_reserve_quota(
+    db: Session,
+    *,
+    owner_id: str,
+    cache_key: str | None,
+    get_limit: Callable[[Session, str], int],
+    quota_key: str,
+    limit_detail: str,
+) -> dict[str, Any] | None:
+    cached = load_cached_response(db, cache_key)
+    if cached is not None:
+        return cached
+
+    limit = get_limit(db, owner_id)
     quota_reserved = reserve_ai_quota(
         db,
-        owner_id=current_user.id,
-        quota_day=today,
+        owner_id=owner_id,
+        quota_day=date.today(),
         limit=limit,
-        quota_key=AI_QUOTA_IMMUNITY_MAP_CANDIDATES,
+        quota_key=quota_key,
     )
     if not quota_reserved:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Daily immunity map candidate limit of {limit} reached.",
+            detail=limit_detail.format(limit=limit),
         )
     db.commit()
+    return None
+
+
+def _store_generated_response(db: Session, cache_key: str | None, generated: dict[str, Any]) -> None:
+    store_cached_response(db, cache_key, generated, model=generated.get("model"))
+    db.commit()
+
+
+async def _generate_structured_response(
+    db: Session,
+    gemini: GeminiClient,
+    *,
+    owner_id: str,
+    endpoint: str,
+    get_limit: Callable[[Session, str], int],
+    quota_key: str,
+    limit_detail: str,
+    prompt: str,
+    response_schema: dict[str, Any],
+    system_prompt: str,
+) -> tuple[dict[str, Any], bool]:
+    """Return the structured payload for ``prompt`` and whether it came from the cache.
+
+    Quota is only reserved when the response cache misses.
+    """
+
+    cache_key = structured_response_cache_key(
+        gemini,
+        endpoint,
+        prompt=prompt,
+        response_schema=response_schema,
+        system_prompt=system_prompt,
+    )
+    cached = await run_in_threadpool(
+        _load_cached_or_reserve_quota,
+        db,
+        owner_id=owner_id,
+        cache_key=cache_key,
+        get_limit=get_limit,
+        quota_key=quota_key,
+        limit_detail=limit_detail,
+    )
+    if cached is not None:
+        return cached, True
+
+    try:
+        generated = await call_gemini(
+            gemini,
+            "generate_structured",
+            prompt=prompt,
+            response_schema=response_schema,
+            system_prompt=system_prompt,
+        )
+    except GeminiRateLimitError as exc:
+        raise _rate_limited_exception(exc) from exc
+    except GeminiError as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
+    await run_in_threadpool(_store_generated_response, db, cache_key, generated)
+    return generated, False
 
+
+def _build_immunity_map_candidate_prompt(
+    db: Session,
+    current_user: models.User,
+    payload: ImmunityMapCandidateRequest,
+) -> tuple[ImmunityMapContext, dict[str, Any], str]:
     include = payload.include
     context_bundle = build_immunity_map_context(
         db,
@@ -785,24 +958,34 @@ def generate_immunity_map_candidates(
         context_bundle.prompt,
     ]
     prompt = "\n".join(prompt_parts).strip()
+    return context_bundle, response_schema, prompt
 
-    try:
-        generated = gemini.generate_structured(
-            prompt=prompt,
-            response_schema=response_schema,
-            system_prompt=_IMMUNITY_MAP_CANDIDATE_SYSTEM_PROMPT,
-        )
-    except GeminiRateLimitError as exc:
-        headers: dict[str, str] | None = None
-        if exc.retry_after_seconds is not None:
-            headers = {"Retry-After": str(exc.retry_after_seconds)}
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(exc),
-            headers=headers,
-        ) from exc
-    except GeminiError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
+@router.post("/immunity-map/candidates", response_model=ImmunityMapCandidateResponse)
+async def generate_immunity_map_candidates(
+    payload: ImmunityMapCandidateRequest,
+    gemini: GeminiClient = Depends(get_gemini_client),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ImmunityMapCandidateResponse:
+    context_bundle, response_schema, prompt = await run_in_threadpool(
+        _build_immunity_map_candidate_prompt,
+        db,
+        current_user,
+        payload,
+    )
+    generated, cached = await _generate_structured_response(
+        db,
+        gemini,
+        owner_id=current_user.id,
+        endpoint=CACHE_ENDPOINT_IMMUNITY_MAP_CANDIDATES,
+        get_limit=get_immunity_map_candidate_daily_limit,
+        quota_key=AI_QUOTA_IMMUNITY_MAP_CANDIDATES,
+        limit_detail="Daily immunity map candidate limit of {limit} reached.",
+        prompt=prompt,
+        response_schema=response_schema,
+        system_prompt=_IMMUNITY_MAP_CANDIDATE_SYSTEM_PROMPT,
+    )
 
     candidates = _parse_immunity_map_candidates(
         generated.get("candidates"),
@@ -823,32 +1006,15 @@ def generate_immunity_map_candidates(
         model=str(model) if model else None,
         token_usage=token_usage if isinstance(token_usage, Mapping) else {},
         warnings=warnings,
+        cached=cached,
     )
 
 
-@router.post("/immunity-map", response_model=ImmunityMapResponse)
-def generate_immunity_map(
+def _build_immunity_map_prompt(
+    db: Session,
+    current_user: models.User,
     payload: ImmunityMapRequest,
-    gemini: GeminiClient = Depends(get_gemini_client),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> ImmunityMapResponse:
-    today = date.today()
-    limit = get_immunity_map_daily_limit(db, current_user.id)
-    quota_reserved = reserve_ai_quota(
-        db,
-        owner_id=current_user.id,
-        quota_day=today,
-        limit=limit,
-        quota_key=AI_QUOTA_IMMUNITY_MAP,
-    )
-    if not quota_reserved:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Daily immunity map generation limit of {limit} reached.",
-        )
-    db.commit()
-
+) -> tuple[list[ImmunityMapNode], str]:
     policy = _resolve_context_policy(payload)
     include_auto = policy in {"auto", "auto+manual"}
     include_manual = policy in {"manual", "auto+manual"}
@@ -928,24 +1094,29 @@ def generate_immunity_map(
         ]
     )
     prompt = "\n".join(user_prompt_parts).strip()
+    return a_nodes, prompt
 
-    try:
-        generated = gemini.generate_structured(
-            prompt=prompt,
-            response_schema=_IMMUNITY_MAP_RESPONSE_SCHEMA,
-            system_prompt=_IMMUNITY_MAP_SYSTEM_PROMPT,
-        )
-    except GeminiRateLimitError as exc:
-        headers: dict[str, str] | None = None
-        if exc.retry_after_seconds is not None:
-            headers = {"Retry-After": str(exc.retry_after_seconds)}
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(exc),
-            headers=headers,
-        ) from exc
-    except GeminiError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
+@router.post("/immunity-map", response_model=ImmunityMapResponse)
+async def generate_immunity_map(
+    payload: ImmunityMapRequest,
+    gemini: GeminiClient = Depends(get_gemini_client),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ImmunityMapResponse:
+    a_nodes, prompt = await run_in_threadpool(_build_immunity_map_prompt, db, current_user, payload)
+    generated, cached = await _generate_structured_response(
+        db,
+        gemini,
+        owner_id=current_user.id,
+        endpoint=CACHE_ENDPOINT_IMMUNITY_MAP,
+        get_limit=get_immunity_map_daily_limit,
+        quota_key=AI_QUOTA_IMMUNITY_MAP,
+        limit_detail="Daily immunity map generation limit of {limit} reached.",
+        prompt=prompt,
+        response_schema=_IMMUNITY_MAP_RESPONSE_SCHEMA,
+        system_prompt=_IMMUNITY_MAP_SYSTEM_PROMPT,
+    )
 
     raw_nodes = _safe_list(generated.get("nodes"))
     raw_edges = _safe_list(generated.get("edges"))
@@ -1077,4 +1248,5 @@ def generate_immunity_map(
         readout_cards=readout_cards,
         token_usage=token_usage if isinstance(token_usage, Mapping) else {},
         warnings=warnings,
+        cached=cached,
     )
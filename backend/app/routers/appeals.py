@@ -20,11 +20,11 @@ def get_appeal_config(
 
 
 @router.post("/generate", response_model=schemas.AppealGenerationResponse)
-def generate_appeal(
+async def generate_appeal(
     payload: schemas.AppealGenerationRequest,
     current_user: models.User = Depends(get_current_user),
     service: AppealGenerationService = Depends(get_appeal_service),
 ) -> schemas.AppealGenerationResponse:
     """Generate appeal narratives for the requested formats."""
 
-    return service.generate(owner=current_user, request=payload)
+    return await service.generate_async(owner=current_user, request=payload)
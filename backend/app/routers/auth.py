@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.requests import Request
 from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.orm import Session
@@ -12,9 +15,10 @@ from ..auth import (
     create_session_token,
     get_current_user,
     get_email_lookup_candidates,
-    hash_password,
+    hash_password_async,
+    invalidate_session_cache,
     normalize_email,
-    verify_password,
+    verify_password_async,
 )
 from ..config import settings
 from ..database import get_db
@@ -27,6 +31,9 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 _LOCAL_FRONTEND_LOGIN_URL = "http://localhost:4200/login"
 
+# Sign-in requests in flight per client address. Only touched on the event loop.
+_AUTH_REQUESTS_IN_FLIGHT: Counter[str] = Counter()
+
 
 def _resolve_frontend_login_url(request: Request) -> str:
     hostname = request.url.hostname or ""
@@ -70,29 +77,67 @@ def get_admin_contact_email(db: Session = Depends(get_db)) -> schemas.AdminConta
     return schemas.AdminContactResponse(email=_find_admin_contact_email(db))
 
 
-@router.post(
-    "/register",
-    response_model=schemas.RegistrationResponse,
-    status_code=status.HTTP_201_CREATED,
-)
-def register(
-    payload: schemas.RegistrationRequest,
-    db: Session = Depends(get_db),
-) -> schemas.RegistrationResponse:
-    payload_data = (
-        payload.model_dump() if hasattr(payload, "model_dump") else payload.dict()  # type: ignore[attr-defined]
-    )
-    raw_email = str(payload_data.get("email", payload.email))
-    email_candidates = get_email_lookup_candidates(raw_email)
-    existing = db.query(models.User).filter(models.User.email.in_(email_candidates)).first()
-    if existing:
+def client_address(request: Request) -> str:
+    """The client address sign-in limits and logs are keyed on.
+
+    Behind ``AUTH_TRUSTED_PROXY_HOPS`` proxies, the peer is the nearest proxy,
+    so the address is read from ``X-Forwarded-For`` that many entries from
+    the right. Those entries were appended by our own proxies and cannot be
+    forged by the client.
+    """
+
+    hops = settings.auth_trusted_proxy_hops
+    if hops:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+def _auth_concurrency_limit() -> int:
+    limit = settings.auth_max_concurrent_requests_per_ip
+    if limit is None:
+        # A serverless instance serves one request at a time, so a per-process count never sheds anything.
+        return 4 if settings.deployment_mode == "server" else 0
+    return limit
+
+
+async def shed_auth_bursts(request: Request) -> AsyncIterator[None]:
+    """Refuse a client's sign-in requests beyond the per-address concurrency limit.
+
+    Password hashing is deliberately slow, so one address retrying in a tight
+    loop could otherwise occupy every KDF worker.
+    """
+
+    limit = _auth_concurrency_limit()
+    client_host = client_address(request)
+    if limit and _AUTH_REQUESTS_IN_FLIGHT[client_host] >= limit:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email already exists.",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent sign-in attempts. Please retry shortly.",
+            headers={"Retry-After": "1"},
         )
+    _AUTH_REQUESTS_IN_FLIGHT[client_host] += 1
+    try:
+        yield
+    finally:
+        _AUTH_REQUESTS_IN_FLIGHT[client_host] -= 1
+        if _AUTH_REQUESTS_IN_FLIGHT[client_host] <= 0:
+            del _AUTH_REQUESTS_IN_FLIGHT[client_host]
 
+
+def _find_users_by_email(db: Session, email_candidates: tuple[str, ...]) -> list[models.User]:
+    """Users matching any candidate, in candidate order, from one ``IN`` query."""
+
+    users = db.query(models.User).filter(models.User.email.in_(email_candidates)).all()
+    rank = {candidate: index for index, candidate in enumerate(email_candidates)}
+    return sorted(users, key=lambda user: rank[user.email])
+
+
+def _create_registered_user(
+    db: Session, payload_data: dict, raw_email: str, password_hash: str
+) -> schemas.RegistrationResponse:
     is_first_user = db.query(models.User).count() == 0
-    password = payload_data.get("password", payload.password)
     normalized_email = normalize_email(raw_email)
     remaining_fields = {
         key: value for key, value in payload_data.items() if key not in {"email", "password"}
@@ -103,7 +148,7 @@ def register(
     user_values = {
         **remaining_fields,
         "email": normalized_email,
-        "password_hash": hash_password(password),
+        "password_hash": password_hash,
         "is_admin": is_first_user,
         "is_active": is_first_user,
     }
@@ -131,22 +176,57 @@ def register(
     )
 
 
+@router.post(
+    "/register",
+    response_model=schemas.RegistrationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def register(
+    payload: schemas.RegistrationRequest,
+    _: None = Depends(shed_auth_bursts),
+    db: Session = Depends(get_db),
+) -> schemas.RegistrationResponse:
+    payload_data = (
+        payload.model_dump() if hasattr(payload, "model_dump") else payload.dict()  # type: ignore[attr-defined]
+    )
+    raw_email = str(payload_data.get("email", payload.email))
+    email_candidates = get_email_lookup_candidates(raw_email)
+    if await run_in_threadpool(_find_users_by_email, db, email_candidates):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists.",
+        )
+
+    password_hash = await hash_password_async(payload_data.get("password", payload.password))
+    return await run_in_threadpool(_create_registered_user, db, payload_data, raw_email, password_hash)
+
+
+def _issue_session(db: Session, user: models.User) -> schemas.TokenResponse:
+    db.query(models.SessionToken).filter(models.SessionToken.user_id == user.id).delete()
+    token_value = create_session_token(db, user)
+    db.commit()
+    # The bulk delete above revokes earlier tokens without flush events.
+    invalidate_session_cache(user_id=user.id)
+    profile = build_user_profile(user)
+    return schemas.TokenResponse(access_token=token_value, user=profile)
+
+
 @router.post("/login", response_model=schemas.TokenResponse)
-def login(
+async def login(
     payload: schemas.AuthCredentials,
     request: Request,
+    _: None = Depends(shed_auth_bursts),
     db: Session = Depends(get_db),
 ) -> schemas.TokenResponse:
     email_candidates = get_email_lookup_candidates(payload.email)
     user: models.User | None = None
-    for candidate in email_candidates:
-        candidate_user = db.query(models.User).filter(models.User.email == candidate).first()
-        if candidate_user and verify_password(payload.password, candidate_user.password_hash):
+    for candidate_user in await run_in_threadpool(_find_users_by_email, db, email_candidates):
+        if await verify_password_async(payload.password, candidate_user.password_hash):
             user = candidate_user
             break
 
     if not user:
-        client_host = request.client.host if request.client else "unknown"
+        client_host = client_address(request)
         normalized_email = normalize_email(payload.email)
         logger.warning("Login failed for %s from %s", normalized_email, client_host)
         raise HTTPException(
@@ -160,11 +240,7 @@ def login(
             detail="Account is pending administrator approval.",
         )
 
-    db.query(models.SessionToken).filter(models.SessionToken.user_id == user.id).delete()
-    token_value = create_session_token(db, user)
-    db.commit()
-    profile = build_user_profile(user)
-    return schemas.TokenResponse(access_token=token_value, user=profile)
+    return await run_in_threadpool(_issue_session, db, user)
 
 
 @router.get("/me", response_model=schemas.UserProfile)
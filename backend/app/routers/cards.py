@@ -1,23 +1,34 @@
 from __future__ import annotations
 
-import re
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Iterable, Mapping
+from typing import Any, Iterable, Iterator, Literal, Mapping
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import func, or_
-from sqlalchemy.orm import Session, joinedload, selectinload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Query as OrmQuery, Session, joinedload, selectinload
 
 from .. import models, schemas
 from ..auth import get_current_user
+from ..config import settings
 from ..database import get_db
+from ..services.card_aggregates import collect_card_aggregates
+from ..services.card_assignees import assigned_card_ids
+from ..services.card_changes import collect_card_changes, decode_change_cursor
 from ..services.card_limits import reserve_daily_card_quota
+from ..services.card_reads import project_cards
+from ..services.card_search import apply_card_search
+from ..services.card_similarity import CARD_TEXT_FIELDS, normalize_words, similar_card_candidate_ids
+from ..services.change_versions import card_list_scopes, scope_versions
 from ..services.profile import build_user_profile
 from ..services.recommendation_scoring import (
     RecommendationScore,
     RecommendationScoringService,
 )
 from ..utils.activity import record_activity
+from ..utils.etags import compute_etag, etag_headers, etag_matches, not_modified_response
+from ..utils.pagination import NEXT_CURSOR_HEADER, apply_keyset, encode_cursor
 from ..utils.quotas import AI_QUOTA_AUTO_CARD, get_auto_card_daily_limit, get_card_daily_limit, reserve_ai_quota
 from ..utils.repository import (
     apply_updates,
@@ -25,6 +36,7 @@ from ..utils.repository import (
     ensure_optional_owned_resource,
     get_resource_or_404,
 )
+from ..utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
@@ -154,28 +166,42 @@ def _member_channel_ids(db: Session, *, user_id: str) -> list[str]:
     ]
 
 
+_CARD_LOAD_OPTIONS = (
+    selectinload(models.Card.subtasks),
+    selectinload(models.Card.labels),
+    joinedload(models.Card.status),
+    joinedload(models.Card.error_category),
+    joinedload(models.Card.initiative),
+)
+
+
 def _card_query(db: Session, *, owner_id: str | None = None, member_user_id: str | None = None):
-    query = db.query(models.Card).options(
-        selectinload(models.Card.subtasks),
-        selectinload(models.Card.labels),
-        joinedload(models.Card.status),
-        joinedload(models.Card.error_category),
-        joinedload(models.Card.initiative),
-    )
+    return _visible_card_query(db, owner_id=owner_id, member_user_id=member_user_id).options(*_CARD_LOAD_OPTIONS)
+
+
+def _visible_card_query(db: Session, *, owner_id: str | None = None, member_user_id: str | None = None):
+    """Card query filtered to what the user may see, without loader options.
+
+    Pass it to :func:`project_cards` for read-only responses; :func:`_card_query`
+    adds the relationship loading the ORM serialization path needs.
+    """
 
     if member_user_id:
-        channel_ids = _member_channel_ids(db, user_id=member_user_id)
-        if channel_ids:
-            query = query.filter(models.Card.channel_id.in_(channel_ids))
-        else:
-            # No memberships: return empty set by filtering impossible condition
-            query = query.filter(models.Card.id == "__none__")
-    elif owner_id:
+        return _channel_card_query(db, _member_channel_ids(db, user_id=member_user_id))
+    query = db.query(models.Card)
+    if owner_id:
         query = query.filter(models.Card.owner_id == owner_id)
-
     return query
 
 
+def _channel_card_query(db: Session, channel_ids: list[str]):
+    query = db.query(models.Card)
+    if channel_ids:
+        return query.filter(models.Card.channel_id.in_(channel_ids))
+    # No memberships: return empty set by filtering impossible condition
+    return query.filter(models.Card.id == "__none__")
+
+
 _DONE_STATUS_TOKENS = {"done", "completed", "完了"}
 
 
@@ -365,12 +391,17 @@ def _get_accessible_card(db: Session, *, user_id: str, card_id: str) -> models.C
     return card
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 def _derive_created_from(time_range: str) -> datetime | None:
     value = (time_range or "").strip().lower()
     if not value:
         return None
 
-    now = datetime.now(timezone.utc)
+    # Whole minutes, so a card list ETag can name the window it was computed for.
+    now = _utcnow().replace(second=0, microsecond=0)
     if value.endswith("d") and value[:-1].isdigit():
         return now - timedelta(days=int(value[:-1]))
     if value.endswith("w") and value[:-1].isdigit():
@@ -386,18 +417,9 @@ def _derive_created_from(time_range: str) -> datetime | None:
     return None
 
 
-def _normalize_words(*texts: str | None) -> set[str]:
-    words: set[str] = set()
-    for text in texts:
-        if not text:
-            continue
-        words.update(re.findall(r"[a-z0-9]+", text.lower()))
-    return words
-
-
 def _text_similarity(left: str | None, right: str | None) -> float:
-    left_words = _normalize_words(left)
-    right_words = _normalize_words(right)
+    left_words = normalize_words(left)
+    right_words = normalize_words(right)
     if not left_words or not right_words:
         return 0.0
     intersection = left_words.intersection(right_words)
@@ -445,8 +467,77 @@ def _score_subtask_similarity(card: models.Card, subtask: models.Subtask) -> flo
     return float(min(0.7 * text_similarity + priority_bonus, 1.0))
 
 
-@router.get("/", response_model=list[schemas.CardRead])
-def list_cards(
+_MAX_CARD_PAGE_SIZE = 500
+_CARD_STREAM_BATCH_SIZE = 200
+
+
+def _serialize_cards(db: Session, cards: list[models.Card]) -> list[schemas.CardRead]:
+    # Resolve userIds -> nickname for display in response
+    user_ids: set[str] = set()
+    for card in cards:
+        user_ids.update([v for v in (card.assignees or []) if v])
+        for sub in card.subtasks:
+            if sub.assignee:
+                user_ids.add(sub.assignee)
+    display_map = _resolve_display_names(db, user_ids)
+    return [_card_read_with_display(card, display_map) for card in cards]
+
+
+def _stream_cards_ndjson(query, *, bind) -> Iterator[bytes]:
+    """Serialize cards in fixed-size batches so memory does not grow with the board.
+
+    The request session is closed before the body is streamed, so the query
+    is re-bound to a dedicated session; serialized cards are expunged from it
+    after every batch.
+    """
+
+    with Session(bind=bind, autoflush=False) as session:
+        batch: list[models.Card] = []
+
+        def flush_batch() -> bytes:
+            payload = b"".join(
+                card.model_dump_json().encode("utf-8") + b"\n" for card in _serialize_cards(session, batch)
+            )
+            for card in batch:
+                session.expunge(card)
+            batch.clear()
+            return payload
+
+        for card in query.with_session(session).yield_per(_CARD_STREAM_BATCH_SIZE):
+            batch.append(card)
+            if len(batch) >= _CARD_STREAM_BATCH_SIZE:
+                yield flush_batch()
+        if batch:
+            yield flush_batch()
+
+
+@dataclass(frozen=True)
+class _CardFilters:
+    """The card list filters shared by ``GET /cards`` and ``GET /cards/aggregates``."""
+
+    status_ids: tuple[str, ...] = ()
+    label_ids: tuple[str, ...] = ()
+    assignees: tuple[str, ...] = ()
+    priority: str | None = None
+    priorities: tuple[str, ...] = ()
+    error_category_id: str | None = None
+    initiative_id: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    due_from: datetime | None = None
+    due_to: datetime | None = None
+    time_range: str | None = None
+    search: str | None = None
+
+    def cache_key(self) -> str:
+        return repr(self)
+
+
+def _unique(values: Iterable[str | None]) -> tuple[str, ...]:
+    return tuple(sorted({value for value in values if value}))
+
+
+def _card_filters(
     status_id: str | None = Query(default=None),
     label_id: str | None = Query(default=None),
     search: str | None = Query(default=None),
@@ -462,77 +553,161 @@ def list_cards(
     due_from: datetime | None = Query(default=None),
     due_to: datetime | None = Query(default=None),
     time_range: str | None = Query(default=None),
+) -> _CardFilters:
+    if time_range and not created_from:
+        # Resolved once, so the query, the ETag and the aggregates cache key share one cutoff.
+        created_from = _derive_created_from(time_range)
+    return _CardFilters(
+        status_ids=_unique([*(status_ids or []), status_id]),
+        label_ids=_unique([*(label_ids or []), label_id]),
+        assignees=_unique(assignees or []),
+        priority=priority,
+        priorities=_unique(priorities or []),
+        error_category_id=error_category_id,
+        initiative_id=initiative_id,
+        created_from=created_from,
+        created_to=created_to,
+        due_from=due_from,
+        due_to=due_to,
+        time_range=time_range,
+        search=search,
+    )
+
+
+def _filter_cards(db: Session, query: OrmQuery, filters: _CardFilters) -> tuple[OrmQuery, list[Any]]:
+    """Apply ``filters`` to a card query; returns the query and search ranking terms."""
+
+    if filters.status_ids:
+        query = query.filter(models.Card.status_id.in_(filters.status_ids))
+    if filters.label_ids:
+        labelled_card_ids = select(models.card_labels.c.card_id).where(
+            models.card_labels.c.label_id.in_(filters.label_ids)
+        )
+        query = query.filter(models.Card.id.in_(labelled_card_ids))
+    if filters.priority:
+        query = query.filter(models.Card.priority == filters.priority)
+    if filters.priorities:
+        query = query.filter(models.Card.priority.in_(filters.priorities))
+    if filters.error_category_id:
+        query = query.filter(models.Card.error_category_id == filters.error_category_id)
+    if filters.initiative_id:
+        query = query.filter(models.Card.initiative_id == filters.initiative_id)
+
+    if filters.created_from:
+        query = query.filter(models.Card.created_at >= filters.created_from)
+    if filters.created_to:
+        query = query.filter(models.Card.created_at <= filters.created_to)
+    if filters.due_from:
+        query = query.filter(models.Card.due_date >= filters.due_from)
+    if filters.due_to:
+        query = query.filter(models.Card.due_date <= filters.due_to)
+
+    if filters.assignees:
+        query = query.filter(models.Card.id.in_(assigned_card_ids(filters.assignees)))
+
+    if filters.search:
+        return apply_card_search(db, query, filters.search)
+    return query, []
+
+
+@router.get("/", response_model=list[schemas.CardRead])
+def list_cards(
+    request: Request,
+    filters: _CardFilters = Depends(_card_filters),
+    limit: int | None = Query(default=None, ge=1, le=_MAX_CARD_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    response_format: Literal["json", "ndjson"] = Query(default="json", alias="format"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-) -> list[models.Card]:
-    query = _card_query(db, member_user_id=current_user.id)
-
-    effective_status_ids = set(status_ids or [])
-    if status_id:
-        effective_status_ids.add(status_id)
-    if effective_status_ids:
-        query = query.filter(models.Card.status_id.in_(effective_status_ids))
-
-    effective_label_ids = set(label_ids or [])
-    if label_id:
-        effective_label_ids.add(label_id)
-    if effective_label_ids:
-        query = query.join(models.Card.labels).filter(models.Label.id.in_(effective_label_ids))
-        query = query.distinct()
-
-    if priority:
-        query = query.filter(models.Card.priority == priority)
-    if priorities:
-        query = query.filter(models.Card.priority.in_(priorities))
-    if error_category_id:
-        query = query.filter(models.Card.error_category_id == error_category_id)
-    if initiative_id:
-        query = query.filter(models.Card.initiative_id == initiative_id)
+) -> Response:
+    """List cards visible to the current user.
+
+    Passing ``limit`` or ``cursor`` switches to keyset pagination ordered by
+    ``(created_at, id)`` descending; the cursor for the following page is
+    returned in the ``X-Next-Cursor`` header. Search ranking only applies to
+    unpaginated requests. ``format=ndjson`` streams one card per line.
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304 before
+    any card is queried.
+    """
 
-    if time_range and not created_from:
-        derived_from = _derive_created_from(time_range)
-        if derived_from:
-            created_from = derived_from
-
-    if created_from:
-        query = query.filter(models.Card.created_at >= created_from)
-    if created_to:
-        query = query.filter(models.Card.created_at <= created_to)
-    if due_from:
-        query = query.filter(models.Card.due_date >= due_from)
-    if due_to:
-        query = query.filter(models.Card.due_date <= due_to)
-
-    if search:
-        like_pattern = f"%{search.lower()}%"
-        query = query.outerjoin(models.Comment, models.Comment.card_id == models.Card.id)
-        query = query.filter(
-            or_(
-                func.lower(models.Card.title).like(like_pattern),
-                func.lower(models.Card.summary).like(like_pattern),
-                func.lower(models.Card.description).like(like_pattern),
-                func.lower(models.Card.ai_notes).like(like_pattern),
-                func.lower(models.Card.analytics_notes).like(like_pattern),
-                func.lower(models.Comment.content).like(like_pattern),
-            )
+    channel_ids = _member_channel_ids(db, user_id=current_user.id)
+    versions = scope_versions(db, card_list_scopes(channel_ids))
+    if filters.time_range and filters.created_from is not None:
+        # A relative window moves with the clock, which the URL does not show.
+        versions = {**versions, "created_from": int(filters.created_from.timestamp())}
+    etag = compute_etag(request, versions)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    query, ranking = _filter_cards(db, _channel_card_query(db, channel_ids), filters)
+
+    if limit is not None or cursor is not None:
+        query = apply_keyset(query, models.Card.created_at, models.Card.id, cursor)
+        if limit is not None:
+            query = query.limit(limit + 1)
+    else:
+        query = query.order_by(*ranking, models.Card.created_at.desc(), models.Card.id.desc())
+
+    if response_format == "ndjson":
+        headers = etag_headers(etag)
+        if limit is not None:
+            # Read the page keys first: headers are sent before the body is streamed.
+            keys = query.with_entities(models.Card.created_at, models.Card.id).all()
+            if len(keys) > limit:
+                headers[NEXT_CURSOR_HEADER] = encode_cursor(*keys[limit - 1])
+            query = query.limit(limit)
+        return StreamingResponse(
+            _stream_cards_ndjson(query.options(*_CARD_LOAD_OPTIONS), bind=db.get_bind()),
+            media_type="application/x-ndjson",
+            headers=headers,
         )
-        query = query.distinct()
 
-    cards = query.order_by(models.Card.created_at.desc()).all()
+    cards = project_cards(db, query)
+    headers = etag_headers(etag)
+    if limit is not None and len(cards) > limit:
+        cards = cards[:limit]
+        last = cards[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last["created_at"], last["id"])
 
-    if assignees:
-        wanted = set(assignees)
-        cards = [card for card in cards if wanted.intersection(set(card.assignees or []))]
+    return FastJSONResponse(cards, headers=headers)
 
-    # Resolve userIds -> nickname for display in response
-    user_ids: set[str] = set()
-    for card in cards:
-        user_ids.update([v for v in (card.assignees or []) if v])
-        for sub in card.subtasks:
-            if sub.assignee:
-                user_ids.add(sub.assignee)
-    display_map = _resolve_display_names(db, user_ids)
-    return [_card_read_with_display(card, display_map) for card in cards]
+
+@router.get("/changes", response_model=schemas.CardChanges)
+def list_card_changes(
+    since: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+) -> Response:
+    """Cards and subtasks changed, and those deleted, since the ``since`` cursor.
+
+    Omit ``since`` to receive every visible card and a first cursor. Items
+    may repeat across calls, so apply them as upserts and deletes.
+    """
+
+    moment = decode_change_cursor(since) if since else None
+    channel_ids = _member_channel_ids(db, user_id=current_user.id)
+    return FastJSONResponse(collect_card_changes(db, channel_ids, moment))
+
+
+@router.get("/aggregates", response_model=schemas.CardAggregates)
+def get_card_aggregates(
+    filters: _CardFilters = Depends(_card_filters),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+) -> Response:
+    """Counts, story points and estimate hours of the visible cards, grouped several ways.
+
+    Accepts the same filters as ``GET /cards``.
+    """
+
+    channel_ids = _member_channel_ids(db, user_id=current_user.id)
+    aggregates = collect_card_aggregates(
+        db,
+        channel_ids,
+        lambda subset: _filter_cards(db, _channel_card_query(db, subset), filters)[0],
+        filters_key=filters.cache_key(),
+    )
+    return FastJSONResponse(aggregates)
 
 
 @router.post("/", response_model=schemas.CardRead, status_code=status.HTTP_201_CREATED)
@@ -680,14 +855,12 @@ def get_card(
     card_id: str,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-) -> schemas.CardRead:
-    card = _get_accessible_card(db, user_id=current_user.id, card_id=card_id)
-    user_ids = set(card.assignees or [])
-    for sub in card.subtasks:
-        if sub.assignee:
-            user_ids.add(sub.assignee)
-    display_map = _resolve_display_names(db, user_ids)
-    return _card_read_with_display(card, display_map)
+) -> Response:
+    query = _visible_card_query(db, member_user_id=current_user.id).filter(models.Card.id == card_id)
+    cards = project_cards(db, query.limit(1))
+    if not cards:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
+    return FastJSONResponse(cards[0])
 
 
 @router.put("/{card_id}", response_model=schemas.CardRead)
@@ -926,49 +1099,243 @@ def delete_subtask(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+def _card_similar_item(candidate: models.Card, score: float) -> schemas.SimilarItem:
+    return schemas.SimilarItem(
+        id=candidate.id,
+        type="card",
+        title=candidate.title,
+        similarity=round(score, 4),
+        labels=[label.name for label in candidate.labels],
+        status=candidate.status.name if candidate.status else None,
+        summary=candidate.summary or candidate.description,
+        quick_actions=["open", "link", "duplicate"],
+        related_card_id=candidate.id,
+    )
+
+
+def _subtask_similar_item(candidate: models.Card, subtask: models.Subtask, score: float) -> schemas.SimilarItem:
+    return schemas.SimilarItem(
+        id=subtask.id,
+        type="subtask",
+        title=subtask.title,
+        similarity=round(min(1.0, score), 4),
+        labels=[label.name for label in candidate.labels],
+        status=subtask.status,
+        summary=subtask.description,
+        quick_actions=["open", "link", "promote"],
+        related_card_id=candidate.id,
+        related_subtask_id=subtask.id,
+    )
+
+
 def _build_similar_items(base_card: models.Card, candidates: Iterable[models.Card]) -> list[schemas.SimilarItem]:
     items: list[schemas.SimilarItem] = []
     for candidate in candidates:
         score = _score_card_similarity(base_card, candidate)
         if score <= 0:
             continue
-        summary = candidate.summary or candidate.description
-        items.append(
-            schemas.SimilarItem(
-                id=candidate.id,
-                type="card",
-                title=candidate.title,
-                similarity=round(score, 4),
-                labels=[label.name for label in candidate.labels],
-                status=candidate.status.name if candidate.status else None,
-                summary=summary,
-                quick_actions=["open", "link", "duplicate"],
-                related_card_id=candidate.id,
-            )
-        )
+        items.append(_card_similar_item(candidate, score))
 
         for subtask in candidate.subtasks:
             sub_score = _score_subtask_similarity(base_card, subtask)
             if sub_score <= 0:
                 continue
-            items.append(
-                schemas.SimilarItem(
-                    id=subtask.id,
-                    type="subtask",
-                    title=subtask.title,
-                    similarity=round(min(1.0, sub_score), 4),
-                    labels=[label.name for label in candidate.labels],
-                    status=subtask.status,
-                    summary=subtask.description,
-                    quick_actions=["open", "link", "promote"],
-                    related_card_id=candidate.id,
-                    related_subtask_id=subtask.id,
-                )
-            )
+            items.append(_subtask_similar_item(candidate, subtask, sub_score))
     items.sort(key=lambda item: item.similarity, reverse=True)
     return items
 
 
+def _embedding_similar_items(
+    db: Session,
+    base_card: models.Card,
+    *,
+    member_user_id: str,
+    limit: int,
+) -> list[schemas.SimilarItem]:
+    """Score every accessible card and subtask in one matrix product and hydrate only the top ``limit``.
+
+    Text similarity is the TF-IDF cosine between stored embeddings. The label,
+    status, priority and error-category terms use the same weights as
+    :func:`_score_card_similarity`, read from plain columns.
+    """
+
+    # NumPy is only needed here, so the card router does not load it on cold starts.
+    import numpy as np
+
+    from ..services.card_embeddings import (
+        cosine_scores,
+        decode_vectors,
+        get_embedding_provider,
+        idf_weights,
+        join_text,
+        load_vector,
+        top_k,
+    )
+
+    channel_ids = _member_channel_ids(db, user_id=member_user_id)
+    if not channel_ids:
+        return []
+
+    provider = get_embedding_provider()
+    base_vector = load_vector(db, base_card.ai_similarity_vector_id)
+    if base_vector is None:
+        base_vector = provider.embed([join_text(getattr(base_card, name) for name in CARD_TEXT_FIELDS)])[0]
+
+    card = models.Card
+    subtask = models.Subtask
+    vector = models.SimilarityVector
+    rows = db.execute(
+        select(
+            vector.source_type,
+            vector.source_id,
+            vector.card_id,
+            vector.vector,
+            card.status_id,
+            card.priority,
+            card.error_category_id,
+            subtask.priority.label("subtask_priority"),
+        )
+        .join(card, card.id == vector.card_id)
+        .outerjoin(subtask, and_(vector.source_type == "subtask", subtask.id == vector.source_id))
+        .where(card.channel_id.in_(channel_ids), card.id != base_card.id, vector.model == provider.name)
+        .order_by(card.created_at.desc(), card.id, vector.source_type)
+    ).all()
+    if not rows:
+        return []
+
+    matrix = decode_vectors([row.vector for row in rows], provider.dimension)
+    text_similarity = cosine_scores(matrix, base_vector[None, :], weights=idf_weights(matrix))[0]
+
+    base_label_ids = [label.id for label in base_card.labels]
+    label_similarity = np.zeros(len(rows), dtype=np.float32)
+    if base_label_ids:
+        card_labels = models.card_labels
+        accessible_ids = select(card.id).where(card.channel_id.in_(channel_ids))
+        totals = dict(
+            db.execute(
+                select(card_labels.c.card_id, func.count())
+                .where(card_labels.c.card_id.in_(accessible_ids))
+                .group_by(card_labels.c.card_id)
+            ).all()
+        )
+        shared = dict(
+            db.execute(
+                select(card_labels.c.card_id, func.count())
+                .where(card_labels.c.card_id.in_(accessible_ids), card_labels.c.label_id.in_(base_label_ids))
+                .group_by(card_labels.c.card_id)
+            ).all()
+        )
+        label_similarity = np.array(
+            [
+                shared.get(row.card_id, 0) / (len(base_label_ids) + totals[row.card_id] - shared[row.card_id])
+                if row.source_type == "card" and shared.get(row.card_id)
+                else 0.0
+                for row in rows
+            ],
+            dtype=np.float32,
+        )
+
+    is_card = np.array([row.source_type == "card" for row in rows])
+    card_bonus = np.array(
+        [
+            (0.05 if base_card.status_id and row.status_id == base_card.status_id else 0.0)
+            + (0.05 if base_card.priority and row.priority == base_card.priority else 0.0)
+            + (0.1 if base_card.error_category_id and row.error_category_id == base_card.error_category_id else 0.0)
+            for row in rows
+        ],
+        dtype=np.float32,
+    )
+    subtask_bonus = np.array(
+        [0.05 if row.subtask_priority and row.subtask_priority == base_card.priority else 0.0 for row in rows],
+        dtype=np.float32,
+    )
+    scores = np.minimum(
+        np.where(
+            is_card,
+            0.45 * text_similarity + 0.35 * label_similarity + card_bonus,
+            0.7 * text_similarity + subtask_bonus,
+        ),
+        1.0,
+    )
+
+    positive = np.flatnonzero(scores > 0)
+    chosen = [int(index) for index in positive[top_k(scores[positive], limit)]]
+    cards_by_id = {
+        candidate.id: candidate
+        for candidate in _card_query(db)
+        .filter(card.id.in_({rows[index].card_id for index in chosen}))
+        .all()
+    }
+
+    items: list[schemas.SimilarItem] = []
+    for index in chosen:
+        row = rows[index]
+        candidate = cards_by_id.get(row.card_id)
+        if candidate is None:
+            continue
+        score = float(scores[index])
+        if row.source_type == "card":
+            items.append(_card_similar_item(candidate, score))
+            continue
+        match = next((item for item in candidate.subtasks if item.id == row.source_id), None)
+        if match is not None:
+            items.append(_subtask_similar_item(candidate, match, score))
+    return items
+
+
+def _attribute_only_similarity_ceiling(base_card: models.Card) -> float:
+    ceiling = 0.0
+    if base_card.status_id:
+        ceiling += 0.05
+    if base_card.priority:
+        ceiling += 0.05
+    if base_card.error_category_id:
+        ceiling += 0.1
+    return ceiling
+
+
+def _attribute_match_candidates(
+    accessible,
+    base_card: models.Card,
+    *,
+    exclude: set[str],
+    limit: int,
+) -> list[models.Card]:
+    """Best ``limit`` cards matched only by attributes, plus cards with same-priority subtasks."""
+
+    card = models.Card
+    bonuses = []
+    if base_card.status_id:
+        bonuses.append(case((card.status_id == base_card.status_id, 0.05), else_=0.0))
+    if base_card.priority:
+        bonuses.append(case((card.priority == base_card.priority, 0.05), else_=0.0))
+    if base_card.error_category_id:
+        bonuses.append(case((card.error_category_id == base_card.error_category_id, 0.1), else_=0.0))
+    remaining = accessible.filter(card.id.not_in(exclude)) if exclude else accessible
+
+    attribute_score = sum(bonuses[1:], start=bonuses[0])
+    matches = (
+        remaining.filter(attribute_score > 0)
+        .order_by(attribute_score.desc(), card.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    if base_card.priority:
+        seen = {match.id for match in matches}
+        same_priority_subtasks = select(models.Subtask.card_id).where(
+            models.Subtask.priority == base_card.priority
+        )
+        if seen:
+            remaining = remaining.filter(card.id.not_in(seen))
+        matches.extend(
+            remaining.filter(card.id.in_(same_priority_subtasks))
+            .order_by(card.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+    return matches
+
+
 @router.get("/{card_id}/similar", response_model=schemas.SimilarItemsResponse)
 def get_similar_items(
     card_id: str,
@@ -977,14 +1344,29 @@ def get_similar_items(
     current_user: models.User = Depends(get_current_user),
 ) -> schemas.SimilarItemsResponse:
     base_card = _get_accessible_card(db, user_id=current_user.id, card_id=card_id)
+    if settings.similarity_engine == "embedding":
+        items = _embedding_similar_items(db, base_card, member_user_id=current_user.id, limit=limit)
+        return schemas.SimilarItemsResponse(items=items)
 
+    accessible = _card_query(db, member_user_id=current_user.id).filter(models.Card.id != card_id)
+
+    candidate_ids = similar_card_candidate_ids(db, base_card)
     candidates = (
-        _card_query(db, member_user_id=current_user.id)
-        .filter(models.Card.id != card_id)
-        .order_by(models.Card.created_at.desc())
-        .all()
+        accessible.filter(models.Card.id.in_(candidate_ids)).order_by(models.Card.created_at.desc()).all()
+        if candidate_ids
+        else []
     )
     items = _build_similar_items(base_card, candidates)
+
+    # Cards without a shared word or label can still score through the
+    # status/priority/error-category bonuses (and subtasks through the
+    # priority bonus). Those scores never exceed ``ceiling``, so they only
+    # matter when the indexed candidates do not already fill the page.
+    ceiling = _attribute_only_similarity_ceiling(base_card)
+    if ceiling > 0 and sum(item.similarity >= ceiling for item in items) < limit:
+        fallback = _attribute_match_candidates(accessible, base_card, exclude=candidate_ids, limit=limit)
+        items.extend(_build_similar_items(base_card, fallback))
+        items.sort(key=lambda item: item.similarity, reverse=True)
     return schemas.SimilarItemsResponse(items=items[:limit])
 
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..auth import get_current_user
 from ..database import get_db
+from ..services.board_events import board_event_stream
 
 router = APIRouter(prefix="/channels", tags=["channels"])
 
@@ -147,3 +149,32 @@ def kick_from_channel(
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+
+@router.get("/{channel_id}/events")
+def stream_channel_events(
+    channel_id: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-Sent Events for writes to the channel's cards, subtasks and comments."""
+
+    if not db.get(models.Channel, channel_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found")
+
+    is_member = (
+        db.query(models.ChannelMember)
+        .filter(models.ChannelMember.channel_id == channel_id, models.ChannelMember.user_id == current_user.id)
+        .first()
+        is not None
+    )
+    if not is_member:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of channel")
+
+    user_id = current_user.id
+    # The stream can stay open for hours; give the pooled connection back now.
+    db.close()
+    return StreamingResponse(
+        board_event_stream(channel_id, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from typing import List, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import asc
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..auth import get_current_user
 from ..database import get_db
+from ..services.change_versions import owner_scope, scope_versions
 from ..utils.activity import record_activity
+from ..utils.etags import compute_etag, etag_headers, etag_matches, not_modified_response
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
@@ -34,11 +36,18 @@ def _serialize_comment(
 
 @router.get("/", response_model=List[schemas.CommentRead])
 def list_comments(
+    request: Request,
+    response: Response,
     card_id: Optional[str] = Query(default=None),
     subtask_id: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-) -> List[schemas.CommentRead]:
+) -> List[schemas.CommentRead] | Response:
+    etag = compute_etag(request, scope_versions(db, [owner_scope(current_user.id)]))
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(etag_headers(etag))
+
     query = (
         db.query(models.Comment, models.User.nickname, models.User.email)
         .join(models.Card, models.Comment.card_id == models.Card.id)
@@ -180,7 +180,6 @@ def trigger_evaluation(
         quota_day=today,
         limit=limit,
         quota_model=models.DailyEvaluationQuota,
-        counter_field="executed_count",
     )
     if not quota_reserved:
         raise HTTPException(
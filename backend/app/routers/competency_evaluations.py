@@ -288,7 +288,6 @@ def create_my_evaluation(
         quota_day=today,
         limit=limit,
         quota_model=models.DailyEvaluationQuota,
-        counter_field="executed_count",
     )
     if not quota_reserved:
         raise HTTPException(
@@ -520,7 +519,6 @@ def create_my_evaluations_batch(
             quota_day=today,
             limit=limit,
             quota_model=models.DailyEvaluationQuota,
-            counter_field="executed_count",
         )
         if not quota_reserved:
             raise HTTPException(
@@ -2,17 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session, joinedload, selectinload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, selectinload
 
 from .. import models, schemas
 from ..auth import get_current_user
 from ..database import get_db
+from ..services.card_reads import project_cards
 from ..utils.repository import (
     apply_updates,
     get_owned_resource_or_404,
     save_model,
 )
+from ..utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/initiatives", tags=["initiatives"])
 
@@ -148,7 +150,7 @@ def list_initiative_cards(
     initiative_id: str,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-) -> list[models.Card]:
+) -> Response:
     get_owned_resource_or_404(
         db,
         models.ImprovementInitiative,
@@ -157,17 +159,13 @@ def list_initiative_cards(
         detail="Initiative not found",
     )
 
-    return (
+    query = (
         db.query(models.Card)
-        .options(
-            selectinload(models.Card.labels),
-            selectinload(models.Card.subtasks),
-            joinedload(models.Card.status),
-        )
         .filter(
             models.Card.initiative_id == initiative_id,
             models.Card.owner_id == current_user.id,
         )
         .order_by(models.Card.created_at.desc())
-        .all()
     )
+    # Unlike /cards, this endpoint returns assignees as stored (user ids).
+    return FastJSONResponse(project_cards(db, query, resolve_display_names=False))
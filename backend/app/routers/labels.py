@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..auth import get_current_user
 from ..database import get_db
+from ..services.change_versions import owner_scope, scope_versions
+from ..utils.etags import compute_etag, etag_headers, etag_matches, not_modified_response
 from ..utils.repository import (
     apply_updates,
     delete_model,
@@ -18,9 +20,15 @@ router = APIRouter(prefix="/labels", tags=["labels"])
 
 @router.get("/", response_model=list[schemas.LabelRead])
 def list_labels(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-) -> list[models.Label]:
+) -> list[models.Label] | Response:
+    etag = compute_etag(request, scope_versions(db, [owner_scope(current_user.id)]))
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(etag_headers(etag))
     return (
         db.query(models.Label)
         .filter(models.Label.owner_id == current_user.id)
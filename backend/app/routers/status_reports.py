@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -10,10 +13,18 @@ from .. import models, schemas
 from ..auth import get_current_user
 from ..database import get_db
 from ..services.gemini import GeminiClient, get_gemini_client
+from ..services.status_report_jobs import (
+    TERMINAL_JOB_STATUSES,
+    dispatch_status_report_job,
+    get_latest_job,
+)
 from ..services.status_reports import StatusReportService
 
 router = APIRouter(prefix="/status-reports", tags=["status-reports"])
 
+_JOB_POLL_INTERVAL_SECONDS = 0.5
+_MAX_JOB_WAIT_SECONDS = 30.0
+
 
 def _commit_or_raise(db: Session) -> None:
     """Commit the current transaction or raise an HTTP 500 on failure."""
@@ -86,33 +97,54 @@ def update_status_report(
     return service.to_read(refreshed)
 
 
-@router.post("/{report_id}/submit", response_model=schemas.StatusReportDetail)
+def _enqueue_analysis(
+    db: Session,
+    service: StatusReportService,
+    report: models.StatusReport,
+    *,
+    analyzer: GeminiClient,
+    background_tasks: BackgroundTasks,
+) -> schemas.StatusReportDetail:
+    job = service.enqueue_report(report)
+    _commit_or_raise(db)
+    dispatch_status_report_job(
+        job.id,
+        bind=db.get_bind(),
+        analyzer=analyzer,
+        background_tasks=background_tasks,
+    )
+    return service.to_detail(report)
+
+
+@router.post(
+    "/{report_id}/submit",
+    response_model=schemas.StatusReportDetail,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def submit_status_report(
     report_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
     analyzer: GeminiClient = Depends(get_gemini_client),
 ) -> schemas.StatusReportDetail:
+    """Queue the report for analysis and return it in the ``processing`` state."""
+
     service = StatusReportService(db, analyzer=analyzer)
     report = service.get_report(report_id=report_id, owner_id=current_user.id, include_details=True)
     if report.status == schemas.StatusReportStatus.PROCESSING.value:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Report is already processing.")
-    result = service.submit_report(report)
-    _commit_or_raise(db)
-    if result.error:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail={
-                "message": result.error,
-                "report": result.detail.model_dump(mode="json"),
-            },
-        )
-    return result.detail
+    return _enqueue_analysis(db, service, report, analyzer=analyzer, background_tasks=background_tasks)
 
 
-@router.post("/{report_id}/retry", response_model=schemas.StatusReportDetail)
+@router.post(
+    "/{report_id}/retry",
+    response_model=schemas.StatusReportDetail,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def retry_status_report(
     report_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
     analyzer: GeminiClient = Depends(get_gemini_client),
@@ -124,14 +156,50 @@ def retry_status_report(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Retry is only available for failed reports.",
         )
-    result = service.submit_report(report)
-    _commit_or_raise(db)
-    if result.error:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail={
-                "message": result.error,
-                "report": result.detail.model_dump(mode="json"),
-            },
+    return _enqueue_analysis(db, service, report, analyzer=analyzer, background_tasks=background_tasks)
+
+
+def _load_job_state(db: Session, *, report_id: str, owner_id: str) -> schemas.StatusReportJobRead:
+    try:
+        report = (
+            db.query(models.StatusReport)
+            .filter(models.StatusReport.id == report_id, models.StatusReport.owner_id == owner_id)
+            .first()
+        )
+        job = get_latest_job(db, report_id=report_id) if report is not None else None
+        if report is None or job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis job not found")
+        return schemas.StatusReportJobRead(
+            id=job.id,
+            report_id=job.report_id,
+            status=job.status,
+            report_status=report.status,
+            attempts=job.attempts,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
         )
-    return result.detail
+    finally:
+        # End the read transaction so no connection is held while the long poll sleeps;
+        # the next poll then reads a fresh snapshot.
+        db.rollback()
+
+
+@router.get("/{report_id}/job", response_model=schemas.StatusReportJobRead)
+async def get_status_report_job(
+    report_id: str,
+    wait: float = Query(default=0, ge=0, le=_MAX_JOB_WAIT_SECONDS),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+) -> schemas.StatusReportJobRead:
+    """Return the latest analysis job, optionally long-polling up to ``wait`` seconds for it to finish."""
+
+    owner_id = current_user.id
+    deadline = time.monotonic() + wait
+    while True:
+        state = await run_in_threadpool(_load_job_state, db, report_id=report_id, owner_id=owner_id)
+        remaining = deadline - time.monotonic()
+        if state.status.value in TERMINAL_JOB_STATUSES or remaining <= 0:
+            return state
+        await asyncio.sleep(min(_JOB_POLL_INTERVAL_SECONDS, remaining))
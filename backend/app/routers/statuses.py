@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..auth import get_current_user
 from ..database import get_db
+from ..services.change_versions import owner_scope, scope_versions
 from ..services.status_defaults import ensure_default_statuses
+from ..utils.etags import compute_etag, etag_headers, etag_matches, not_modified_response
 from ..utils.repository import (
     apply_updates,
     delete_model,
@@ -19,12 +21,18 @@ router = APIRouter(prefix="/statuses", tags=["statuses"])
 
 @router.get("/", response_model=list[schemas.StatusRead])
 def list_statuses(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-) -> list[models.Status]:
+) -> list[models.Status] | Response:
     _, created_or_updated = ensure_default_statuses(db, owner_id=current_user.id)
     if created_or_updated:
         db.commit()
+    etag = compute_etag(request, scope_versions(db, [owner_scope(current_user.id)]))
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(etag_headers(etag))
     return (
         db.query(models.Status)
         .filter(models.Status.owner_id == current_user.id)
@@ -379,6 +379,58 @@ class CardRead(CardBase):
         return data if data is not None else values
 
 
+class SubtaskChange(SubtaskRead):
+    card_id: str
+
+
+class DeletedCardItem(BaseModel):
+    id: str
+    card_id: str
+    deleted_at: datetime
+
+
+class CardChanges(BaseModel):
+    """Delta returned by ``GET /cards/changes``.
+
+    ``cards`` carry their full subtask list; ``subtasks`` only lists changed
+    subtasks of cards that are not in ``cards``. Pass ``cursor`` as ``since``
+    on the next call. ``full_resync`` means the cursor predates the tombstone
+    retention window: ``cards`` then holds every visible card, and the client
+    replaces its local copy instead of merging.
+    """
+
+    cards: List[CardRead] = Field(default_factory=list)
+    subtasks: List[SubtaskChange] = Field(default_factory=list)
+    deleted_cards: List[DeletedCardItem] = Field(default_factory=list)
+    deleted_subtasks: List[DeletedCardItem] = Field(default_factory=list)
+    cursor: str
+    full_resync: bool = False
+
+
+class CardAggregateBucket(BaseModel):
+    key: Optional[str] = None
+    name: Optional[str] = None
+    count: int = 0
+    story_points: int = 0
+    estimate_hours: float = 0.0
+
+
+class CardAggregates(BaseModel):
+    """Grouped counts returned by ``GET /cards/aggregates``.
+
+    ``key`` is the status ID, label ID, priority or assignee, and ``None``
+    collects cards without one. ``name`` is the status or label name, or the
+    assignee's display name.
+    """
+
+    total: CardAggregateBucket
+    overdue: CardAggregateBucket
+    by_status: List[CardAggregateBucket] = Field(default_factory=list)
+    by_label: List[CardAggregateBucket] = Field(default_factory=list)
+    by_priority: List[CardAggregateBucket] = Field(default_factory=list)
+    by_assignee: List[CardAggregateBucket] = Field(default_factory=list)
+
+
 class SimilarItem(BaseModel):
     id: str
     type: Literal["card", "subtask"]
@@ -576,6 +628,7 @@ class AnalysisResponse(BaseModel):
     model: str
     proposals: List[AnalysisCard]
     warnings: List[str] = Field(default_factory=list)
+    cached: bool = False
 
 
 class StatusReportStatus(str, Enum):
@@ -693,6 +746,27 @@ class StatusReportDetail(StatusReportRead):
     pending_proposals: List[AnalysisCard] = Field(default_factory=list)
 
 
+class StatusReportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class StatusReportJobRead(BaseModel):
+    id: str
+    report_id: str
+    status: StatusReportJobStatus
+    report_status: StatusReportStatus
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # Channels
 class ChannelRead(BaseModel):
     id: str
@@ -835,6 +909,7 @@ class ImmunityMapCandidateResponse(BaseModel):
     model: Optional[str] = None
     token_usage: Dict[str, Any] = Field(default_factory=dict)
     warnings: List[str] = Field(default_factory=list)
+    cached: bool = False
 
     model_config = ConfigDict(extra="forbid")
 
@@ -900,6 +975,7 @@ class ImmunityMapResponse(BaseModel):
     readout_cards: List[ImmunityMapReadoutCard] = Field(default_factory=list)
     token_usage: Dict[str, Any] = Field(default_factory=dict)
     warnings: List[str] = Field(default_factory=list)
+    cached: bool = False
 
     model_config = ConfigDict(extra="forbid")
 
@@ -1256,6 +1332,19 @@ class UserQuotaUpdate(BaseModel):
     auto_card_daily_limit: Optional[int] = Field(default=None, ge=0)
 
 
+class DatabasePoolMetrics(BaseModel):
+    deployment_mode: Literal["serverless", "server"]
+    pool_class: str
+    checked_out: int
+    checkouts: int
+    checkout_wait_ms_total: float
+    checkout_wait_ms_avg: float
+    checkout_wait_ms_max: float
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+
+
 # --------------------------------------------------------------------------------------------
 # Appeal generation schemas
 
@@ -1363,6 +1452,7 @@ class AppealGenerationResponse(BaseModel):
     formats: Dict[str, AppealGeneratedFormat]
     generation_status: str
     ai_failure_reason: str | None = None
+    cached: bool = False
 
 
 # --------------------------------------------------------------------------------------------
@@ -1370,3 +1460,4 @@ class AppealGenerationResponse(BaseModel):
 
 # Resolve forward references for nested models defined later in the module.
 CardRead.model_rebuild()
+CardChanges.model_rebuild()
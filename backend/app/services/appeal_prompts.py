@@ -1,19 +1,18 @@
 from __future__ import annotations
 
+import functools
+import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, ClassVar, Iterable
-
-try:
-    from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
-except ModuleNotFoundError as exc:  # pragma: no cover - exercised in import failure environments
-    Environment = FileSystemLoader = StrictUndefined = select_autoescape = None  # type: ignore[assignment]
-    _jinja_import_error = exc
-else:
-    _jinja_import_error: ModuleNotFoundError | None = None
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable
 
 from .. import schemas
 
+if TYPE_CHECKING:  # pragma: no cover - Jinja2 is imported on first use
+    from jinja2 import Template
+
+_PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
 CAUSAL_CONNECTORS = {"link": "そのため", "result": "結果として"}
 
 
@@ -25,6 +24,34 @@ class FlowStepDetail:
     description: str
 
 
+def _tojson_filter(value: Any, *, indent: int | None = None) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=indent)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_template(template_name: str) -> Template:
+    """Compile ``template_name`` once per process; every builder shares the result."""
+
+    try:
+        from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+    except ModuleNotFoundError as exc:  # pragma: no cover - depends on external environment
+        message = (
+            "Jinja2 is required to render appeal prompts. "
+            "Please install the backend dependencies via 'pip install -r backend/requirements.txt'."
+        )
+        raise RuntimeError(message) from exc
+
+    environment = Environment(
+        loader=FileSystemLoader(str(_PROMPTS_DIR)),
+        autoescape=select_autoescape(enabled_extensions=("jinja", "jinja2")),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        undefined=StrictUndefined,
+    )
+    environment.filters.setdefault("tojson", _tojson_filter)
+    return environment.get_template(template_name)
+
+
 class AppealPromptBuilder:
     """Render prompt instructions for the appeal generation model."""
 
@@ -38,23 +65,7 @@ class AppealPromptBuilder:
     }
 
     def __init__(self, template_name: str = "appeals.jinja") -> None:
-        if _jinja_import_error is not None:  # pragma: no cover - depends on external environment
-            message = (
-                "Jinja2 is required to render appeal prompts. "
-                "Please install the backend dependencies via 'pip install -r backend/requirements.txt'."
-            )
-            raise RuntimeError(message) from _jinja_import_error
-        base_dir = Path(__file__).resolve().parent.parent / "prompts"
-        loader = FileSystemLoader(str(base_dir))
-        self._environment = Environment(
-            loader=loader,
-            autoescape=select_autoescape(enabled_extensions=("jinja", "jinja2")),
-            trim_blocks=True,
-            lstrip_blocks=True,
-            undefined=StrictUndefined,
-        )
-        self._environment.filters.setdefault("tojson", self._tojson_filter)
-        self._template = self._environment.get_template(template_name)
+        self._template = _load_template(template_name)
 
     def build(
         self,
@@ -141,11 +152,6 @@ class AppealPromptBuilder:
         description = self._STEP_DESCRIPTIONS.get(step_label, "ステップの目的を読者に分かりやすく伝える")
         return FlowStepDetail(label=step_label, description=description)
 
-    def _tojson_filter(self, value: Any, *, indent: int | None = None) -> str:
-        import json
-
-        return json.dumps(value, ensure_ascii=False, indent=indent)
-
 
 class AppealFallbackBuilder:
     """Construct deterministic narratives when AI generation is unavailable."""
@@ -4,10 +4,12 @@ import html
 import logging
 import re
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import date
 from typing import ClassVar, Iterable
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
@@ -21,13 +23,38 @@ from ..services.appeal_prompts import (
 from ..services.gemini import (
     GeminiClient,
     GeminiError,
+    call_gemini,
     get_optional_gemini_client,
 )
+from ..services.response_cache import (
+    CACHE_ENDPOINT_APPEAL,
+    appeal_response_cache_key,
+    load_cached_response,
+    store_cached_response,
+)
 from ..utils.quotas import AI_QUOTA_APPEAL, get_appeal_daily_limit, reserve_ai_quota
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _AppealGenerationPlan:
+    """Inputs resolved from the database before the model is called."""
+
+    subject: str
+    warnings: list[str]
+    log_context: dict[str, object]
+    fallback_formats: dict[str, schemas.AppealGeneratedFormat]
+    prompt: str | None = None
+    response_schema: dict[str, object] = field(default_factory=dict)
+    cache_key: str | None = None
+    cached_payload: dict[str, object] | None = None
+
+    @property
+    def needs_generation(self) -> bool:
+        return self.prompt is not None and self.cached_payload is None
+
+
 class AppealGenerationService:
     """Provides helper methods for configuring and generating appeal narratives."""
 
@@ -83,21 +110,53 @@ class AppealGenerationService:
         owner: models.User,
         request: schemas.AppealGenerationRequest,
     ) -> schemas.AppealGenerationResponse:
-        today = date.today()
-        limit = get_appeal_daily_limit(self._db, owner.id)
-        quota_reserved = reserve_ai_quota(
-            self._db,
-            owner_id=owner.id,
-            quota_day=today,
-            limit=limit,
-            quota_key=AI_QUOTA_APPEAL,
+        plan = self._prepare_generation(owner=owner, request=request)
+        payload, error = plan.cached_payload, None
+        if plan.needs_generation:
+            try:
+                payload = self._gemini.generate_appeal(prompt=plan.prompt, response_schema=plan.response_schema)
+            except GeminiError as exc:
+                error = exc
+        return self._finalize_generation(owner=owner, request=request, plan=plan, payload=payload, error=error)
+
+    async def generate_async(
+        self,
+        *,
+        owner: models.User,
+        request: schemas.AppealGenerationRequest,
+    ) -> schemas.AppealGenerationResponse:
+        """Variant of :meth:`generate` that awaits the model outside the threadpool."""
+
+        plan = await run_in_threadpool(self._prepare_generation, owner=owner, request=request)
+        payload, error = plan.cached_payload, None
+        if plan.needs_generation:
+            # Persist the quota reservation before awaiting the model so the
+            # write transaction is not held open for the duration of the call.
+            await run_in_threadpool(self._db.commit)
+            try:
+                payload = await call_gemini(
+                    self._gemini,
+                    "generate_appeal",
+                    prompt=plan.prompt,
+                    response_schema=plan.response_schema,
+                )
+            except GeminiError as exc:
+                error = exc
+        return await run_in_threadpool(
+            self._finalize_generation,
+            owner=owner,
+            request=request,
+            plan=plan,
+            payload=payload,
+            error=error,
         )
-        if not quota_reserved:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Daily appeal generation limit of {limit} reached.",
-            )
 
+    def _prepare_generation(
+        self,
+        *,
+        owner: models.User,
+        request: schemas.AppealGenerationRequest,
+    ) -> _AppealGenerationPlan:
         subject_label_id: str | None = None
         if request.subject.type == "label":
             subject_label_id = request.subject.value
@@ -118,7 +177,6 @@ class AppealGenerationService:
         sanitized_subject = self._sanitize_subject(subject_text)
         achievements = self._resolve_achievements(owner_id=owner.id, label_id=subject_label_id, request=request)
         sanitized_achievements = self._sanitize_achievements(achievements)
-        warnings = self._derive_flow_warnings(request.flow)
         log_context: dict[str, object] = {
             "owner_id": owner.id,
             "subject_type": request.subject.type,
@@ -137,61 +195,89 @@ class AppealGenerationService:
             achievements=sanitized_achievements,
         )
 
-        generated_formats = dict(fallback_formats)
-        token_usage = {fmt: payload.tokens_used or 0 for fmt, payload in fallback_formats.items()}
+        plan = _AppealGenerationPlan(
+            subject=sanitized_subject,
+            warnings=self._derive_flow_warnings(request.flow),
+            log_context=log_context,
+            fallback_formats=fallback_formats,
+        )
+        if self._gemini is not None and self._prompt_builder is not None:
+            plan.prompt = self._prompt_builder.build(
+                subject=sanitized_subject,
+                subject_type=request.subject.type,
+                flow=request.flow,
+                achievements=sanitized_achievements,
+                formats=[self._format_definitions[fmt] for fmt in request.formats if fmt in self._format_definitions],
+                workspace_profile=self._build_workspace_profile(owner),
+            )
+            plan.response_schema = self._prompt_builder.build_response_schema(request.formats)
+            plan.cache_key = appeal_response_cache_key(
+                self._gemini,
+                CACHE_ENDPOINT_APPEAL,
+                prompt=plan.prompt,
+                response_schema=plan.response_schema,
+            )
+            plan.cached_payload = load_cached_response(self._db, plan.cache_key)
+
+        if plan.cached_payload is None:
+            self._reserve_quota(owner)
+        return plan
+
+    def _finalize_generation(
+        self,
+        *,
+        owner: models.User,
+        request: schemas.AppealGenerationRequest,
+        plan: _AppealGenerationPlan,
+        payload: dict[str, object] | None,
+        error: GeminiError | None,
+    ) -> schemas.AppealGenerationResponse:
+        log_context = plan.log_context
+        warnings = plan.warnings
+        generated_formats = dict(plan.fallback_formats)
+        token_usage = {fmt: item.tokens_used or 0 for fmt, item in plan.fallback_formats.items()}
         generation_status = "fallback"
         ai_failure_reason: str | None = None
 
-        if self._gemini is not None and self._prompt_builder is not None:
-            try:
-                prompt = self._prompt_builder.build(
-                    subject=sanitized_subject,
-                    subject_type=request.subject.type,
-                    flow=request.flow,
-                    achievements=sanitized_achievements,
-                    formats=[
-                        self._format_definitions[fmt] for fmt in request.formats if fmt in self._format_definitions
-                    ],
-                    workspace_profile=self._build_workspace_profile(owner),
-                )
-                response_schema = self._prompt_builder.build_response_schema(request.formats)
-                payload = self._gemini.generate_appeal(prompt=prompt, response_schema=response_schema)
-                (
-                    generated_formats,
-                    token_usage,
+        if error is not None:
+            ai_failure_reason = str(error)
+            logger.warning(
+                "Appeal generation fallback: gemini_error. context=%s reason=%s",
+                log_context,
+                str(error),
+                exc_info=error,
+            )
+        elif payload is not None:
+            if plan.needs_generation:
+                store_cached_response(self._db, plan.cache_key, payload, model=payload.get("model"))
+            (
+                generated_formats,
+                token_usage,
+                generation_status,
+                ai_formats,
+                fallback_formats_used,
+            ) = self._merge_ai_payload(
+                requested_formats=request.formats,
+                payload=payload,
+                fallback_formats=plan.fallback_formats,
+                subject=plan.subject,
+            )
+            if generation_status != "success":
+                reason = "ai_response_partial" if ai_formats else "ai_response_empty"
+                logger.warning(
+                    "Appeal generation returned status=%s reason=%s context=%s ai_formats=%s fallback_formats=%s",
                     generation_status,
+                    reason,
+                    log_context,
                     ai_formats,
                     fallback_formats_used,
-                ) = self._merge_ai_payload(
-                    requested_formats=request.formats,
-                    payload=payload,
-                    fallback_formats=fallback_formats,
-                    subject=sanitized_subject,
-                )
-                if generation_status != "success":
-                    reason = "ai_response_partial" if ai_formats else "ai_response_empty"
-                    logger.warning(
-                        "Appeal generation returned status=%s reason=%s context=%s ai_formats=%s fallback_formats=%s",
-                        generation_status,
-                        reason,
-                        log_context,
-                        ai_formats,
-                        fallback_formats_used,
-                    )
-                ai_warnings = payload.get("warnings")
-                if isinstance(ai_warnings, list):
-                    for item in ai_warnings:
-                        text = str(item or "").strip()
-                        if text and text not in warnings:
-                            warnings.append(text)
-            except GeminiError as exc:
-                ai_failure_reason = str(exc)
-                logger.warning(
-                    "Appeal generation fallback: gemini_error. context=%s reason=%s",
-                    log_context,
-                    str(exc),
-                    exc_info=True,
                 )
+            ai_warnings = payload.get("warnings")
+            if isinstance(ai_warnings, list):
+                for item in ai_warnings:
+                    text = str(item or "").strip()
+                    if text and text not in warnings:
+                        warnings.append(text)
         elif self._gemini is not None and self._prompt_builder is None:
             ai_failure_reason = "AI のテンプレートが利用できないため、フォールバックで生成しました。"
             logger.warning(
@@ -206,7 +292,7 @@ class AppealGenerationService:
         record = self._repository.create(
             owner_id=owner.id,
             subject_type=request.subject.type,
-            subject_value=sanitized_subject,
+            subject_value=plan.subject,
             flow=request.flow,
             formats=request.formats,
             formats_payload=generated_formats,
@@ -217,13 +303,30 @@ class AppealGenerationService:
 
         return schemas.AppealGenerationResponse(
             generation_id=record.id,
-            subject_echo=sanitized_subject,
+            subject_echo=plan.subject,
             flow=request.flow,
             warnings=warnings,
             formats=generated_formats,
             generation_status=generation_status,
             ai_failure_reason=ai_failure_reason,
+            cached=plan.cached_payload is not None,
+        )
+
+    def _reserve_quota(self, owner: models.User) -> None:
+        today = date.today()
+        limit = get_appeal_daily_limit(self._db, owner.id)
+        quota_reserved = reserve_ai_quota(
+            self._db,
+            owner_id=owner.id,
+            quota_day=today,
+            limit=limit,
+            quota_key=AI_QUOTA_APPEAL,
         )
+        if not quota_reserved:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Daily appeal generation limit of {limit} reached.",
+            )
 
     @property
     def _format_definitions(self) -> dict[str, schemas.AppealFormatDefinition]:
@@ -0,0 +1,467 @@
+"""Server-Sent Events push for shared boards (``GET /channels/{id}/events``).
+
+Flush hooks note every card, subtask and comment write, plus removed channel
+members, in ``session.info``. Once the transaction commits, they hand the
+batch to the process-wide :class:`BoardEventBroker`. A rollback discards it.
+The broker fans each batch out to the local subscribers of the channel, and
+its transport forwards it to the other worker processes:
+
+* ``memory`` (:class:`InMemoryTransport`) only reaches brokers in this
+  process. That is enough for a single worker, and tests use it as a stand-in
+  for several workers.
+* ``postgres`` (:class:`PostgresNotifyTransport`) sends ``pg_notify`` on the
+  ``board_events`` channel. A listener thread with one dedicated connection
+  delivers the notifications from other processes.
+
+Events only carry IDs (``{"entity", "action", "id", "card_id"}``), never
+content. Clients react by calling ``GET /cards/changes`` with their cursor.
+Each subscriber has a bounded queue. A client that reads too slowly has its
+backlog replaced by a single ``resync`` event, and so does every subscriber
+of a worker whose listener reconnected and may have missed notifications.
+Idle streams get a comment line every ``BOARD_EVENTS_HEARTBEAT_SECONDS``, so
+proxies keep them open and dead connections are noticed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import uuid
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Protocol
+
+from sqlalchemy import event, func, inspect, select as sql_select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+Change = dict[str, Any]
+Deliver = Callable[[str, list[Change]], None]
+
+NOTIFY_CHANNEL = "board_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+_NOTIFY_PAYLOAD_LIMIT = 7900
+_PENDING_KEY = "board_events.pending"
+_RETRY_MILLISECONDS = 3000
+
+
+class BoardEventTransport(Protocol):
+    def start(self, deliver: Deliver, resync: Callable[[], None]) -> None: ...
+
+    def publish(self, channel_id: str, changes: list[Change]) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class InMemoryTransport:
+    """Forwards batches to the other transports that share ``hub``."""
+
+    def __init__(self, hub: list[InMemoryTransport] | None = None) -> None:
+        self._hub = hub if hub is not None else []
+        self._deliver: Deliver | None = None
+
+    def start(self, deliver: Deliver, resync: Callable[[], None]) -> None:
+        self._deliver = deliver
+        if self not in self._hub:
+            self._hub.append(self)
+
+    def publish(self, channel_id: str, changes: list[Change]) -> None:
+        for peer in list(self._hub):
+            if peer is not self and peer._deliver is not None:
+                peer._deliver(channel_id, changes)
+
+    def stop(self) -> None:
+        if self in self._hub:
+            self._hub.remove(self)
+        self._deliver = None
+
+
+def notify_payloads(origin: str, channel_id: str, changes: list[Change]) -> list[str]:
+    """Split a batch into NOTIFY payloads below the Postgres size limit."""
+
+    payloads: list[str] = []
+    chunk: list[Change] = []
+    for change in changes:
+        candidate = _notify_payload(origin, channel_id, [*chunk, change])
+        if chunk and len(candidate.encode("utf-8")) > _NOTIFY_PAYLOAD_LIMIT:
+            payloads.append(_notify_payload(origin, channel_id, chunk))
+            chunk = [change]
+        else:
+            chunk.append(change)
+    if chunk:
+        payloads.append(_notify_payload(origin, channel_id, chunk))
+    return payloads
+
+
+def _notify_payload(origin: str, channel_id: str, changes: list[Change]) -> str:
+    return json.dumps({"origin": origin, "channel_id": channel_id, "changes": changes}, separators=(",", ":"))
+
+
+class PostgresNotifyTransport:
+    """Cross-process delivery through Postgres ``LISTEN``/``NOTIFY`` (psycopg2 only)."""
+
+    def __init__(self, engine: Engine, *, poll_interval: float = 1.0, reconnect_delay: float = 2.0) -> None:
+        self._engine = engine
+        self._poll_interval = poll_interval
+        self._reconnect_delay = reconnect_delay
+        self._origin = uuid.uuid4().hex
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._deliver: Deliver | None = None
+        self._resync: Callable[[], None] | None = None
+
+    def start(self, deliver: Deliver, resync: Callable[[], None]) -> None:
+        self._deliver, self._resync = deliver, resync
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="board-events-listener", daemon=True)
+        self._thread.start()
+
+    def publish(self, channel_id: str, changes: list[Change]) -> None:
+        with self._engine.begin() as connection:
+            for payload in notify_payloads(self._origin, channel_id, changes):
+                connection.execute(sql_select(func.pg_notify(NOTIFY_CHANNEL, payload)))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stopping.is_set():
+            raw = None
+            try:
+                raw = self._engine.raw_connection()
+                driver = raw.driver_connection
+                driver.autocommit = True
+                with driver.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                if connected_before and self._resync is not None:
+                    # Notifications sent while we were disconnected are lost.
+                    self._resync()
+                connected_before = True
+                self._listen(driver)
+            except Exception:
+                logger.exception("Board event listener failed; reconnecting")
+                self._stopping.wait(self._reconnect_delay)
+            finally:
+                if raw is not None:
+                    # Never hand a LISTENing connection back to the pool.
+                    raw.invalidate()
+
+    def _listen(self, driver: Any) -> None:
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([driver], [], [], self._poll_interval)
+            if not readable:
+                continue
+            driver.poll()
+            while driver.notifies:
+                self._receive(driver.notifies.pop(0).payload)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed board event payload")
+            return
+        if message.get("origin") != self._origin and self._deliver is not None:
+            self._deliver(message["channel_id"], message["changes"])
+
+
+class Subscription:
+    """One stream's bounded queue of ``(event, data)`` pairs, filled from any thread."""
+
+    def __init__(self, channel_id: str, user_id: str, *, queue_size: int) -> None:
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, name: str, data: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, name, data)
+        except RuntimeError:
+            # The stream's event loop has already shut down.
+            pass
+
+    async def get(self) -> tuple[str, Any]:
+        return await self._queue.get()
+
+    def _put(self, name: str, data: Any) -> None:
+        if name == "closed":
+            self._drain()
+        try:
+            self._queue.put_nowait((name, data))
+        except asyncio.QueueFull:
+            # The client fell behind. Drop its backlog; it catches up through /cards/changes.
+            self._drain()
+            self._queue.put_nowait(("resync", {}))
+
+    def _drain(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+class BoardEventBroker:
+    """Routes committed change batches to the subscribers of each channel."""
+
+    def __init__(self, transport: BoardEventTransport, *, queue_size: int) -> None:
+        self._transport = transport
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    def start(self) -> None:
+        self._transport.start(self.deliver, self.resync_all)
+
+    def stop(self) -> None:
+        self._transport.stop()
+        for subscription in self._all_subscriptions():
+            subscription.offer("closed", {})
+
+    def subscribe(self, channel_id: str, user_id: str) -> Subscription:
+        """Register a stream; must be called on the event loop that will read it."""
+
+        subscription = Subscription(channel_id, user_id, queue_size=self._queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.channel_id]
+
+    def subscriber_count(self, channel_id: str) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(channel_id, ()))
+
+    def publish(self, batches: dict[str, list[Change]]) -> None:
+        for channel_id, changes in batches.items():
+            self.deliver(channel_id, changes)
+            try:
+                self._transport.publish(channel_id, changes)
+            except Exception:
+                logger.exception("Forwarding board events for channel %s failed", channel_id)
+
+    def deliver(self, channel_id: str, changes: list[Change]) -> None:
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel_id, ()))
+        for subscription in subscribers:
+            subscription.offer("changes", changes)
+
+    def resync_all(self) -> None:
+        for subscription in self._all_subscriptions():
+            subscription.offer("resync", {})
+
+    def _all_subscriptions(self) -> list[Subscription]:
+        with self._lock:
+            return [subscription for subscribers in self._subscriptions.values() for subscription in subscribers]
+
+
+_broker: BoardEventBroker | None = None
+_broker_lock = threading.Lock()
+
+
+def _new_broker(transport: BoardEventTransport) -> BoardEventBroker:
+    broker = BoardEventBroker(transport, queue_size=settings.board_events_queue_size)
+    broker.start()
+    return broker
+
+
+def get_board_event_broker() -> BoardEventBroker:
+    """The process-wide broker; an in-memory one until :func:`start_board_events` runs."""
+
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = _new_broker(InMemoryTransport())
+        return _broker
+
+
+def start_board_events(engine: Engine) -> BoardEventBroker:
+    """Install the broker for ``BOARD_EVENTS_TRANSPORT``."""
+
+    global _broker
+    transport: BoardEventTransport = InMemoryTransport()
+    if settings.board_events_transport == "postgres":
+        if engine.dialect.driver == "psycopg2":
+            transport = PostgresNotifyTransport(engine)
+        else:
+            logger.warning(
+                "BOARD_EVENTS_TRANSPORT=postgres needs the psycopg2 driver, not %s; "
+                "board events stay within this process.",
+                engine.dialect.driver,
+            )
+    with _broker_lock:
+        previous, _broker = _broker, _new_broker(transport)
+    if previous is not None:
+        previous.stop()
+    return _broker
+
+
+def stop_board_events() -> None:
+    """Stop the transport and end every open stream."""
+
+    global _broker
+    with _broker_lock:
+        broker, _broker = _broker, None
+    if broker is not None:
+        broker.stop()
+
+
+def format_sse(name: str, data: Any) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def board_event_stream(
+    channel_id: str,
+    user_id: str,
+    *,
+    heartbeat_seconds: float | None = None,
+) -> AsyncIterator[str]:
+    """SSE frames for one client until it disconnects, is removed, or the broker stops.
+
+    The subscription is registered before the ``ready`` event, so a client
+    that syncs on ``ready`` misses nothing.
+    """
+
+    heartbeat = settings.board_events_heartbeat_seconds if heartbeat_seconds is None else heartbeat_seconds
+    broker = get_board_event_broker()
+    subscription = broker.subscribe(channel_id, user_id)
+    # The pending get() survives heartbeats, so an item that arrives as one fires is not lost.
+    getter: asyncio.Future[tuple[str, Any]] | None = None
+    try:
+        yield f"retry: {_RETRY_MILLISECONDS}\n" + format_sse("ready", {"channel_id": channel_id})
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({getter}, timeout=heartbeat)
+            if not done:
+                yield ": heartbeat\n\n"
+                continue
+            name, data = getter.result()
+            getter = None
+            if name == "closed":
+                return
+            yield format_sse(name, data)
+            if name == "changes" and _removes_member(data, user_id):
+                return
+    finally:
+        if getter is not None:
+            getter.cancel()
+        broker.unsubscribe(subscription)
+
+
+def _removes_member(changes: list[Change], user_id: str) -> bool:
+    return any(
+        change["entity"] == "member" and change["action"] == "deleted" and change["id"] == user_id for change in changes
+    )
+
+
+def _change(entity: str, action: str, entity_id: str, card_id: str | None) -> Change:
+    return {"entity": entity, "action": action, "id": entity_id, "card_id": card_id}
+
+
+def _action(session: Session, instance: Any) -> str:
+    if instance in session.new:
+        return "created"
+    if instance in session.deleted:
+        return "deleted"
+    return "updated"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_board_events(session: Session, flush_context: Any) -> None:
+    batches: list[tuple[str, Change]] = []
+    whole_card_ids: set[str] = set()
+    children: list[tuple[str, str, Any]] = []
+
+    changed = [instance for instance in session.dirty if session.is_modified(instance)]
+    for instance in (*session.new, *changed, *session.deleted):
+        if isinstance(instance, models.Card):
+            action = _action(session, instance)
+            if action != "updated":
+                # Subtasks and comments written along with the card are covered by its event.
+                whole_card_ids.add(instance.id)
+            if instance.channel_id:
+                batches.append((instance.channel_id, _change("card", action, instance.id, instance.id)))
+            # A card that moved is gone from the channel it left.
+            for channel_id in inspect(instance).attrs.channel_id.history.deleted:
+                if channel_id and channel_id != instance.channel_id:
+                    batches.append((channel_id, _change("card", "deleted", instance.id, instance.id)))
+        elif isinstance(instance, models.Subtask):
+            children.append(("subtask", _action(session, instance), instance))
+        elif isinstance(instance, models.Comment):
+            children.append(("comment", _action(session, instance), instance))
+        elif isinstance(instance, models.ChannelMember) and instance in session.deleted:
+            batches.append((instance.channel_id, _change("member", "deleted", instance.user_id, None)))
+
+    pending = [item for item in children if item[2].card_id not in whole_card_ids]
+    if pending:
+        rows = session.connection().execute(
+            sql_select(models.Card.id, models.Card.channel_id).where(
+                models.Card.id.in_({instance.card_id for _, _, instance in pending})
+            )
+        )
+        channels = dict(rows.tuples().all())
+        for entity, action, instance in pending:
+            channel_id = channels.get(instance.card_id)
+            if channel_id:
+                batches.append((channel_id, _change(entity, action, instance.id, instance.card_id)))
+
+    if batches:
+        session.info.setdefault(_PENDING_KEY, []).extend(batches)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_board_events(session: Session) -> None:
+    pending: list[tuple[str, Change]] = session.info.pop(_PENDING_KEY, [])
+    if not pending:
+        return
+    batches: dict[str, list[Change]] = {}
+    seen: set[tuple[str, str, str, str]] = set()
+    for channel_id, change in pending:
+        key = (channel_id, change["entity"], change["action"], change["id"])
+        if key not in seen:
+            seen.add(key)
+            batches.setdefault(channel_id, []).append(change)
+    try:
+        get_board_event_broker().publish(batches)
+    except Exception:
+        # The write is committed; a lost notification only delays other viewers.
+        logger.exception("Publishing board events failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_board_events(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+__all__ = [
+    "NOTIFY_CHANNEL",
+    "BoardEventBroker",
+    "BoardEventTransport",
+    "InMemoryTransport",
+    "PostgresNotifyTransport",
+    "Subscription",
+    "board_event_stream",
+    "format_sse",
+    "get_board_event_broker",
+    "notify_payloads",
+    "start_board_events",
+    "stop_board_events",
+]
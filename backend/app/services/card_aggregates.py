@@ -0,0 +1,228 @@
+"""Grouped card counts for ``GET /cards/aggregates``.
+
+Each dimension (status, label, priority, assignee, plus the total and the
+overdue cards) is one ``GROUP BY`` over the filtered cards. The cards are
+also grouped by channel. A card belongs to exactly one channel, so the
+per-channel results add up to the caller's figures, and they can be cached
+per channel and shared by every member who uses the same filters.
+
+A cache entry records the channel's ``change_versions`` counter (see
+:mod:`app.services.change_versions`). Any write to the channel's cards
+makes the entry miss immediately. ``CARD_AGGREGATES_CACHE_TTL_SECONDS`` only
+bounds how long the ``overdue`` figures can lag. A relative ``time_range`` is
+already resolved to a cutoff, rounded down to the minute, in ``filters_key``.
+Names are looked up on every request.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import func, null, select
+from sqlalchemy.orm import Query, Session
+
+from .. import models
+from ..config import settings
+from .card_reads import display_names
+from .change_versions import channel_scope, scope_versions
+
+_DIMENSIONS = ("status", "label", "priority", "assignee")
+_MAX_CACHE_ENTRIES = 4096
+
+
+@dataclass
+class _Bucket:
+    count: int = 0
+    story_points: int = 0
+    estimate_hours: float = 0.0
+
+    def add(self, count: int, story_points: Any, estimate_hours: Any) -> None:
+        self.count += count
+        self.story_points += int(story_points or 0)
+        self.estimate_hours += float(estimate_hours or 0.0)
+
+
+# Section ("total", "overdue" or a dimension) -> group key -> bucket.
+_Aggregates = dict[str, dict[str | None, _Bucket]]
+
+_cache_lock = threading.Lock()
+# (channel_id, filters key) -> (expires at, channel version, aggregates)
+_cache: dict[tuple[str, str], tuple[float, int, _Aggregates]] = {}
+
+
+def invalidate_card_aggregates_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def collect_card_aggregates(
+    db: Session,
+    channel_ids: list[str],
+    filtered_cards: Callable[[list[str]], Query],
+    *,
+    filters_key: str,
+) -> dict[str, Any]:
+    """Aggregates over ``filtered_cards(channel_ids)``, shaped like ``schemas.CardAggregates``.
+
+    ``filtered_cards`` builds the filtered ``Card`` query for a subset of the
+    channels. ``filters_key`` must identify the filters, as it is part of the
+    cache key.
+    """
+
+    ttl = settings.card_aggregates_cache_ttl_seconds
+    per_channel: dict[str, _Aggregates] = {}
+    versions: dict[str, int] = {}
+    if ttl > 0 and channel_ids:
+        # Read before computing, so a concurrent write can only make an entry look older than it is.
+        scopes = scope_versions(db, [channel_scope(channel_id) for channel_id in channel_ids])
+        versions = {channel_id: scopes[channel_scope(channel_id)] for channel_id in channel_ids}
+        now = time.monotonic()
+        with _cache_lock:
+            for channel_id in channel_ids:
+                entry = _cache.get((channel_id, filters_key))
+                if entry is not None and entry[0] > now and entry[1] == versions[channel_id]:
+                    per_channel[channel_id] = entry[2]
+
+    missing = [channel_id for channel_id in channel_ids if channel_id not in per_channel]
+    if missing:
+        computed = _compute(db, filtered_cards(missing))
+        for channel_id in missing:
+            per_channel[channel_id] = computed.get(channel_id, {})
+        if ttl > 0:
+            _store(
+                {channel_id: per_channel[channel_id] for channel_id in missing},
+                versions,
+                filters_key,
+                expires_at=time.monotonic() + ttl,
+            )
+
+    return _render(db, _merge(per_channel.values()))
+
+
+def _store(
+    computed: dict[str, _Aggregates],
+    versions: dict[str, int],
+    filters_key: str,
+    *,
+    expires_at: float,
+) -> None:
+    with _cache_lock:
+        if len(_cache) + len(computed) > _MAX_CACHE_ENTRIES:
+            now = time.monotonic()
+            for key in [key for key, entry in _cache.items() if entry[0] <= now]:
+                del _cache[key]
+            if len(_cache) + len(computed) > _MAX_CACHE_ENTRIES:
+                _cache.clear()
+        for channel_id, aggregates in computed.items():
+            _cache[(channel_id, filters_key)] = (expires_at, versions[channel_id], aggregates)
+
+
+def _compute(db: Session, query: Query) -> dict[str, _Aggregates]:
+    card = models.Card
+    cards = (
+        query.with_entities(
+            card.id.label("card_id"),
+            card.channel_id,
+            card.status_id,
+            card.priority,
+            card.story_points,
+            card.estimate_hours,
+            card.due_date,
+            card.completed_at,
+        )
+        .order_by(None)
+        .subquery()
+    )
+    labels = models.card_labels
+    assignees = models.card_assignees
+    measures = (func.count(), func.sum(cards.c.story_points), func.sum(cards.c.estimate_hours))
+
+    def grouped(key: Any, *criteria: Any, source: Any = cards) -> Any:
+        group_by = (cards.c.channel_id,) if key is None else (cards.c.channel_id, key)
+        return (
+            select(cards.c.channel_id, null() if key is None else key, *measures)
+            .select_from(source)
+            .where(*criteria)
+            .group_by(*group_by)
+        )
+
+    now = datetime.now(timezone.utc)
+    statements = {
+        "total": grouped(None),
+        "overdue": grouped(
+            None,
+            cards.c.completed_at.is_(None),
+            cards.c.due_date.is_not(None),
+            cards.c.due_date < now,
+        ),
+        "status": grouped(cards.c.status_id),
+        "priority": grouped(cards.c.priority),
+        "label": grouped(
+            labels.c.label_id,
+            source=cards.outerjoin(labels, labels.c.card_id == cards.c.card_id),
+        ),
+        "assignee": grouped(
+            assignees.c.assignee,
+            source=cards.outerjoin(assignees, assignees.c.card_id == cards.c.card_id),
+        ),
+    }
+
+    computed: dict[str, _Aggregates] = {}
+    for section, statement in statements.items():
+        for channel_id, key, count, story_points, estimate_hours in db.execute(statement):
+            sections = computed.setdefault(channel_id, {})
+            sections.setdefault(section, {}).setdefault(key, _Bucket()).add(count, story_points, estimate_hours)
+    return computed
+
+
+def _merge(per_channel: Iterable[_Aggregates]) -> _Aggregates:
+    merged: _Aggregates = {section: {} for section in ("total", "overdue", *_DIMENSIONS)}
+    for aggregates in per_channel:
+        for section, buckets in aggregates.items():
+            for key, bucket in buckets.items():
+                merged[section].setdefault(key, _Bucket()).add(bucket.count, bucket.story_points, bucket.estimate_hours)
+    return merged
+
+
+def _names(db: Session, model: Any, ids: Iterable[str | None]) -> dict[str, str]:
+    wanted = {value for value in ids if value}
+    if not wanted:
+        return {}
+    rows = db.execute(select(model.id, model.name).where(model.id.in_(wanted)))
+    return dict(rows.tuples().all())
+
+
+def _render(db: Session, merged: _Aggregates) -> dict[str, Any]:
+    names = {
+        "status": _names(db, models.Status, merged["status"]),
+        "label": _names(db, models.Label, merged["label"]),
+        "assignee": display_names(db, [key for key in merged["assignee"] if key]),
+        "priority": {},
+    }
+
+    def bucket(key: str | None, values: _Bucket, section_names: dict[str, str]) -> dict[str, Any]:
+        return {
+            "key": key,
+            "name": section_names.get(key) if key else None,
+            "count": values.count,
+            "story_points": values.story_points,
+            "estimate_hours": values.estimate_hours,
+        }
+
+    def section(name: str) -> list[dict[str, Any]]:
+        ordered = sorted(merged[name].items(), key=lambda item: (-item[1].count, item[0] is None, item[0] or ""))
+        return [bucket(key, values, names[name]) for key, values in ordered]
+
+    return {
+        "total": bucket(None, merged["total"].get(None, _Bucket()), {}),
+        "overdue": bucket(None, merged["overdue"].get(None, _Bucket()), {}),
+        **{f"by_{name}": section(name) for name in _DIMENSIONS},
+    }
+
+
+__all__ = ["collect_card_aggregates", "invalidate_card_aggregates_cache"]
@@ -0,0 +1,86 @@
+"""Keep the ``card_assignees`` association in step with ``Card.assignees``.
+
+``Card.assignees`` stays the JSON list the API reads and writes. The
+association table mirrors it one row per (card, assignee) so filters like
+"cards assigned to me" resolve through ``ix_card_assignees_assignee_card_id``
+instead of hydrating every card in the channel.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .. import models
+
+_REBUILD_BATCH_SIZE = 500
+
+
+def _normalize(values: Iterable[Any] | None) -> list[str]:
+    if not isinstance(values, (list, tuple)):
+        return []
+    return list(dict.fromkeys(str(value) for value in values if value is not None and str(value).strip()))
+
+
+def sync_card_assignees(connection: Connection, assignments: Mapping[str, Iterable[Any] | None]) -> None:
+    """Replace the association rows for each card in ``assignments``."""
+
+    if not assignments:
+        return
+    table = models.card_assignees
+    connection.execute(delete(table).where(table.c.card_id.in_(list(assignments))))
+    rows = [
+        {"card_id": card_id, "assignee": assignee}
+        for card_id, values in assignments.items()
+        for assignee in _normalize(values)
+    ]
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+def rebuild_card_assignees(connection: Connection) -> int:
+    """Recreate the association from ``cards.assignees``. Returns the number of cards processed."""
+
+    card_table = models.Card.__table__
+    rows = connection.execute(select(card_table.c.id, card_table.c.assignees)).all()
+    for start in range(0, len(rows), _REBUILD_BATCH_SIZE):
+        sync_card_assignees(connection, dict(rows[start : start + _REBUILD_BATCH_SIZE]))
+    return len(rows)
+
+
+def assigned_card_ids(assignees: Iterable[str]):
+    """Subquery of card IDs assigned to any of ``assignees``."""
+
+    table = models.card_assignees
+    return select(table.c.card_id).where(table.c.assignee.in_(list(assignees)))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_assignee_changes(session: Session, flush_context: Any) -> None:
+    changed: dict[str, Any] = {}
+    for instance in session.new:
+        if isinstance(instance, models.Card):
+            changed[instance.id] = instance.assignees
+    for instance in session.dirty:
+        if isinstance(instance, models.Card) and inspect(instance).attrs.assignees.history.has_changes():
+            changed[instance.id] = instance.assignees
+    removed = [instance.id for instance in session.deleted if isinstance(instance, models.Card)]
+
+    if removed:
+        table = models.card_assignees
+        session.connection().execute(delete(table).where(table.c.card_id.in_(removed)))
+    if changed:
+        sync_card_assignees(session.connection(), changed)
+
+
+@event.listens_for(models.card_assignees, "after_create")
+def _backfill_card_assignees(target: Any, connection: Connection, **_: Any) -> None:
+    if inspect(connection).has_table(models.Card.__tablename__):
+        rebuild_card_assignees(connection)
+
+
+__all__ = ["assigned_card_ids", "rebuild_card_assignees", "sync_card_assignees"]
@@ -0,0 +1,280 @@
+"""Incremental board sync for ``GET /cards/changes``.
+
+A change cursor is a point in time. Cards and subtasks changed after it are
+found through ``updated_at`` (indexed as ``ix_cards_channel_id_updated_at``
+and ``ix_subtasks_updated_at``). Deletions are found through
+``card_tombstones`` rows, which a flush hook writes whenever a card or subtask
+in a channel is deleted, or a card moves to another channel.
+
+``updated_at`` is stamped at flush time but only becomes visible at commit. So
+each new cursor trails the server clock by ``CARD_CHANGES_OVERLAP_SECONDS``,
+and a write that commits late is still picked up by the next call. Clients
+apply every item as an idempotent upsert or delete. They will see some items
+twice.
+
+Card responses embed labels, statuses and initiatives as they were when the
+card last changed. Clients refresh those through their own list endpoints.
+
+Tombstones are kept for ``CARD_TOMBSTONE_RETENTION_SECONDS``.
+:func:`prune_card_tombstones` deletes older ones, from a background thread in
+long-running deployments or from ``python -m app.services.card_changes``. A
+cursor older than the retention window could miss deletions, so it is answered
+with a full resync instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..utils.pagination import decode_cursor, encode_cursor
+from .card_reads import project_cards, project_subtasks
+
+logger = logging.getLogger(__name__)
+
+# Stored as the cursor's identifier so list cursors are rejected here.
+_CURSOR_KIND = "changes"
+_PRUNE_BATCH_SIZE = 1000
+_tombstones = models.CardTombstone.__table__
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def encode_change_cursor(moment: datetime) -> str:
+    return encode_cursor(moment, _CURSOR_KIND)
+
+
+def decode_change_cursor(cursor: str) -> datetime:
+    moment, kind = decode_cursor(cursor)
+    if kind != _CURSOR_KIND:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return moment
+
+
+def collect_card_changes(db: Session, channel_ids: list[str], since: datetime | None) -> dict[str, Any]:
+    """Changes to cards in ``channel_ids`` after ``since``, shaped like ``schemas.CardChanges``.
+
+    Without ``since`` every card is returned and no deletions, which is how a
+    client bootstraps its first cursor. A ``since`` older than the tombstone
+    retention gets the same answer, flagged ``full_resync``.
+    """
+
+    now = _utcnow()
+    cursor = encode_change_cursor(now - timedelta(seconds=settings.card_changes_overlap_seconds))
+    changes: dict[str, Any] = {
+        "cards": [],
+        "subtasks": [],
+        "deleted_cards": [],
+        "deleted_subtasks": [],
+        "full_resync": False,
+    }
+    if since is not None and since < now - timedelta(seconds=settings.card_tombstone_retention_seconds):
+        changes["full_resync"] = True
+        since = None
+    if not channel_ids:
+        return {**changes, "cursor": cursor}
+
+    card_query = db.query(models.Card).filter(models.Card.channel_id.in_(channel_ids))
+    if since is not None:
+        card_query = card_query.filter(models.Card.updated_at > since)
+    changes["cards"] = project_cards(db, card_query.order_by(models.Card.updated_at, models.Card.id))
+    if since is None:
+        return {**changes, "cursor": cursor}
+
+    card_ids = {card["id"] for card in changes["cards"]}
+    changed_subtasks = (
+        select(models.Subtask.id)
+        .join(models.Card, models.Card.id == models.Subtask.card_id)
+        .where(models.Subtask.updated_at > since, models.Card.channel_id.in_(channel_ids))
+    )
+    changes["subtasks"] = [
+        subtask for subtask in project_subtasks(db, changed_subtasks) if subtask["card_id"] not in card_ids
+    ]
+
+    tombstones = db.execute(
+        select(_tombstones.c.entity_type, _tombstones.c.entity_id, _tombstones.c.card_id, _tombstones.c.deleted_at)
+        .where(_tombstones.c.channel_id.in_(channel_ids), _tombstones.c.deleted_at > since)
+        .order_by(_tombstones.c.deleted_at, _tombstones.c.id)
+    )
+    for entity_type, entity_id, card_id, deleted_at in tombstones:
+        item = {"id": entity_id, "card_id": card_id, "deleted_at": deleted_at}
+        if entity_type == "subtask":
+            changes["deleted_subtasks"].append(item)
+        elif entity_id not in card_ids:
+            # A card that left one channel but is visible through another is not gone.
+            changes["deleted_cards"].append(item)
+    return {**changes, "cursor": cursor}
+
+
+@event.listens_for(Session, "before_flush")
+def _touch_cards_with_collection_changes(session: Session, flush_context: Any, instances: Any) -> None:
+    # Changing only a card's labels writes card_labels, not cards. Bump
+    # updated_at so the card still shows up as changed.
+    for instance in session.dirty:
+        if isinstance(instance, models.Card) and session.is_modified(instance):
+            instance.updated_at = _utcnow()
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones(session: Session, flush_context: Any) -> None:
+    now = _utcnow()
+    rows: list[dict[str, Any]] = []
+    deleted_card_ids: set[str] = set()
+    orphaned: list[models.Subtask] = []
+
+    for instance in session.deleted:
+        if isinstance(instance, models.Card):
+            deleted_card_ids.add(instance.id)
+            if instance.channel_id:
+                rows.append(_tombstone("card", instance.id, instance.id, instance.channel_id, now))
+        elif isinstance(instance, models.Subtask):
+            orphaned.append(instance)
+    for instance in session.dirty:
+        if isinstance(instance, models.Card):
+            # Moving a card deletes it from the channel it left.
+            for channel_id in inspect(instance).attrs.channel_id.history.deleted:
+                if channel_id:
+                    rows.append(_tombstone("card", instance.id, instance.id, channel_id, now))
+
+    pending = [subtask for subtask in orphaned if subtask.card_id not in deleted_card_ids]
+    if pending:
+        card_channels = select(models.Card.id, models.Card.channel_id).where(
+            models.Card.id.in_({subtask.card_id for subtask in pending})
+        )
+        channels = dict(session.connection().execute(card_channels).tuples().all())
+        for subtask in pending:
+            channel_id = channels.get(subtask.card_id)
+            if channel_id:
+                rows.append(_tombstone("subtask", subtask.id, subtask.card_id, channel_id, now))
+
+    if rows:
+        session.connection().execute(insert(_tombstones), rows)
+
+
+def _tombstone(entity_type: str, entity_id: str, card_id: str, channel_id: str, now: datetime) -> dict[str, Any]:
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "card_id": card_id,
+        "channel_id": channel_id,
+        "deleted_at": now,
+    }
+
+
+def prune_card_tombstones(
+    bind: Engine | Connection, *, batch_size: int = _PRUNE_BATCH_SIZE, now: datetime | None = None
+) -> int:
+    """Delete tombstones older than the retention window, ``batch_size`` rows per transaction."""
+
+    cutoff = (now or _utcnow()) - timedelta(seconds=settings.card_tombstone_retention_seconds)
+    deleted = 0
+    with Session(bind=bind, future=True) as db:
+        while True:
+            expired = (
+                db.execute(select(_tombstones.c.id).where(_tombstones.c.deleted_at < cutoff).limit(batch_size))
+                .scalars()
+                .all()
+            )
+            if not expired:
+                break
+            db.execute(delete(_tombstones).where(_tombstones.c.id.in_(expired)))
+            db.commit()
+            deleted += len(expired)
+            if len(expired) < batch_size:
+                break
+    logger.info("Pruned %d card tombstone(s) older than %s.", deleted, cutoff.isoformat())
+    return deleted
+
+
+class CardTombstoneSweeper:
+    """Thread that prunes expired tombstones every ``interval`` seconds."""
+
+    def __init__(self, bind: Engine | Connection, *, interval: float) -> None:
+        self._bind = bind
+        self._interval = interval
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="card-tombstone-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._interval):
+            try:
+                prune_card_tombstones(self._bind)
+            except Exception:
+                logger.exception("Card tombstone sweep failed")
+
+
+_sweeper: CardTombstoneSweeper | None = None
+
+
+def start_card_tombstone_sweeper(bind: Engine | Connection) -> CardTombstoneSweeper | None:
+    """Start the process-wide sweeper unless ``CARD_TOMBSTONE_SWEEP_INTERVAL_SECONDS`` is ``0``."""
+
+    global _sweeper
+    if settings.card_tombstone_sweep_interval_seconds <= 0:
+        return None
+    if _sweeper is None:
+        _sweeper = CardTombstoneSweeper(bind, interval=settings.card_tombstone_sweep_interval_seconds)
+    _sweeper.start()
+    return _sweeper
+
+
+def stop_card_tombstone_sweeper() -> None:
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.stop()
+        _sweeper = None
+
+
+def main(argv: list[str] | None = None) -> None:
+    from ..database import get_engine
+
+    parser = argparse.ArgumentParser(description="Delete card tombstones older than the retention window.")
+    parser.add_argument("--batch-size", type=int, default=_PRUNE_BATCH_SIZE, help="Rows deleted per transaction.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    prune_card_tombstones(get_engine(), batch_size=args.batch_size)
+
+
+__all__ = [
+    "CardTombstoneSweeper",
+    "collect_card_changes",
+    "decode_change_cursor",
+    "encode_change_cursor",
+    "prune_card_tombstones",
+    "start_card_tombstone_sweeper",
+    "stop_card_tombstone_sweeper",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual batch entry point
+    main()
@@ -0,0 +1,317 @@
+"""Local text embeddings for cards and subtasks.
+
+Each card and subtask has one :class:`~app.models.SimilarityVector` row. It
+holds a float32 embedding of the item's text, and the item's
+``ai_similarity_vector_id`` points at that row. Rows are rewritten from an
+``after_flush`` hook whenever card or subtask text changes, and they are
+backfilled when the table is created.
+
+The default provider hashes terms into a fixed number of buckets with
+sublinear term frequencies (the "hashing trick"), so it needs no vocabulary
+and no external service. ASCII text is split into words. Other scripts
+(Japanese in particular) are split into character bigrams. Inverse document
+frequency is applied at query time over whatever matrix is being searched,
+so it always reflects the cards the caller can see. Another provider can be
+installed with :func:`set_embedding_provider`. Rows written by a different
+provider are ignored until :func:`rebuild_similarity_vectors` runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Protocol
+
+import numpy as np
+from sqlalchemy import delete, event, insert, inspect, literal, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from .. import models
+from .card_similarity import CARD_TEXT_FIELDS, SUBTASK_TEXT_FIELDS, collect_card_text_changes
+
+EMBEDDING_DIMENSION = 256
+_TERM_PATTERN = re.compile(r"\w+")
+_REBUILD_BATCH_SIZE = 500
+
+_vectors = models.SimilarityVector.__table__
+
+
+class EmbeddingProvider(Protocol):
+    name: str
+    dimension: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return one L2-normalized float32 row per text."""
+
+
+@lru_cache(maxsize=65_536)
+def _hash_term(term: str, dimension: int) -> tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % dimension, 1.0 if digest >> 63 else -1.0
+
+
+def tokenize(text: str | None) -> list[str]:
+    terms: list[str] = []
+    for word in _TERM_PATTERN.findall((text or "").lower()):
+        if word.isascii() or len(word) == 1:
+            terms.append(word)
+        else:
+            terms.extend(word[index : index + 2] for index in range(len(word) - 1))
+    return terms
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class HashedTermEmbedder:
+    """Signed feature hashing of sublinear term frequencies."""
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION) -> None:
+        self.dimension = dimension
+        self.name = f"hashed-tf-{dimension}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term, count in Counter(tokenize(text)).items():
+                bucket, sign = _hash_term(term, self.dimension)
+                matrix[row, bucket] += sign * (1.0 + math.log(count))
+        return normalize_rows(matrix)
+
+
+_provider: EmbeddingProvider = HashedTermEmbedder()
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    return _provider
+
+
+def set_embedding_provider(provider: EmbeddingProvider) -> None:
+    """Install ``provider`` for new embeddings and searches."""
+
+    global _provider
+    _provider = provider
+
+
+def vector_id(source_type: str, source_id: str) -> str:
+    return f"{source_type}:{source_id}"
+
+
+def join_text(values: Iterable[str | None]) -> str:
+    return "\n".join(value for value in values if value)
+
+
+def encode_vector(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def decode_vectors(blobs: Sequence[bytes], dimension: int) -> np.ndarray:
+    if not blobs:
+        return np.zeros((0, dimension), dtype=np.float32)
+    return np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), dimension)
+
+
+def idf_weights(matrix: np.ndarray) -> np.ndarray:
+    """Smoothed inverse document frequency of each dimension of ``matrix``."""
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    return (np.log((1.0 + matrix.shape[0]) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+
+def cosine_scores(matrix: np.ndarray, queries: np.ndarray, *, weights: np.ndarray | None = None) -> np.ndarray:
+    """Return the ``(len(queries), len(matrix))`` cosine similarities, optionally reweighted."""
+
+    if weights is not None:
+        matrix = normalize_rows(matrix * weights)
+        queries = normalize_rows(queries * weights)
+    return queries @ matrix.T
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest ``scores``, best first. Earlier rows win ties."""
+
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < scores.size:
+        candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def sync_similarity_vectors(connection: Connection, card_ids: Iterable[str]) -> list[tuple[str, str]]:
+    """Re-embed ``card_ids`` and their subtasks. Returns the ``(source_type, source_id)`` pairs written."""
+
+    ids = list(dict.fromkeys(card_id for card_id in card_ids if card_id))
+    if not ids:
+        return []
+
+    card_table = models.Card.__table__
+    subtask_table = models.Subtask.__table__
+    entries: list[tuple[str, str, str, str]] = []
+    for card in connection.execute(
+        select(card_table.c.id, *(card_table.c[name] for name in CARD_TEXT_FIELDS)).where(card_table.c.id.in_(ids))
+    ):
+        entries.append(("card", card.id, card.id, join_text(card[1:])))
+    for subtask in connection.execute(
+        select(
+            subtask_table.c.id,
+            subtask_table.c.card_id,
+            *(subtask_table.c[name] for name in SUBTASK_TEXT_FIELDS),
+        ).where(subtask_table.c.card_id.in_(ids))
+    ):
+        entries.append(("subtask", subtask.id, subtask.card_id, join_text(subtask[2:])))
+
+    provider = get_embedding_provider()
+    embeddings = provider.embed([entry[3] for entry in entries])
+    connection.execute(delete(_vectors).where(_vectors.c.card_id.in_(ids)))
+    if entries:
+        connection.execute(
+            insert(_vectors),
+            [
+                {
+                    "id": vector_id(source_type, source_id),
+                    "source_type": source_type,
+                    "source_id": source_id,
+                    "card_id": card_id,
+                    "model": provider.name,
+                    "vector": encode_vector(embedding),
+                }
+                for (source_type, source_id, card_id, _), embedding in zip(entries, embeddings, strict=True)
+            ],
+        )
+
+    # Point the rows at their vectors without touching ``updated_at``.
+    for source_table, source_type, owner_column in (
+        (card_table, "card", card_table.c.id),
+        (subtask_table, "subtask", subtask_table.c.card_id),
+    ):
+        expected = literal(f"{source_type}:") + source_table.c.id
+        connection.execute(
+            update(source_table)
+            .where(owner_column.in_(ids), source_table.c.ai_similarity_vector_id.is_distinct_from(expected))
+            .values(ai_similarity_vector_id=expected, updated_at=source_table.c.updated_at)
+        )
+    return [(source_type, source_id) for source_type, source_id, _, _ in entries]
+
+
+def rebuild_similarity_vectors(connection: Connection) -> int:
+    """Re-embed every card and subtask. Returns the number of cards processed."""
+
+    card_ids = connection.execute(select(models.Card.__table__.c.id)).scalars().all()
+    for start in range(0, len(card_ids), _REBUILD_BATCH_SIZE):
+        sync_similarity_vectors(connection, card_ids[start : start + _REBUILD_BATCH_SIZE])
+    return len(card_ids)
+
+
+def load_vector(db: Session, identifier: str | None) -> np.ndarray | None:
+    """Return the stored vector ``identifier`` when it was written by the current provider."""
+
+    if not identifier:
+        return None
+    provider = get_embedding_provider()
+    blob = db.execute(
+        select(_vectors.c.vector).where(_vectors.c.id == identifier, _vectors.c.model == provider.name)
+    ).scalar_one_or_none()
+    if blob is None:
+        return None
+    return decode_vectors([blob], provider.dimension)[0]
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    card_id: str
+    title: str
+    similarity: float
+
+
+def find_duplicate_cards(
+    db: Session,
+    *,
+    owner_id: str,
+    texts: Sequence[str],
+    threshold: float,
+) -> list[DuplicateMatch | None]:
+    """For each of ``texts``, return the owner's most similar card when it reaches ``threshold``."""
+
+    if not texts:
+        return []
+    provider = get_embedding_provider()
+    rows = db.execute(
+        select(models.Card.id, models.Card.title, _vectors.c.vector)
+        .join(_vectors, _vectors.c.card_id == models.Card.id)
+        .where(
+            models.Card.owner_id == owner_id,
+            _vectors.c.source_type == "card",
+            _vectors.c.model == provider.name,
+        )
+    ).all()
+    if not rows:
+        return [None] * len(texts)
+
+    matrix = decode_vectors([row.vector for row in rows], provider.dimension)
+    scores = cosine_scores(matrix, provider.embed(texts), weights=idf_weights(matrix))
+    best = scores.argmax(axis=1)
+    matches: list[DuplicateMatch | None] = []
+    for index, column in enumerate(best):
+        similarity = float(scores[index, column])
+        if similarity >= threshold:
+            matches.append(DuplicateMatch(rows[column].id, rows[column].title, similarity))
+        else:
+            matches.append(None)
+    return matches
+
+
+@event.listens_for(Session, "after_flush")
+def _track_embedding_changes(session: Session, flush_context: Any) -> None:
+    stale, removed = collect_card_text_changes(session)
+    if removed:
+        session.connection().execute(delete(_vectors).where(_vectors.c.card_id.in_(removed)))
+    if not stale:
+        return
+
+    written = sync_similarity_vectors(session.connection(), stale)
+    source_models = {"card": models.Card, "subtask": models.Subtask}
+    for source_type, source_id in written:
+        instance = session.identity_map.get(identity_key(source_models[source_type], source_id))
+        if instance is not None:
+            set_committed_value(instance, "ai_similarity_vector_id", vector_id(source_type, source_id))
+
+
+@event.listens_for(_vectors, "after_create")
+def _backfill_similarity_vectors(target: Any, connection: Connection, **_: Any) -> None:
+    inspector = inspect(connection)
+    if inspector.has_table(models.Card.__tablename__) and inspector.has_table(models.Subtask.__tablename__):
+        rebuild_similarity_vectors(connection)
+
+
+__all__ = [
+    "EMBEDDING_DIMENSION",
+    "DuplicateMatch",
+    "EmbeddingProvider",
+    "HashedTermEmbedder",
+    "cosine_scores",
+    "decode_vectors",
+    "encode_vector",
+    "find_duplicate_cards",
+    "get_embedding_provider",
+    "idf_weights",
+    "join_text",
+    "load_vector",
+    "rebuild_similarity_vectors",
+    "set_embedding_provider",
+    "sync_similarity_vectors",
+    "tokenize",
+    "top_k",
+    "vector_id",
+]
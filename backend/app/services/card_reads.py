@@ -0,0 +1,197 @@
+"""Card responses assembled from column projections.
+
+Validating ``CardRead`` from an ORM ``Card`` hydrates the card and every related
+object, then builds one Pydantic model per nested object. The card router also
+copies each card and subtask to substitute display names. On large boards that
+work outweighs the queries. :func:`project_cards` selects only the columns the
+read schemas expose, with one query per relationship, and returns plain dicts
+in schema field order with display names already substituted. They can be
+handed straight to :class:`app.utils.responses.FastJSONResponse`.
+
+The output must stay identical to ``CardRead.model_dump(mode="json")`` for the
+same rows. ``tests/test_card_reads.py`` compares the two paths.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+from uuid import uuid4
+
+from pydantic import BaseModel
+from sqlalchemy import Column, Select, select
+from sqlalchemy.orm import Query, Session
+
+from .. import models, schemas
+
+# Bound the IN lists so large boards stay under driver parameter limits.
+_IN_CHUNK_SIZE = 500
+
+
+def _schema_columns(schema: type[BaseModel], model: type[models.Base]) -> tuple[Column, ...]:
+    table = model.__table__
+    return tuple(table.c[name] for name in schema.model_fields if name in table.c)
+
+
+_CARD_FIELDS = tuple(schemas.CardRead.model_fields)
+_CARD_COLUMNS = _schema_columns(schemas.CardRead, models.Card)
+_LABEL_COLUMNS = _schema_columns(schemas.LabelRead, models.Label)
+_SUBTASK_COLUMNS = _schema_columns(schemas.SubtaskRead, models.Subtask)
+_STATUS_COLUMNS = _schema_columns(schemas.StatusRead, models.Status)
+_ERROR_CATEGORY_COLUMNS = _schema_columns(schemas.ErrorCategoryRead, models.ErrorCategory)
+_INITIATIVE_COLUMNS = _schema_columns(schemas.ImprovementInitiativeRead, models.ImprovementInitiative)
+_PROGRESS_LOG_COLUMNS = _schema_columns(schemas.InitiativeProgressLogRead, models.InitiativeProgressLog)
+_USER_COLUMNS = _schema_columns(schemas.UserRead, models.User)
+
+
+def _chunks(values: Iterable[str]) -> Iterator[list[str]]:
+    unique = list(dict.fromkeys(value for value in values if value))
+    for start in range(0, len(unique), _IN_CHUNK_SIZE):
+        yield unique[start : start + _IN_CHUNK_SIZE]
+
+
+def _row_dict(row: Any, columns: Sequence[Column]) -> dict[str, Any]:
+    mapping = row._mapping
+    return {column.key: mapping[column] for column in columns}
+
+
+def _rows_by_id(db: Session, columns: Sequence[Column], ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+    id_column = columns[0].table.c.id
+    found: dict[str, dict[str, Any]] = {}
+    for chunk in _chunks(ids):
+        for row in db.execute(select(*columns).where(id_column.in_(chunk))):
+            item = _row_dict(row, columns)
+            found[item["id"]] = item
+    return found
+
+
+def _grouped_rows(
+    db: Session,
+    columns: Sequence[Column],
+    key_column: Column,
+    keys: Iterable[str],
+    *,
+    order_by: Sequence[Any] = (),
+    join: Any = None,
+) -> dict[str, list[dict[str, Any]]]:
+    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for chunk in _chunks(keys):
+        statement = select(key_column, *columns)
+        if join is not None:
+            statement = statement.select_from(join)
+        statement = statement.where(key_column.in_(chunk)).order_by(*order_by)
+        for row in db.execute(statement):
+            grouped[row[0]].append(_row_dict(row, columns))
+    return grouped
+
+
+def _checklist(items: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    # Mirrors ChecklistItem: extra keys are dropped and missing ids are generated.
+    return [
+        {"id": item.get("id") or str(uuid4()), "label": item["label"], "done": item.get("done", False)}
+        for item in items or []
+    ]
+
+
+def _display_name(user: Mapping[str, Any]) -> str:
+    nickname = (user["nickname"] or "").strip()
+    return nickname if nickname else (user["email"] or "").strip()
+
+
+def _load_users(db: Session, user_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+    columns = (*_USER_COLUMNS, models.User.nickname)
+    return _rows_by_id(db, columns, user_ids)
+
+
+def display_names(db: Session, user_ids: Iterable[str]) -> dict[str, str]:
+    """Nickname, or email when there is none, of each known user ID."""
+
+    return {user_id: _display_name(user) for user_id, user in _load_users(db, user_ids).items()}
+
+
+def _finish_subtask(subtask: dict[str, Any], display: Mapping[str, str]) -> None:
+    subtask["assignee"] = display.get(subtask["assignee"], subtask["assignee"])
+    subtask["checklist"] = _checklist(subtask["checklist"])
+
+
+def project_cards(db: Session, query: Query, *, resolve_display_names: bool = True) -> list[dict[str, Any]]:
+    """Run a ``Card`` query as a column projection and return ``CardRead``-shaped dicts.
+
+    ``query`` keeps its filters, ordering and limit but must not carry loader
+    options. With ``resolve_display_names`` card and subtask assignees that
+    are user ids are replaced by the user's nickname (or email), as the card
+    router does for its ORM responses.
+    """
+
+    cards = [_row_dict(row, _CARD_COLUMNS) for row in query.with_entities(*_CARD_COLUMNS)]
+    if not cards:
+        return []
+
+    card_ids = [card["id"] for card in cards]
+    labels = _grouped_rows(
+        db,
+        _LABEL_COLUMNS,
+        models.card_labels.c.card_id,
+        card_ids,
+        join=models.card_labels.join(models.Label, models.Label.id == models.card_labels.c.label_id),
+    )
+    subtasks = _grouped_rows(db, _SUBTASK_COLUMNS, models.Subtask.card_id, card_ids)
+    statuses = _rows_by_id(db, _STATUS_COLUMNS, (card["status_id"] for card in cards))
+    error_categories = _rows_by_id(db, _ERROR_CATEGORY_COLUMNS, (card["error_category_id"] for card in cards))
+    initiatives = _rows_by_id(db, _INITIATIVE_COLUMNS, (card["initiative_id"] for card in cards))
+    progress_logs = _grouped_rows(
+        db,
+        _PROGRESS_LOG_COLUMNS,
+        models.InitiativeProgressLog.initiative_id,
+        initiatives,
+        order_by=(models.InitiativeProgressLog.timestamp,),
+    )
+    for initiative_id, initiative in initiatives.items():
+        initiative["progress_logs"] = progress_logs.get(initiative_id, [])
+
+    user_ids = {card["owner_id"] for card in cards}
+    if resolve_display_names:
+        for card in cards:
+            user_ids.update(assignee for assignee in card["assignees"] or [] if isinstance(assignee, str))
+        for card_subtasks in subtasks.values():
+            user_ids.update(subtask["assignee"] for subtask in card_subtasks if subtask["assignee"])
+    users = _load_users(db, user_ids)
+    display = {user_id: _display_name(user) for user_id, user in users.items()} if resolve_display_names else {}
+    owners = {user_id: {column.key: user[column.key] for column in _USER_COLUMNS} for user_id, user in users.items()}
+
+    payloads: list[dict[str, Any]] = []
+    for card in cards:
+        card_labels = labels.get(card["id"], [])
+        card_subtasks = subtasks.get(card["id"], [])
+        for subtask in card_subtasks:
+            _finish_subtask(subtask, display)
+        related = {
+            "assignees": [display.get(assignee, assignee) for assignee in card["assignees"] or []],
+            "label_ids": [label["id"] for label in card_labels],
+            "labels": card_labels,
+            "subtasks": card_subtasks,
+            "status": statuses.get(card["status_id"]),
+            "error_category": error_categories.get(card["error_category_id"]),
+            "initiative": initiatives.get(card["initiative_id"]),
+            "owner": owners.get(card["owner_id"]),
+        }
+        payloads.append({field: related[field] if field in related else card[field] for field in _CARD_FIELDS})
+    return payloads
+
+
+def project_subtasks(db: Session, subtask_ids: Select) -> list[dict[str, Any]]:
+    """``SubtaskRead``-shaped dicts, plus ``card_id``, for the subtasks ``subtask_ids`` selects.
+
+    Assignees are replaced by display names as in :func:`project_cards`.
+    """
+
+    statement = select(*_SUBTASK_COLUMNS, models.Subtask.card_id).where(models.Subtask.id.in_(subtask_ids))
+    subtasks = [_row_dict(row, (*_SUBTASK_COLUMNS, models.Subtask.card_id)) for row in db.execute(statement)]
+    display = display_names(db, (subtask["assignee"] for subtask in subtasks if subtask["assignee"]))
+    for subtask in subtasks:
+        _finish_subtask(subtask, display)
+    return subtasks
+
+
+__all__ = ["display_names", "project_cards", "project_subtasks"]
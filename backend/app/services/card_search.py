@@ -0,0 +1,242 @@
+"""Indexed full-text search over cards and their comments.
+
+Every card has one :class:`~app.models.CardSearchDocument` row holding the
+lower-cased text of its searchable fields and comments. The row is rewritten
+from an ``after_flush`` hook whenever a card's text or one of its comments
+changes, so all writers keep the index current without extra calls.
+
+The document table is indexed per dialect:
+
+* SQLite: an external-content FTS5 table using the ``trigram`` tokenizer,
+  kept in sync by triggers. Matches are ranked with ``bm25``.
+* PostgreSQL: a ``pg_trgm`` GIN index on ``content``. It serves the
+  ``LIKE '%term%'`` filter, and ``word_similarity`` ranks the matches.
+
+Trigram matching keeps the substring semantics of the previous ``LIKE``
+search, so prefix and mid-word queries still work. It also works for
+Japanese text, which has no whitespace word boundaries. Queries shorter than
+three characters cannot use a trigram index. They fall back to a ``LIKE``
+scan of the single document table, with no comment join or ``DISTINCT``.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import column, delete, event, func, insert, inspect, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query, Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+SEARCHABLE_CARD_FIELDS = ("title", "summary", "description", "ai_notes", "analytics_notes")
+FTS_TABLE_NAME = "card_search_fts"
+_TRIGRAM_MIN_LENGTH = 3
+_REBUILD_BATCH_SIZE = 500
+
+_documents = models.CardSearchDocument.__table__
+_fts = table(FTS_TABLE_NAME, column("rowid"))
+_index_available: dict[str, bool] = {}
+
+# S608: the only interpolated value is the FTS_TABLE_NAME constant.
+_SQLITE_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5("
+    " content, content='card_search_documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS card_search_documents_ai AFTER INSERT ON card_search_documents BEGIN"  # noqa: S608
+    f" INSERT INTO {FTS_TABLE_NAME}(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS card_search_documents_ad AFTER DELETE ON card_search_documents BEGIN"  # noqa: S608
+    f" INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS card_search_documents_au AFTER UPDATE ON card_search_documents BEGIN"  # noqa: S608
+    f" INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, content) VALUES ('delete', old.id, old.content);"
+    f" INSERT INTO {FTS_TABLE_NAME}(rowid, content) VALUES (new.id, new.content); END",
+)
+_POSTGRES_INDEX_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_card_search_documents_content_trgm"
+    " ON card_search_documents USING gin (content gin_trgm_ops)",
+)
+
+
+def _bind_key(connection: Connection) -> str:
+    return connection.engine.url.render_as_string(hide_password=True)
+
+
+def build_search_content(card_fields: Iterable[str | None], comments: Iterable[str | None]) -> str:
+    parts = [value.strip() for value in (*card_fields, *comments) if value and value.strip()]
+    return "\n".join(parts).lower()
+
+
+def sync_card_search_documents(connection: Connection, card_ids: Iterable[str]) -> None:
+    """Rewrite the search documents for ``card_ids`` from the current card and comment rows."""
+
+    ids = list(dict.fromkeys(card_id for card_id in card_ids if card_id))
+    if not ids:
+        return
+
+    card_table = models.Card.__table__
+    comment_table = models.Comment.__table__
+    cards = connection.execute(
+        select(card_table.c.id, *(card_table.c[name] for name in SEARCHABLE_CARD_FIELDS)).where(
+            card_table.c.id.in_(ids)
+        )
+    ).all()
+    comments: dict[str, list[str]] = {}
+    for card_id, content in connection.execute(
+        select(comment_table.c.card_id, comment_table.c.content)
+        .where(comment_table.c.card_id.in_(ids))
+        .order_by(comment_table.c.created_at)
+    ):
+        comments.setdefault(card_id, []).append(content)
+
+    now = datetime.now(timezone.utc)
+    connection.execute(delete(_documents).where(_documents.c.card_id.in_(ids)))
+    rows = [
+        {
+            "card_id": row.id,
+            "content": build_search_content(row[1:], comments.get(row.id, ())),
+            "updated_at": now,
+        }
+        for row in cards
+    ]
+    if rows:
+        connection.execute(insert(_documents), rows)
+
+
+def rebuild_card_search_index(connection: Connection) -> int:
+    """Recreate every search document. Returns the number of cards indexed."""
+
+    card_ids = connection.execute(select(models.Card.__table__.c.id)).scalars().all()
+    for start in range(0, len(card_ids), _REBUILD_BATCH_SIZE):
+        sync_card_search_documents(connection, card_ids[start : start + _REBUILD_BATCH_SIZE])
+    return len(card_ids)
+
+
+def _text_changed(instance: Any, fields: Iterable[str]) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_card_search_changes(session: Session, flush_context: Any) -> None:
+    stale: set[str] = set()
+    removed: set[str] = set()
+
+    for instance in session.new:
+        if isinstance(instance, models.Card):
+            stale.add(instance.id)
+        elif isinstance(instance, models.Comment):
+            stale.add(instance.card_id)
+    for instance in session.dirty:
+        if isinstance(instance, models.Card) and _text_changed(instance, SEARCHABLE_CARD_FIELDS):
+            stale.add(instance.id)
+        elif isinstance(instance, models.Comment) and _text_changed(instance, ("content", "card_id")):
+            stale.add(instance.card_id)
+            stale.update(inspect(instance).attrs.card_id.history.deleted or ())
+    for instance in session.deleted:
+        if isinstance(instance, models.Card):
+            removed.add(instance.id)
+        elif isinstance(instance, models.Comment):
+            stale.add(instance.card_id)
+
+    stale.discard(None)  # type: ignore[arg-type]
+    if removed:
+        session.connection().execute(delete(_documents).where(_documents.c.card_id.in_(removed)))
+    if stale - removed:
+        sync_card_search_documents(session.connection(), stale - removed)
+
+
+@event.listens_for(_documents, "after_create")
+def _create_search_index(target: Any, connection: Connection, **_: Any) -> None:
+    statements = {"sqlite": _SQLITE_INDEX_DDL, "postgresql": _POSTGRES_INDEX_DDL}.get(connection.dialect.name)
+    if statements:
+        try:
+            with connection.begin_nested():
+                for statement in statements:
+                    connection.execute(text(statement))
+        except SQLAlchemyError:
+            logger.warning(
+                "Full-text index for card search is unavailable on %s; falling back to LIKE scans.",
+                connection.dialect.name,
+                exc_info=True,
+            )
+    _index_available.pop(_bind_key(connection), None)
+
+    if inspect(connection).has_table(models.Card.__tablename__):
+        indexed = rebuild_card_search_index(connection)
+        if indexed:
+            logger.info("Indexed %d existing cards for search.", indexed)
+
+
+@event.listens_for(_documents, "before_drop")
+def _drop_search_index(target: Any, connection: Connection, **_: Any) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE_NAME}"))
+    _index_available.pop(_bind_key(connection), None)
+
+
+def _search_index_available(db: Session) -> bool:
+    connection = db.connection()
+    key = _bind_key(connection)
+    available = _index_available.get(key)
+    if available is None:
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            available = inspect(connection).has_table(FTS_TABLE_NAME)
+        elif dialect == "postgresql":
+            available = (
+                connection.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+            )
+        else:
+            available = False
+        _index_available[key] = available
+    return available
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def apply_card_search(db: Session, query: Query, search: str) -> tuple[Query, list[Any]]:
+    """Restrict ``query`` to cards matching ``search`` and return ranking ``ORDER BY`` terms.
+
+    The ranking terms put the best matches first. Callers should append their
+    own tie-breaker.
+    """
+
+    term = search.strip().lower()
+    if not term:
+        return query, []
+
+    document = models.CardSearchDocument
+    query = query.join(document, document.card_id == models.Card.id)
+    dialect = db.get_bind().dialect.name
+    indexed = len(term) >= _TRIGRAM_MIN_LENGTH and _search_index_available(db)
+
+    if indexed and dialect == "sqlite":
+        phrase = '"' + term.replace('"', '""') + '"'
+        query = query.join(_fts, _fts.c.rowid == document.id).filter(
+            text(f"{FTS_TABLE_NAME} MATCH :card_search_phrase").bindparams(card_search_phrase=phrase)
+        )
+        return query, [text(f"bm25({FTS_TABLE_NAME})")]
+
+    query = query.filter(document.content.like(_like_pattern(term), escape="\\"))
+    if indexed and dialect == "postgresql":
+        return query, [func.word_similarity(term, document.content).desc()]
+    return query, []
+
+
+__all__ = [
+    "FTS_TABLE_NAME",
+    "SEARCHABLE_CARD_FIELDS",
+    "apply_card_search",
+    "build_search_content",
+    "rebuild_card_search_index",
+    "sync_card_search_documents",
+]
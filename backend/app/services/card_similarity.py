@@ -0,0 +1,165 @@
+"""Inverted word index used to pick candidates for similar-item lookups.
+
+``GET /cards/{card_id}/similar`` scores cards by word overlap (Jaccard over
+title, summary and description), shared labels and a few matching
+attributes, and it scores subtasks by word overlap with the base card. A
+candidate can only get a text score if it shares at least one word with the
+base card. So the ``similarity_postings`` table stores one row per
+(word, card or subtask). Looking up the base card's words there, plus its
+labels in ``card_labels``, gives every card that can score above the
+attribute-only bonuses. The router still computes the exact scores for those
+candidates.
+
+Postings for a card and all of its subtasks are rewritten from an
+``after_flush`` hook when their text changes, and they are backfilled when
+the table is created.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .. import models
+
+CARD_TEXT_FIELDS = ("title", "summary", "description")
+SUBTASK_TEXT_FIELDS = ("title", "description")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_REBUILD_BATCH_SIZE = 500
+
+_postings = models.similarity_postings
+
+
+def normalize_words(*texts: str | None) -> set[str]:
+    words: set[str] = set()
+    for text in texts:
+        if not text:
+            continue
+        words.update(_WORD_PATTERN.findall(text.lower()))
+    return words
+
+
+def sync_similarity_postings(connection: Connection, card_ids: Iterable[str]) -> None:
+    """Rewrite the postings for ``card_ids`` and their subtasks from the current rows."""
+
+    ids = list(dict.fromkeys(card_id for card_id in card_ids if card_id))
+    if not ids:
+        return
+
+    card_table = models.Card.__table__
+    subtask_table = models.Subtask.__table__
+    rows: list[dict[str, str]] = []
+    for card in connection.execute(
+        select(card_table.c.id, *(card_table.c[name] for name in CARD_TEXT_FIELDS)).where(card_table.c.id.in_(ids))
+    ):
+        rows.extend(
+            {"token": token, "source_type": "card", "source_id": card.id, "card_id": card.id}
+            for token in normalize_words(*card[1:])
+        )
+    for subtask in connection.execute(
+        select(
+            subtask_table.c.id,
+            subtask_table.c.card_id,
+            *(subtask_table.c[name] for name in SUBTASK_TEXT_FIELDS),
+        ).where(subtask_table.c.card_id.in_(ids))
+    ):
+        rows.extend(
+            {"token": token, "source_type": "subtask", "source_id": subtask.id, "card_id": subtask.card_id}
+            for token in normalize_words(*subtask[2:])
+        )
+
+    connection.execute(delete(_postings).where(_postings.c.card_id.in_(ids)))
+    if rows:
+        connection.execute(insert(_postings), rows)
+
+
+def rebuild_similarity_postings(connection: Connection) -> int:
+    """Recreate every posting. Returns the number of cards indexed."""
+
+    card_ids = connection.execute(select(models.Card.__table__.c.id)).scalars().all()
+    for start in range(0, len(card_ids), _REBUILD_BATCH_SIZE):
+        sync_similarity_postings(connection, card_ids[start : start + _REBUILD_BATCH_SIZE])
+    return len(card_ids)
+
+
+def similar_card_candidate_ids(db: Session, base_card: models.Card) -> set[str]:
+    """IDs of cards that share a word (in the card or a subtask) or a label with ``base_card``."""
+
+    candidates: set[str] = set()
+    tokens = normalize_words(*(getattr(base_card, name) for name in CARD_TEXT_FIELDS))
+    if tokens:
+        candidates.update(
+            db.execute(select(_postings.c.card_id).where(_postings.c.token.in_(tokens)).distinct()).scalars()
+        )
+    label_ids = [label.id for label in base_card.labels]
+    if label_ids:
+        card_labels = models.card_labels
+        candidates.update(
+            db.execute(select(card_labels.c.card_id).where(card_labels.c.label_id.in_(label_ids)).distinct()).scalars()
+        )
+    candidates.discard(base_card.id)
+    return candidates
+
+
+def _text_changed(instance: Any, fields: Iterable[str]) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+
+def collect_card_text_changes(session: Session) -> tuple[set[str], set[str]]:
+    """Return ``(stale, removed)`` card IDs whose card or subtask text changed in this flush."""
+
+    stale: set[str] = set()
+    removed: set[str] = set()
+
+    for instance in session.new:
+        if isinstance(instance, models.Card):
+            stale.add(instance.id)
+        elif isinstance(instance, models.Subtask):
+            stale.add(instance.card_id)
+    for instance in session.dirty:
+        if isinstance(instance, models.Card) and _text_changed(instance, CARD_TEXT_FIELDS):
+            stale.add(instance.id)
+        elif isinstance(instance, models.Subtask) and _text_changed(instance, (*SUBTASK_TEXT_FIELDS, "card_id")):
+            stale.add(instance.card_id)
+            stale.update(inspect(instance).attrs.card_id.history.deleted or ())
+    for instance in session.deleted:
+        if isinstance(instance, models.Card):
+            removed.add(instance.id)
+        elif isinstance(instance, models.Subtask):
+            stale.add(instance.card_id)
+
+    stale.discard(None)  # type: ignore[arg-type]
+    return stale - removed, removed
+
+
+@event.listens_for(Session, "after_flush")
+def _track_similarity_changes(session: Session, flush_context: Any) -> None:
+    stale, removed = collect_card_text_changes(session)
+    if removed:
+        session.connection().execute(delete(_postings).where(_postings.c.card_id.in_(removed)))
+    if stale:
+        sync_similarity_postings(session.connection(), stale)
+
+
+@event.listens_for(_postings, "after_create")
+def _backfill_similarity_postings(target: Any, connection: Connection, **_: Any) -> None:
+    inspector = inspect(connection)
+    if inspector.has_table(models.Card.__tablename__) and inspector.has_table(models.Subtask.__tablename__):
+        rebuild_similarity_postings(connection)
+
+
+__all__ = [
+    "CARD_TEXT_FIELDS",
+    "SUBTASK_TEXT_FIELDS",
+    "collect_card_text_changes",
+    "normalize_words",
+    "rebuild_similarity_postings",
+    "similar_card_candidate_ids",
+    "sync_similarity_postings",
+]
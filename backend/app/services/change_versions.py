@@ -0,0 +1,218 @@
+"""Per-scope write counters behind conditional GETs on the board endpoints.
+
+Flush hooks bump a row in ``change_versions`` in the same transaction as every
+write that can change a polled list:
+
+* ``channel:<id>``: cards in the channel. This covers their subtasks and
+  comments, plus the labels, statuses, error categories and initiatives that
+  card responses embed.
+* ``owner:<id>``: the user's statuses and labels, and the comments on the
+  cards they own.
+
+A user update bumps the channel and owner scopes of the cards that show the
+user: as owner, assignee, subtask assignee or comment author.
+
+List endpoints read the counters they depend on with :func:`scope_versions`
+and hash them into an ETag (:func:`app.utils.etags.compute_etag`). The
+counters are read before the list query, so a write that commits in between
+produces a response newer than its tag. The next poll then gets a full 200
+instead of a stale 304.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import distinct, event, insert, inspect, select, union, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+_PENDING_SCOPES_KEY = "change_versions.pending_scopes"
+_versions = models.ChangeVersion.__table__
+
+# Card columns that point at rows embedded in card responses.
+_CARD_REFERENCES = {
+    models.Status: models.Card.status_id,
+    models.ErrorCategory: models.Card.error_category_id,
+    models.ImprovementInitiative: models.Card.initiative_id,
+}
+
+
+def channel_scope(channel_id: str) -> str:
+    return f"channel:{channel_id}"
+
+
+def owner_scope(owner_id: str) -> str:
+    return f"owner:{owner_id}"
+
+
+def card_list_scopes(channel_ids: Iterable[str]) -> list[str]:
+    """Scopes behind a card list drawn from ``channel_ids``.
+
+    The channel IDs are part of the scope names, so joining or leaving a
+    channel changes the ETag without a bump.
+    """
+
+    return [channel_scope(channel_id) for channel_id in channel_ids]
+
+
+def scope_versions(db: Session, scopes: Iterable[str]) -> dict[str, int]:
+    """Current counter per scope; scopes that were never bumped report ``0``."""
+
+    wanted = sorted(set(scopes))
+    versions = dict.fromkeys(wanted, 0)
+    if wanted:
+        rows = db.execute(select(_versions.c.scope, _versions.c.version).where(_versions.c.scope.in_(wanted)))
+        versions.update(rows.tuples().all())
+    return versions
+
+
+def bump_scopes(connection: Connection, scopes: Iterable[str]) -> None:
+    """Increment each scope's counter, creating rows at ``1``.
+
+    Rows are touched in sorted order so concurrent writers lock them in the
+    same order.
+    """
+
+    rows = [{"scope": scope} for scope in sorted(set(scopes))]
+    if not rows:
+        return
+
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(_versions).values(version=1)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[_versions.c.scope],
+                set_={"version": _versions.c.version + 1},
+            ),
+            rows,
+        )
+        return
+
+    for row in rows:
+        increment = update(_versions).where(_versions.c.scope == row["scope"]).values(version=_versions.c.version + 1)
+        if connection.execute(increment).rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(_versions).values(scope=row["scope"], version=1))
+        except IntegrityError:
+            connection.execute(increment)
+
+
+def _column_values(instance: Any, name: str) -> set[str]:
+    """Current and pre-flush values of ``name``, so moves bump both sides."""
+
+    history = inspect(instance).attrs[name].history
+    values = {getattr(instance, name), *history.deleted}
+    values.discard(None)
+    return values
+
+
+def _referencing_channels(connection: Connection, criterion: Any) -> set[str]:
+    rows = connection.execute(
+        select(distinct(models.Card.channel_id)).where(criterion, models.Card.channel_id.is_not(None))
+    )
+    return {channel_scope(channel_id) for channel_id in rows.scalars()}
+
+
+def _card_scopes(connection: Connection, card_ids: set[str]) -> set[str]:
+    if not card_ids:
+        return set()
+    rows = connection.execute(select(models.Card.channel_id, models.Card.owner_id).where(models.Card.id.in_(card_ids)))
+    scopes: set[str] = set()
+    for channel_id, owner_id in rows:
+        if channel_id:
+            scopes.add(channel_scope(channel_id))
+        scopes.add(owner_scope(owner_id))
+    return scopes
+
+
+def _user_card_ids(connection: Connection, user_ids: set[str]) -> set[str]:
+    """Cards whose responses, or whose owner's comment list, show one of ``user_ids``."""
+
+    if not user_ids:
+        return set()
+    shown = union(
+        select(models.Card.id).where(models.Card.owner_id.in_(user_ids)),
+        select(models.card_assignees.c.card_id).where(models.card_assignees.c.assignee.in_(user_ids)),
+        select(models.Subtask.card_id).where(models.Subtask.assignee.in_(user_ids)),
+        select(models.Comment.card_id).where(models.Comment.author_id.in_(user_ids)),
+    )
+    return set(connection.execute(shown).scalars())
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_referenced_changes(session: Session, flush_context: Any, instances: Any) -> None:
+    # Cards that embed a changed label, status, error category or initiative
+    # must be found before the flush, while deleted rows are still linked.
+    referenced: dict[Any, set[str]] = {column: set() for column in _CARD_REFERENCES.values()}
+    label_ids: set[str] = set()
+
+    changed = [instance for instance in session.dirty if session.is_modified(instance)]
+    for instance in (*changed, *session.deleted):
+        if isinstance(instance, models.Label):
+            label_ids.add(instance.id)
+        elif isinstance(instance, models.InitiativeProgressLog):
+            referenced[models.Card.initiative_id].update(_column_values(instance, "initiative_id"))
+        elif type(instance) in _CARD_REFERENCES:
+            referenced[_CARD_REFERENCES[type(instance)]].add(instance.id)
+    for instance in session.new:
+        if isinstance(instance, models.InitiativeProgressLog) and instance.initiative_id:
+            referenced[models.Card.initiative_id].add(instance.initiative_id)
+
+    if not (label_ids or any(referenced.values())):
+        return
+
+    connection = session.connection()
+    scopes: set[str] = set()
+    if label_ids:
+        labelled = select(models.card_labels.c.card_id).where(models.card_labels.c.label_id.in_(label_ids))
+        scopes |= _referencing_channels(connection, models.Card.id.in_(labelled))
+    for column, ids in referenced.items():
+        if ids:
+            scopes |= _referencing_channels(connection, column.in_(ids))
+    session.info.setdefault(_PENDING_SCOPES_KEY, set()).update(scopes)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_change_versions(session: Session, flush_context: Any) -> None:
+    scopes: set[str] = session.info.pop(_PENDING_SCOPES_KEY, set())
+    card_ids: set[str] = set()
+    user_ids: set[str] = set()
+
+    changed = [instance for instance in session.dirty if session.is_modified(instance)]
+    for instance in (*session.new, *changed, *session.deleted):
+        if isinstance(instance, models.Card):
+            scopes.update(channel_scope(channel_id) for channel_id in _column_values(instance, "channel_id"))
+            scopes.update(owner_scope(owner_id) for owner_id in _column_values(instance, "owner_id"))
+        elif isinstance(instance, (models.Subtask, models.Comment)):
+            card_ids.update(_column_values(instance, "card_id"))
+        elif isinstance(instance, (models.Label, models.Status)):
+            scopes.add(owner_scope(instance.owner_id))
+        elif isinstance(instance, models.User) and instance not in session.new:
+            user_ids.add(instance.id)
+
+    if user_ids:
+        card_ids |= _user_card_ids(session.connection(), user_ids)
+    scopes |= _card_scopes(session.connection(), card_ids)
+    if scopes:
+        bump_scopes(session.connection(), scopes)
+
+
+__all__ = [
+    "bump_scopes",
+    "card_list_scopes",
+    "channel_scope",
+    "owner_scope",
+    "scope_versions",
+]
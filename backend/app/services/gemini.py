@@ -1,31 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import math
 import re
 import threading
 import time
+import weakref
 from copy import deepcopy
-from dataclasses import dataclass
-from typing import Any, ClassVar, List, Optional, Sequence
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, ClassVar, Iterator, List, Optional, Sequence
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-try:  # pragma: no cover - optional dependency wrapper
-    import google.generativeai as genai
-    from google.api_core.exceptions import GoogleAPIError, ResourceExhausted
-except ModuleNotFoundError:  # pragma: no cover - executed when SDK missing
-    genai = None  # type: ignore[misc, assignment]
-
-    class GoogleAPIError(Exception):
-        """Fallback error raised when the Gemini SDK is unavailable."""
-
-    class ResourceExhausted(GoogleAPIError):
-        """Fallback error raised when the Gemini SDK is unavailable."""
-
-
 from .. import models
 from ..config import settings
 from ..database import get_db
@@ -38,13 +30,82 @@ from ..schemas import (
 )
 from ..utils.crypto import SecretDecryptionError
 from ..utils.secrets import SecretEncryptionKeyError, get_secret_cipher
+from .response_cache import build_response_cache_key
 from .status_defaults import ensure_default_statuses
 
 logger = logging.getLogger(__name__)
 
+# The Gemini SDK and google.api_core (which pulls in grpc) take over a second to
+# import, so they load on first use instead of on every cold start. Tests
+# replace ``genai`` with a fake namespace.
+_SDK_NOT_LOADED: Any = object()
+genai: Any = _SDK_NOT_LOADED
+
+
+class _FallbackGoogleAPIError(Exception):
+    """Fallback error raised when the Gemini SDK is unavailable."""
+
+
+class _FallbackResourceExhausted(_FallbackGoogleAPIError):  # noqa: N818 - mirrors google.api_core
+    """Fallback error raised when the Gemini SDK is unavailable."""
+
+
+def _load_genai() -> Any:
+    """Return the ``google.generativeai`` module, or ``None`` when it is not installed."""
+
+    global genai
+    if genai is _SDK_NOT_LOADED:
+        try:  # pragma: no cover - optional dependency wrapper
+            import google.generativeai as sdk
+        except ModuleNotFoundError:  # pragma: no cover - executed when SDK missing
+            sdk = None
+        genai = sdk
+    return genai
+
+
+@functools.lru_cache(maxsize=1)
+def _google_api_errors() -> tuple[type[Exception], type[Exception]]:
+    """``(GoogleAPIError, ResourceExhausted)`` from google.api_core, or local stand-ins."""
+
+    try:  # pragma: no cover - optional dependency wrapper
+        from google.api_core.exceptions import GoogleAPIError, ResourceExhausted
+    except ModuleNotFoundError:  # pragma: no cover - executed when SDK missing
+        return _FallbackGoogleAPIError, _FallbackResourceExhausted
+    return GoogleAPIError, ResourceExhausted
+
+
+def _google_api_error() -> type[Exception]:
+    return _google_api_errors()[0]
+
+
+def _resource_exhausted() -> type[Exception]:
+    return _google_api_errors()[1]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "GoogleAPIError":
+        return _google_api_error()
+    if name == "ResourceExhausted":
+        return _resource_exhausted()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 _RATE_LIMIT_LOCK = threading.Lock()
 _RATE_LIMIT_UNTIL = 0.0
 
+# Process-wide caches that keep credential decryption, SDK configuration and
+# model discovery off the request path. Entries are keyed by a fingerprint of
+# the API key so rotating the credential naturally produces a new entry.
+_CLIENT_CACHE_LOCK = threading.Lock()
+_CLIENT_REGISTRY: dict[tuple[str, str, str], "GeminiClient"] = {}
+_MODEL_CATALOG_CACHE: dict[str, tuple[float, list[Any]]] = {}
+_DECRYPTED_SECRET_CACHE: dict[str, str] = {}
+
+# Gemini calls are bounded separately from the shared AnyIO threadpool so slow
+# LLM responses queue among themselves instead of starving cheap endpoints.
+_AI_CONCURRENCY_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class GeminiError(RuntimeError):
     """Base exception for Gemini integration errors."""
@@ -112,6 +173,80 @@ def _record_rate_limit(retry_after_seconds: int | None) -> int | None:
     return retry_after_seconds
 
 
+def _fingerprint(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _load_model_catalog(api_key: str | None, list_models: Any) -> list[Any]:
+    """Return the Gemini model catalog, reusing a cached copy while it is fresh."""
+
+    ttl = settings.gemini_model_catalog_ttl_seconds
+    if not api_key or ttl <= 0:
+        return list(list_models())
+
+    cache_key = _fingerprint(api_key)
+    now = time.monotonic()
+    with _CLIENT_CACHE_LOCK:
+        cached = _MODEL_CATALOG_CACHE.get(cache_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    catalog = list(list_models())
+    with _CLIENT_CACHE_LOCK:
+        _MODEL_CATALOG_CACHE[cache_key] = (now + ttl, catalog)
+    return catalog
+
+
+def get_ai_concurrency_limiter() -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent Gemini calls on the running event loop."""
+
+    loop = asyncio.get_running_loop()
+    limiter = _AI_CONCURRENCY_LIMITERS.get(loop)
+    if limiter is None:
+        limiter = asyncio.Semaphore(settings.gemini_max_concurrency)
+        _AI_CONCURRENCY_LIMITERS[loop] = limiter
+    return limiter
+
+
+async def call_gemini(client: Any, method: str, /, *args: Any, **kwargs: Any) -> Any:
+    """Invoke ``method`` on ``client`` without blocking the event loop.
+
+    The client's ``<method>_async`` coroutine is preferred; clients that only
+    expose the synchronous method are run in a worker thread. Either way the
+    call holds a slot of the AI concurrency limiter.
+    """
+
+    async with get_ai_concurrency_limiter():
+        async_method = getattr(client, f"{method}_async", None)
+        if callable(async_method):
+            return await async_method(*args, **kwargs)
+        return await run_in_threadpool(getattr(client, method), *args, **kwargs)
+
+
+def invalidate_gemini_client_cache() -> None:
+    """Drop cached clients, decrypted secrets and model catalogs.
+
+    Called whenever an administrator changes the stored API credential so the
+    next request rebuilds the client against the new key and model.
+    """
+
+    with _CLIENT_CACHE_LOCK:
+        _CLIENT_REGISTRY.clear()
+        _MODEL_CATALOG_CACHE.clear()
+        _DECRYPTED_SECRET_CACHE.clear()
+
+
+@dataclass
+class _GenerationOutcome:
+    """Bookkeeping for a ``generate_content`` call across zero-quota fallbacks."""
+
+    response: Any = None
+    used_model: str | None = None
+    used_override: str | None = None
+    primary_model: str | None = None
+    zero_quota_models: list[str] = field(default_factory=list)
+
+
 class GeminiClient:
     """Gemini client that transforms notes into structured proposals."""
 
@@ -294,14 +429,15 @@ class GeminiClient:
         if not self.api_key:
             raise GeminiConfigurationError("Gemini API key is not configured. Update it from the admin settings.")
 
-        if genai is None:
+        sdk = _load_genai()
+        if sdk is None:
             raise GeminiConfigurationError(
                 "Gemini SDK is not installed. Install the 'google-generativeai' package to enable analysis."
             )
 
-        genai.configure(api_key=self.api_key)
+        sdk.configure(api_key=self.api_key)
         self.model = self._ensure_supported_model(self.model)
-        self._client = genai.GenerativeModel(self.model)
+        self._client = sdk.GenerativeModel(self.model)
         if self.requested_model and self.model and self.requested_model != self.model:
             self._initial_warnings.append(
                 f"Gemini モデル '{self.requested_model}' は利用可能なバリアント '{self.model}' に解決されました。"
@@ -314,7 +450,15 @@ class GeminiClient:
         normalized = self.normalize_model_name(model_override)
         sanitized = self.sanitize_model_name(normalized, fallback=self.model)
         resolved = self._ensure_supported_model(sanitized)
-        return genai.GenerativeModel(resolved), resolved
+        fallback_clients = getattr(self, "_fallback_clients", None)
+        if fallback_clients is None:
+            fallback_clients = {}
+            self._fallback_clients = fallback_clients
+        client = fallback_clients.get(resolved)
+        if client is None:
+            client = _load_genai().GenerativeModel(resolved)
+            fallback_clients[resolved] = client
+        return client, resolved
 
     def _base_warnings(self) -> list[str]:
         warnings = getattr(self, "_initial_warnings", None)
@@ -334,12 +478,12 @@ class GeminiClient:
     def _ensure_supported_model(self, model: str) -> str:
         """Return a model that is supported by the configured Gemini account."""
 
-        list_models = getattr(genai, "list_models", None)
+        list_models = getattr(_load_genai(), "list_models", None)
         if not callable(list_models):
             return model
 
         try:
-            catalog = list(list_models())
+            catalog = _load_model_catalog(getattr(self, "api_key", None), list_models)
         except Exception:  # pragma: no cover - defensive fallback when discovery fails
             logger.debug("Unable to list Gemini models; continuing with configured model.", exc_info=True)
             return model
@@ -518,12 +662,43 @@ class GeminiClient:
                 user_profile,
                 workspace_options,
             )
-        except GoogleAPIError as exc:
+        except _google_api_error() as exc:
+            self._raise_for_google_api_error(exc, context="analysis")
+        except json.JSONDecodeError as exc:
+            logger.exception("Unable to decode Gemini response")
+            raise GeminiError("Gemini returned an invalid response.") from exc
+
+        return self._build_analysis_response(payload, text, request.max_cards)
+
+    async def analyze_async(
+        self,
+        request: AnalysisRequest,
+        *,
+        user_profile: UserProfile | None = None,
+        workspace_options: AnalysisWorkspaceOptions | None = None,
+    ) -> AnalysisResponse:
+        """Non-blocking variant of :meth:`analyze` for ``async`` endpoints."""
+
+        text = request.text.strip()
+        if not text:
+            return AnalysisResponse(model=self.model, proposals=[], warnings=[])
+
+        try:
+            payload = await self._request_analysis_async(
+                text,
+                request.max_cards,
+                user_profile,
+                workspace_options,
+            )
+        except _google_api_error() as exc:
             self._raise_for_google_api_error(exc, context="analysis")
         except json.JSONDecodeError as exc:
             logger.exception("Unable to decode Gemini response")
             raise GeminiError("Gemini returned an invalid response.") from exc
 
+        return self._build_analysis_response(payload, text, request.max_cards)
+
+    def _build_analysis_response(self, payload: dict[str, Any], text: str, max_cards: int) -> AnalysisResponse:
         warnings = payload.get("warnings", [])
         if not isinstance(warnings, list):
             warnings = []
@@ -544,7 +719,57 @@ class GeminiClient:
 
         model_name = payload.get("model") if isinstance(payload, dict) else None
         resolved_model = str(model_name).strip() if isinstance(model_name, str) and model_name.strip() else self.model
-        return AnalysisResponse(model=resolved_model, proposals=proposals[: request.max_cards], warnings=warnings)
+        return AnalysisResponse(model=resolved_model, proposals=proposals[:max_cards], warnings=warnings)
+
+    def analysis_cache_key(
+        self,
+        request: AnalysisRequest,
+        *,
+        user_profile: UserProfile | None = None,
+        workspace_options: AnalysisWorkspaceOptions | None = None,
+    ) -> str:
+        """Return the response cache key for an ``analyze`` call."""
+
+        combined_prompt, schema = self._build_analysis_prompt(
+            request.text.strip(),
+            request.max_cards,
+            user_profile,
+            workspace_options,
+        )
+        return build_response_cache_key(
+            prompt=combined_prompt,
+            response_schema=self._sanitize_schema(schema),
+            model=self.model,
+        )
+
+    def structured_cache_key(
+        self,
+        *,
+        prompt: str,
+        response_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        model_override: str | None = None,
+    ) -> str:
+        """Return the response cache key for a ``generate_structured`` call."""
+
+        model = self.model
+        if model_override:
+            model = self.sanitize_model_name(self.normalize_model_name(model_override), fallback=self.model)
+        combined_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        return build_response_cache_key(
+            prompt=combined_prompt,
+            response_schema=self._sanitize_schema(response_schema),
+            model=model,
+        )
+
+    def appeal_cache_key(self, *, prompt: str, response_schema: dict[str, Any]) -> str:
+        """Return the response cache key for a ``generate_appeal`` call."""
+
+        return self.structured_cache_key(
+            prompt=prompt,
+            response_schema=response_schema,
+            system_prompt=self._APPEAL_SYSTEM_PROMPT,
+        )
 
     def generate_appeal(
         self,
@@ -560,6 +785,20 @@ class GeminiClient:
             system_prompt=self._APPEAL_SYSTEM_PROMPT,
         )
 
+    async def generate_appeal_async(
+        self,
+        *,
+        prompt: str,
+        response_schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Non-blocking variant of :meth:`generate_appeal`."""
+
+        return await self.generate_structured_async(
+            prompt=prompt,
+            response_schema=response_schema,
+            system_prompt=self._APPEAL_SYSTEM_PROMPT,
+        )
+
     def generate_structured(
         self,
         *,
@@ -568,13 +807,85 @@ class GeminiClient:
         system_prompt: str | None = None,
         model_override: str | None = None,
     ) -> dict[str, Any]:
+        combined_prompt, generation_config = self._prepare_structured_request(prompt, response_schema, system_prompt)
+        warnings = self._base_warnings()
+        try:
+            outcome = self._generate_with_fallback(
+                combined_prompt,
+                generation_config,
+                primary_override=model_override,
+            )
+        except _google_api_error() as exc:
+            self._raise_for_google_api_error(exc, context="structured generation")
+        return self._build_generated_payload(outcome, warnings, context="structured", include_usage=True)
+
+    async def generate_structured_async(
+        self,
+        *,
+        prompt: str,
+        response_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        model_override: str | None = None,
+    ) -> dict[str, Any]:
+        """Non-blocking variant of :meth:`generate_structured`."""
+
+        combined_prompt, generation_config = self._prepare_structured_request(prompt, response_schema, system_prompt)
+        warnings = self._base_warnings()
+        try:
+            outcome = await self._generate_with_fallback_async(
+                combined_prompt,
+                generation_config,
+                primary_override=model_override,
+            )
+        except _google_api_error() as exc:
+            self._raise_for_google_api_error(exc, context="structured generation")
+        return self._build_generated_payload(outcome, warnings, context="structured", include_usage=True)
+
+    def _prepare_structured_request(
+        self,
+        prompt: str,
+        response_schema: dict[str, Any],
+        system_prompt: str | None,
+    ) -> tuple[str, Any]:
         if not prompt.strip():
             raise GeminiError("Prompt must not be empty.")
 
         sanitized_schema = self._sanitize_schema(response_schema)
         generation_config = self._build_generation_config(sanitized_schema)
         combined_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        self._ensure_not_rate_limited()
+        return combined_prompt, generation_config
+
+    def _request_analysis(
+        self,
+        text: str,
+        max_cards: int,
+        user_profile: UserProfile | None = None,
+        workspace_options: AnalysisWorkspaceOptions | None = None,
+    ) -> dict[str, Any]:
+        self._ensure_not_rate_limited()
+        combined_prompt, schema = self._build_analysis_prompt(text, max_cards, user_profile, workspace_options)
+        generation_config = self._build_generation_config(schema)
+        warnings = self._base_warnings()
+        outcome = self._generate_with_fallback(combined_prompt, generation_config, primary_override=None)
+        return self._build_generated_payload(outcome, warnings, context="analysis", include_usage=False)
 
+    async def _request_analysis_async(
+        self,
+        text: str,
+        max_cards: int,
+        user_profile: UserProfile | None = None,
+        workspace_options: AnalysisWorkspaceOptions | None = None,
+    ) -> dict[str, Any]:
+        self._ensure_not_rate_limited()
+        combined_prompt, schema = self._build_analysis_prompt(text, max_cards, user_profile, workspace_options)
+        generation_config = self._build_generation_config(schema)
+        warnings = self._base_warnings()
+        outcome = await self._generate_with_fallback_async(combined_prompt, generation_config, primary_override=None)
+        return self._build_generated_payload(outcome, warnings, context="analysis", include_usage=False)
+
+    @staticmethod
+    def _ensure_not_rate_limited() -> None:
         remaining = _rate_limit_remaining_seconds()
         if remaining is not None:
             raise GeminiRateLimitError(
@@ -582,45 +893,126 @@ class GeminiClient:
                 retry_after_seconds=remaining,
             )
 
-        response = None
-        used_model: str | None = None
-        used_override: str | None = None
-        primary_model: str | None = None
-        last_zero_quota_error: ResourceExhausted | None = None
-        zero_quota_models: list[str] = []
-        warnings = self._base_warnings()
+    @staticmethod
+    def _request_options() -> dict[str, Any]:
+        return {"retry": None, "timeout": settings.gemini_request_timeout_seconds}
 
-        for candidate_override in self._zero_quota_fallback_overrides(primary_override=model_override):
+    def _fallback_candidates(self, primary_override: str | None) -> Iterator[tuple[str | None, Any, str]]:
+        for candidate_override in self._zero_quota_fallback_overrides(primary_override=primary_override):
             try:
                 client, candidate_model = self._get_model_client(candidate_override)
             except GeminiConfigurationError:
                 continue
+            yield candidate_override, client, candidate_model
+
+    async def _fallback_candidates_async(
+        self, primary_override: str | None
+    ) -> AsyncIterator[tuple[str | None, Any, str]]:
+        """Async twin of :meth:`_fallback_candidates`.
 
-            if primary_model is None:
-                primary_model = candidate_model
+        Resolving a model may call the blocking ``list_models`` when the
+        catalog cache is cold, so it runs in a worker thread.
+        """
 
+        for candidate_override in self._zero_quota_fallback_overrides(primary_override=primary_override):
             try:
-                response = client.generate_content(
+                client, candidate_model = await run_in_threadpool(self._get_model_client, candidate_override)
+            except GeminiConfigurationError:
+                continue
+            yield candidate_override, client, candidate_model
+
+    def _generate_with_fallback(
+        self,
+        combined_prompt: str,
+        generation_config: Any,
+        *,
+        primary_override: str | None,
+    ) -> _GenerationOutcome:
+        """Call ``generate_content``, moving to fallback models when a model has zero quota."""
+
+        outcome = _GenerationOutcome()
+        last_zero_quota_error: Exception | None = None
+        for candidate_override, client, candidate_model in self._fallback_candidates(primary_override):
+            if outcome.primary_model is None:
+                outcome.primary_model = candidate_model
+            try:
+                outcome.response = client.generate_content(
                     combined_prompt,
                     generation_config=generation_config,
-                    request_options={"retry": None, "timeout": settings.gemini_request_timeout_seconds},
+                    request_options=self._request_options(),
                 )
-                used_model = candidate_model
-                used_override = candidate_override
-                break
-            except ResourceExhausted as exc:
-                if _is_zero_quota(str(exc)):
-                    last_zero_quota_error = exc
-                    zero_quota_models.append(candidate_model)
-                    continue
-                self._raise_for_google_api_error(exc, context="structured generation")
-            except GoogleAPIError as exc:
-                self._raise_for_google_api_error(exc, context="structured generation")
+            except _resource_exhausted() as exc:
+                if not _is_zero_quota(str(exc)):
+                    raise
+                last_zero_quota_error = exc
+                outcome.zero_quota_models.append(candidate_model)
+                continue
+            outcome.used_model = candidate_model
+            outcome.used_override = candidate_override
+            return outcome
+
+        if last_zero_quota_error is not None:
+            raise last_zero_quota_error
+        raise GeminiError("Gemini request failed.")
+
+    async def _generate_with_fallback_async(
+        self,
+        combined_prompt: str,
+        generation_config: Any,
+        *,
+        primary_override: str | None,
+    ) -> _GenerationOutcome:
+        """Async twin of :meth:`_generate_with_fallback` built on ``generate_content_async``.
+
+        Model clients without an async API are driven from a worker thread instead.
+        """
+
+        outcome = _GenerationOutcome()
+        last_zero_quota_error: Exception | None = None
+        async for candidate_override, client, candidate_model in self._fallback_candidates_async(primary_override):
+            if outcome.primary_model is None:
+                outcome.primary_model = candidate_model
+            try:
+                generate_async = getattr(client, "generate_content_async", None)
+                if callable(generate_async):
+                    outcome.response = await generate_async(
+                        combined_prompt,
+                        generation_config=generation_config,
+                        request_options=self._request_options(),
+                    )
+                else:
+                    outcome.response = await run_in_threadpool(
+                        client.generate_content,
+                        combined_prompt,
+                        generation_config=generation_config,
+                        request_options=self._request_options(),
+                    )
+            except _resource_exhausted() as exc:
+                if not _is_zero_quota(str(exc)):
+                    raise
+                last_zero_quota_error = exc
+                outcome.zero_quota_models.append(candidate_model)
+                continue
+            outcome.used_model = candidate_model
+            outcome.used_override = candidate_override
+            return outcome
 
-        if response is None:
-            if last_zero_quota_error is not None:
-                self._raise_for_google_api_error(last_zero_quota_error, context="structured generation")
-            raise GeminiError("Gemini request failed.")
+        if last_zero_quota_error is not None:
+            raise last_zero_quota_error
+        raise GeminiError("Gemini request failed.")
+
+    def _build_generated_payload(
+        self,
+        outcome: _GenerationOutcome,
+        warnings: list[str],
+        *,
+        context: str,
+        include_usage: bool,
+    ) -> dict[str, Any]:
+        response = outcome.response
+        used_model = outcome.used_model
+        used_override = outcome.used_override
+        primary_model = outcome.primary_model
 
         content = self._extract_content(response)
         data = self._parse_json_payload(content)
@@ -638,16 +1030,18 @@ class GeminiClient:
             )
 
         if primary_model and used_model and used_model != primary_model:
-            if primary_model in zero_quota_models and reported_model:
+            if primary_model in outcome.zero_quota_models and reported_model:
                 logger.warning(
-                    "Gemini model fallback due to zero quota (structured): primary=%s reported=%s",
+                    "Gemini model fallback due to zero quota (%s): primary=%s reported=%s",
+                    context,
                     primary_model,
                     reported_model,
                 )
             elif reported_model:
                 warnings.append(f"Gemini モデル '{primary_model}' から '{reported_model}' にフォールバックしました。")
             logger.warning(
-                "Gemini model fallback (structured): primary=%s used=%s reported=%s",
+                "Gemini model fallback (%s): primary=%s used=%s reported=%s",
+                context,
                 primary_model,
                 used_model,
                 reported_model,
@@ -656,32 +1050,26 @@ class GeminiClient:
         if warnings:
             payload["warnings"] = warnings
 
-        usage = self._extract_usage(response)
-        if usage:
-            existing_usage = payload.get("token_usage")
-            if isinstance(existing_usage, dict):
-                merged = dict(existing_usage)
-                merged.update({key: value for key, value in usage.items() if key not in merged})
-                payload["token_usage"] = merged
-            else:
-                payload["token_usage"] = usage
+        if include_usage:
+            usage = self._extract_usage(response)
+            if usage:
+                existing_usage = payload.get("token_usage")
+                if isinstance(existing_usage, dict):
+                    merged = dict(existing_usage)
+                    merged.update({key: value for key, value in usage.items() if key not in merged})
+                    payload["token_usage"] = merged
+                else:
+                    payload["token_usage"] = usage
 
         return payload
 
-    def _request_analysis(
+    def _build_analysis_prompt(
         self,
         text: str,
         max_cards: int,
         user_profile: UserProfile | None = None,
         workspace_options: AnalysisWorkspaceOptions | None = None,
-    ) -> dict[str, Any]:
-        remaining = _rate_limit_remaining_seconds()
-        if remaining is not None:
-            raise GeminiRateLimitError(
-                f"Gemini API のレート制限に達しました。{remaining} 秒後に再試行してください。",
-                retry_after_seconds=remaining,
-            )
-
+    ) -> tuple[str, dict[str, Any]]:
         response_format = self._build_response_format(max_cards)
         user_prompt = self._build_user_prompt(
             text,
@@ -689,87 +1077,12 @@ class GeminiClient:
             user_profile,
             workspace_options,
         )
-        generation_config = self._build_generation_config(response_format["json_schema"]["schema"])
-        combined_prompt = f"{self._SYSTEM_PROMPT}\n\n{user_prompt}"
-
-        response = None
-        used_model: str | None = None
-        used_override: str | None = None
-        primary_model: str | None = None
-        last_zero_quota_error: ResourceExhausted | None = None
-        zero_quota_models: list[str] = []
-        warnings = self._base_warnings()
-
-        for model_override in self._zero_quota_fallback_overrides(primary_override=None):
-            try:
-                client, candidate_model = self._get_model_client(model_override)
-            except GeminiConfigurationError:
-                continue
-
-            if primary_model is None:
-                primary_model = candidate_model
-
-            try:
-                response = client.generate_content(
-                    combined_prompt,
-                    generation_config=generation_config,
-                    request_options={"retry": None, "timeout": settings.gemini_request_timeout_seconds},
-                )
-                used_model = candidate_model
-                used_override = model_override
-                break
-            except ResourceExhausted as exc:
-                if _is_zero_quota(str(exc)):
-                    last_zero_quota_error = exc
-                    zero_quota_models.append(candidate_model)
-                    continue
-                raise
+        return f"{self._SYSTEM_PROMPT}\n\n{user_prompt}", response_format["json_schema"]["schema"]
 
-        if response is None:
-            if last_zero_quota_error is not None:
-                raise last_zero_quota_error
-            raise GeminiError("Gemini request failed.")
-
-        content = self._extract_content(response)
-        data = self._parse_json_payload(content)
-        if not isinstance(data, dict):
-            raise GeminiError("Gemini response must be a JSON object.")
-
-        reported_model = self._resolve_effective_model(response, used_model)
-        enriched = dict(data)
-        if reported_model:
-            enriched["model"] = reported_model
-
-        if used_override is not None and used_model and used_model != used_override:
-            warnings.append(
-                f"Gemini モデル '{used_override}' は利用可能なバリアント '{used_model}' に解決されました。"
-            )
-
-        if primary_model and used_model and used_model != primary_model:
-            if primary_model in zero_quota_models and reported_model:
-                logger.warning(
-                    "Gemini model fallback due to zero quota (analysis): primary=%s reported=%s",
-                    primary_model,
-                    reported_model,
-                )
-            elif reported_model:
-                warnings.append(f"Gemini モデル '{primary_model}' から '{reported_model}' にフォールバックしました。")
-            logger.warning(
-                "Gemini model fallback (analysis): primary=%s used=%s reported=%s",
-                primary_model,
-                used_model,
-                reported_model,
-            )
-
-        if warnings:
-            enriched["warnings"] = warnings
-
-        return enriched
-
-    def _raise_for_google_api_error(self, exc: GoogleAPIError, *, context: str) -> None:
+    def _raise_for_google_api_error(self, exc: Exception, *, context: str) -> None:
         message = str(exc)
 
-        if isinstance(exc, ResourceExhausted):
+        if isinstance(exc, _resource_exhausted()):
             if _is_zero_quota(message):
                 model = _extract_quota_model(message)
                 suffix = f" (model: {model})" if model else ""
@@ -857,7 +1170,7 @@ class GeminiClient:
             "response_mime_type": "application/json",
             "response_schema": sanitized_schema,
         }
-        generation_config_cls = getattr(getattr(genai, "types", None), "GenerationConfig", None)
+        generation_config_cls = getattr(getattr(_load_genai(), "types", None), "GenerationConfig", None)
         if generation_config_cls is not None:
             try:
                 return generation_config_cls(**config)
@@ -1235,27 +1548,35 @@ def _load_gemini_configuration(db: Session, provider: str = "gemini") -> tuple[s
 
         raise GeminiConfigurationError("Gemini API key is not configured. Update it from the admin settings.")
 
-    try:
-        cipher = get_secret_cipher()
-    except SecretEncryptionKeyError as exc:
-        raise GeminiConfigurationError(str(exc)) from exc
-    try:
-        decryption = cipher.decrypt(credential.encrypted_secret)
-        secret = decryption.plaintext
-    except SecretDecryptionError as exc:
-        logger.exception("Failed to decrypt API credential for provider '%s'", provider)
-        raise GeminiConfigurationError(
-            "Gemini API key could not be decrypted. Update it from the admin settings."
-        ) from exc
-    except Exception as exc:  # pragma: no cover - defensive path
-        logger.exception("Failed to decrypt API credential for provider '%s'", provider)
-        raise GeminiConfigurationError("Failed to decrypt Gemini API key.") from exc
+    secret_key = _fingerprint(credential.encrypted_secret)
+    with _CLIENT_CACHE_LOCK:
+        secret = _DECRYPTED_SECRET_CACHE.get(secret_key)
 
-    if decryption.reencrypted_payload:
-        credential.encrypted_secret = decryption.reencrypted_payload
-        db.add(credential)
-        db.commit()
-        db.refresh(credential)
+    if secret is None:
+        try:
+            cipher = get_secret_cipher()
+        except SecretEncryptionKeyError as exc:
+            raise GeminiConfigurationError(str(exc)) from exc
+        try:
+            decryption = cipher.decrypt(credential.encrypted_secret)
+            secret = decryption.plaintext
+        except SecretDecryptionError as exc:
+            logger.exception("Failed to decrypt API credential for provider '%s'", provider)
+            raise GeminiConfigurationError(
+                "Gemini API key could not be decrypted. Update it from the admin settings."
+            ) from exc
+        except Exception as exc:  # pragma: no cover - defensive path
+            logger.exception("Failed to decrypt API credential for provider '%s'", provider)
+            raise GeminiConfigurationError("Failed to decrypt Gemini API key.") from exc
+
+        if decryption.reencrypted_payload:
+            credential.encrypted_secret = decryption.reencrypted_payload
+            db.add(credential)
+            db.commit()
+            db.refresh(credential)
+        elif secret:
+            with _CLIENT_CACHE_LOCK:
+                _DECRYPTED_SECRET_CACHE[secret_key] = secret
 
     if not secret:
         raise GeminiConfigurationError("Gemini API key is not configured. Update it from the admin settings.")
@@ -1280,13 +1601,14 @@ def list_gemini_generate_content_models(db: Session, provider: str = "gemini") -
     """Return Gemini model names that support generateContent for the configured API key."""
 
     api_key = _load_gemini_api_key(db, provider)
-    if genai is None:
+    sdk = _load_genai()
+    if sdk is None:
         raise GeminiConfigurationError(
             "Gemini SDK is not installed. Install the 'google-generativeai' package to enable analysis."
         )
 
-    genai.configure(api_key=api_key)
-    list_models = getattr(genai, "list_models", None)
+    sdk.configure(api_key=api_key)
+    list_models = getattr(sdk, "list_models", None)
     if not callable(list_models):
         raise GeminiConfigurationError(
             "Gemini SDK does not support model discovery. Upgrade the 'google-generativeai' package."
@@ -1294,7 +1616,7 @@ def list_gemini_generate_content_models(db: Session, provider: str = "gemini") -
 
     try:
         catalog = list(list_models())
-    except GoogleAPIError as exc:
+    except _google_api_error() as exc:
         logger.exception("Unable to list Gemini models")
         raise GeminiError("Gemini model discovery failed.") from exc
     except Exception as exc:  # pragma: no cover - defensive path
@@ -1307,10 +1629,28 @@ def list_gemini_generate_content_models(db: Session, provider: str = "gemini") -
     return filtered
 
 
+def get_cached_gemini_client(*, api_key: str, model: str, provider: str = "gemini") -> GeminiClient:
+    """Return a process-wide client for the credential, constructing it on first use."""
+
+    registry_key = (provider, _fingerprint(api_key), model)
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_REGISTRY.get(registry_key)
+    if client is not None:
+        return client
+
+    client = GeminiClient(api_key=api_key, model=model)
+    with _CLIENT_CACHE_LOCK:
+        # Only the latest configuration per provider is kept; a rotated key
+        # or model replaces the previous entry instead of accumulating.
+        for stale_key in [key for key in _CLIENT_REGISTRY if key[0] == provider and key != registry_key]:
+            del _CLIENT_REGISTRY[stale_key]
+        return _CLIENT_REGISTRY.setdefault(registry_key, client)
+
+
 def get_gemini_client(db: Session = Depends(get_db)) -> GeminiClient:
     try:
         api_key, model = _load_gemini_configuration(db)
-        return GeminiClient(api_key=api_key, model=model)
+        return get_cached_gemini_client(api_key=api_key, model=model)
     except GeminiConfigurationError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -35,7 +35,7 @@ _MISSING_PILLOW_MESSAGE = "画像処理ライブラリ(Pillow)がインストー
 def build_user_profile(user: models.User) -> schemas.UserProfile:
     profile = schemas.UserProfile.model_validate(user)
 
-    if user.avatar_image and user.avatar_mime_type:
+    if user.avatar_mime_type and user.avatar_image:
         encoded = base64.b64encode(user.avatar_image).decode()
         profile.avatar_url = f"data:{user.avatar_mime_type};base64,{encoded}"
     else:
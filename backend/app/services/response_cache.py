@@ -0,0 +1,330 @@
+"""Content-addressed cache for structured Gemini responses.
+
+Identical requests — a status report re-submitted through ``/retry``, a
+double-clicked analysis, an unchanged immunity-map context — hash to the same
+key, so the stored payload can be served without calling Gemini or consuming
+a daily AI quota slot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping, Protocol
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENDPOINT_ANALYSIS = "analysis"
+CACHE_ENDPOINT_IMMUNITY_MAP_CANDIDATES = "immunity_map_candidates"
+CACHE_ENDPOINT_IMMUNITY_MAP = "immunity_map"
+CACHE_ENDPOINT_APPEAL = "appeal"
+CACHE_ENDPOINT_STATUS_REPORT = "status_report"
+
+# Expired and excess ``ai_response_cache`` rows are pruned at most this often per process.
+_DATABASE_EVICTION_INTERVAL_SECONDS = 60.0
+
+
+def build_response_cache_key(*, prompt: str, response_schema: Mapping[str, Any], model: str) -> str:
+    """Hash the combined prompt, sanitized schema and resolved model into a cache key."""
+
+    material = json.dumps(
+        {"model": model, "prompt": prompt, "schema": response_schema},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(Protocol):
+    """Interface shared by the cache tiers."""
+
+    def get(self, db: Session, key: str) -> dict[str, Any] | None: ...
+
+    def set(self, db: Session, key: str, payload: dict[str, Any], *, model: str | None = None) -> None: ...
+
+    def clear(self) -> None:
+        """Drop process-local entries. Persistent tiers keep their rows."""
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Bounded LRU kept in process memory."""
+
+    def __init__(self, *, max_entries: int, ttl_seconds: int) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return deepcopy(payload)
+
+    def set(self, db: Session, key: str, payload: dict[str, Any], *, model: str | None = None) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, deepcopy(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DatabaseResponseCache(ResponseCache):
+    """Shared tier stored in ``ai_response_cache`` with TTL and size-based eviction.
+
+    Rows are written through the caller's session so they commit together
+    with the request that produced them. Eviction runs on a write at most
+    every ``evict_interval_seconds``, so the table can exceed ``max_entries``
+    by the rows written in between.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: int,
+        evict_interval_seconds: float = _DATABASE_EVICTION_INTERVAL_SECONDS,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._evict_interval_seconds = evict_interval_seconds
+        self._next_eviction = 0.0
+
+    def get(self, db: Session, key: str) -> dict[str, Any] | None:
+        payload = db.execute(
+            select(models.AiResponseCacheEntry.payload).where(
+                models.AiResponseCacheEntry.cache_key == key,
+                models.AiResponseCacheEntry.expires_at > datetime.now(timezone.utc),
+            )
+        ).scalar_one_or_none()
+        return dict(payload) if isinstance(payload, dict) else None
+
+    def set(self, db: Session, key: str, payload: dict[str, Any], *, model: str | None = None) -> None:
+        now = datetime.now(timezone.utc)
+        entry = db.get(models.AiResponseCacheEntry, key)
+        if entry is None:
+            entry = models.AiResponseCacheEntry(cache_key=key)
+            db.add(entry)
+        entry.model = model
+        entry.payload = deepcopy(payload)
+        entry.expires_at = now + timedelta(seconds=self._ttl_seconds)
+        db.flush()
+        if time.monotonic() >= self._next_eviction:
+            self._next_eviction = time.monotonic() + self._evict_interval_seconds
+            self._evict(db, now=now)
+
+    def _evict(self, db: Session, *, now: datetime) -> None:
+        db.execute(
+            delete(models.AiResponseCacheEntry)
+            .where(models.AiResponseCacheEntry.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        total = db.execute(select(func.count()).select_from(models.AiResponseCacheEntry)).scalar_one()
+        excess = total - self._max_entries
+        if excess <= 0:
+            return
+        oldest = (
+            select(models.AiResponseCacheEntry.cache_key)
+            .order_by(models.AiResponseCacheEntry.updated_at.asc())
+            .limit(excess)
+        )
+        db.execute(
+            delete(models.AiResponseCacheEntry)
+            .where(models.AiResponseCacheEntry.cache_key.in_(oldest.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+
+
+class TieredResponseCache(ResponseCache):
+    """Consult tiers in order and backfill faster tiers on a hit."""
+
+    def __init__(self, *tiers: ResponseCache) -> None:
+        self._tiers = tiers
+
+    def get(self, db: Session, key: str) -> dict[str, Any] | None:
+        for index, tier in enumerate(self._tiers):
+            payload = tier.get(db, key)
+            if payload is None:
+                continue
+            for faster in self._tiers[:index]:
+                faster.set(db, key, payload, model=payload.get("model"))
+            return payload
+        return None
+
+    def set(self, db: Session, key: str, payload: dict[str, Any], *, model: str | None = None) -> None:
+        for tier in self._tiers:
+            tier.set(db, key, payload, model=model)
+
+    def clear(self) -> None:
+        for tier in self._tiers:
+            tier.clear()
+
+
+_CACHE_LOCK = threading.Lock()
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, building it from settings on first use."""
+
+    global _response_cache
+    with _CACHE_LOCK:
+        if _response_cache is None:
+            ttl_seconds = settings.gemini_response_cache_ttl_seconds
+            _response_cache = TieredResponseCache(
+                InMemoryResponseCache(
+                    max_entries=settings.gemini_response_cache_memory_entries,
+                    ttl_seconds=ttl_seconds,
+                ),
+                DatabaseResponseCache(
+                    max_entries=settings.gemini_response_cache_max_entries,
+                    ttl_seconds=ttl_seconds,
+                ),
+            )
+        return _response_cache
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Install a custom cache implementation, or ``None`` to rebuild from settings."""
+
+    global _response_cache
+    with _CACHE_LOCK:
+        _response_cache = cache
+
+
+def reset_response_cache() -> None:
+    """Drop process-local cache state so the next lookup rebuilds from settings."""
+
+    cache = _response_cache
+    if cache is not None:
+        cache.clear()
+    set_response_cache(None)
+
+
+def response_cache_enabled(endpoint: str) -> bool:
+    """Return whether ``endpoint`` may serve and store cached responses."""
+
+    if not settings.gemini_response_cache_enabled:
+        return False
+    return endpoint not in settings.gemini_response_cache_disabled_endpoints
+
+
+def analysis_response_cache_key(
+    client: Any,
+    endpoint: str,
+    request: Any,
+    *,
+    user_profile: Any = None,
+    workspace_options: Any = None,
+) -> str | None:
+    """Return the cache key for an ``analyze`` call, or ``None`` when caching does not apply."""
+
+    if not response_cache_enabled(endpoint):
+        return None
+    builder = getattr(client, "analysis_cache_key", None)
+    if not callable(builder):
+        return None
+    return builder(request, user_profile=user_profile, workspace_options=workspace_options)
+
+
+def structured_response_cache_key(
+    client: Any,
+    endpoint: str,
+    *,
+    prompt: str,
+    response_schema: dict[str, Any],
+    system_prompt: str | None = None,
+) -> str | None:
+    """Return the cache key for a ``generate_structured`` call, or ``None`` when caching does not apply."""
+
+    if not response_cache_enabled(endpoint):
+        return None
+    builder = getattr(client, "structured_cache_key", None)
+    if not callable(builder):
+        return None
+    return builder(prompt=prompt, response_schema=response_schema, system_prompt=system_prompt)
+
+
+def appeal_response_cache_key(
+    client: Any,
+    endpoint: str,
+    *,
+    prompt: str,
+    response_schema: dict[str, Any],
+) -> str | None:
+    """Return the cache key for a ``generate_appeal`` call, or ``None`` when caching does not apply."""
+
+    if not response_cache_enabled(endpoint):
+        return None
+    builder = getattr(client, "appeal_cache_key", None)
+    if not callable(builder):
+        return None
+    return builder(prompt=prompt, response_schema=response_schema)
+
+
+def load_cached_response(db: Session, key: str | None) -> dict[str, Any] | None:
+    """Return the cached payload for ``key``; ``None`` keys always miss."""
+
+    if key is None:
+        return None
+    payload = get_response_cache().get(db, key)
+    if payload is not None:
+        logger.info("Serving Gemini response from cache (key=%s…)", key[:12])
+    return payload
+
+
+def store_cached_response(db: Session, key: str | None, payload: dict[str, Any], *, model: str | None = None) -> None:
+    """Persist ``payload`` under ``key``; ``None`` keys are ignored."""
+
+    if key is None:
+        return
+    get_response_cache().set(db, key, payload, model=model)
+
+
+__all__ = [
+    "CACHE_ENDPOINT_ANALYSIS",
+    "CACHE_ENDPOINT_APPEAL",
+    "CACHE_ENDPOINT_IMMUNITY_MAP",
+    "CACHE_ENDPOINT_IMMUNITY_MAP_CANDIDATES",
+    "CACHE_ENDPOINT_STATUS_REPORT",
+    "DatabaseResponseCache",
+    "InMemoryResponseCache",
+    "ResponseCache",
+    "TieredResponseCache",
+    "analysis_response_cache_key",
+    "appeal_response_cache_key",
+    "build_response_cache_key",
+    "get_response_cache",
+    "load_cached_response",
+    "reset_response_cache",
+    "response_cache_enabled",
+    "set_response_cache",
+    "store_cached_response",
+    "structured_response_cache_key",
+]
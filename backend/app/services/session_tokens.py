@@ -0,0 +1,178 @@
+"""Reclaim expired rows from ``session_tokens``.
+
+Every login inserts a token with a 24 hour lifetime, and nothing else removes
+tokens once they expire. :func:`sweep_expired_session_tokens` deletes them in
+bounded batches, committing after each batch so no single transaction holds
+many row locks. The ``ix_session_tokens_expires_at`` index keeps each batch
+lookup cheap. Long-running deployments sweep from a background thread started
+in the app lifespan. Serverless deployments can schedule
+``python -m app.services.session_tokens`` instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    deleted: int
+    batches: int
+    duration_ms: float
+
+
+@dataclass
+class SweeperStats:
+    """Totals since process start, reported in every sweep's log line."""
+
+    runs: int = 0
+    reclaimed: int = 0
+    last_run_at: str | None = None
+    last_deleted: int = 0
+
+
+_stats_lock = threading.Lock()
+_stats = SweeperStats()
+
+
+def get_sweeper_stats() -> SweeperStats:
+    with _stats_lock:
+        return SweeperStats(**asdict(_stats))
+
+
+def sweep_expired_session_tokens(
+    bind: Engine | Connection,
+    *,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    now: datetime | None = None,
+) -> SweepResult:
+    """Delete tokens that expired before ``now``, ``batch_size`` rows per transaction."""
+
+    batch_size = batch_size or settings.session_token_sweep_batch_size
+    cutoff = now or datetime.now(timezone.utc)
+    token_model = models.SessionToken
+    started = time.perf_counter()
+    deleted = batches = 0
+
+    with Session(bind=bind, future=True) as db:
+        while max_batches is None or batches < max_batches:
+            expired = (
+                db.execute(
+                    select(token_model.token)
+                    .where(token_model.expires_at.is_not(None), token_model.expires_at < cutoff)
+                    .limit(batch_size)
+                )
+                .scalars()
+                .all()
+            )
+            if not expired:
+                break
+            result = db.execute(
+                delete(token_model).where(token_model.token.in_(expired)),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            deleted += result.rowcount or 0
+            batches += 1
+            if len(expired) < batch_size:
+                break
+
+    result = SweepResult(deleted=deleted, batches=batches, duration_ms=round((time.perf_counter() - started) * 1000, 2))
+    with _stats_lock:
+        _stats.runs += 1
+        _stats.reclaimed += deleted
+        _stats.last_run_at = cutoff.isoformat()
+        _stats.last_deleted = deleted
+        totals = asdict(_stats)
+    logger.info("session_token_sweep %s", json.dumps({**asdict(result), "totals": totals}))
+    return result
+
+
+class SessionTokenSweeper:
+    """Thread that sweeps expired tokens every ``interval`` seconds."""
+
+    def __init__(self, bind: Engine | Connection, *, interval: float) -> None:
+        self._bind = bind
+        self._interval = interval
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="session-token-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        # The first sweep waits one interval so startup stays cheap.
+        while not self._stopping.wait(self._interval):
+            try:
+                sweep_expired_session_tokens(self._bind)
+            except Exception:
+                logger.exception("Session token sweep failed")
+
+
+_sweeper: SessionTokenSweeper | None = None
+
+
+def start_session_token_sweeper(bind: Engine | Connection) -> SessionTokenSweeper | None:
+    """Start the process-wide sweeper unless ``SESSION_TOKEN_SWEEP_INTERVAL_SECONDS`` is ``0``."""
+
+    global _sweeper
+    if settings.session_token_sweep_interval_seconds <= 0:
+        return None
+    if _sweeper is None:
+        _sweeper = SessionTokenSweeper(bind, interval=settings.session_token_sweep_interval_seconds)
+    _sweeper.start()
+    return _sweeper
+
+
+def stop_session_token_sweeper() -> None:
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.stop()
+        _sweeper = None
+
+
+def main(argv: list[str] | None = None) -> None:
+    from ..database import get_engine
+
+    parser = argparse.ArgumentParser(description="Delete expired session tokens.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    result = sweep_expired_session_tokens(get_engine(), batch_size=args.batch_size, max_batches=args.max_batches)
+    logger.info("Reclaimed %d expired session token(s) in %d batch(es).", result.deleted, result.batches)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual batch entry point
+    main()
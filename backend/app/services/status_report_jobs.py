@@ -0,0 +1,342 @@
+"""Database-backed job queue for status report analysis.
+
+Submitting a report only records a :class:`~app.models.StatusReportJob` row.
+Jobs are executed by a small in-process worker pool (or, when the pool is
+disabled, by a FastAPI background task after the response is sent), so HTTP
+workers never wait on Gemini. Because the queue lives in the database, any
+process pointing at the same database can drain it, which is what
+``python -m app.services.status_report_jobs`` does for overnight batches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from uuid import uuid4
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .. import models, schemas
+from ..config import settings
+from .gemini import GeminiClient, get_gemini_client
+from .status_reports import StatusReportService
+
+logger = logging.getLogger(__name__)
+
+AnalyzerFactory = Callable[[Session], GeminiClient]
+
+_MAX_JOB_ATTEMPTS = 3
+_QUEUED = schemas.StatusReportJobStatus.QUEUED.value
+_RUNNING = schemas.StatusReportJobStatus.RUNNING.value
+_COMPLETED = schemas.StatusReportJobStatus.COMPLETED.value
+_FAILED = schemas.StatusReportJobStatus.FAILED.value
+TERMINAL_JOB_STATUSES = frozenset({_COMPLETED, _FAILED})
+
+
+def load_job_analyzer(db: Session) -> GeminiClient:
+    """Resolve the Gemini client for a worker from the stored credentials."""
+
+    return get_gemini_client(db)
+
+
+def _session_factory(bind: Engine | Connection) -> sessionmaker:
+    return sessionmaker(bind=bind, autocommit=False, autoflush=False, expire_on_commit=False, future=True)
+
+
+def get_latest_job(db: Session, *, report_id: str) -> models.StatusReportJob | None:
+    return (
+        db.query(models.StatusReportJob)
+        .filter(models.StatusReportJob.report_id == report_id)
+        .order_by(models.StatusReportJob.created_at.desc())
+        .first()
+    )
+
+
+def claim_job(db: Session, *, worker_id: str, job_id: str | None = None) -> models.StatusReportJob | None:
+    """Atomically move the oldest runnable job to ``running`` and return it.
+
+    Jobs whose lease expired (their worker died mid-run) are claimable again.
+    The compare-and-set ``UPDATE`` keeps concurrent workers, including ones in
+    other processes, from picking up the same job.
+    """
+
+    job_model = models.StatusReportJob
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=settings.status_report_job_lease_seconds)
+    claimable = or_(
+        job_model.status == _QUEUED,
+        and_(job_model.status == _RUNNING, job_model.started_at < stale_before),
+    )
+
+    query = db.query(job_model.id).filter(claimable)
+    if job_id is not None:
+        query = query.filter(job_model.id == job_id)
+    candidates = [row.id for row in query.order_by(job_model.created_at).limit(5)]
+
+    for candidate_id in candidates:
+        claimed = (
+            db.query(job_model)
+            .filter(job_model.id == candidate_id, claimable)
+            .update(
+                {
+                    job_model.status: _RUNNING,
+                    job_model.locked_by: worker_id,
+                    job_model.started_at: now,
+                    job_model.attempts: job_model.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed:
+            return db.get(job_model, candidate_id)
+    return None
+
+
+def _finish_job(job: models.StatusReportJob, status: str, error: str | None = None) -> None:
+    job.status = status
+    job.error = error
+    job.locked_by = None
+    job.finished_at = datetime.now(timezone.utc)
+
+
+def _fail_job(db: Session, job: models.StatusReportJob, message: str) -> None:
+    report = db.get(models.StatusReport, job.report_id)
+    if report is not None:
+        StatusReportService(db).fail_analysis(report, message)
+    _finish_job(job, _FAILED, message)
+    db.commit()
+
+
+def process_job(db: Session, job: models.StatusReportJob, *, analyzer_factory: AnalyzerFactory) -> None:
+    """Run the analysis for a claimed job and persist the outcome."""
+
+    report = db.get(models.StatusReport, job.report_id)
+    if report is None:
+        _finish_job(job, _FAILED, "Status report not found.")
+        db.commit()
+        return
+
+    if job.attempts > _MAX_JOB_ATTEMPTS:
+        _fail_job(db, job, "Status report analysis was abandoned after repeated worker failures.")
+        return
+
+    try:
+        analyzer = analyzer_factory(db)
+    except HTTPException as exc:
+        _fail_job(db, job, str(exc.detail))
+        return
+
+    service = StatusReportService(db, analyzer=analyzer)
+    service.start_analysis(report)
+    db.commit()
+
+    inputs = service.prepare_analysis(report, max_cards=job.max_cards)
+    # End the read transaction so the worker holds no connection while Gemini runs.
+    db.commit()
+    result = service.process_report(report, inputs=inputs)
+    _finish_job(job, _FAILED if result.error else _COMPLETED, result.error)
+    db.commit()
+
+
+def run_next_job(
+    session_factory: sessionmaker,
+    *,
+    worker_id: str,
+    analyzer_factory: AnalyzerFactory = load_job_analyzer,
+    job_id: str | None = None,
+) -> bool:
+    """Claim and process one job. Return ``False`` when nothing was runnable."""
+
+    with session_factory() as db:
+        job = claim_job(db, worker_id=worker_id, job_id=job_id)
+        if job is None:
+            return False
+
+        try:
+            process_job(db, job, analyzer_factory=analyzer_factory)
+        except Exception:
+            logger.exception("Status report job %s failed unexpectedly", job.id)
+            db.rollback()
+            job = db.get(models.StatusReportJob, job.id)
+            if job is not None:
+                if job.attempts >= _MAX_JOB_ATTEMPTS:
+                    _fail_job(db, job, "Status report analysis failed unexpectedly.")
+                else:
+                    job.status = _QUEUED
+                    job.locked_by = None
+                    db.commit()
+        return True
+
+
+def run_status_report_job(job_id: str, *, bind: Engine | Connection, analyzer: GeminiClient) -> None:
+    """Process ``job_id`` with an already resolved analyzer (background-task path)."""
+
+    run_next_job(
+        _session_factory(bind),
+        worker_id=f"inline-{uuid4().hex[:8]}",
+        analyzer_factory=lambda _db: analyzer,
+        job_id=job_id,
+    )
+
+
+def drain_status_report_jobs(
+    bind: Engine | Connection,
+    *,
+    limit: int | None = None,
+    analyzer_factory: AnalyzerFactory = load_job_analyzer,
+) -> int:
+    """Process queued jobs until the queue is empty or ``limit`` is reached."""
+
+    session_factory = _session_factory(bind)
+    worker_id = f"batch-{uuid4().hex[:8]}"
+    processed = 0
+    while limit is None or processed < limit:
+        if not run_next_job(session_factory, worker_id=worker_id, analyzer_factory=analyzer_factory):
+            break
+        processed += 1
+    return processed
+
+
+class StatusReportWorkerPool:
+    """Threads that poll the job table and run status report analyses."""
+
+    def __init__(
+        self,
+        bind: Engine | Connection,
+        *,
+        workers: int,
+        poll_interval: float,
+        analyzer_factory: AnalyzerFactory = load_job_analyzer,
+    ) -> None:
+        self._session_factory = _session_factory(bind)
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._analyzer_factory = analyzer_factory
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        prefix = uuid4().hex[:8]
+        self._threads = [
+            threading.Thread(
+                target=self._run,
+                args=(f"worker-{prefix}-{index}",),
+                name=f"status-report-worker-{index}",
+                daemon=True,
+            )
+            for index in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers so a freshly queued job starts without waiting for the next poll."""
+
+        self._wake.set()
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = run_next_job(
+                    self._session_factory,
+                    worker_id=worker_id,
+                    analyzer_factory=self._analyzer_factory,
+                )
+            except Exception:
+                logger.exception("Status report worker %s crashed while polling", worker_id)
+                processed = False
+            if not processed:
+                self._wake.wait(self._poll_interval)
+                self._wake.clear()
+
+
+_worker_pool: StatusReportWorkerPool | None = None
+
+
+def get_status_report_worker_pool() -> StatusReportWorkerPool | None:
+    return _worker_pool
+
+
+def start_status_report_workers(bind: Engine | Connection) -> StatusReportWorkerPool | None:
+    """Start the process-wide worker pool unless it is disabled by configuration.
+
+    Without ``STATUS_REPORT_WORKER_COUNT``, only ``DEPLOYMENT_MODE=server``
+    starts workers: a frozen serverless instance would strand claimed jobs
+    until their lease expires, so jobs run as background tasks there instead.
+    """
+
+    global _worker_pool
+    workers = settings.status_report_worker_count
+    if workers is None:
+        workers = 2 if settings.deployment_mode == "server" else 0
+    if workers <= 0:
+        return None
+    if _worker_pool is None:
+        _worker_pool = StatusReportWorkerPool(
+            bind,
+            workers=workers,
+            poll_interval=settings.status_report_job_poll_interval_seconds,
+        )
+    _worker_pool.start()
+    return _worker_pool
+
+
+def stop_status_report_workers() -> None:
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.stop()
+        _worker_pool = None
+
+
+def dispatch_status_report_job(
+    job_id: str,
+    *,
+    bind: Engine | Connection,
+    analyzer: GeminiClient,
+    background_tasks: BackgroundTasks,
+) -> None:
+    """Hand a committed job to the worker pool, or run it after the response when the pool is off."""
+
+    pool = get_status_report_worker_pool()
+    if pool is not None and pool.running:
+        pool.notify()
+        return
+    background_tasks.add_task(run_status_report_job, job_id, bind=bind, analyzer=analyzer)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from ..database import get_engine
+
+    parser = argparse.ArgumentParser(description="Process queued status report analyses.")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of jobs to process.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    processed = drain_status_report_jobs(get_engine(), limit=args.limit)
+    logger.info("Processed %d status report job(s).", processed)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual batch entry point
+    main()
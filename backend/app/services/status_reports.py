@@ -9,10 +9,17 @@ from sqlalchemy.orm import Session, selectinload
 
 from .. import models, schemas
 from .gemini import (
+    AnalysisWorkspaceOptions,
     GeminiClient,
     GeminiError,
     build_workspace_analysis_options,
 )
+from .response_cache import (
+    CACHE_ENDPOINT_STATUS_REPORT,
+    analysis_response_cache_key,
+    load_cached_response,
+    store_cached_response,
+)
 from .status_report_content import StatusReportContentService
 from .status_report_presenter import StatusReportPresenter
 from ..utils.quotas import (
@@ -34,6 +41,16 @@ class StatusReportProcessResult:
     error: str | None = None
 
 
+@dataclass
+class StatusReportAnalysisInputs:
+    """Everything the analysis of a report reads from the database."""
+
+    request: schemas.AnalysisRequest
+    workspace_options: AnalysisWorkspaceOptions
+    cache_key: str | None
+    cached_payload: dict[str, Any] | None
+
+
 class StatusReportService:
     """Orchestrates CRUD and analysis flows for status reports."""
 
@@ -164,12 +181,18 @@ class StatusReportService:
     # ------------------------------------------------------------------
     # Analysis pipeline
     # ------------------------------------------------------------------
-    def submit_report(
+    def enqueue_report(
         self,
         report: models.StatusReport,
         *,
         max_cards: int = _MAX_GENERATED_CARDS,
-    ) -> StatusReportProcessResult:
+    ) -> models.StatusReportJob:
+        """Mark ``report`` as processing and queue it for the analysis workers.
+
+        The daily quota is reserved here so callers learn about exhausted limits
+        immediately; requests already answered by the response cache are free.
+        """
+
         if self.analyzer is None:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -186,42 +209,96 @@ class StatusReportService:
                 detail=f"Report in status '{report.status}' cannot be submitted.",
             )
 
-        today = date.today()
-        limit = get_status_report_daily_limit(self.db, report.owner_id)
-        quota_reserved = reserve_ai_quota(
-            self.db,
-            owner_id=report.owner_id,
-            quota_day=today,
-            limit=limit,
-            quota_key=AI_QUOTA_STATUS_REPORT,
-        )
-        if not quota_reserved:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Daily status report analysis limit of {limit} reached.",
+        analysis_request, workspace_options, cache_key = self._build_analysis_inputs(report, max_cards)
+        if load_cached_response(self.db, cache_key) is None:
+            limit = get_status_report_daily_limit(self.db, report.owner_id)
+            quota_reserved = reserve_ai_quota(
+                self.db,
+                owner_id=report.owner_id,
+                quota_day=date.today(),
+                limit=limit,
+                quota_key=AI_QUOTA_STATUS_REPORT,
             )
+            if not quota_reserved:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Daily status report analysis limit of {limit} reached.",
+                )
 
         report.status = schemas.StatusReportStatus.PROCESSING.value
-        report.analysis_started_at = datetime.now(timezone.utc)
+        report.analysis_started_at = None
+        report.analysis_completed_at = None
         report.analysis_model = None
         report.failure_reason = None
         self._record_event(report, schemas.StatusReportEventType.SUBMITTED)
+
+        job = models.StatusReportJob(
+            report_id=report.id,
+            owner_id=report.owner_id,
+            status=schemas.StatusReportJobStatus.QUEUED.value,
+            max_cards=max_cards,
+        )
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def start_analysis(self, report: models.StatusReport) -> None:
+        """Record that a worker picked up ``report``."""
+
+        report.status = schemas.StatusReportStatus.PROCESSING.value
+        report.analysis_started_at = datetime.now(timezone.utc)
         self._record_event(report, schemas.StatusReportEventType.ANALYSIS_STARTED)
         self.db.flush()
 
-        sections = self.content_service.extract_sections(report)
-        analysis_text = self.content_service.compose_analysis_prompt(report, sections)
+    def prepare_analysis(
+        self,
+        report: models.StatusReport,
+        *,
+        max_cards: int = _MAX_GENERATED_CARDS,
+    ) -> StatusReportAnalysisInputs:
+        """Read the prompt, workspace options and cached response for ``report``."""
+
+        if self.analyzer is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Status report analyzer is not configured.",
+            )
+
+        analysis_request, workspace_options, cache_key = self._build_analysis_inputs(report, max_cards)
+        return StatusReportAnalysisInputs(
+            request=analysis_request,
+            workspace_options=workspace_options,
+            cache_key=cache_key,
+            cached_payload=load_cached_response(self.db, cache_key),
+        )
+
+    def process_report(
+        self,
+        report: models.StatusReport,
+        *,
+        max_cards: int = _MAX_GENERATED_CARDS,
+        inputs: StatusReportAnalysisInputs | None = None,
+    ) -> StatusReportProcessResult:
+        """Run the AI analysis for a started report and record the outcome.
+
+        ``inputs`` from :meth:`prepare_analysis` let the caller end its read
+        transaction first; the Gemini call itself does not use the database.
+        """
+
+        if inputs is None:
+            inputs = self.prepare_analysis(report, max_cards=max_cards)
+        cached_payload = inputs.cached_payload
+
         proposals: list[schemas.AnalysisCard] = []
         error_message: str | None = None
         analysis_warnings: list[str] = []
 
-        workspace_options = build_workspace_analysis_options(self.db, owner_id=report.owner_id)
-
         try:
-            response = self.analyzer.analyze(
-                schemas.AnalysisRequest(text=analysis_text, max_cards=max_cards),
-                workspace_options=workspace_options,
-            )
+            if cached_payload is not None:
+                response = schemas.AnalysisResponse.model_validate(cached_payload).model_copy(update={"cached": True})
+            else:
+                response = self.analyzer.analyze(inputs.request, workspace_options=inputs.workspace_options)
+                store_cached_response(self.db, inputs.cache_key, response.model_dump(mode="json"), model=response.model)
         except GeminiError as exc:
             error_message = str(exc)
         else:
@@ -230,26 +307,17 @@ class StatusReportService:
             analysis_warnings = [str(item) for item in (response.warnings or []) if isinstance(item, str) and item]
 
         if error_message:
-            report.status = schemas.StatusReportStatus.FAILED.value
-            report.analysis_completed_at = datetime.now(timezone.utc)
-            report.failure_reason = error_message
-            self._update_processing_meta(
+            self.fail_analysis(
                 report,
-                last_error=error_message,
+                error_message,
                 ai_warnings=analysis_warnings,
                 ai_requested_model=getattr(self.analyzer, "requested_model", None),
                 ai_used_model=report.analysis_model,
             )
-            self._record_event(
-                report,
-                schemas.StatusReportEventType.ANALYSIS_FAILED,
-                {"message": error_message},
-            )
-            self.db.flush()
             detail = self.to_detail(report)
             return StatusReportProcessResult(detail=detail, proposals=[], destroyed=False, error=error_message)
 
-        stored_proposals = proposals[:max_cards]
+        stored_proposals = proposals[: inputs.request.max_cards]
         self._update_processing_meta(
             report,
             proposals=[proposal.model_dump() for proposal in stored_proposals],
@@ -258,6 +326,7 @@ class StatusReportService:
             ai_warnings=analysis_warnings,
             ai_requested_model=getattr(self.analyzer, "requested_model", None),
             ai_used_model=report.analysis_model,
+            ai_cached=cached_payload is not None,
         )
         report.status = schemas.StatusReportStatus.COMPLETED.value
         report.analysis_completed_at = datetime.now(timezone.utc)
@@ -281,6 +350,37 @@ class StatusReportService:
             error=None,
         )
 
+    def fail_analysis(self, report: models.StatusReport, message: str, **meta: Any) -> None:
+        """Mark the analysis of ``report`` as failed with ``message``."""
+
+        report.status = schemas.StatusReportStatus.FAILED.value
+        report.analysis_completed_at = datetime.now(timezone.utc)
+        report.failure_reason = message
+        self._update_processing_meta(report, last_error=message, **meta)
+        self._record_event(
+            report,
+            schemas.StatusReportEventType.ANALYSIS_FAILED,
+            {"message": message},
+        )
+        self.db.flush()
+
+    def _build_analysis_inputs(
+        self,
+        report: models.StatusReport,
+        max_cards: int,
+    ) -> tuple[schemas.AnalysisRequest, AnalysisWorkspaceOptions, str | None]:
+        sections = self.content_service.extract_sections(report)
+        analysis_text = self.content_service.compose_analysis_prompt(report, sections)
+        analysis_request = schemas.AnalysisRequest(text=analysis_text, max_cards=max_cards)
+        workspace_options = build_workspace_analysis_options(self.db, owner_id=report.owner_id)
+        cache_key = analysis_response_cache_key(
+            self.analyzer,
+            CACHE_ENDPOINT_STATUS_REPORT,
+            analysis_request,
+            workspace_options=workspace_options,
+        )
+        return analysis_request, workspace_options, cache_key
+
     # ------------------------------------------------------------------
     # Serialization helpers
     # ------------------------------------------------------------------
@@ -6,12 +6,13 @@ import base64
 import binascii
 import hashlib
 from dataclasses import dataclass
-from typing import Optional
-
-from cryptography.fernet import Fernet, InvalidToken
+from typing import TYPE_CHECKING, Optional
 
 from ..config import DEFAULT_SECRET_ENCRYPTION_KEY
 
+if TYPE_CHECKING:  # pragma: no cover - imported lazily to keep cold starts fast
+    from cryptography.fernet import Fernet
+
 
 class SecretDecryptionError(RuntimeError):
     """Raised when a stored payload cannot be decrypted."""
@@ -34,6 +35,8 @@ class SecretCipher:
         self._legacy_key_bytes: Optional[bytes]
         self._fernet: Optional[Fernet]
         if key:
+            from cryptography.fernet import Fernet
+
             digest = hashlib.sha256(key.encode("utf-8")).digest()
             self._legacy_key_bytes = digest
             derived = base64.urlsafe_b64encode(digest)
@@ -58,6 +61,8 @@ class SecretCipher:
             return SecretDecryptionResult(plaintext="")
 
         if self._fernet and payload.startswith(self._PREFIX):
+            from cryptography.fernet import InvalidToken
+
             token = payload[len(self._PREFIX) :]
             try:
                 plaintext_bytes = self._fernet.decrypt(token.encode("ascii"))
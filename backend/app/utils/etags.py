@@ -0,0 +1,44 @@
+"""Strong ETags and ``If-None-Match`` handling for polled list endpoints."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Mapping
+
+from fastapi import Request, Response, status
+
+# Part of every tag. Bump it when a list response changes shape, so clients
+# holding tags from the previous release refetch instead of getting a 304.
+_REPRESENTATION_VERSION = "1"
+
+
+def compute_etag(request: Request, versions: Mapping[str, int]) -> str:
+    """Strong ETag for ``request`` given the change counters its response depends on."""
+
+    digest = hashlib.sha256()
+    digest.update(f"{_REPRESENTATION_VERSION}\n{request.url.path}?{request.url.query}\n".encode())
+    for scope in sorted(versions):
+        digest.update(f"{scope}={versions[scope]}\n".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` lists ``etag`` (weak comparison, per RFC 9110)."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    # ``no-cache`` lets browsers store the body but makes them revalidate every time.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+
+
+__all__ = ["compute_etag", "etag_headers", "etag_matches", "not_modified_response"]
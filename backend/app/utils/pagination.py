@@ -0,0 +1,67 @@
+"""Keyset (cursor) pagination helpers."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, identifier: str) -> str:
+    """Return an opaque cursor that points just past ``(created_at, identifier)``."""
+
+    raw = json.dumps([created_at.isoformat(), identifier], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Parse a cursor produced by :func:`encode_cursor` or raise HTTP 400."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, identifier = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(identifier)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.") from exc
+
+
+def apply_keyset(
+    query: Query,
+    created_column: Any,
+    id_column: Any,
+    cursor: str | None,
+    *,
+    descending: bool = True,
+) -> Query:
+    """Order ``query`` by ``(created_column, id_column)`` and skip past ``cursor``.
+
+    Pages run newest-first by default. Pass ``descending=False`` for oldest-first.
+    """
+
+    if cursor:
+        created_at, identifier = decode_cursor(cursor)
+        if descending:
+            after_cursor = or_(
+                created_column < created_at,
+                and_(created_column == created_at, id_column < identifier),
+            )
+        else:
+            after_cursor = or_(
+                created_column > created_at,
+                and_(created_column == created_at, id_column > identifier),
+            )
+        query = query.filter(after_cursor)
+    if descending:
+        return query.order_by(created_column.desc(), id_column.desc())
+    return query.order_by(created_column.asc(), id_column.asc())
+
+
+__all__ = ["NEXT_CURSOR_HEADER", "apply_keyset", "decode_cursor", "encode_cursor"]
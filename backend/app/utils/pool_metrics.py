@@ -0,0 +1,101 @@
+"""Connection pool checkout accounting.
+
+:class:`TimedQueuePool` and :class:`TimedNullPool` measure how long each
+checkout takes. For a ``QueuePool`` that is the time spent waiting for a free
+connection, or opening a new one when the pool has room to grow. For a
+``NullPool`` every checkout opens a connection, so it is the connect time (TLS
+handshake included). :func:`pool_snapshot` combines these timings with the
+pool's in-use counts.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+_STATS_LOCK = threading.Lock()
+_STATS_ATTRIBUTE = "_checkout_stats"
+
+
+@dataclass
+class CheckoutStats:
+    checkouts: int = 0
+    in_use: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class _CheckoutTimingMixin:
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        connection = super()._do_get()  # type: ignore[misc]
+        elapsed = time.perf_counter() - started
+        stats = checkout_stats(self)  # type: ignore[arg-type]
+        with _STATS_LOCK:
+            stats.checkouts += 1
+            stats.in_use += 1
+            stats.total_wait_seconds += elapsed
+            stats.max_wait_seconds = max(stats.max_wait_seconds, elapsed)
+        return connection
+
+    def _do_return_conn(self, record: Any) -> None:
+        try:
+            super()._do_return_conn(record)  # type: ignore[misc]
+        finally:
+            stats = checkout_stats(self)  # type: ignore[arg-type]
+            with _STATS_LOCK:
+                stats.in_use = max(stats.in_use - 1, 0)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(_CheckoutTimingMixin, NullPool):
+    pass
+
+
+def checkout_stats(pool: Pool) -> CheckoutStats:
+    """Counters for ``pool``; pools that are not timed report zeros."""
+
+    with _STATS_LOCK:
+        return pool.__dict__.setdefault(_STATS_ATTRIBUTE, CheckoutStats())
+
+
+def pool_snapshot(engine: Engine) -> dict[str, Any]:
+    pool = engine.pool
+    stats = checkout_stats(pool)
+    with _STATS_LOCK:
+        checkouts = stats.checkouts
+        in_use = stats.in_use
+        total_wait = stats.total_wait_seconds
+        max_wait = stats.max_wait_seconds
+
+    snapshot: dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "checked_out": in_use,
+        "checkouts": checkouts,
+        "checkout_wait_ms_total": round(total_wait * 1000.0, 3),
+        "checkout_wait_ms_avg": round(total_wait * 1000.0 / checkouts, 3) if checkouts else 0.0,
+        "checkout_wait_ms_max": round(max_wait * 1000.0, 3),
+        "size": None,
+        "checked_in": None,
+        "overflow": None,
+    }
+    if isinstance(pool, QueuePool):
+        snapshot.update(size=pool.size(), checked_in=pool.checkedin(), overflow=pool.overflow())
+    return snapshot
+
+
+__all__ = [
+    "CheckoutStats",
+    "TimedNullPool",
+    "TimedQueuePool",
+    "checkout_stats",
+    "pool_snapshot",
+]
@@ -0,0 +1,469 @@
+"""Daily quota counters with optional write-behind persistence.
+
+``QUOTA_ENGINE_MODE=sync`` (the default) reserves every slot with one upsert
+of the ``daily_*_quotas`` row (see :mod:`app.utils.quota_ledger`) inside the
+caller's transaction. That is strict across any number of processes and hosts, and it
+is the only safe choice for serverless deployments that freeze idle
+instances.
+
+``memory`` and ``shared`` take reservations off the database:
+
+* ``memory`` keeps one counter per (quota, owner, day) in this process.
+* ``shared`` keeps the counters in a local SQLite file so every worker process
+  on the host draws from the same counters. ``BEGIN IMMEDIATE`` serves as the
+  cross-process lock.
+
+A counter is seeded from its persisted row the first time it is used, in the
+same locked step as the reservation. A
+:class:`QuotaFlusher` thread adds the pending increments to the database rows
+every ``QUOTA_FLUSH_INTERVAL_SECONDS`` and adopts the persisted totals, which
+brings in reservations made by other hosts. Counters left idle for a whole
+interval are evicted and reseeded on their next use.
+
+A reservation is held in ``session.info`` of the caller's session until its
+transaction ends. If that transaction does not commit (rollback, or the
+session is closed), the slot is released again, like the ``sync`` upsert would
+be rolled back. A release that arrives after its increment was flushed is
+written back as a negative increment.
+
+Guarantees: a single counter tier (one process in ``memory`` mode, one host in
+``shared`` mode) never grants more than the limit. Separate tiers may overshoot
+by the reservations the other tiers made during roughly the last two flush
+intervals. A crash loses at most one interval of increments, which
+under-counts and never over-counts. Write-behind only engages while the
+flusher is running. Without it (CLI scripts, tests without the app lifespan),
+reservations use the ``sync`` path.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Protocol
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from ..config import settings
+from .quota_ledger import QuotaCounter, add_to_persisted_count, load_persisted_count
+
+logger = logging.getLogger(__name__)
+
+_SHARED_STORE_FILENAME = "verbalize-quota-counters.sqlite3"
+_HELD_KEY = "quota_engine.held"
+_ROW_MATCH = "counter_table = ? AND owner_id = ? AND quota_day = ? AND quota_key = ?"
+
+
+class CounterStore(Protocol):
+    """Counter tier behind write-behind reservations.
+
+    ``try_reserve`` and ``release`` return ``None``/``False`` for a counter the
+    store does not track yet. Callers then retry with ``seed`` set to the
+    persisted count, which the store applies only if the counter is still
+    missing, in the same locked step.
+
+    ``give_back`` returns the increments of a failed flush. If a counter was
+    evicted meanwhile, its increments are kept as pending on an untracked
+    counter, which the next ``seed`` completes.
+    """
+
+    def try_reserve(self, counter: QuotaCounter, limit: int, *, seed: int | None = None) -> bool | None: ...
+
+    def release(self, counter: QuotaCounter, *, seed: int | None = None) -> bool: ...
+
+    def usage(self, counter: QuotaCounter) -> int | None: ...
+
+    def discard(self, counter: QuotaCounter) -> None: ...
+
+    def take_pending(self) -> dict[QuotaCounter, int]: ...
+
+    def give_back(self, pending: dict[QuotaCounter, int]) -> None: ...
+
+    def adopt_persisted(self, counter: QuotaCounter, persisted: int) -> None: ...
+
+
+@dataclass
+class _Entry:
+    # ``None`` until seeded: the entry only holds increments handed back by a failed flush.
+    base: int | None
+    pending: int = 0
+    active: bool = True
+
+
+class LocalCounterStore:
+    """Counters held in this process, guarded by one lock."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[QuotaCounter, _Entry] = {}
+
+    def _entry(self, counter: QuotaCounter, seed: int | None) -> _Entry | None:
+        entry = self._entries.get(counter)
+        if entry is None or entry.base is None:
+            if seed is None:
+                return None
+            if entry is None:
+                entry = self._entries[counter] = _Entry(base=seed)
+            entry.base = seed
+        return entry
+
+    def try_reserve(self, counter: QuotaCounter, limit: int, *, seed: int | None = None) -> bool | None:
+        with self._lock:
+            entry = self._entry(counter, seed)
+            if entry is None:
+                return None
+            entry.active = True
+            if entry.base + entry.pending >= limit:
+                return False
+            entry.pending += 1
+            return True
+
+    def release(self, counter: QuotaCounter, *, seed: int | None = None) -> bool:
+        with self._lock:
+            entry = self._entry(counter, seed)
+            if entry is None:
+                return False
+            entry.active = True
+            entry.pending -= 1
+            return True
+
+    def usage(self, counter: QuotaCounter) -> int | None:
+        with self._lock:
+            entry = self._entries.get(counter)
+            return None if entry is None or entry.base is None else entry.base + entry.pending
+
+    def discard(self, counter: QuotaCounter) -> None:
+        with self._lock:
+            self._entries.pop(counter, None)
+
+    def take_pending(self) -> dict[QuotaCounter, int]:
+        with self._lock:
+            pending: dict[QuotaCounter, int] = {}
+            for counter, entry in list(self._entries.items()):
+                if entry.pending:
+                    pending[counter] = entry.pending
+                if entry.base is None or not entry.active:
+                    del self._entries[counter]
+                    continue
+                entry.base += entry.pending
+                entry.pending = 0
+                entry.active = False
+            return pending
+
+    def give_back(self, pending: dict[QuotaCounter, int]) -> None:
+        with self._lock:
+            for counter, delta in pending.items():
+                entry = self._entries.get(counter)
+                if entry is None:
+                    self._entries[counter] = _Entry(base=None, pending=delta)
+                    continue
+                if entry.base is not None:
+                    entry.base -= delta
+                entry.pending += delta
+                entry.active = True
+
+    def adopt_persisted(self, counter: QuotaCounter, persisted: int) -> None:
+        with self._lock:
+            entry = self._entries.get(counter)
+            if entry is not None and entry.base is not None:
+                entry.base = max(entry.base, persisted)
+
+
+class SharedCounterStore:
+    """Counters in a SQLite file shared by the worker processes of one host."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota_counters ("
+                " counter_table TEXT NOT NULL, owner_id TEXT NOT NULL, quota_day TEXT NOT NULL,"
+                " quota_key TEXT NOT NULL, base INTEGER, pending INTEGER NOT NULL DEFAULT 0,"
+                " active INTEGER NOT NULL DEFAULT 1,"
+                " PRIMARY KEY (counter_table, owner_id, quota_day, quota_key))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _key(counter: QuotaCounter) -> tuple[str, str, str, str]:
+        return (counter.table, counter.owner_id, counter.quota_day.isoformat(), counter.quota_key)
+
+    def _seed(self, conn: sqlite3.Connection, counter: QuotaCounter, seed: int | None) -> None:
+        if seed is not None:
+            conn.execute(
+                "INSERT INTO quota_counters (counter_table, owner_id, quota_day, quota_key, base)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (counter_table, owner_id, quota_day, quota_key)"
+                " DO UPDATE SET base = excluded.base WHERE base IS NULL",
+                (*self._key(counter), seed),
+            )
+
+    def try_reserve(self, counter: QuotaCounter, limit: int, *, seed: int | None = None) -> bool | None:
+        with self._transaction() as conn:
+            self._seed(conn, counter, seed)
+            result = conn.execute(
+                "UPDATE quota_counters SET pending = pending + 1, active = 1"  # noqa: S608 - constant _ROW_MATCH
+                f" WHERE {_ROW_MATCH} AND base + pending < ?",
+                (*self._key(counter), limit),
+            )
+            if result.rowcount:
+                return True
+            result = conn.execute(
+                "UPDATE quota_counters SET active = 1"  # noqa: S608 - constant _ROW_MATCH
+                f" WHERE {_ROW_MATCH} AND base IS NOT NULL",
+                self._key(counter),
+            )
+            return False if result.rowcount else None
+
+    def release(self, counter: QuotaCounter, *, seed: int | None = None) -> bool:
+        with self._transaction() as conn:
+            self._seed(conn, counter, seed)
+            result = conn.execute(
+                "UPDATE quota_counters SET pending = pending - 1, active = 1"  # noqa: S608 - constant _ROW_MATCH
+                f" WHERE {_ROW_MATCH} AND base IS NOT NULL",
+                self._key(counter),
+            )
+            return bool(result.rowcount)
+
+    def usage(self, counter: QuotaCounter) -> int | None:
+        query = f"SELECT base + pending FROM quota_counters WHERE {_ROW_MATCH}"  # noqa: S608 - constant _ROW_MATCH
+        row = self._connection().execute(query, self._key(counter)).fetchone()
+        return None if row is None or row[0] is None else int(row[0])
+
+    def discard(self, counter: QuotaCounter) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                f"DELETE FROM quota_counters WHERE {_ROW_MATCH}",  # noqa: S608 - constant _ROW_MATCH
+                self._key(counter),
+            )
+
+    def take_pending(self) -> dict[QuotaCounter, int]:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM quota_counters WHERE active = 0 AND pending = 0")
+            rows = conn.execute(
+                "SELECT counter_table, owner_id, quota_day, quota_key, pending FROM quota_counters WHERE pending != 0"
+            ).fetchall()
+            conn.execute("DELETE FROM quota_counters WHERE base IS NULL")
+            conn.execute("UPDATE quota_counters SET base = base + pending, pending = 0, active = 0")
+        return {
+            QuotaCounter(table, owner_id, date.fromisoformat(quota_day), quota_key): int(delta)
+            for table, owner_id, quota_day, quota_key, delta in rows
+        }
+
+    def give_back(self, pending: dict[QuotaCounter, int]) -> None:
+        with self._transaction() as conn:
+            for counter, delta in pending.items():
+                # An evicted counter comes back with a NULL base, so the next use seeds it.
+                conn.execute(
+                    "INSERT INTO quota_counters (counter_table, owner_id, quota_day, quota_key, base, pending)"
+                    " VALUES (?, ?, ?, ?, NULL, ?)"
+                    " ON CONFLICT (counter_table, owner_id, quota_day, quota_key)"
+                    " DO UPDATE SET base = base - excluded.pending, pending = pending + excluded.pending, active = 1",
+                    (*self._key(counter), delta),
+                )
+
+    def adopt_persisted(self, counter: QuotaCounter, persisted: int) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                f"UPDATE quota_counters SET base = MAX(base, ?) WHERE {_ROW_MATCH}",  # noqa: S608 - constant _ROW_MATCH
+                (persisted, *self._key(counter)),
+            )
+
+
+class QuotaFlusher:
+    """Thread that writes pending counter increments back to the quota tables."""
+
+    def __init__(self, bind: Engine | Connection, store: CounterStore, *, interval: float) -> None:
+        self.bind = bind
+        self.store = store
+        self._interval = interval
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="quota-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Quota flush failed")
+
+    def flush(self) -> int:
+        """Persist pending increments and return how many counters were written."""
+
+        pending = self.store.take_pending()
+        if not pending:
+            return 0
+        with Session(bind=self.bind, future=True) as db:
+            try:
+                for counter, delta in pending.items():
+                    add_to_persisted_count(db, counter, delta)
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.store.give_back(pending)
+                raise
+            for counter in pending:
+                self.store.adopt_persisted(counter, load_persisted_count(db, counter))
+        return len(pending)
+
+
+_flusher: QuotaFlusher | None = None
+
+
+def _build_store() -> CounterStore:
+    if settings.quota_engine_mode == "shared":
+        path = settings.quota_shared_store_path or os.path.join(tempfile.gettempdir(), _SHARED_STORE_FILENAME)
+        return SharedCounterStore(path)
+    return LocalCounterStore()
+
+
+def get_quota_flusher() -> QuotaFlusher | None:
+    return _flusher
+
+
+def start_quota_flusher(bind: Engine | Connection) -> QuotaFlusher | None:
+    """Enable write-behind reservations unless ``QUOTA_ENGINE_MODE`` is ``sync``."""
+
+    global _flusher
+    if settings.quota_engine_mode == "sync":
+        return None
+    if _flusher is None:
+        _flusher = QuotaFlusher(bind, _build_store(), interval=settings.quota_flush_interval_seconds)
+    _flusher.start()
+    return _flusher
+
+
+def stop_quota_flusher() -> None:
+    """Stop the flusher after writing every pending increment."""
+
+    global _flusher
+    if _flusher is not None:
+        flusher, _flusher = _flusher, None
+        flusher.stop()
+
+
+def _active_store() -> CounterStore | None:
+    flusher = _flusher
+    if flusher is None or not flusher.running:
+        return None
+    return flusher.store
+
+
+def write_behind_enabled() -> bool:
+    return _active_store() is not None
+
+
+def reserve_buffered(db: Session, counter: QuotaCounter, limit: int) -> bool:
+    """Reserve one slot from the counter tier; requires :func:`write_behind_enabled`."""
+
+    store = _active_store()
+    if store is None:
+        raise RuntimeError("The quota flusher is not running.")
+    reserved = store.try_reserve(counter, limit)
+    if reserved is None:
+        reserved = bool(store.try_reserve(counter, limit, seed=load_persisted_count(db, counter)))
+    if reserved:
+        if not db.in_transaction():
+            # The hooks below need a transaction to end; this one holds no database work.
+            db.begin()
+        db.info.setdefault(_HELD_KEY, []).append(counter)
+    return reserved
+
+
+def _release(counter: QuotaCounter) -> None:
+    flusher = _flusher
+    if flusher is None or not flusher.running:
+        return
+    if not flusher.store.release(counter):
+        # Evicted since the reservation, so its increment was already flushed.
+        with Session(bind=flusher.bind, future=True) as db:
+            flusher.store.release(counter, seed=load_persisted_count(db, counter))
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_held_reservations(session: Session) -> None:
+    session.info.pop(_HELD_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_held_reservations(session: Session, transaction: SessionTransaction) -> None:
+    # Also runs after a commit, by which point ``after_commit`` has kept the reservations.
+    if transaction.parent is not None:
+        return
+    for counter in session.info.pop(_HELD_KEY, []):
+        try:
+            _release(counter)
+        except Exception:
+            logger.exception("Releasing a quota reservation failed")
+
+
+def buffered_usage(counter: QuotaCounter) -> int | None:
+    """Current usage including unflushed reservations, or ``None`` when not tracked."""
+
+    store = _active_store()
+    return None if store is None else store.usage(counter)
+
+
+def discard_buffered(counter: QuotaCounter) -> None:
+    store = _active_store()
+    if store is not None:
+        store.discard(counter)
+
+
+__all__ = [
+    "CounterStore",
+    "LocalCounterStore",
+    "QuotaFlusher",
+    "SharedCounterStore",
+    "buffered_usage",
+    "discard_buffered",
+    "get_quota_flusher",
+    "reserve_buffered",
+    "start_quota_flusher",
+    "stop_quota_flusher",
+    "write_behind_enabled",
+]
@@ -0,0 +1,179 @@
+"""Persisted daily quota counters (``daily_ai_quotas``, ``daily_card_quotas``, ``daily_evaluation_quotas``).
+
+On PostgreSQL and SQLite each reservation is one round trip::
+
+    INSERT ... VALUES (..., 1)
+    ON CONFLICT (owner_id, quota_date[, quota_key])
+    DO UPDATE SET used = used + 1 WHERE used < :limit
+    RETURNING used
+
+A fresh row is created with one slot taken. An existing row is only
+incremented while it is under the limit. When no row comes back, the limit has
+been reached. The conflict target is the table's unique constraint, so
+concurrent first reservations serialize on the row and cannot double-insert.
+Other dialects fall back to ``UPDATE`` → ``INSERT`` (in a savepoint) →
+``UPDATE``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+QuotaModel = type[models.DailyAiQuota] | type[models.DailyCardQuota] | type[models.DailyEvaluationQuota]
+
+_QUOTA_MODELS: dict[str, tuple[QuotaModel, str]] = {
+    models.DailyAiQuota.__tablename__: (models.DailyAiQuota, "used_count"),
+    models.DailyCardQuota.__tablename__: (models.DailyCardQuota, "created_count"),
+    models.DailyEvaluationQuota.__tablename__: (models.DailyEvaluationQuota, "executed_count"),
+}
+_UPSERT_DIALECTS = frozenset({"postgresql", "sqlite"})
+
+
+@dataclass(frozen=True)
+class QuotaCounter:
+    """Identifies one persisted daily counter row."""
+
+    table: str
+    owner_id: str
+    quota_day: date
+    quota_key: str = ""
+
+    @classmethod
+    def for_model(
+        cls, quota_model: QuotaModel, *, owner_id: str, quota_day: date, quota_key: str = ""
+    ) -> "QuotaCounter":
+        return cls(quota_model.__tablename__, owner_id, quota_day, quota_key)
+
+    @property
+    def model(self) -> QuotaModel:
+        return _QUOTA_MODELS[self.table][0]
+
+    @property
+    def counter_field(self) -> str:
+        return _QUOTA_MODELS[self.table][1]
+
+    @property
+    def keyed(self) -> bool:
+        return self.model is models.DailyAiQuota
+
+    def row_filter(self) -> list[Any]:
+        model = self.model
+        criteria = [model.owner_id == self.owner_id, model.quota_date == self.quota_day]
+        if self.keyed:
+            criteria.append(model.quota_key == self.quota_key)
+        return criteria
+
+    def row_values(self, count: int) -> dict[str, Any]:
+        values: dict[str, Any] = {
+            "owner_id": self.owner_id,
+            "quota_date": self.quota_day,
+            self.counter_field: count,
+        }
+        if self.keyed:
+            values["quota_key"] = self.quota_key
+        return values
+
+    def conflict_columns(self) -> list[Any]:
+        model = self.model
+        columns = [model.owner_id, model.quota_date]
+        if self.keyed:
+            columns.append(model.quota_key)
+        return columns
+
+
+def _dialect_insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def load_persisted_count(db: Session, counter: QuotaCounter) -> int:
+    column = getattr(counter.model, counter.counter_field)
+    value = db.execute(select(column).where(*counter.row_filter())).scalar_one_or_none()
+    return int(value or 0)
+
+
+def _insert_or_increment(db: Session, counter: QuotaCounter, delta: int, limit: int | None) -> bool:
+    """Portable fallback for dialects without ``ON CONFLICT``."""
+
+    model = counter.model
+    column = getattr(model, counter.counter_field)
+    criteria = counter.row_filter()
+    if limit is not None:
+        criteria.append(column < limit)
+    increment = update(model).where(*criteria).values({counter.counter_field: column + delta})
+    if db.execute(increment).rowcount:
+        return True
+
+    # A savepoint keeps a lost insert race from discarding the caller's pending work.
+    try:
+        with db.begin_nested():
+            db.execute(insert(model).values(**counter.row_values(delta)))
+    except IntegrityError:
+        return bool(db.execute(increment).rowcount)
+    return True
+
+
+def reserve_slot(db: Session, counter: QuotaCounter, limit: int) -> bool:
+    """Take one slot from ``counter`` unless it already reached ``limit`` (``limit <= 0`` is unlimited)."""
+
+    if limit <= 0:
+        return True
+
+    dialect_insert = _dialect_insert(db)
+    if dialect_insert is None:
+        return _insert_or_increment(db, counter, 1, limit)
+
+    column = getattr(counter.model, counter.counter_field)
+    statement = (
+        dialect_insert(counter.model)
+        .values(**counter.row_values(1))
+        .on_conflict_do_update(
+            index_elements=counter.conflict_columns(),
+            set_={counter.counter_field: column + 1},
+            where=column < limit,
+        )
+        .returning(column)
+    )
+    return db.execute(statement).scalar_one_or_none() is not None
+
+
+def add_to_persisted_count(db: Session, counter: QuotaCounter, delta: int) -> None:
+    """Add ``delta`` to the counter row without a limit check, creating the row when missing."""
+
+    dialect_insert = _dialect_insert(db)
+    if dialect_insert is None:
+        _insert_or_increment(db, counter, delta, None)
+        return
+
+    column = getattr(counter.model, counter.counter_field)
+    db.execute(
+        dialect_insert(counter.model)
+        .values(**counter.row_values(delta))
+        .on_conflict_do_update(
+            index_elements=counter.conflict_columns(),
+            set_={counter.counter_field: column + delta},
+        )
+    )
+
+
+__all__ = [
+    "QuotaCounter",
+    "QuotaModel",
+    "add_to_persisted_count",
+    "load_persisted_count",
+    "reserve_slot",
+]
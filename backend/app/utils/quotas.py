@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
 from datetime import date
+from typing import Any
 
-from sqlalchemy import insert, select, update
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event, update
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..config import settings
+from .quota_engine import buffered_usage, discard_buffered, reserve_buffered, write_behind_enabled
+from .quota_ledger import QuotaCounter, load_persisted_count, reserve_slot
 
 DEFAULT_CARD_DAILY_LIMIT = 25
 DEFAULT_EVALUATION_DAILY_LIMIT = 3
@@ -26,6 +33,11 @@ AI_QUOTA_IMMUNITY_MAP_CANDIDATES = "immunity_map_candidates"
 AI_QUOTA_APPEAL = "appeal_generation"
 AI_QUOTA_AUTO_CARD = "auto_card"
 
+_OVERRIDE_BATCH_SIZE = 500
+_QUOTA_CHANGES_KEY = "quota_limit_changes"
+_LIMITS_CACHE_LOCK = threading.Lock()
+_LIMITS_CACHE: dict[str, tuple[float, "EffectiveLimits"]] = {}
+
 
 def _coerce_limit(limit: int) -> int:
     """Return the provided limit clamped to a non-negative integer."""
@@ -42,29 +54,6 @@ def _normalize_override_value(limit: int | None) -> int | None:
     return _coerce_limit(limit)
 
 
-def _resolve_limit(
-    db: Session,
-    user_id: str,
-    *,
-    override_field: str,
-    default_field: str,
-    default_fallback: int,
-) -> int:
-    """Resolve the effective limit for the given user and quota field."""
-
-    override = db.query(models.UserQuotaOverride).filter_by(user_id=user_id).one_or_none()
-    if override is not None:
-        override_value = getattr(override, override_field)
-        if override_value is not None:
-            return _coerce_limit(override_value)
-
-    defaults = _ensure_defaults(db)
-    default_value = getattr(defaults, default_field)
-    if default_value is None:
-        default_value = default_fallback
-    return _coerce_limit(default_value)
-
-
 def _ensure_defaults(db: Session) -> models.QuotaDefaults:
     defaults = (
         db.query(models.QuotaDefaults).order_by(models.QuotaDefaults.id.asc()).first()
@@ -87,84 +76,165 @@ def _ensure_defaults(db: Session) -> models.QuotaDefaults:
     return defaults
 
 
+QUOTA_LIMIT_FIELDS: tuple[tuple[str, int], ...] = (
+    ("card_daily_limit", DEFAULT_CARD_DAILY_LIMIT),
+    ("evaluation_daily_limit", DEFAULT_EVALUATION_DAILY_LIMIT),
+    ("analysis_daily_limit", DEFAULT_ANALYSIS_DAILY_LIMIT),
+    ("status_report_daily_limit", DEFAULT_STATUS_REPORT_DAILY_LIMIT),
+    ("immunity_map_daily_limit", DEFAULT_IMMUNITY_MAP_DAILY_LIMIT),
+    ("immunity_map_candidate_daily_limit", DEFAULT_IMMUNITY_MAP_CANDIDATE_DAILY_LIMIT),
+    ("appeal_daily_limit", DEFAULT_APPEAL_DAILY_LIMIT),
+    ("auto_card_daily_limit", DEFAULT_AUTO_CARD_DAILY_LIMIT),
+)
+
+
+@dataclass(frozen=True)
+class EffectiveLimits:
+    """Every daily limit that applies to one user after overrides."""
+
+    card_daily_limit: int
+    evaluation_daily_limit: int
+    analysis_daily_limit: int
+    status_report_daily_limit: int
+    immunity_map_daily_limit: int
+    immunity_map_candidate_daily_limit: int
+    appeal_daily_limit: int
+    auto_card_daily_limit: int
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def _effective_limits(
+    defaults: models.QuotaDefaults,
+    override: models.UserQuotaOverride | None,
+) -> EffectiveLimits:
+    values: dict[str, int] = {}
+    for field, fallback in QUOTA_LIMIT_FIELDS:
+        value = getattr(override, field) if override is not None else None
+        if value is None:
+            value = getattr(defaults, field)
+        if value is None:
+            value = fallback
+        values[field] = _coerce_limit(value)
+    return EffectiveLimits(**values)
+
+
+def resolve_effective_limits(db: Session, user_ids: Iterable[str]) -> dict[str, EffectiveLimits]:
+    """Resolve every limit for ``user_ids`` with one defaults lookup and batched override reads."""
+
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+
+    defaults = _ensure_defaults(db)
+    overrides: dict[str, models.UserQuotaOverride] = {}
+    for start in range(0, len(ids), _OVERRIDE_BATCH_SIZE):
+        batch = ids[start : start + _OVERRIDE_BATCH_SIZE]
+        for override in db.query(models.UserQuotaOverride).filter(models.UserQuotaOverride.user_id.in_(batch)):
+            overrides[override.user_id] = override
+    return {user_id: _effective_limits(defaults, overrides.get(user_id)) for user_id in ids}
+
+
+def invalidate_effective_limits_cache(user_id: str | None = None) -> None:
+    """Drop cached limits for ``user_id``, or for everyone when omitted."""
+
+    with _LIMITS_CACHE_LOCK:
+        if user_id is None:
+            _LIMITS_CACHE.clear()
+        else:
+            _LIMITS_CACHE.pop(user_id, None)
+
+
+def get_effective_limits(db: Session, user_id: str) -> EffectiveLimits:
+    """Return the user's limits, served from a short-lived per-process cache.
+
+    Quota writes through the ORM invalidate the cache on commit. Writes from
+    other processes become visible after ``QUOTA_LIMITS_CACHE_TTL_SECONDS``.
+    """
+
+    ttl = settings.quota_limits_cache_ttl_seconds
+    now = time.monotonic()
+    if ttl > 0:
+        with _LIMITS_CACHE_LOCK:
+            cached = _LIMITS_CACHE.get(user_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+    limits = resolve_effective_limits(db, [user_id])[user_id]
+    if ttl > 0:
+        with _LIMITS_CACHE_LOCK:
+            _LIMITS_CACHE[user_id] = (now + ttl, limits)
+    return limits
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_quota_changes(session: Session, flush_context: Any) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, models.QuotaDefaults):
+            session.info[_QUOTA_CHANGES_KEY] = None
+            return
+        if isinstance(instance, models.UserQuotaOverride):
+            changes = session.info.setdefault(_QUOTA_CHANGES_KEY, set())
+            if changes is not None:
+                changes.add(instance.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_quota_changes(session: Session) -> None:
+    if _QUOTA_CHANGES_KEY not in session.info:
+        return
+    changes = session.info.pop(_QUOTA_CHANGES_KEY)
+    if changes is None:
+        invalidate_effective_limits_cache()
+        return
+    for user_id in changes:
+        invalidate_effective_limits_cache(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_quota_changes(session: Session) -> None:
+    session.info.pop(_QUOTA_CHANGES_KEY, None)
+
+
 def get_card_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="card_daily_limit",
-        default_field="card_daily_limit",
-        default_fallback=DEFAULT_CARD_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).card_daily_limit
 
 
 def get_evaluation_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="evaluation_daily_limit",
-        default_field="evaluation_daily_limit",
-        default_fallback=DEFAULT_EVALUATION_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).evaluation_daily_limit
 
 
 def get_analysis_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="analysis_daily_limit",
-        default_field="analysis_daily_limit",
-        default_fallback=DEFAULT_ANALYSIS_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).analysis_daily_limit
 
 
 def get_status_report_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="status_report_daily_limit",
-        default_field="status_report_daily_limit",
-        default_fallback=DEFAULT_STATUS_REPORT_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).status_report_daily_limit
 
 
 def get_immunity_map_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="immunity_map_daily_limit",
-        default_field="immunity_map_daily_limit",
-        default_fallback=DEFAULT_IMMUNITY_MAP_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).immunity_map_daily_limit
 
 
 def get_immunity_map_candidate_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="immunity_map_candidate_daily_limit",
-        default_field="immunity_map_candidate_daily_limit",
-        default_fallback=DEFAULT_IMMUNITY_MAP_CANDIDATE_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).immunity_map_candidate_daily_limit
 
 
 def get_appeal_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="appeal_daily_limit",
-        default_field="appeal_daily_limit",
-        default_fallback=DEFAULT_APPEAL_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).appeal_daily_limit
 
 
 def get_auto_card_daily_limit(db: Session, user_id: str) -> int:
-    return _resolve_limit(
-        db,
-        user_id,
-        override_field="auto_card_daily_limit",
-        default_field="auto_card_daily_limit",
-        default_fallback=DEFAULT_AUTO_CARD_DAILY_LIMIT,
-    )
+    return get_effective_limits(db, user_id).auto_card_daily_limit
+
+
+def _reserve(db: Session, counter: QuotaCounter, limit: int) -> bool:
+    if limit <= 0:
+        return True
+    if write_behind_enabled():
+        return reserve_buffered(db, counter, limit)
+    return reserve_slot(db, counter, limit)
 
 
 def reserve_daily_quota(
@@ -174,45 +244,10 @@ def reserve_daily_quota(
     quota_day: date,
     limit: int,
     quota_model: type[models.DailyCardQuota] | type[models.DailyEvaluationQuota],
-    counter_field: str,
 ) -> bool:
     """Attempt to reserve quota entry for the provided owner."""
 
-    if limit <= 0:
-        return True
-
-    counter_column = getattr(quota_model, counter_field)
-
-    def _attempt_increment() -> bool:
-        result = db.execute(
-            update(quota_model)
-            .where(
-                quota_model.owner_id == owner_id,
-                quota_model.quota_date == quota_day,
-                counter_column < limit,
-            )
-            .values({counter_field: counter_column + 1})
-        )
-        return bool(result.rowcount)
-
-    if _attempt_increment():
-        return True
-
-    insert_stmt = insert(quota_model).values(
-        owner_id=owner_id,
-        quota_date=quota_day,
-        **{counter_field: 1},
-    )
-
-    try:
-        insert_result = db.execute(insert_stmt)
-    except IntegrityError:
-        db.rollback()
-    else:
-        if insert_result.rowcount:
-            return True
-
-    return _attempt_increment()
+    return _reserve(db, QuotaCounter.for_model(quota_model, owner_id=owner_id, quota_day=quota_day), limit)
 
 
 def reserve_ai_quota(
@@ -225,41 +260,8 @@ def reserve_ai_quota(
 ) -> bool:
     """Reserve one slot from the user's daily AI quota."""
 
-    if limit <= 0:
-        return True
-
-    def _attempt_increment() -> bool:
-        result = db.execute(
-            update(models.DailyAiQuota)
-            .where(
-                models.DailyAiQuota.owner_id == owner_id,
-                models.DailyAiQuota.quota_date == quota_day,
-                models.DailyAiQuota.quota_key == quota_key,
-                models.DailyAiQuota.used_count < limit,
-            )
-            .values(used_count=models.DailyAiQuota.used_count + 1)
-        )
-        return bool(result.rowcount)
-
-    if _attempt_increment():
-        return True
-
-    insert_stmt = insert(models.DailyAiQuota).values(
-        owner_id=owner_id,
-        quota_date=quota_day,
-        quota_key=quota_key,
-        used_count=1,
-    )
-
-    try:
-        insert_result = db.execute(insert_stmt)
-    except IntegrityError:
-        db.rollback()
-    else:
-        if insert_result.rowcount:
-            return True
-
-    return _attempt_increment()
+    counter = QuotaCounter.for_model(models.DailyAiQuota, owner_id=owner_id, quota_day=quota_day, quota_key=quota_key)
+    return _reserve(db, counter, limit)
 
 
 def reset_daily_quota(
@@ -275,6 +277,7 @@ def reset_daily_quota(
         .where(quota_model.owner_id == owner_id, quota_model.quota_date == quota_day)
         .values({counter_field: 0})
     )
+    discard_buffered(QuotaCounter.for_model(quota_model, owner_id=owner_id, quota_day=quota_day))
 
 
 def get_quota_defaults(db: Session) -> models.QuotaDefaults:
@@ -361,15 +364,11 @@ def get_daily_usage(
     owner_id: str,
     quota_day: date,
 ) -> int:
-    result = db.execute(
-        select(getattr(quota_model, "created_count", getattr(quota_model, "executed_count", 0))).where(
-            quota_model.owner_id == owner_id,
-            quota_model.quota_date == quota_day,
-        )
-    ).scalar_one_or_none()
-    if result is None:
-        return 0
-    return int(result)
+    counter = QuotaCounter.for_model(quota_model, owner_id=owner_id, quota_day=quota_day)
+    pending_usage = buffered_usage(counter)
+    if pending_usage is not None:
+        return pending_usage
+    return load_persisted_count(db, counter)
 
 
 __all__ = [
@@ -387,20 +386,25 @@ __all__ = [
     "DEFAULT_IMMUNITY_MAP_CANDIDATE_DAILY_LIMIT",
     "DEFAULT_IMMUNITY_MAP_DAILY_LIMIT",
     "DEFAULT_STATUS_REPORT_DAILY_LIMIT",
+    "QUOTA_LIMIT_FIELDS",
+    "EffectiveLimits",
     "get_analysis_daily_limit",
     "get_appeal_daily_limit",
     "get_auto_card_daily_limit",
     "get_card_daily_limit",
     "get_daily_usage",
+    "get_effective_limits",
     "get_evaluation_daily_limit",
     "get_immunity_map_candidate_daily_limit",
     "get_immunity_map_daily_limit",
     "get_quota_defaults",
     "get_status_report_daily_limit",
     "get_user_quota",
+    "invalidate_effective_limits_cache",
     "reserve_ai_quota",
     "reserve_daily_quota",
     "reset_daily_quota",
+    "resolve_effective_limits",
     "set_quota_defaults",
     "upsert_user_quota",
 ]
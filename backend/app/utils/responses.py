@@ -0,0 +1,23 @@
+"""Response classes shared by routers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` encoded to bytes by pydantic-core.
+
+    Content may hold datetimes and other values Pydantic knows how to dump, so
+    routers can return plain dicts without ``jsonable_encoder`` or a response
+    model pass. The output matches ``model_dump_json`` for the same values.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+__all__ = ["FastJSONResponse"]
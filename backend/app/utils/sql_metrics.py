@@ -0,0 +1,144 @@
+"""Per-request SQL statement accounting.
+
+:func:`instrument_engine` attaches cursor hooks to an engine. While a request
+is being tracked (see :func:`track_sql`, used by the HTTP middleware), every
+statement executed on an instrumented engine adds to that request's
+:class:`SqlMetrics`: the statement count, total database time, and a counter
+of statement fingerprints. A fingerprint that repeats many times within one
+request is the usual sign of an N+1 query.
+
+:func:`capture_sql` records every statement on one engine regardless of
+request context. Tests use it to enforce statement budgets.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))+\s*\)")
+_NUMBER_LITERAL = re.compile(r"\b\d+\b")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_START_TIMES_KEY = "sql_metrics_start_times"
+
+_current_metrics: ContextVar["SqlMetrics | None"] = ContextVar("sql_metrics", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """Collapse literals, ``IN`` placeholder lists and whitespace so repeated queries compare equal."""
+
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class SqlMetrics:
+    statement_count: int = 0
+    total_seconds: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statement_count += 1
+        self.total_seconds += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    @property
+    def total_milliseconds(self) -> float:
+        return self.total_seconds * 1000.0
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints executed at least ``threshold`` times, most frequent first."""
+
+        return [(statement, count) for statement, count in self.fingerprints.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_milliseconds:.2f};desc="{self.statement_count} statements"'
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+    if _current_metrics.get() is not None:
+        conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+    metrics = _current_metrics.get()
+    starts = conn.info.get(_START_TIMES_KEY)
+    if metrics is not None and starts:
+        metrics.record(statement, time.perf_counter() - starts.pop())
+
+
+def _discard_failed_start(context: Any) -> None:
+    connection = context.connection
+    starts = connection.info.get(_START_TIMES_KEY) if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Attach the request-tracking hooks to ``engine`` (idempotent)."""
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _discard_failed_start)
+    return engine
+
+
+@contextmanager
+def track_sql() -> Iterator[SqlMetrics]:
+    """Attribute statements on instrumented engines in this context to a fresh :class:`SqlMetrics`."""
+
+    metrics = SqlMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def capture_sql(engine: Engine) -> Iterator[SqlMetrics]:
+    """Record every statement executed on ``engine`` from any thread until the block exits."""
+
+    metrics = SqlMetrics()
+    start_key = f"{_START_TIMES_KEY}:{id(metrics)}"
+
+    def before(conn: Any, *_: Any) -> None:
+        conn.info.setdefault(start_key, []).append(time.perf_counter())
+
+    def after(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+        starts = conn.info.get(start_key)
+        if starts:
+            metrics.record(statement, time.perf_counter() - starts.pop())
+
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    try:
+        yield metrics
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+        event.remove(engine, "after_cursor_execute", after)
+
+
+__all__ = [
+    "SERVER_TIMING_HEADER",
+    "SqlMetrics",
+    "capture_sql",
+    "fingerprint",
+    "instrument_engine",
+    "track_sql",
+]
@@ -0,0 +1,124 @@
+"""Login throughput and card-list latency while sign-ins burst.
+
+Runs the app in-process on a temporary SQLite database. First it measures
+``GET /cards`` latency with no other traffic. Then it measures the same latency
+while ``--logins`` sign-ins run ``--concurrency`` at a time, and reports the
+login throughput::
+
+    cd backend
+    python -m benchmarks.auth_throughput --logins 200 --concurrency 32 --kdf-workers 2
+
+Raising ``--kdf-workers`` trades card-list latency for login throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+_PASSWORD = "BenchmarkPass123!"  # noqa: S105 - throwaway benchmark account
+
+
+async def _poll_cards(client, headers: dict[str, str], stop: asyncio.Event) -> list[float]:
+    latencies: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/cards/", headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def _login_burst(client, *, logins: int, concurrency: int) -> float:
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        async with limiter:
+            response = await client.post("/auth/login", json={"email": "bench@example.com", "password": _PASSWORD})
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - started
+
+
+def _describe(latencies: list[float]) -> str:
+    if len(latencies) < 2:
+        return f"n={len(latencies)}"
+    quantiles = statistics.quantiles(latencies, n=20)
+    return f"n={len(latencies)} p50={statistics.median(latencies):.1f}ms p95={quantiles[18]:.1f}ms"
+
+
+async def _run(args: argparse.Namespace) -> None:
+    import httpx
+
+    from app.config import settings
+    from app.database import Base, get_engine
+    from app.main import app
+
+    settings.password_hash_workers = args.kdf_workers
+    settings.auth_max_concurrent_requests_per_ip = 0
+    Base.metadata.create_all(get_engine())
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        registered = await client.post(
+            "/auth/register", json={"email": "bench@example.com", "password": _PASSWORD, "nickname": "Bench"}
+        )
+        registered.raise_for_status()
+        login = await client.post("/auth/login", json={"email": "bench@example.com", "password": _PASSWORD})
+        login.raise_for_status()
+        # Sign-ins revoke earlier tokens, so the poller authenticates as a second user.
+        await client.post(
+            "/auth/register", json={"email": "reader@example.com", "password": _PASSWORD, "nickname": "Reader"}
+        )
+        admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        users = (await client.get("/admin/users", headers=admin_headers)).json()
+        reader_id = next(user["id"] for user in users if user["email"] == "reader@example.com")
+        await client.patch(f"/admin/users/{reader_id}", headers=admin_headers, json={"is_active": True})
+        reader = await client.post("/auth/login", json={"email": "reader@example.com", "password": _PASSWORD})
+        reader.raise_for_status()
+        headers = {"Authorization": f"Bearer {reader.json()['access_token']}"}
+        for index in range(args.cards):
+            await client.post("/cards/", headers=headers, json={"title": f"Benchmark card {index}"})
+
+        stop = asyncio.Event()
+        poller = asyncio.create_task(_poll_cards(client, headers, stop))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await poller
+
+        stop = asyncio.Event()
+        poller = asyncio.create_task(_poll_cards(client, headers, stop))
+        elapsed = await _login_burst(client, logins=args.logins, concurrency=args.concurrency)
+        stop.set()
+        under_load = await poller
+
+    print(f"kdf workers={args.kdf_workers} logins={args.logins} concurrency={args.concurrency}")
+    print(f"  login throughput: {args.logins / elapsed:.1f}/s")
+    print(f"  GET /cards idle:       {_describe(baseline)}")
+    print(f"  GET /cards under load: {_describe(under_load)}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--kdf-workers", type=int, default=2)
+    parser.add_argument("--cards", type=int, default=50)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'auth-benchmark.db'}"
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark entry point
+    main()
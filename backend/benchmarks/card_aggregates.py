@@ -0,0 +1,109 @@
+"""Board aggregates: counting a full card list versus ``GET /cards/aggregates``.
+
+Seeds ``--cards`` cards with the :mod:`benchmarks.card_reads` fixture, then
+times the handler work only (no HTTP):
+
+* ``list_and_count``: the ``GET /cards`` projection, followed by the
+  counting a client used to do over the JSON.
+* ``aggregates``: :func:`app.services.card_aggregates.collect_card_aggregates`
+  with the cache disabled.
+* ``aggregates_cached``: the same call answered from the per-channel cache.
+
+::
+
+    cd backend
+    python -m benchmarks.card_aggregates --cards 3000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import Base
+from app.routers.cards import _channel_card_query, _member_channel_ids, _visible_card_query
+from app.services.card_aggregates import collect_card_aggregates, invalidate_card_aggregates_cache
+from app.services.card_reads import project_cards
+from app.utils.responses import FastJSONResponse
+
+from .card_reads import _seed, _time
+
+
+def _list_and_count(session: Session, user_id: str) -> bytes:
+    query = _visible_card_query(session, member_user_id=user_id).order_by(
+        models.Card.created_at.desc(), models.Card.id.desc()
+    )
+    cards = json.loads(FastJSONResponse(project_cards(session, query)).body)
+    counts = {
+        "status": Counter(card["status_id"] for card in cards),
+        "priority": Counter(card["priority"] for card in cards),
+        "label": Counter(label for card in cards for label in card["label_ids"]),
+        "assignee": Counter(assignee for card in cards for assignee in card["assignees"]),
+        "story_points": sum(card["story_points"] or 0 for card in cards),
+    }
+    return json.dumps(counts, default=str).encode("utf-8")
+
+
+def _aggregates(session: Session, user_id: str) -> bytes:
+    channel_ids = _member_channel_ids(session, user_id=user_id)
+    aggregates = collect_card_aggregates(
+        session,
+        channel_ids,
+        lambda subset: _channel_card_query(session, subset),
+        filters_key="",
+    )
+    return FastJSONResponse(aggregates).body
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'card-aggregates.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            user_id = _seed(session, cards=args.cards)[0].id
+
+        def cold(session: Session) -> bytes:
+            settings.card_aggregates_cache_ttl_seconds = 0
+            return _aggregates(session, user_id)
+
+        def cached(session: Session) -> bytes:
+            settings.card_aggregates_cache_ttl_seconds = 60
+            return _aggregates(session, user_id)
+
+        runs: dict[str, Callable[[Session], bytes]] = {
+            "list_and_count": lambda session: _list_and_count(session, user_id),
+            "aggregates": cold,
+            "aggregates_cached": cached,
+        }
+
+        ttl = settings.card_aggregates_cache_ttl_seconds
+        invalidate_card_aggregates_cache()
+        with Session(engine) as session:
+            cached(session)
+        print(f"cards={args.cards} repeat={args.repeat}")
+        try:
+            for name, run in runs.items():
+                samples, size = _time(engine, run, repeat=args.repeat)
+                print(f"  {name:18} {statistics.median(samples):9.2f} ms  ({size} bytes)")
+        finally:
+            settings.card_aggregates_cache_ttl_seconds = ttl
+        engine.dispose()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark entry point
+    main()
@@ -0,0 +1,182 @@
+"""Card read latency: ORM serialization versus the projection read path.
+
+Seeds ``--cards`` cards (with labels, subtasks, a status, an error category and
+an initiative) in a temporary SQLite database. Then it times the three card
+read endpoints both ways, measuring the handler work only (no HTTP):
+
+* ``orm``: the ORM query with eager loading, then ``CardRead`` validation plus
+  display-name copies, then ``model_dump_json``. This is what the endpoints did
+  before :mod:`app.services.card_reads`.
+* ``projection``: :func:`app.services.card_reads.project_cards` rendered by
+  :class:`app.utils.responses.FastJSONResponse`.
+
+::
+
+    cd backend
+    python -m benchmarks.card_reads --cards 3000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app import models, schemas
+from app.database import Base
+from app.routers.cards import _card_query, _serialize_cards, _visible_card_query
+from app.services.card_reads import project_cards
+from app.utils.responses import FastJSONResponse
+
+_CARD_LIST = TypeAdapter(list[schemas.CardRead])
+
+
+def _seed(session: Session, *, cards: int) -> tuple[models.User, str, str]:
+    now = datetime.now(timezone.utc)
+    user = models.User(email="bench@example.com", password_hash="x", nickname="Bench")  # noqa: S106 - never logs in
+    session.add(user)
+    session.flush()
+    channel = models.Channel(name="Bench", owner_user_id=user.id)
+    session.add(channel)
+    session.flush()
+    session.add(models.ChannelMember(channel_id=channel.id, user_id=user.id, role="owner"))
+    status = models.Status(name="Doing", category="in-progress", order=1, owner_id=user.id)
+    category = models.ErrorCategory(name="Timeout", severity_level="high", owner_id=user.id)
+    initiative = models.ImprovementInitiative(name="Stabilize", owner_id=user.id)
+    labels = [models.Label(name=f"label-{index}", owner_id=user.id) for index in range(8)]
+    session.add_all([status, category, initiative, *labels])
+    session.flush()
+    session.add(models.InitiativeProgressLog(initiative_id=initiative.id, notes="Kickoff", timestamp=now))
+
+    first_card_id = ""
+    for index in range(cards):
+        card = models.Card(
+            title=f"Benchmark card {index}",
+            description="Seeded for the card read benchmark.",
+            owner_id=user.id,
+            channel_id=channel.id,
+            status_id=status.id,
+            error_category_id=category.id if index % 3 == 0 else None,
+            initiative_id=initiative.id if index % 2 == 0 else None,
+            assignees=[user.id, "contractor"],
+            custom_fields={"index": index},
+            labels=[labels[index % len(labels)], labels[(index + 3) % len(labels)]],
+            created_at=now - timedelta(seconds=index),
+        )
+        card.subtasks = [
+            models.Subtask(title=f"Step {step}", assignee=user.id, checklist=[{"id": f"c{step}", "label": "check"}])
+            for step in range(3)
+        ]
+        session.add(card)
+        if index == 0:
+            session.flush()
+            first_card_id = card.id
+    session.commit()
+    return user, first_card_id, initiative.id
+
+
+def _orm_list_cards(session: Session, user: models.User) -> bytes:
+    query = _card_query(session, member_user_id=user.id).order_by(models.Card.created_at.desc(), models.Card.id.desc())
+    return _CARD_LIST.dump_json(_serialize_cards(session, query.all()))
+
+
+def _orm_get_card(session: Session, user: models.User, card_id: str) -> bytes:
+    card = _card_query(session, member_user_id=user.id).filter(models.Card.id == card_id).one()
+    return _serialize_cards(session, [card])[0].model_dump_json().encode("utf-8")
+
+
+def _orm_initiative_cards(session: Session, user: models.User, initiative_id: str) -> bytes:
+    cards = (
+        session.query(models.Card)
+        .options(
+            selectinload(models.Card.labels),
+            selectinload(models.Card.subtasks),
+            joinedload(models.Card.status),
+        )
+        .filter(models.Card.initiative_id == initiative_id, models.Card.owner_id == user.id)
+        .order_by(models.Card.created_at.desc())
+        .all()
+    )
+    return _CARD_LIST.dump_json([schemas.CardRead.model_validate(card) for card in cards])
+
+
+def _projection_list_cards(session: Session, user: models.User) -> bytes:
+    query = _visible_card_query(session, member_user_id=user.id).order_by(
+        models.Card.created_at.desc(), models.Card.id.desc()
+    )
+    return FastJSONResponse(project_cards(session, query)).body
+
+
+def _projection_get_card(session: Session, user: models.User, card_id: str) -> bytes:
+    query = _visible_card_query(session, member_user_id=user.id).filter(models.Card.id == card_id).limit(1)
+    return FastJSONResponse(project_cards(session, query)[0]).body
+
+
+def _projection_initiative_cards(session: Session, user: models.User, initiative_id: str) -> bytes:
+    query = (
+        session.query(models.Card)
+        .filter(models.Card.initiative_id == initiative_id, models.Card.owner_id == user.id)
+        .order_by(models.Card.created_at.desc())
+    )
+    return FastJSONResponse(project_cards(session, query, resolve_display_names=False)).body
+
+
+def _time(engine, run: Callable[[Session], bytes], *, repeat: int) -> tuple[list[float], int]:
+    samples: list[float] = []
+    size = 0
+    for _ in range(repeat):
+        # A fresh session per run, as each request gets, so the identity map starts empty.
+        with Session(engine) as session:
+            started = time.perf_counter()
+            size = len(run(session))
+            samples.append((time.perf_counter() - started) * 1000.0)
+    return samples, size
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'card-reads.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            user, card_id, initiative_id = _seed(session, cards=args.cards)
+            user_id = user.id
+
+        def as_user(run: Callable[..., bytes], *extra: str) -> Callable[[Session], bytes]:
+            return lambda session: run(session, session.get(models.User, user_id), *extra)
+
+        endpoints = {
+            "list_cards": (as_user(_orm_list_cards), as_user(_projection_list_cards)),
+            "get_card": (as_user(_orm_get_card, card_id), as_user(_projection_get_card, card_id)),
+            "list_initiative_cards": (
+                as_user(_orm_initiative_cards, initiative_id),
+                as_user(_projection_initiative_cards, initiative_id),
+            ),
+        }
+
+        print(f"cards={args.cards} repeat={args.repeat}")
+        for name, (orm, projection) in endpoints.items():
+            orm_samples, orm_size = _time(engine, orm, repeat=args.repeat)
+            fast_samples, fast_size = _time(engine, projection, repeat=args.repeat)
+            orm_ms = statistics.median(orm_samples)
+            fast_ms = statistics.median(fast_samples)
+            print(f"  {name}")
+            print(f"    orm:        {orm_ms:9.2f} ms  ({orm_size} bytes)")
+            print(f"    projection: {fast_ms:9.2f} ms  ({fast_size} bytes)  {orm_ms / fast_ms:.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark entry point
+    main()
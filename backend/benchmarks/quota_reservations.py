@@ -0,0 +1,125 @@
+"""Round trips per quota reservation under contention.
+
+Compares the single-statement upsert in :mod:`app.utils.quota_ledger` with the
+UPDATE → INSERT → UPDATE sequence it replaced. Each run starts from an empty
+counter and has ``--threads`` workers race for ``--reservations`` slots against
+a limit of ``--limit``::
+
+    cd backend
+    python -m benchmarks.quota_reservations --threads 16 --reservations 400
+    python -m benchmarks.quota_reservations --database-url postgresql+psycopg://...
+
+The database must be disposable: its tables are created and dropped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models
+from app.database import Base
+from app.utils.quota_ledger import QuotaCounter, reserve_slot
+from app.utils.sql_metrics import capture_sql
+
+Strategy = Callable[[Session, QuotaCounter, int], bool]
+
+
+def reserve_update_insert_update(db: Session, counter: QuotaCounter, limit: int) -> bool:
+    """The pre-ledger sequence, kept here only as the comparison baseline."""
+
+    model = models.DailyAiQuota
+
+    def attempt_increment() -> bool:
+        result = db.execute(
+            update(model).where(*counter.row_filter(), model.used_count < limit).values(used_count=model.used_count + 1)
+        )
+        return bool(result.rowcount)
+
+    if attempt_increment():
+        return True
+    try:
+        with db.begin_nested():
+            db.execute(insert(model).values(**counter.row_values(1)))
+    except IntegrityError:
+        return attempt_increment()
+    return True
+
+
+STRATEGIES: dict[str, Strategy] = {
+    "upsert": reserve_slot,
+    "update-insert-update": reserve_update_insert_update,
+}
+
+
+def run(engine: Engine, strategy: Strategy, *, threads: int, reservations: int, limit: int) -> dict[str, float]:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, future=True)
+    with factory() as db:
+        user = models.User(email="benchmark@example.com", password_hash="unused")  # noqa: S106 - placeholder, never verified
+        db.add(user)
+        db.commit()
+        counter = QuotaCounter.for_model(
+            models.DailyAiQuota, owner_id=user.id, quota_day=date.today(), quota_key="benchmark"
+        )
+
+    def reserve(_: int) -> bool:
+        with factory() as db:
+            granted = strategy(db, counter, limit)
+            db.commit()
+            return granted
+
+    started = time.perf_counter()
+    with capture_sql(engine) as metrics, ThreadPoolExecutor(max_workers=threads) as pool:
+        granted = sum(pool.map(reserve, range(reservations)))
+    elapsed = time.perf_counter() - started
+    return {
+        "granted": granted,
+        "statements_per_reservation": metrics.statement_count / reservations,
+        "db_ms_per_reservation": metrics.total_milliseconds / reservations,
+        "wall_ms_per_reservation": elapsed * 1000.0 / reservations,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="Disposable database (default: a temporary SQLite file).")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--reservations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50, help="Daily limit; reservations past it are refused.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        url = args.database_url or f"sqlite:///{Path(workdir) / 'quota-benchmark.db'}"
+        connect_args = {"check_same_thread": False, "timeout": 30} if url.startswith("sqlite") else {}
+        engine = create_engine(url, connect_args=connect_args, pool_size=args.threads, future=True)
+        try:
+            print(
+                f"{engine.dialect.name}: {args.threads} threads, {args.reservations} reservations, limit {args.limit}"
+            )
+            for name, strategy in STRATEGIES.items():
+                result = run(engine, strategy, threads=args.threads, reservations=args.reservations, limit=args.limit)
+                print(
+                    f"{name:>22}: granted={result['granted']:.0f}"
+                    f" statements/reservation={result['statements_per_reservation']:.2f}"
+                    f" db_ms/reservation={result['db_ms_per_reservation']:.3f}"
+                    f" wall_ms/reservation={result['wall_ms_per_reservation']:.3f}"
+                )
+        finally:
+            Base.metadata.drop_all(engine)
+            engine.dispose()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark entry point
+    main()
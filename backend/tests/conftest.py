@@ -28,9 +28,13 @@ if str(BACKEND_DIR) not in sys.path:
 
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
 
+from app.auth import invalidate_session_cache
 from app.config import DEFAULT_SECRET_ENCRYPTION_KEY
 from app.database import Base, get_db
 from app.main import app
+from app.services.gemini import invalidate_gemini_client_cache
+from app.services.response_cache import reset_response_cache
+from app.utils.sql_metrics import instrument_engine
 
 _PYTEST_COV_AVAILABLE = importlib.util.find_spec("pytest_cov") is not None
 
@@ -38,7 +42,9 @@ if TYPE_CHECKING:  # pragma: no cover - import used for type checking only
     from coverage import Coverage
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, future=True)
+engine = instrument_engine(
+    create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, future=True)
+)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
 
@@ -154,6 +160,17 @@ if not _PYTEST_COV_AVAILABLE:
         _emit_reports(cov, reports)
 
 
+@pytest.fixture(autouse=True)
+def _reset_gemini_client_cache() -> Generator[None, None, None]:
+    invalidate_gemini_client_cache()
+    reset_response_cache()
+    invalidate_session_cache()
+    yield
+    invalidate_gemini_client_cache()
+    reset_response_cache()
+    invalidate_session_cache()
+
+
 @pytest.fixture()
 def email_factory() -> Callable[[], str]:
     counter = itertools.count()
@@ -182,6 +199,8 @@ def client(secret_encryption_key: str, monkeypatch: pytest.MonkeyPatch) -> Gener
     Base.metadata.create_all(bind=engine)
 
     monkeypatch.setattr("app.config.settings.debug", True)
+    # Run queued status report analyses as background tasks so tests observe them deterministically.
+    monkeypatch.setattr("app.config.settings.status_report_worker_count", 0)
 
     def override_get_db():
         db = TestingSessionLocal()
@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 from app import models
 from app.config import settings
+from app.services import gemini as gemini_service
 from app.services.gemini import GeminiClient
 from app.utils.secrets import build_secret_hint, get_secret_cipher
 
@@ -176,3 +177,46 @@ def test_competency_level_identifier_is_unique(client: TestClient) -> None:
         json={"value": "advanced", "label": "Advanced", "scale": 5},
     )
     assertions.assertTrue(duplicate.status_code == 409, duplicate.text)
+
+
+def test_updating_credential_invalidates_cached_gemini_client(client: TestClient, monkeypatch) -> None:
+    headers = _admin_headers(client)
+    invalidations: list[bool] = []
+    original = gemini_service.invalidate_gemini_client_cache
+
+    def tracking_invalidate() -> None:
+        invalidations.append(True)
+        original()
+
+    monkeypatch.setattr(
+        "app.routers.admin_settings.invalidate_gemini_client_cache",
+        tracking_invalidate,
+    )
+
+    update = client.put(
+        "/admin/api-credentials/gemini",
+        headers=headers,
+        json={"secret": "sk-rotated", "model": "gemini-1.5-pro"},
+    )
+    assertions.assertTrue(update.status_code == 200, update.text)
+    assertions.assertTrue(len(invalidations) == 1)
+
+    deactivate = client.delete("/admin/api-credentials/gemini", headers=headers)
+    assertions.assertTrue(deactivate.status_code == 204, deactivate.text)
+    assertions.assertTrue(len(invalidations) == 2)
+
+
+def test_database_pool_metrics_require_admin(client: TestClient) -> None:
+    headers = _admin_headers(client)
+
+    metrics = client.get("/admin/metrics/database-pool", headers=headers)
+    assertions.assertTrue(metrics.status_code == 200, metrics.text)
+    payload = metrics.json()
+    assertions.assertEqual(payload["deployment_mode"], settings.deployment_mode)
+    assertions.assertEqual(payload["pool_class"], "QueuePool")
+    assertions.assertIn("checkout_wait_ms_avg", payload)
+
+    member = register_user(client, email="member@example.com", password="MemberPass123!", nickname="Member")  # noqa: S106
+    member_headers = {"Authorization": f"Bearer {member['access_token']}"}
+    forbidden = client.get("/admin/metrics/database-pool", headers=member_headers)
+    assertions.assertEqual(forbidden.status_code, 403)
@@ -7,7 +7,8 @@ from fastapi.testclient import TestClient
 from app import models
 
 from .conftest import TestingSessionLocal
-from .utils.auth import register_user
+from .utils.auth import UNUSED_PASSWORD_HASH, register_user
+from .utils.sql_budget import statement_budget
 
 assertions = TestCase()
 
@@ -201,3 +202,41 @@ def test_admin_can_delete_admin_who_created_api_credentials(client: TestClient)
         stored_credentials = db.query(models.ApiCredential).all()
         assertions.assertTrue(stored_credentials, "expected API credential to persist")
         assertions.assertTrue(all(item.created_by_id is None for item in stored_credentials))
+
+
+def test_list_users_resolves_limits_in_bulk_and_paginates(client: TestClient) -> None:
+    headers, _ = _create_admin(client)
+    with TestingSessionLocal() as db:
+        members = [
+            models.User(email=f"bulk-{index}@example.com", password_hash=UNUSED_PASSWORD_HASH, nickname=f"Bulk {index}")
+            for index in range(30)
+        ]
+        db.add_all(members)
+        db.flush()
+        db.add(models.UserQuotaOverride(user_id=members[3].id, card_daily_limit=7))
+        override_id, plain_id = members[3].id, members[0].id
+        db.commit()
+
+    with statement_budget(8, max_repeats=2):
+        response = client.get("/admin/users", headers=headers)
+    assertions.assertTrue(response.status_code == 200, response.text)
+    users = {user["id"]: user for user in response.json()}
+    assertions.assertTrue(len(users) == 31)
+    assertions.assertTrue(users[override_id]["card_daily_limit"] == 7)
+    assertions.assertTrue(users[override_id]["analysis_daily_limit"] == users[plain_id]["analysis_daily_limit"])
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 12, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/admin/users", params=params, headers=headers)
+        assertions.assertTrue(page.status_code == 200, page.text)
+        seen.extend(user["id"] for user in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assertions.assertTrue(seen == [user["id"] for user in response.json()])
+
+    updated = client.patch(f"/admin/users/{override_id}", json={"card_daily_limit": 9}, headers=headers)
+    assertions.assertTrue(updated.status_code == 200, updated.text)
+    assertions.assertTrue(updated.json()["card_daily_limit"] == 9)
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest import TestCase
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app import models, schemas
+from app.config import settings
 from app.main import app
-from app.services.gemini import GeminiError, GeminiRateLimitError, get_gemini_client
+from app.services.gemini import GeminiClient, GeminiError, GeminiRateLimitError, get_gemini_client
 
 from .conftest import TestingSessionLocal
 from .utils.auth import register_user
@@ -168,6 +171,39 @@ def test_analysis_registers_new_labels(client: TestClient) -> None:
         assertions.assertEqual(data["proposals"][0]["labels"][0], labels[0].id)
 
 
+def test_analysis_warns_about_proposals_matching_existing_cards(client: TestClient) -> None:
+    headers = _register_and_login(client, "analysis-duplicates@example.com")
+    existing = client.post(
+        "/cards",
+        json={"title": "Add login coverage", "summary": "Write regression tests for the login flow."},
+        headers=headers,
+    )
+    assertions.assertEqual(existing.status_code, 201, existing.text)
+
+    response_payload = schemas.AnalysisResponse(
+        model="gemini-pro-test",
+        proposals=[
+            schemas.AnalysisCard(title="Add login coverage", summary="Write regression tests for login flow."),
+            schemas.AnalysisCard(title="Plan the offsite", summary="Book a venue for the team retreat."),
+        ],
+    )
+
+    class StubGemini:
+        def analyze(self, request, *, user_profile=None, workspace_options=None) -> schemas.AnalysisResponse:
+            return response_payload
+
+    app.dependency_overrides[get_gemini_client] = lambda: StubGemini()
+    try:
+        response = client.post("/analysis", json={"text": "Login tests and offsite", "max_cards": 2}, headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_gemini_client, None)
+
+    assertions.assertEqual(response.status_code, 200, response.text)
+    warnings = response.json()["warnings"]
+    assertions.assertEqual(len(warnings), 1)
+    assertions.assertIn("Add login coverage", warnings[0])
+
+
 def test_analysis_records_failure(client: TestClient) -> None:
     headers = _register_and_login(client, "analysis-failure@example.com")
 
@@ -445,3 +481,80 @@ def test_immunity_map_generates_mermaid(client: TestClient) -> None:
     assertions.assertIn(("C1", "F1"), edge_pairs)
     assertions.assertNotIn(("A1", "E1"), edge_pairs)
     assertions.assertNotIn(("B1", "C1"), edge_pairs)
+
+
+def _counting_gemini_client(calls: list[str]) -> GeminiClient:
+    def fake_generate_content(prompt: str, *, generation_config: object, request_options: object = None):
+        calls.append(prompt)
+        payload = {
+            "proposals": [
+                {
+                    "title": "Write release notes",
+                    "summary": "Summarize the sprint changes.",
+                    "status": "todo",
+                    "labels": [],
+                    "priority": "medium",
+                    "subtasks": [],
+                }
+            ]
+        }
+        return SimpleNamespace(text=json.dumps(payload))
+
+    gemini_client = object.__new__(GeminiClient)
+    gemini_client.model = "models/gemini-test"
+    gemini_client._client = SimpleNamespace(generate_content=fake_generate_content)  # type: ignore[attr-defined]
+    return gemini_client
+
+
+def _limit_analysis_quota(email: str, limit: int) -> None:
+    with TestingSessionLocal() as db:
+        user = db.query(models.User).filter(models.User.email == email).one()
+        db.add(models.UserQuotaOverride(user_id=user.id, analysis_daily_limit=limit))
+        db.commit()
+
+
+def test_analysis_serves_repeated_request_from_cache_without_quota(client: TestClient) -> None:
+    email = "analysis-cache@example.com"
+    headers = _register_and_login(client, email)
+    _limit_analysis_quota(email, 1)
+    calls: list[str] = []
+    gemini_client = _counting_gemini_client(calls)
+    app.dependency_overrides[get_gemini_client] = lambda: gemini_client
+
+    try:
+        first = client.post("/analysis", json={"text": "Prepare the sprint release", "max_cards": 1}, headers=headers)
+        second = client.post("/analysis", json={"text": "Prepare the sprint release", "max_cards": 1}, headers=headers)
+        different = client.post("/analysis", json={"text": "Plan the retrospective", "max_cards": 1}, headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_gemini_client, None)
+
+    assertions.assertEqual(first.status_code, 200, first.text)
+    assertions.assertFalse(first.json()["cached"])
+    assertions.assertEqual(second.status_code, 200, second.text)
+    assertions.assertTrue(second.json()["cached"])
+    assertions.assertEqual(second.json()["proposals"], first.json()["proposals"])
+    assertions.assertEqual(len(calls), 1)
+    assertions.assertEqual(different.status_code, 429, different.text)
+
+    with TestingSessionLocal() as db:
+        assertions.assertEqual(db.query(models.AiResponseCacheEntry).count(), 1)
+        quota = db.query(models.DailyAiQuota).one()
+        assertions.assertEqual(quota.used_count, 1)
+
+
+def test_analysis_cache_respects_endpoint_opt_out(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    headers = _register_and_login(client, "analysis-cache-opt-out@example.com")
+    monkeypatch.setattr(settings, "gemini_response_cache_disabled_endpoints", ["analysis"])
+    calls: list[str] = []
+    gemini_client = _counting_gemini_client(calls)
+    app.dependency_overrides[get_gemini_client] = lambda: gemini_client
+
+    try:
+        for _ in range(2):
+            response = client.post("/analysis", json={"text": "Refresh the roadmap", "max_cards": 1}, headers=headers)
+            assertions.assertEqual(response.status_code, 200, response.text)
+            assertions.assertFalse(response.json()["cached"])
+    finally:
+        app.dependency_overrides.pop(get_gemini_client, None)
+
+    assertions.assertEqual(len(calls), 2)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest import TestCase
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.services import board_events
+from app.services.board_events import (
+    BoardEventBroker,
+    InMemoryTransport,
+    Subscription,
+    board_event_stream,
+    get_board_event_broker,
+    notify_payloads,
+)
+
+from .conftest import TestingSessionLocal
+from .test_cards import register_and_login
+
+assertions = TestCase()
+
+
+async def _next_event(subscription: Subscription, timeout: float = 2.0) -> tuple[str, object]:
+    return await asyncio.wait_for(subscription.get(), timeout)
+
+
+async def _assert_idle(subscription: Subscription) -> None:
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(subscription.get(), 0.1)
+
+
+def _shared_channel(client: TestClient) -> tuple[dict[str, str], dict[str, str], str]:
+    owner = register_and_login(client, "events-owner@example.com")
+    member = register_and_login(client, "events-member@example.com")
+    channel_id = client.get("/channels/mine", headers=owner).json()[0]["id"]
+    invited = client.post(f"/channels/{channel_id}/invite", headers=owner, json={"email": "events-member@example.com"})
+    assertions.assertEqual(invited.status_code, 204, invited.text)
+    return owner, member, channel_id
+
+
+def test_committed_writes_reach_channel_subscribers(client: TestClient) -> None:
+    owner, member, channel_id = _shared_channel(client)
+
+    async def scenario() -> list[list[dict]]:
+        subscription = get_board_event_broker().subscribe(channel_id, "watcher")
+        batches: list[list[dict]] = []
+        try:
+            created = await asyncio.to_thread(
+                client.post, "/cards/", headers=owner, json={"title": "Shared", "subtasks": [{"title": "Step"}]}
+            )
+            card = created.json()
+            subtask_id = card["subtasks"][0]["id"]
+            writes = [
+                lambda: client.put(
+                    f"/cards/{card['id']}/subtasks/{subtask_id}", headers=member, json={"status": "done"}
+                ),
+                lambda: client.post("/comments/", headers=owner, json={"card_id": card["id"], "content": "On it"}),
+                lambda: client.delete(f"/cards/{card['id']}", headers=owner),
+            ]
+            batches.append((await _next_event(subscription))[1])
+            for write in writes:
+                assertions.assertLess((await asyncio.to_thread(write)).status_code, 300)
+                name, changes = await _next_event(subscription)
+                assertions.assertEqual(name, "changes")
+                batches.append(changes)
+            await _assert_idle(subscription)
+        finally:
+            get_board_event_broker().unsubscribe(subscription)
+        return batches
+
+    batches = asyncio.run(scenario())
+    assertions.assertEqual(
+        [[(change["entity"], change["action"]) for change in batch] for batch in batches],
+        [[("card", "created")], [("subtask", "updated")], [("comment", "created")], [("card", "deleted")]],
+    )
+    card_id = batches[0][0]["id"]
+    assertions.assertTrue(all(change["card_id"] == card_id for batch in batches for change in batch))
+
+
+def test_rolled_back_writes_publish_nothing(client: TestClient) -> None:
+    owner, _, channel_id = _shared_channel(client)
+    owner_id = client.get("/profile/me", headers=owner).json()["id"]
+
+    async def scenario() -> None:
+        subscription = get_board_event_broker().subscribe(channel_id, "watcher")
+        try:
+            with TestingSessionLocal() as db:
+                db.add(models.Card(title="Abandoned", owner_id=owner_id, channel_id=channel_id))
+                db.flush()
+                db.rollback()
+            await _assert_idle(subscription)
+        finally:
+            get_board_event_broker().unsubscribe(subscription)
+
+    asyncio.run(scenario())
+
+
+def test_stream_heartbeats_resyncs_slow_clients_and_ends_on_removal(monkeypatch: pytest.MonkeyPatch) -> None:
+    broker = BoardEventBroker(InMemoryTransport(), queue_size=2)
+    monkeypatch.setattr(board_events, "_broker", broker)
+    removed = {"entity": "member", "action": "deleted", "id": "user-1", "card_id": None}
+
+    async def scenario() -> list[str]:
+        stream = board_event_stream("channel-1", "user-1", heartbeat_seconds=0.05)
+        frames = [await anext(stream), await anext(stream)]
+        for index in range(3):
+            broker.deliver("channel-1", [{"entity": "card", "action": "updated", "id": str(index), "card_id": None}])
+        frames.append(await anext(stream))
+        broker.deliver("channel-1", [removed])
+        frames.append(await anext(stream))
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        return frames
+
+    ready, heartbeat, resync, final = asyncio.run(scenario())
+    assertions.assertTrue(ready.startswith("retry: "))
+    assertions.assertIn('event: ready\ndata: {"channel_id":"channel-1"}\n\n', ready)
+    assertions.assertEqual(heartbeat, ": heartbeat\n\n")
+    assertions.assertEqual(resync, "event: resync\ndata: {}\n\n")
+    assertions.assertEqual(final, f"event: changes\ndata: {json.dumps([removed], separators=(',', ':'))}\n\n")
+    assertions.assertEqual(broker.subscriber_count("channel-1"), 0)
+
+
+def test_transport_forwards_to_other_workers_once() -> None:
+    hub: list[InMemoryTransport] = []
+    first = BoardEventBroker(InMemoryTransport(hub), queue_size=8)
+    second = BoardEventBroker(InMemoryTransport(hub), queue_size=8)
+    change = {"entity": "card", "action": "created", "id": "card-1", "card_id": "card-1"}
+
+    async def scenario() -> None:
+        first.start()
+        second.start()
+        local = first.subscribe("channel-1", "user-1")
+        remote = second.subscribe("channel-1", "user-2")
+        first.publish({"channel-1": [change]})
+        assertions.assertEqual(await _next_event(local), ("changes", [change]))
+        assertions.assertEqual(await _next_event(remote), ("changes", [change]))
+        await _assert_idle(local)
+        await _assert_idle(remote)
+
+        second.stop()
+        assertions.assertEqual(await _next_event(remote), ("closed", {}))
+        first.publish({"channel-1": [change]})
+        await _assert_idle(remote)
+        first.stop()
+
+    asyncio.run(scenario())
+
+
+def test_notify_payloads_stay_under_the_postgres_limit() -> None:
+    changes = [{"entity": "card", "action": "updated", "id": f"{index:036d}", "card_id": None} for index in range(400)]
+
+    payloads = notify_payloads("origin", "channel-1", changes)
+
+    assertions.assertGreater(len(payloads), 1)
+    assertions.assertTrue(all(len(payload.encode("utf-8")) < 8000 for payload in payloads))
+    assertions.assertEqual([change for payload in payloads for change in json.loads(payload)["changes"]], changes)
+
+
+def test_event_stream_requires_channel_membership(client: TestClient) -> None:
+    _, _, channel_id = _shared_channel(client)
+    outsider = register_and_login(client, "events-outsider@example.com")
+
+    assertions.assertEqual(client.get(f"/channels/{channel_id}/events", headers=outsider).status_code, 403)
+    assertions.assertEqual(client.get("/channels/missing/events", headers=outsider).status_code, 404)
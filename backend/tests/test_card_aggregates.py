@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.card_aggregates import invalidate_card_aggregates_cache
+
+from .test_cards import create_status, register_and_login
+from .test_change_versions import recorded_selects
+
+assertions = TestCase()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> None:
+    invalidate_card_aggregates_cache()
+
+
+def _create_card(client: TestClient, headers: dict[str, str], title: str, **fields) -> dict:
+    response = client.post("/cards/", headers=headers, json={"title": title, **fields})
+    assertions.assertEqual(response.status_code, 201, response.text)
+    return response.json()
+
+
+def _aggregates(client: TestClient, headers: dict[str, str], **params) -> dict:
+    response = client.get("/cards/aggregates", headers=headers, params=params)
+    assertions.assertEqual(response.status_code, 200, response.text)
+    return response.json()
+
+
+def _counts(buckets: list[dict]) -> dict:
+    return {bucket["key"]: bucket["count"] for bucket in buckets}
+
+
+def test_aggregates_group_the_visible_cards(client: TestClient) -> None:
+    headers = register_and_login(client, "aggregates@example.com")
+    me = client.get("/profile/me", headers=headers).json()
+    status_id = create_status(client, headers)
+    urgent = client.post("/labels/", headers=headers, json={"name": "urgent"}).json()
+    past = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    future = (datetime.now(timezone.utc) + timedelta(days=2)).isoformat()
+
+    _create_card(
+        client,
+        headers,
+        "Late",
+        status_id=status_id,
+        priority="high",
+        story_points=3,
+        estimate_hours=1.5,
+        assignees=[me["id"], "contractor"],
+        label_ids=[urgent["id"]],
+        due_date=past,
+    )
+    _create_card(client, headers, "Planned", priority="high", story_points=5, estimate_hours=2.0, due_date=future)
+    _create_card(client, headers, "Loose", assignees=["contractor"])
+
+    result = _aggregates(client, headers)
+
+    assertions.assertEqual(
+        result["total"], {"key": None, "name": None, "count": 3, "story_points": 8, "estimate_hours": 3.5}
+    )
+    assertions.assertEqual((result["overdue"]["count"], result["overdue"]["story_points"]), (1, 3))
+    assertions.assertEqual(_counts(result["by_priority"]), {"high": 2, None: 1})
+    assertions.assertEqual(result["by_priority"][0]["story_points"], 8)
+    assertions.assertEqual(_counts(result["by_label"]), {urgent["id"]: 1, None: 2})
+    assertions.assertEqual(result["by_label"][1]["name"], "urgent")
+    assertions.assertEqual(_counts(result["by_assignee"]), {"contractor": 2, me["id"]: 1, None: 1})
+    assertions.assertEqual(
+        {bucket["key"]: bucket["name"] for bucket in result["by_assignee"]},
+        {"contractor": None, me["id"]: me["nickname"], None: None},
+    )
+    by_status = {bucket["key"]: bucket for bucket in result["by_status"]}
+    assertions.assertEqual((by_status[status_id]["count"], by_status[status_id]["name"]), (1, "Todo"))
+    assertions.assertEqual(sum(bucket["count"] for bucket in result["by_status"]), 3)
+
+    outsider = register_and_login(client, "aggregates-outsider@example.com")
+    assertions.assertEqual(_aggregates(client, outsider)["total"]["count"], 0)
+
+
+def test_aggregates_accept_the_card_list_filters(client: TestClient) -> None:
+    headers = register_and_login(client, "aggregates-filters@example.com")
+    label = client.post("/labels/", headers=headers, json={"name": "focus"}).json()
+    _create_card(client, headers, "Focused fix", priority="high", label_ids=[label["id"]])
+    _create_card(client, headers, "Focused docs", priority="low", label_ids=[label["id"]])
+    _create_card(client, headers, "Other fix", priority="high", assignees=["someone"])
+
+    for params in (
+        {"label_id": label["id"]},
+        {"priority": "high"},
+        {"priorities": ["low", "high"], "label_ids": [label["id"]]},
+        {"assignees": ["someone"]},
+        {"search": "fix"},
+    ):
+        listed = client.get("/cards/", headers=headers, params=params).json()
+        aggregated = _aggregates(client, headers, **params)
+        assertions.assertEqual(aggregated["total"]["count"], len(listed), params)
+
+
+def test_cached_aggregates_follow_channel_writes(client: TestClient) -> None:
+    headers = register_and_login(client, "aggregates-cache@example.com")
+    card = _create_card(client, headers, "Counted", priority="low")
+    assertions.assertEqual(_counts(_aggregates(client, headers)["by_priority"]), {"low": 1})
+
+    with recorded_selects() as statements:
+        cached = _aggregates(client, headers)
+    assertions.assertEqual(_counts(cached["by_priority"]), {"low": 1})
+    assertions.assertFalse([sql for sql in statements if "FROM cards" in sql], statements)
+
+    client.put(f"/cards/{card['id']}", headers=headers, json={"priority": "high"})
+    assertions.assertEqual(_counts(_aggregates(client, headers)["by_priority"]), {"high": 1})
+    assertions.assertEqual(_counts(_aggregates(client, headers, priority="low")["by_priority"]), {})
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.config import settings
+from app.services.card_changes import encode_change_cursor, prune_card_tombstones
+
+from .conftest import TestingSessionLocal, engine
+from .test_cards import register_and_login
+
+assertions = TestCase()
+
+
+@pytest.fixture(autouse=True)
+def _no_cursor_overlap(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Every write in these tests commits before the next call, so no overlap is needed.
+    monkeypatch.setattr(settings, "card_changes_overlap_seconds", 0.0)
+
+
+def _create_card(client: TestClient, headers: dict[str, str], title: str, **fields) -> dict:
+    response = client.post("/cards/", headers=headers, json={"title": title, **fields})
+    assertions.assertEqual(response.status_code, 201, response.text)
+    return response.json()
+
+
+def _changes(client: TestClient, headers: dict[str, str], since: str | None = None) -> dict:
+    response = client.get("/cards/changes", headers=headers, params={"since": since} if since else {})
+    assertions.assertEqual(response.status_code, 200, response.text)
+    return response.json()
+
+
+def test_changes_bootstrap_then_report_only_later_writes(client: TestClient) -> None:
+    headers = register_and_login(client, "changes@example.com")
+    kept = _create_card(client, headers, "Kept")
+    edited = _create_card(client, headers, "Edited", subtasks=[{"title": "Step"}])
+    removed = _create_card(client, headers, "Removed", subtasks=[{"title": "Goes with the card"}])
+
+    bootstrap = _changes(client, headers)
+    assertions.assertEqual({card["title"] for card in bootstrap["cards"]}, {"Kept", "Edited", "Removed"})
+    assertions.assertEqual(bootstrap["deleted_cards"], [])
+
+    idle = _changes(client, headers, bootstrap["cursor"])
+    assertions.assertEqual(idle["cards"] + idle["subtasks"] + idle["deleted_cards"] + idle["deleted_subtasks"], [])
+
+    client.put(f"/cards/{edited['id']}", headers=headers, json={"title": "Edited again"})
+    client.delete(f"/cards/{removed['id']}", headers=headers)
+    created = _create_card(client, headers, "Created")
+
+    delta = _changes(client, headers, idle["cursor"])
+    assertions.assertEqual([card["title"] for card in delta["cards"]], ["Edited again", "Created"])
+    assertions.assertEqual([item["id"] for item in delta["deleted_cards"]], [removed["id"]])
+    assertions.assertEqual(delta["deleted_subtasks"], [])
+    assertions.assertNotIn(kept["id"], {card["id"] for card in delta["cards"]})
+    assertions.assertIn(created["id"], {card["id"] for card in delta["cards"]})
+
+
+def test_subtask_writes_and_deletions_leave_a_trace(client: TestClient) -> None:
+    headers = register_and_login(client, "subtask-changes@example.com")
+    card = _create_card(client, headers, "Parent", subtasks=[{"title": "Update me"}, {"title": "Delete me"}])
+    updated_id, deleted_id = (subtask["id"] for subtask in card["subtasks"])
+    cursor = _changes(client, headers)["cursor"]
+
+    client.put(f"/cards/{card['id']}/subtasks/{updated_id}", headers=headers, json={"status": "done"})
+    client.delete(f"/cards/{card['id']}/subtasks/{deleted_id}", headers=headers)
+
+    delta = _changes(client, headers, cursor)
+    assertions.assertEqual(delta["cards"], [])
+    assertions.assertEqual(
+        [(item["id"], item["card_id"], item["status"]) for item in delta["subtasks"]],
+        [(updated_id, card["id"], "done")],
+    )
+    assertions.assertEqual(
+        [(item["id"], item["card_id"]) for item in delta["deleted_subtasks"]], [(deleted_id, card["id"])]
+    )
+
+
+def test_label_only_edits_mark_the_card_changed(client: TestClient) -> None:
+    headers = register_and_login(client, "label-changes@example.com")
+    label = client.post("/labels/", headers=headers, json={"name": "flagged"}).json()
+    card = _create_card(client, headers, "Relabelled")
+    cursor = _changes(client, headers)["cursor"]
+
+    client.put(f"/cards/{card['id']}", headers=headers, json={"label_ids": [label["id"]]})
+
+    delta = _changes(client, headers, cursor)
+    assertions.assertEqual([item["label_ids"] for item in delta["cards"]], [[label["id"]]])
+
+
+def test_changes_reject_foreign_cursors(client: TestClient) -> None:
+    headers = register_and_login(client, "cursor-changes@example.com")
+    for index in range(2):
+        _create_card(client, headers, f"Paged {index}")
+    list_cursor = client.get("/cards/", headers=headers, params={"limit": 1}).headers["X-Next-Cursor"]
+
+    for cursor in (list_cursor, "not-a-cursor"):
+        response = client.get("/cards/changes", headers=headers, params={"since": cursor})
+        assertions.assertEqual(response.status_code, 400, response.text)
+
+
+def test_expired_tombstones_are_pruned_and_old_cursors_resync(client: TestClient) -> None:
+    headers = register_and_login(client, "tombstone-changes@example.com")
+    kept = _create_card(client, headers, "Kept")
+    removed = _create_card(client, headers, "Removed")
+    client.delete(f"/cards/{removed['id']}", headers=headers)
+    long_ago = datetime.now(timezone.utc) - timedelta(seconds=settings.card_tombstone_retention_seconds + 60)
+    with TestingSessionLocal() as db:
+        db.query(models.CardTombstone).update({"deleted_at": long_ago})
+        db.commit()
+
+    assertions.assertEqual(prune_card_tombstones(engine), 1)
+    with TestingSessionLocal() as db:
+        assertions.assertEqual(db.query(models.CardTombstone).count(), 0)
+
+    resync = _changes(client, headers, encode_change_cursor(long_ago))
+    assertions.assertTrue(resync["full_resync"])
+    assertions.assertEqual([card["id"] for card in resync["cards"]], [kept["id"]])
+    assertions.assertFalse(_changes(client, headers, resync["cursor"])["full_resync"])
@@ -0,0 +1,123 @@
+"""The projection read path must return exactly what ORM serialization returns."""
+
+from __future__ import annotations
+
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+
+from app import models, schemas
+from app.routers.cards import _card_query, _serialize_cards
+
+from .conftest import TestingSessionLocal
+from .utils.auth import register_user
+
+assertions = TestCase()
+
+
+def _post(client: TestClient, path: str, headers: dict[str, str], payload: dict) -> dict:
+    response = client.post(path, headers=headers, json=payload)
+    assertions.assertEqual(response.status_code, 201, response.text)
+    return response.json()
+
+
+def _seed_board(client: TestClient) -> tuple[dict[str, str], str, str]:
+    session = register_user(client, email="projection@example.com", password="Projection123!")  # noqa: S106
+    headers = {"Authorization": f"Bearer {session['access_token']}"}
+    status = _post(client, "/statuses/", headers, {"name": "Reviewing", "category": "in-progress", "order": 5})
+    first_label = _post(client, "/labels/", headers, {"name": "backend", "color": "#111111"})
+    second_label = _post(client, "/labels/", headers, {"name": "urgent"})
+    category = _post(client, "/error-categories/", headers, {"name": "Timeout", "severity_level": "high"})
+    initiative = _post(
+        client, "/initiatives/", headers, {"name": "Stabilize", "owner": "Platform", "target_metrics": {"p95": 200}}
+    )
+    for notes in ("Kickoff", "Halfway"):
+        _post(client, f"/initiatives/{initiative['id']}/progress", headers, {"notes": notes, "status": "on_track"})
+
+    card = _post(
+        client,
+        "/cards/",
+        headers,
+        {
+            "title": "Fully populated",
+            "status_id": status["id"],
+            "priority": "high",
+            "story_points": 3,
+            "estimate_hours": 1.5,
+            "assignees": ["Tester", "outside-contractor"],
+            "due_date": "2030-01-02T03:04:05Z",
+            "custom_fields": {"team": "core", "sizes": [1, 2]},
+            "label_ids": [first_label["id"], second_label["id"]],
+            "error_category_id": category["id"],
+            "initiative_id": initiative["id"],
+            "subtasks": [
+                {"title": "Mine", "assignee": "Tester", "checklist": [{"label": "write"}, {"label": "ship"}]},
+                {"title": "Unassigned"},
+            ],
+        },
+    )
+    _post(client, "/cards/", headers, {"title": "Bare card"})
+    return headers, card["id"], initiative["id"]
+
+
+def test_card_reads_match_orm_serialization(client: TestClient) -> None:
+    headers, card_id, _ = _seed_board(client)
+
+    listed = client.get("/cards/", headers=headers)
+    detail = client.get(f"/cards/{card_id}", headers=headers)
+    assertions.assertEqual(listed.status_code, 200, listed.text)
+    assertions.assertEqual(detail.status_code, 200, detail.text)
+
+    with TestingSessionLocal() as db:
+        user = db.query(models.User).filter(models.User.email == "projection@example.com").one()
+        cards = (
+            _card_query(db, member_user_id=user.id).order_by(models.Card.created_at.desc(), models.Card.id.desc()).all()
+        )
+        expected = [card.model_dump(mode="json") for card in _serialize_cards(db, cards)]
+
+    assertions.assertEqual(listed.json(), expected)
+    assertions.assertEqual([list(card) for card in listed.json()], [list(card) for card in expected])
+    assertions.assertEqual(detail.json(), next(card for card in expected if card["id"] == card_id))
+    populated = detail.json()
+    assertions.assertEqual(populated["assignees"], ["Tester", "outside-contractor"])
+    assertions.assertEqual(populated["subtasks"][0]["assignee"], "Tester")
+    assertions.assertEqual([log["notes"] for log in populated["initiative"]["progress_logs"]], ["Kickoff", "Halfway"])
+
+
+def test_initiative_cards_match_orm_serialization(client: TestClient) -> None:
+    headers, _, initiative_id = _seed_board(client)
+
+    response = client.get(f"/initiatives/{initiative_id}/cards", headers=headers)
+    assertions.assertEqual(response.status_code, 200, response.text)
+
+    with TestingSessionLocal() as db:
+        cards = (
+            db.query(models.Card)
+            .filter(models.Card.initiative_id == initiative_id)
+            .order_by(models.Card.created_at.desc())
+            .all()
+        )
+        expected = [schemas.CardRead.model_validate(card).model_dump(mode="json") for card in cards]
+
+    assertions.assertEqual(response.json(), expected)
+    assertions.assertNotIn("Tester", response.json()[0]["assignees"])
+
+
+def test_card_list_cursor_header_survives_projection(client: TestClient) -> None:
+    headers, _, _ = _seed_board(client)
+
+    first = client.get("/cards/", headers=headers, params={"limit": 1})
+    assertions.assertEqual(first.status_code, 200, first.text)
+    assertions.assertEqual([card["title"] for card in first.json()], ["Bare card"])
+
+    second = client.get("/cards/", headers=headers, params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]})
+    assertions.assertEqual([card["title"] for card in second.json()], ["Fully populated"])
+    assertions.assertNotIn("X-Next-Cursor", second.headers)
+
+
+def test_missing_card_is_not_found(client: TestClient) -> None:
+    headers, _, _ = _seed_board(client)
+
+    response = client.get("/cards/does-not-exist", headers=headers)
+    assertions.assertEqual(response.status_code, 404)
+    assertions.assertEqual(response.json()["detail"], "Card not found")
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import json
 from unittest import TestCase
 
 from fastapi.testclient import TestClient
 
+from app import models
+from app.config import settings
 from app.routers import cards as cards_router
 from app.services.recommendation_scoring import RecommendationScore
 from app.utils.quotas import DEFAULT_CARD_DAILY_LIMIT
 
+from .conftest import TestingSessionLocal
 from .utils.auth import register_user
+from .utils.sql_budget import statement_budget
 
 assertions = TestCase()
 
@@ -519,3 +524,287 @@ def test_board_layouts_are_user_specific(client: TestClient) -> None:
 
     get_filter_b = client.get(f"/filters/{filter_id}", headers=headers_b)
     assertions.assertTrue(get_filter_b.status_code == 404)
+
+
+def test_card_search_matches_fields_and_comments_incrementally(client: TestClient) -> None:
+    headers = register_and_login(client, "search@example.com")
+    status_id = create_status(client, headers)
+
+    def create(title: str, **fields: str) -> str:
+        response = client.post(
+            "/cards",
+            json={"title": title, "status_id": status_id, **fields},
+            headers=headers,
+        )
+        assertions.assertTrue(response.status_code == 201, response.text)
+        return response.json()["id"]
+
+    def search(term: str) -> list[str]:
+        response = client.get("/cards", params={"search": term}, headers=headers)
+        assertions.assertTrue(response.status_code == 200, response.text)
+        return [card["id"] for card in response.json()]
+
+    deploy_id = create("Deployment checklist", summary="Deploy the billing service")
+    notes_id = create("Weekly sync", description="請求システムの移行メモ")
+    other_id = create("Unrelated chore")
+
+    assertions.assertTrue(search("deploy") == [deploy_id])
+    assertions.assertTrue(search("DEPLOY") == [deploy_id])
+    assertions.assertTrue(search("請求システム") == [notes_id])
+    assertions.assertTrue(search("移行") == [notes_id])
+    assertions.assertTrue(search("100%") == [])
+
+    comment = client.post(
+        "/comments",
+        json={"card_id": other_id, "content": "Blocked on deployment credentials"},
+        headers=headers,
+    )
+    assertions.assertTrue(comment.status_code == 201, comment.text)
+    assertions.assertTrue(set(search("deploy")) == {deploy_id, other_id})
+
+    updated = client.put(f"/cards/{deploy_id}", json={"summary": "Ship the billing service"}, headers=headers)
+    assertions.assertTrue(updated.status_code == 200, updated.text)
+    assertions.assertTrue(search("ship the billing") == [deploy_id])
+    assertions.assertTrue(search("deploy the billing") == [])
+
+    deleted = client.delete(f"/comments/{comment.json()['id']}", headers=headers)
+    assertions.assertTrue(deleted.status_code == 204, deleted.text)
+    assertions.assertTrue(search("credentials") == [])
+
+
+def test_card_search_ranks_stronger_matches_first(client: TestClient) -> None:
+    headers = register_and_login(client, "search-rank@example.com")
+    status_id = create_status(client, headers)
+
+    strong = client.post(
+        "/cards",
+        json={"title": "Migration", "summary": "Database migration", "status_id": status_id},
+        headers=headers,
+    ).json()["id"]
+    weak = client.post(
+        "/cards",
+        json={
+            "title": "Quarterly planning",
+            "description": "Long agenda covering hiring, budget, roadmap and a short migration note.",
+            "status_id": status_id,
+        },
+        headers=headers,
+    ).json()["id"]
+
+    response = client.get("/cards", params={"search": "migration"}, headers=headers)
+    assertions.assertTrue(response.status_code == 200, response.text)
+    assertions.assertTrue([card["id"] for card in response.json()] == [strong, weak])
+
+
+def test_list_cards_keyset_pagination_and_ndjson_stream(client: TestClient) -> None:
+    headers = register_and_login(client, "pager@example.com")
+    status_id = create_status(client, headers)
+    created_ids = [
+        client.post("/cards", json={"title": f"Card {index}", "status_id": status_id}, headers=headers).json()["id"]
+        for index in range(5)
+    ]
+
+    seen: list[str] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        params: dict[str, object] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/cards", params=params, headers=headers)
+        assertions.assertTrue(page.status_code == 200, page.text)
+        seen.extend(card["id"] for card in page.json())
+        pages += 1
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assertions.assertTrue(pages == 3)
+    assertions.assertTrue(seen == list(reversed(created_ids)))
+
+    invalid = client.get("/cards", params={"cursor": "not-a-cursor"}, headers=headers)
+    assertions.assertTrue(invalid.status_code == 400, invalid.text)
+
+    streamed = client.get("/cards", params={"format": "ndjson"}, headers=headers)
+    assertions.assertTrue(streamed.status_code == 200, streamed.text)
+    assertions.assertTrue(streamed.headers["content-type"].startswith("application/x-ndjson"))
+    lines = [json.loads(line) for line in streamed.text.splitlines() if line]
+    assertions.assertTrue([item["id"] for item in lines] == list(reversed(created_ids)))
+    assertions.assertTrue(all(item["status"]["id"] == status_id for item in lines))
+
+    streamed_ids: list[str] = []
+    params = {"format": "ndjson", "limit": 2}
+    while True:
+        page = client.get("/cards", params=params, headers=headers)
+        assertions.assertTrue(page.status_code == 200, page.text)
+        page_ids = [json.loads(line)["id"] for line in page.text.splitlines() if line]
+        assertions.assertTrue(len(page_ids) <= 2)
+        streamed_ids.extend(page_ids)
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"format": "ndjson", "limit": 2, "cursor": cursor}
+    assertions.assertTrue(streamed_ids == list(reversed(created_ids)))
+
+
+def test_list_cards_filters_assignees_through_association_table(client: TestClient) -> None:
+    headers = register_and_login(client, "assignee-filter@example.com")
+    status_id = create_status(client, headers)
+
+    def create(title: str, assignees: list[str]) -> str:
+        response = client.post(
+            "/cards",
+            json={"title": title, "status_id": status_id, "assignees": assignees},
+            headers=headers,
+        )
+        assertions.assertTrue(response.status_code == 201, response.text)
+        return response.json()["id"]
+
+    def filtered(*names: str) -> set[str]:
+        response = client.get("/cards", params={"assignees": list(names)}, headers=headers)
+        assertions.assertTrue(response.status_code == 200, response.text)
+        return {card["id"] for card in response.json()}
+
+    alice_card = create("Alice task", ["alice", "alice"])
+    shared_card = create("Shared task", ["alice", "bob"])
+    create("Nobody task", [])
+
+    assertions.assertTrue(filtered("alice") == {alice_card, shared_card})
+    assertions.assertTrue(filtered("bob") == {shared_card})
+    assertions.assertTrue(filtered("bob", "carol") == {shared_card})
+
+    updated = client.put(f"/cards/{shared_card}", json={"assignees": ["carol"]}, headers=headers)
+    assertions.assertTrue(updated.status_code == 200, updated.text)
+    assertions.assertTrue(filtered("bob") == set())
+    assertions.assertTrue(filtered("carol") == {shared_card})
+
+    deleted = client.delete(f"/cards/{alice_card}", headers=headers)
+    assertions.assertTrue(deleted.status_code == 204, deleted.text)
+    assertions.assertTrue(filtered("alice") == set())
+
+
+def test_similar_items_match_full_scan_scores(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "similarity_engine", "lexical")
+    headers = register_and_login(client, "similar@example.com")
+    status_id = create_status(client, headers)
+
+    def create(title: str, **fields) -> str:
+        response = client.post("/cards", json={"title": title, "status_id": status_id, **fields}, headers=headers)
+        assertions.assertTrue(response.status_code == 201, response.text)
+        return response.json()["id"]
+
+    base_id = create("Checkout payment timeout", description="Stripe webhook retries", priority="high")
+    wording_id = create("Payment timeout on mobile", priority="low")
+    subtask_card_id = create("Quarterly planning", priority="low")
+    status_only_id = create("Office move", priority="medium")
+    subtask = client.post(
+        f"/cards/{subtask_card_id}/subtasks",
+        json={"title": "Budget review"},
+        headers=headers,
+    ).json()
+
+    def similar() -> dict[str, float]:
+        response = client.get(f"/cards/{base_id}/similar", params={"limit": 50}, headers=headers)
+        assertions.assertTrue(response.status_code == 200, response.text)
+        return {item["id"]: item["similarity"] for item in response.json()["items"]}
+
+    def full_scan() -> dict[str, float]:
+        with TestingSessionLocal() as db:
+            cards = db.query(models.Card).all()
+            base = next(card for card in cards if card.id == base_id)
+            items = cards_router._build_similar_items(base, [card for card in cards if card.id != base_id])
+            return {item.id: item.similarity for item in items}
+
+    scores = similar()
+    assertions.assertTrue(scores == full_scan())
+    assertions.assertTrue(scores[wording_id] > scores[status_only_id] > 0)
+    assertions.assertTrue(subtask["id"] not in scores)
+
+    updated = client.put(
+        f"/cards/{subtask_card_id}/subtasks/{subtask['id']}",
+        json={"title": "Investigate webhook retries"},
+        headers=headers,
+    )
+    assertions.assertTrue(updated.status_code == 200, updated.text)
+    scores = similar()
+    assertions.assertTrue(scores == full_scan())
+    assertions.assertTrue(scores[subtask["id"]] > 0)
+
+
+def test_similar_items_rank_stored_embeddings(client: TestClient) -> None:
+    headers = register_and_login(client, "similar-embedding@example.com")
+    status_id = create_status(client, headers)
+
+    def create(title: str, **fields) -> dict:
+        response = client.post("/cards", json={"title": title, "status_id": status_id, **fields}, headers=headers)
+        assertions.assertTrue(response.status_code == 201, response.text)
+        return response.json()
+
+    base = create("Checkout payment timeout", description="Stripe webhook retries")
+    wording = create("Payment timeout on checkout")
+    unrelated = create("Office move")
+    planning = create("Quarterly planning")
+    subtask = client.post(
+        f"/cards/{planning['id']}/subtasks",
+        json={"title": "Budget review"},
+        headers=headers,
+    ).json()
+    with TestingSessionLocal() as db:
+        assertions.assertTrue(db.get(models.Card, base["id"]).ai_similarity_vector_id == f"card:{base['id']}")
+        stored = db.get(models.Subtask, subtask["id"])
+        assertions.assertTrue(stored.ai_similarity_vector_id == f"subtask:{subtask['id']}")
+        assertions.assertTrue(db.get(models.SimilarityVector, stored.ai_similarity_vector_id) is not None)
+
+    def similar() -> list[dict]:
+        response = client.get(f"/cards/{base['id']}/similar", params={"limit": 3}, headers=headers)
+        assertions.assertTrue(response.status_code == 200, response.text)
+        return response.json()["items"]
+
+    items = similar()
+    assertions.assertTrue(items[0]["id"] == wording["id"])
+    assertions.assertTrue(items[0]["similarity"] > 0.45 * 0.5)
+    # Unrelated cards only score through the shared status bonus.
+    assertions.assertTrue(any(item["id"] == unrelated["id"] and item["similarity"] == 0.05 for item in items))
+    assertions.assertTrue(len(items) == 3)
+
+    updated = client.put(
+        f"/cards/{planning['id']}/subtasks/{subtask['id']}",
+        json={"title": "Investigate stripe webhook retries"},
+        headers=headers,
+    )
+    assertions.assertTrue(updated.status_code == 200, updated.text)
+    items = similar()
+    assertions.assertTrue({item["id"] for item in items[:2]} == {subtask["id"], wording["id"]})
+    assertions.assertTrue(all(item["id"] != unrelated["id"] for item in items[:2]))
+
+
+def test_list_cards_statement_count_does_not_grow_with_cards(client: TestClient) -> None:
+    headers = register_and_login(client, "sql-budget@example.com")
+    status_id = create_status(client, headers)
+
+    def create(index: int) -> None:
+        response = client.post(
+            "/cards",
+            json={
+                "title": f"Budget card {index}",
+                "status_id": status_id,
+                "labels": [f"label-{index}"],
+                "assignees": ["alice"],
+                "subtasks": [{"title": "Step one"}, {"title": "Step two"}],
+            },
+            headers=headers,
+        )
+        assertions.assertTrue(response.status_code == 201, response.text)
+
+    create(0)
+    with statement_budget(10) as few:
+        response = client.get("/cards", headers=headers)
+    assertions.assertTrue(response.status_code == 200, response.text)
+    assertions.assertTrue(response.headers["Server-Timing"].startswith("db;dur="))
+    assertions.assertTrue(f'desc="{few.statement_count} statements"' in response.headers["Server-Timing"])
+
+    for index in range(1, 6):
+        create(index)
+    with statement_budget(few.statement_count, max_repeats=2):
+        response = client.get("/cards", headers=headers)
+    assertions.assertTrue(len(response.json()) == 6)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import TestCase
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.routers import cards as cards_router
+from app.services.change_versions import bump_scopes, owner_scope, scope_versions
+
+from .conftest import TestingSessionLocal, engine
+from .test_cards import register_and_login
+
+assertions = TestCase()
+
+
+@contextmanager
+def recorded_selects() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _revalidate(client: TestClient, path: str, headers: dict[str, str], etag: str):
+    return client.get(path, headers={**headers, "If-None-Match": etag})
+
+
+def _create_card(client: TestClient, headers: dict[str, str], **fields) -> dict:
+    response = client.post("/cards/", headers=headers, json={"title": "Versioned", **fields})
+    assertions.assertEqual(response.status_code, 201, response.text)
+    return response.json()
+
+
+def test_card_list_answers_304_without_querying_cards(client: TestClient) -> None:
+    headers = register_and_login(client, "etag-cards@example.com")
+    _create_card(client, headers)
+
+    first = client.get("/cards/", headers=headers)
+    etag = first.headers["ETag"]
+    assertions.assertEqual(first.status_code, 200)
+    assertions.assertTrue(etag.startswith('"') and etag.endswith('"'))
+    assertions.assertEqual(first.headers["Cache-Control"], "private, no-cache")
+
+    with recorded_selects() as statements:
+        cached = _revalidate(client, "/cards/", headers, etag)
+    assertions.assertEqual(cached.status_code, 304)
+    assertions.assertEqual(cached.headers["ETag"], etag)
+    assertions.assertEqual(cached.content, b"")
+    assertions.assertFalse([sql for sql in statements if "FROM cards" in sql], statements)
+
+    assertions.assertEqual(_revalidate(client, "/cards/", headers, f"W/{etag}").status_code, 304)
+    assertions.assertEqual(_revalidate(client, "/cards/?limit=5", headers, etag).status_code, 200)
+
+
+def test_relative_time_range_etag_follows_the_clock(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    headers = register_and_login(client, "etag-window@example.com")
+    _create_card(client, headers)
+    path = "/cards/?time_range=7d"
+
+    first = client.get(path, headers=headers)
+    assertions.assertEqual(len(first.json()), 1)
+    etag = first.headers["ETag"]
+    assertions.assertEqual(_revalidate(client, path, headers, etag).status_code, 304)
+
+    later = cards_router._utcnow() + timedelta(days=8)
+    monkeypatch.setattr(cards_router, "_utcnow", lambda: later)
+    moved = _revalidate(client, path, headers, etag)
+    assertions.assertEqual(moved.status_code, 200)
+    assertions.assertEqual(moved.json(), [])
+
+
+def test_card_writes_change_the_card_list_etag(client: TestClient) -> None:
+    headers = register_and_login(client, "etag-writes@example.com")
+    label = client.post("/labels/", headers=headers, json={"name": "tracked"}).json()
+    card = _create_card(client, headers, label_ids=[label["id"]], subtasks=[{"title": "Step"}])
+    subtask_id = card["subtasks"][0]["id"]
+
+    writes = [
+        lambda: client.put(f"/cards/{card['id']}", headers=headers, json={"title": "Renamed"}),
+        lambda: client.put(f"/cards/{card['id']}/subtasks/{subtask_id}", headers=headers, json={"status": "done"}),
+        lambda: client.put(f"/labels/{label['id']}", headers=headers, json={"color": "#ff0000"}),
+        lambda: client.post("/comments/", headers=headers, json={"card_id": card["id"], "content": "Noted"}),
+        lambda: client.delete(f"/cards/{card['id']}", headers=headers),
+    ]
+    etag = client.get("/cards/", headers=headers).headers["ETag"]
+    for write in writes:
+        assertions.assertLess(write().status_code, 300)
+        refreshed = _revalidate(client, "/cards/", headers, etag)
+        assertions.assertEqual(refreshed.status_code, 200)
+        assertions.assertNotEqual(refreshed.headers["ETag"], etag)
+        etag = refreshed.headers["ETag"]
+
+
+def test_owner_lists_revalidate_per_owner(client: TestClient) -> None:
+    headers = register_and_login(client, "etag-owner@example.com")
+    other = register_and_login(client, "etag-other@example.com")
+
+    for path in ("/statuses/", "/labels/", "/comments/"):
+        etag = client.get(path, headers=headers).headers["ETag"]
+        assertions.assertEqual(_revalidate(client, path, headers, etag).status_code, 304, path)
+
+    labels_etag = client.get("/labels/", headers=headers).headers["ETag"]
+    client.post("/labels/", headers=other, json={"name": "someone else's"})
+    assertions.assertEqual(_revalidate(client, "/labels/", headers, labels_etag).status_code, 304)
+    client.post("/labels/", headers=headers, json={"name": "mine"})
+    assertions.assertEqual(_revalidate(client, "/labels/", headers, labels_etag).status_code, 200)
+
+    card = _create_card(client, headers)
+    client.post("/comments/", headers=headers, json={"card_id": card["id"], "content": "First"})
+    comments_etag = client.get("/comments/", headers=headers).headers["ETag"]
+    client.put("/profile/me", headers=headers, data={"nickname": "Renamed"})
+    renamed = _revalidate(client, "/comments/", headers, comments_etag)
+    assertions.assertEqual(renamed.status_code, 200)
+    assertions.assertEqual(renamed.json()[0]["author_nickname"], "Renamed")
+
+
+def test_profile_edits_only_revalidate_lists_that_show_the_user(client: TestClient) -> None:
+    renamed = register_and_login(client, "etag-renamed@example.com")
+    bystander = register_and_login(client, "etag-bystander@example.com")
+    _create_card(client, renamed)
+    _create_card(client, bystander)
+
+    renamed_etag = client.get("/cards/", headers=renamed).headers["ETag"]
+    bystander_etag = client.get("/cards/", headers=bystander).headers["ETag"]
+    client.put("/profile/me", headers=renamed, data={"nickname": "New name"})
+
+    assertions.assertEqual(_revalidate(client, "/cards/", renamed, renamed_etag).status_code, 200)
+    assertions.assertEqual(_revalidate(client, "/cards/", bystander, bystander_etag).status_code, 304)
+
+
+def test_versions_only_advance_when_the_transaction_commits(client: TestClient) -> None:
+    scope = owner_scope("rollback-check")
+
+    with TestingSessionLocal() as db:
+        bump_scopes(db.connection(), [scope])
+        db.rollback()
+        assertions.assertEqual(scope_versions(db, [scope]), {scope: 0})
+
+        bump_scopes(db.connection(), [scope, scope])
+        bump_scopes(db.connection(), [scope])
+        db.commit()
+        assertions.assertEqual(scope_versions(db, [scope]), {scope: 2})
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
+import time
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from typing import Any
@@ -24,6 +27,9 @@ from app.services.gemini import (
     ResourceExhausted,
     _load_gemini_configuration,
     build_workspace_analysis_options,
+    call_gemini,
+    get_cached_gemini_client,
+    invalidate_gemini_client_cache,
 )
 from app.utils.secrets import get_secret_cipher
 
@@ -715,3 +721,170 @@ def test_client_keeps_model_when_catalog_unavailable(monkeypatch: pytest.MonkeyP
     client = GeminiClient(model="models/gemini-2.0-flash", api_key="sk-fallback")
 
     assertions.assertTrue(client.model == "models/gemini-2.0-flash")
+
+
+def test_cached_client_reuses_instance_and_model_catalog(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeModel:
+        def __init__(self, name: str, methods: tuple[str, ...]) -> None:
+            self.name = name
+            self.supported_generation_methods = methods
+
+    calls = {"list_models": 0}
+
+    def fake_list_models() -> list[FakeModel]:
+        calls["list_models"] += 1
+        return [FakeModel("models/gemini-2.0-flash", ("generateContent",))]
+
+    monkeypatch.setattr(
+        "app.services.gemini.genai",
+        SimpleNamespace(
+            configure=lambda **_: None,
+            list_models=fake_list_models,
+            GenerativeModel=lambda name: SimpleNamespace(name=name),
+            types=SimpleNamespace(GenerationConfig=None),
+        ),
+    )
+
+    first = get_cached_gemini_client(api_key="sk-cached", model="models/gemini-2.0-flash")
+    second = get_cached_gemini_client(api_key="sk-cached", model="models/gemini-2.0-flash")
+
+    assertions.assertTrue(first is second)
+    assertions.assertTrue(calls["list_models"] == 1)
+
+    rotated = get_cached_gemini_client(api_key="sk-rotated", model="models/gemini-2.0-flash")
+    assertions.assertTrue(rotated is not first)
+    assertions.assertTrue(calls["list_models"] == 2)
+
+    invalidate_gemini_client_cache()
+    rebuilt = get_cached_gemini_client(api_key="sk-rotated", model="models/gemini-2.0-flash")
+    assertions.assertTrue(rebuilt is not rotated)
+    assertions.assertTrue(calls["list_models"] == 3)
+
+
+def test_model_catalog_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeModel:
+        def __init__(self, name: str, methods: tuple[str, ...]) -> None:
+            self.name = name
+            self.supported_generation_methods = methods
+
+    calls = {"list_models": 0}
+
+    def fake_list_models() -> list[FakeModel]:
+        calls["list_models"] += 1
+        return [FakeModel("models/gemini-2.0-flash", ("generateContent",))]
+
+    monkeypatch.setattr(settings, "gemini_model_catalog_ttl_seconds", 0)
+    monkeypatch.setattr(
+        "app.services.gemini.genai",
+        SimpleNamespace(
+            configure=lambda **_: None,
+            list_models=fake_list_models,
+            GenerativeModel=lambda name: SimpleNamespace(name=name),
+            types=SimpleNamespace(GenerationConfig=None),
+        ),
+    )
+
+    GeminiClient(model="models/gemini-2.0-flash", api_key="sk-uncached")
+    GeminiClient(model="models/gemini-2.0-flash", api_key="sk-uncached")
+
+    assertions.assertTrue(calls["list_models"] == 2)
+
+
+def test_generate_structured_async_uses_async_sdk_method() -> None:
+    client = _make_client()
+
+    recorded: dict[str, object] = {}
+
+    def blocking_generate(*_: object, **__: object) -> SimpleNamespace:
+        raise AssertionError("the blocking SDK call must not be used when an async variant exists")
+
+    async def fake_generate_async(
+        prompt: str, *, generation_config: object, request_options: object | None = None
+    ) -> SimpleNamespace:
+        recorded["prompt"] = prompt
+        recorded["request_options"] = request_options
+        return SimpleNamespace(model="gemini-async", text='{"items": []}')
+
+    client._client = SimpleNamespace(  # type: ignore[attr-defined]
+        generate_content=blocking_generate,
+        generate_content_async=fake_generate_async,
+    )
+
+    payload = asyncio.run(
+        GeminiClient.generate_structured_async(
+            client,
+            prompt="List things",
+            response_schema={"type": "object", "properties": {"items": {"type": "array"}}},
+        )
+    )
+
+    assertions.assertTrue(payload["items"] == [])
+    assertions.assertTrue(payload["model"] == "gemini-async")
+    assertions.assertTrue("List things" in recorded["prompt"])
+    assertions.assertTrue(
+        recorded["request_options"] == {"retry": None, "timeout": settings.gemini_request_timeout_seconds}
+    )
+
+
+def test_async_fallback_resolves_models_off_the_event_loop() -> None:
+    client = _make_client()
+    client.model = "models/gemini-2.0-flash-lite"
+    resolved_on: list[int] = []
+
+    async def primary_generate(
+        prompt: str, *, generation_config: object, request_options: object | None = None
+    ) -> SimpleNamespace:
+        raise ResourceExhausted("Quota exceeded, limit: 0, model: gemini-2.0-flash-lite")
+
+    async def fallback_generate(
+        prompt: str, *, generation_config: object, request_options: object | None = None
+    ) -> SimpleNamespace:
+        return SimpleNamespace(model="models/gemini-2.0-flash", text='{"proposals": []}')
+
+    primary_client = SimpleNamespace(generate_content_async=primary_generate)
+    fallback_client = SimpleNamespace(generate_content_async=fallback_generate)
+
+    def blocking_get_model_client(model_override: str | None) -> tuple[object, str]:
+        # Stands in for a cold model catalog, which calls the blocking ``list_models``.
+        resolved_on.append(threading.get_ident())
+        if model_override is None:
+            return primary_client, client.model
+        return fallback_client, model_override
+
+    client._get_model_client = blocking_get_model_client  # type: ignore[method-assign]
+
+    data = asyncio.run(GeminiClient._request_analysis_async(client, "Analyse Notes", 2))
+
+    assertions.assertTrue(data["model"] == "models/gemini-2.0-flash")
+    assertions.assertTrue(len(resolved_on) == 2)
+    assertions.assertTrue(threading.get_ident() not in resolved_on)
+
+
+def test_call_gemini_bounds_concurrency_and_runs_sync_clients_in_threads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "gemini_max_concurrency", 2)
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class SyncOnlyClient:
+        def generate_structured(self, *, prompt: str) -> dict[str, Any]:
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return {"prompt": prompt, "thread": threading.get_ident()}
+
+    async def run_batch() -> list[dict[str, Any]]:
+        stub = SyncOnlyClient()
+        return await asyncio.gather(
+            *(call_gemini(stub, "generate_structured", prompt=f"p{index}") for index in range(5))
+        )
+
+    results = asyncio.run(run_batch())
+
+    assertions.assertTrue([item["prompt"] for item in results] == [f"p{index}" for index in range(5)])
+    assertions.assertTrue(all(item["thread"] != threading.get_ident() for item in results))
+    assertions.assertTrue(state["peak"] == 2)
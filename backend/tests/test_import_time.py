@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+from unittest import TestCase
+
+from .utils.import_budget import cumulative_ms, profile_imports, self_ms_by_package
+
+assertions = TestCase()
+
+# Serverless cold starts pay for every import in app.main. These SDKs load on first use instead.
+DEFERRED_MODULES = ("google.generativeai", "google.api_core", "grpc", "jinja2", "cryptography")
+
+# app.main imports in about 1.7 s with the SDKs deferred (3.2 s before). Override on slow CI runners.
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "3000"))
+
+
+def test_app_import_defers_heavy_sdks() -> None:
+    loaded = {timing.module for timing in profile_imports("app.main")}
+
+    eager = sorted(module for module in loaded if module.startswith(DEFERRED_MODULES))
+    assertions.assertEqual(eager, [])
+
+
+def test_app_import_stays_within_budget() -> None:
+    # Take the best of a few runs so one noisy sample does not fail the build.
+    best = float("inf")
+    for _ in range(3):
+        timings = profile_imports("app.main")
+        best = min(best, cumulative_ms(timings, "app.main"))
+        if best <= IMPORT_BUDGET_MS:
+            break
+
+    packages = self_ms_by_package(timings).most_common(5)
+    slowest = ", ".join(f"{package} {elapsed:.0f} ms" for package, elapsed in packages)
+    assertions.assertLessEqual(best, IMPORT_BUDGET_MS, f"import app.main took {best:.0f} ms; slowest: {slowest}")
@@ -8,6 +8,7 @@ from sqlalchemy import create_engine, inspect, text
 
 import app.migrations as migrations
 from app.migrations import run_startup_migrations
+from app.utils.sql_metrics import capture_sql
 
 assertions = TestCase()
 
@@ -401,3 +402,111 @@ def test_run_startup_migrations_removes_deprecated_gemini_models() -> None:
 
     assertions.assertTrue(models["gemini"] == expected)
     assertions.assertTrue(models["legacy"] == expected)
+
+
+def test_run_startup_migrations_indexes_session_tokens() -> None:
+    engine = create_engine("sqlite:///:memory:", future=True)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE session_tokens (
+                    token VARCHAR PRIMARY KEY,
+                    user_id VARCHAR NOT NULL,
+                    expires_at DATETIME,
+                    created_at DATETIME,
+                    updated_at DATETIME
+                )
+                """
+            )
+        )
+
+    run_startup_migrations(engine)
+    run_startup_migrations(engine)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("session_tokens")}
+    assertions.assertTrue({"ix_session_tokens_expires_at", "ix_session_tokens_user_id"} <= index_names)
+
+
+def test_apply_pending_migrations_records_steps_and_then_only_reads_the_ledger(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}", future=True)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE cards (
+                    id VARCHAR PRIMARY KEY,
+                    title VARCHAR NOT NULL,
+                    owner_id VARCHAR NOT NULL,
+                    assignees JSON,
+                    created_at DATETIME,
+                    updated_at DATETIME
+                )
+                """
+            )
+        )
+
+    applied = migrations.apply_pending_migrations(engine)
+
+    assertions.assertEqual(set(applied), set(migrations.get_applied_migrations(engine)))
+    assertions.assertIn("card_error_category_column", applied)
+    # error_categories only exists after create_all, so the second pass adds the column.
+    columns = {column["name"] for column in inspect(engine).get_columns("cards")}
+    assertions.assertIn("error_category_id", columns)
+    assertions.assertEqual(migrations.get_pending_migrations(engine), [])
+
+    with capture_sql(engine) as metrics:
+        assertions.assertEqual(migrations.apply_pending_migrations(engine), [])
+    assertions.assertEqual(metrics.statement_count, 1)
+
+
+def test_apply_pending_migrations_runs_only_new_steps(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}", future=True)
+    migrations.apply_pending_migrations(engine)
+
+    calls: list[str] = []
+    new_step = ("test_new_step", lambda bind: calls.append(bind.dialect.name))
+    with patch.object(migrations, "MIGRATION_STEPS", (*migrations.MIGRATION_STEPS, new_step)):
+        assertions.assertEqual(migrations.get_pending_migrations(engine), ["test_new_step"])
+        assertions.assertEqual(migrations.apply_pending_migrations(engine), ["test_new_step"])
+        assertions.assertEqual(migrations.apply_pending_migrations(engine), [])
+
+    assertions.assertEqual(calls, ["sqlite", "sqlite"])
+
+
+def test_run_startup_migrations_adds_hot_query_indexes() -> None:
+    engine = create_engine("sqlite:///:memory:", future=True)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE comments (
+                    id VARCHAR PRIMARY KEY,
+                    card_id VARCHAR,
+                    content TEXT NOT NULL,
+                    created_at DATETIME,
+                    updated_at DATETIME
+                )
+                """
+            )
+        )
+        connection.execute(
+            text(
+                """
+                CREATE TABLE channel_members (
+                    id VARCHAR PRIMARY KEY,
+                    channel_id VARCHAR NOT NULL,
+                    user_id VARCHAR NOT NULL
+                )
+                """
+            )
+        )
+
+    run_startup_migrations(engine)
+    run_startup_migrations(engine)
+
+    inspector = inspect(engine)
+    comment_indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes("comments")}
+    member_indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes("channel_members")}
+    assertions.assertEqual(comment_indexes["ix_comments_card_id_created_at"], ["card_id", "created_at"])
+    assertions.assertEqual(member_indexes["ix_channel_members_user_id"], ["user_id"])
@@ -0,0 +1,130 @@
+"""EXPLAIN regression tests for the indexes behind hot endpoints.
+
+Each test records the SELECT statements an endpoint runs and asks SQLite for
+their query plans, so dropping an index (or rewriting a query so it no longer
+matches one) fails here instead of showing up as a slow endpoint.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.services.immunity_map import build_immunity_map_context
+
+from .conftest import TestingSessionLocal, engine
+from .utils.auth import register_user
+
+assertions = TestCase()
+
+
+@contextmanager
+def query_plans() -> Iterator[list[str]]:
+    """Collect the ``EXPLAIN QUERY PLAN`` output of every SELECT run inside the block."""
+
+    statements: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    plans: list[str] = []
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield plans
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append("\n".join(str(row[-1]) for row in rows))
+
+
+def assert_index_used(plans: list[str], index_name: str) -> None:
+    assertions.assertTrue(
+        any(index_name in plan for plan in plans),
+        f"No query used {index_name}. Plans:\n" + "\n---\n".join(plans),
+    )
+
+
+def _headers(client: TestClient, email: str = "plans@example.com") -> dict[str, str]:
+    session = register_user(client, email=email, password="QueryPlans123!")  # noqa: S106 - test credential
+    return {"Authorization": f"Bearer {session['access_token']}"}
+
+
+def _create_card(client: TestClient, headers: dict[str, str], title: str = "Indexed card") -> str:
+    response = client.post("/cards/", headers=headers, json={"title": title})
+    assertions.assertEqual(response.status_code, 201, response.text)
+    return response.json()["id"]
+
+
+def test_card_list_uses_membership_and_channel_indexes(client: TestClient) -> None:
+    headers = _headers(client)
+    _create_card(client, headers)
+
+    with query_plans() as plans:
+        response = client.get("/cards/", headers=headers)
+    assertions.assertEqual(response.status_code, 200, response.text)
+
+    assert_index_used(plans, "ix_channel_members_user_id")
+    assert_index_used(plans, "ix_cards_channel_id_created_at")
+
+
+def test_card_creation_counts_recent_cards_by_index(client: TestClient) -> None:
+    headers = _headers(client)
+
+    with query_plans() as plans:
+        _create_card(client, headers)
+
+    assert_index_used(plans, "ix_cards_owner_id_created_at")
+
+
+def test_immunity_map_context_uses_owner_timestamp_indexes(client: TestClient) -> None:
+    headers = _headers(client)
+    _create_card(client, headers)
+
+    with TestingSessionLocal() as db:
+        user = db.query(models.User).filter(models.User.email == "plans@example.com").one()
+        with query_plans() as plans:
+            build_immunity_map_context(db, user=user, include_status_reports=False)
+
+    assert_index_used(plans, "ix_cards_owner_id_updated_at")
+    assert_index_used(plans, "ix_cards_owner_id_completed_at")
+
+
+def test_comment_and_activity_feeds_use_card_indexes(client: TestClient) -> None:
+    headers = _headers(client)
+    card_id = _create_card(client, headers)
+    comment = client.post("/comments/", headers=headers, json={"card_id": card_id, "content": "Looks good"})
+    assertions.assertEqual(comment.status_code, 201, comment.text)
+
+    with query_plans() as plans:
+        comments = client.get("/comments/", headers=headers, params={"card_id": card_id})
+        activity = client.get("/activity-log/", headers=headers, params={"card_id": card_id})
+    assertions.assertEqual(comments.status_code, 200, comments.text)
+    assertions.assertEqual(activity.status_code, 200, activity.text)
+
+    assert_index_used(plans, "ix_comments_card_id_created_at")
+    assert_index_used(plans, "ix_activity_logs_card_id_created_at")
+
+
+def test_status_report_detail_loads_events_by_index(client: TestClient) -> None:
+    headers = _headers(client)
+    created = client.post(
+        "/status-reports",
+        headers=headers,
+        json={"sections": [{"title": "Summary", "body": "Indexed events."}]},
+    )
+    assertions.assertEqual(created.status_code, 201, created.text)
+
+    with query_plans() as plans:
+        detail = client.get(f"/status-reports/{created.json()['id']}", headers=headers)
+    assertions.assertEqual(detail.status_code, 200, detail.text)
+
+    assert_index_used(plans, "ix_status_report_events_report_id")
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.services.response_cache import (
+    DatabaseResponseCache,
+    InMemoryResponseCache,
+    TieredResponseCache,
+    build_response_cache_key,
+)
+
+from .conftest import TestingSessionLocal
+
+assertions = TestCase()
+
+
+def test_cache_key_is_stable_across_schema_key_order() -> None:
+    first = build_response_cache_key(
+        prompt="hello",
+        response_schema={"type": "object", "properties": {"a": {"type": "string"}}},
+        model="models/gemini-2.5-flash",
+    )
+    second = build_response_cache_key(
+        prompt="hello",
+        response_schema={"properties": {"a": {"type": "string"}}, "type": "object"},
+        model="models/gemini-2.5-flash",
+    )
+    other_model = build_response_cache_key(
+        prompt="hello",
+        response_schema={"type": "object", "properties": {"a": {"type": "string"}}},
+        model="models/gemini-2.5-pro",
+    )
+
+    assertions.assertEqual(first, second)
+    assertions.assertNotEqual(first, other_model)
+
+
+def test_in_memory_cache_evicts_least_recently_used_entry() -> None:
+    cache = InMemoryResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set(None, "a", {"value": 1})  # type: ignore[arg-type]
+    cache.set(None, "b", {"value": 2})  # type: ignore[arg-type]
+    assertions.assertEqual(cache.get(None, "a"), {"value": 1})  # type: ignore[arg-type]
+
+    cache.set(None, "c", {"value": 3})  # type: ignore[arg-type]
+
+    assertions.assertIsNone(cache.get(None, "b"))  # type: ignore[arg-type]
+    assertions.assertEqual(cache.get(None, "a"), {"value": 1})  # type: ignore[arg-type]
+    assertions.assertEqual(cache.get(None, "c"), {"value": 3})  # type: ignore[arg-type]
+
+
+def test_in_memory_cache_returns_copies() -> None:
+    cache = InMemoryResponseCache(max_entries=2, ttl_seconds=60)
+    payload = {"items": [1]}
+    cache.set(None, "a", payload)  # type: ignore[arg-type]
+    payload["items"].append(2)
+
+    cached = cache.get(None, "a")  # type: ignore[arg-type]
+    assertions.assertEqual(cached, {"items": [1]})
+    cached["items"].append(3)  # type: ignore[index]
+    assertions.assertEqual(cache.get(None, "a"), {"items": [1]})  # type: ignore[arg-type]
+
+
+def test_database_cache_expires_and_evicts_oldest_rows(client: TestClient) -> None:
+    cache = DatabaseResponseCache(max_entries=2, ttl_seconds=60, evict_interval_seconds=0)
+
+    with TestingSessionLocal() as db:
+        cache.set(db, "first", {"value": 1}, model="m")
+        db.commit()
+        stale = db.get(models.AiResponseCacheEntry, "first")
+        stale.updated_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        db.commit()
+
+        cache.set(db, "second", {"value": 2}, model="m")
+        cache.set(db, "third", {"value": 3}, model="m")
+        db.commit()
+
+        keys = {row.cache_key for row in db.query(models.AiResponseCacheEntry).all()}
+        assertions.assertEqual(keys, {"second", "third"})
+        assertions.assertEqual(cache.get(db, "third"), {"value": 3})
+
+        expired = db.get(models.AiResponseCacheEntry, "third")
+        expired.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+        assertions.assertIsNone(cache.get(db, "third"))
+
+
+def test_database_cache_evicts_at_most_once_per_interval(client: TestClient) -> None:
+    cache = DatabaseResponseCache(max_entries=1, ttl_seconds=60)
+
+    with TestingSessionLocal() as db:
+        for key in ("first", "second", "third"):
+            cache.set(db, key, {"value": key}, model="m")
+        db.commit()
+
+        # Only the first write ran the eviction, before the table was over its limit.
+        assertions.assertEqual(db.query(models.AiResponseCacheEntry).count(), 3)
+
+
+def test_tiered_cache_backfills_memory_from_database(client: TestClient) -> None:
+    memory = InMemoryResponseCache(max_entries=4, ttl_seconds=60)
+    database = DatabaseResponseCache(max_entries=4, ttl_seconds=60)
+
+    with TestingSessionLocal() as db:
+        database.set(db, "shared", {"value": "db"}, model="m")
+        db.commit()
+
+        cache = TieredResponseCache(memory, database)
+        assertions.assertEqual(cache.get(db, "shared"), {"value": "db"})
+
+    assertions.assertEqual(memory.get(None, "shared"), {"value": "db"})  # type: ignore[arg-type]
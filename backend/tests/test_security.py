@@ -1,17 +1,23 @@
+import asyncio
 import hashlib
 from unittest import TestCase
 
 import pytest
+from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.requests import Request
 from fastapi.testclient import TestClient
 
 from app import models
-from app.auth import hash_password
+from app.auth import hash_password, hash_password_async, verify_password_async
 from app.config import Settings, settings
 from app.database import get_db
 from app.main import app
+from app.routers.auth import client_address, shed_auth_bursts
 
-from .utils.auth import register_user
+from .conftest import engine
+from .utils.auth import login_user, register_user
+from .utils.sql_budget import statement_budget
 
 assertions = TestCase()
 
@@ -261,3 +267,95 @@ def test_generate_report_sets_author_to_authenticated_admin(client: TestClient)
     assertions.assertTrue(response.status_code == 201, response.text)
     data = response.json()
     assertions.assertTrue(data["author_id"] == admin_payload["user"]["id"])
+
+
+def test_session_cache_skips_token_lookup_and_honours_revocation(client: TestClient) -> None:
+    admin_payload, member_payload = _bootstrap_admin_and_member(client)
+    admin_headers = {"Authorization": f"Bearer {admin_payload['access_token']}"}
+    member_headers = {"Authorization": f"Bearer {member_payload['access_token']}"}
+
+    assertions.assertEqual(client.get("/auth/me", headers=member_headers).status_code, 200)
+    with statement_budget(0):
+        cached = client.get("/auth/me", headers=member_headers)
+    assertions.assertEqual(cached.status_code, 200, cached.text)
+    assertions.assertEqual(cached.json()["id"], member_payload["user"]["id"])
+
+    # Signing in again revokes the previous token.
+    relogin = login_user(client, email="member@example.com", password="SecurePass123!")  # noqa: S106
+    assertions.assertEqual(client.get("/auth/me", headers=member_headers).status_code, 401)
+    member_headers = {"Authorization": f"Bearer {relogin['access_token']}"}
+    assertions.assertEqual(client.get("/auth/me", headers=member_headers).status_code, 200)
+
+    deactivated = client.patch(
+        f"/admin/users/{member_payload['user']['id']}", headers=admin_headers, json={"is_active": False}
+    )
+    assertions.assertEqual(deactivated.status_code, 200, deactivated.text)
+    assertions.assertEqual(client.get("/auth/me", headers=member_headers).status_code, 401)
+
+
+def test_session_cache_revalidates_against_other_workers(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    payload = _register_user(client, "revalidate@example.com", "StrongPass123!")
+    headers = {"Authorization": f"Bearer {payload['access_token']}"}
+    assertions.assertEqual(client.get("/auth/me", headers=headers).status_code, 200)
+    monkeypatch.setattr("app.config.settings.session_cache_ttl_seconds", 0)
+
+    with statement_budget(1):
+        assertions.assertEqual(client.get("/auth/me", headers=headers).status_code, 200)
+
+    # A core DELETE bypasses this process's invalidation hooks, like a logout on another worker.
+    with engine.begin() as connection:
+        connection.execute(models.SessionToken.__table__.delete())
+    assertions.assertEqual(client.get("/auth/me", headers=headers).status_code, 401)
+
+
+def test_password_kdf_runs_on_the_dedicated_pool() -> None:
+    async def scenario() -> tuple[bool, bool]:
+        encoded = await hash_password_async("StrongPass123!")
+        return (
+            await verify_password_async("StrongPass123!", encoded),
+            await verify_password_async("WrongPass123!", encoded),
+        )
+
+    assertions.assertEqual(asyncio.run(scenario()), (True, False))
+
+
+def test_auth_requests_are_shed_per_client_address(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.config.settings.auth_max_concurrent_requests_per_ip", 1)
+
+    def request_from(host: str) -> Request:
+        return Request({"type": "http", "method": "POST", "path": "/auth/login", "headers": [], "client": (host, 1)})
+
+    async def scenario() -> None:
+        first = shed_auth_bursts(request_from("203.0.113.5"))
+        await first.__anext__()
+
+        with pytest.raises(HTTPException) as shed:
+            await shed_auth_bursts(request_from("203.0.113.5")).__anext__()
+        assertions.assertEqual(shed.value.status_code, 429)
+        assertions.assertEqual(shed.value.headers, {"Retry-After": "1"})
+
+        other = shed_auth_bursts(request_from("198.51.100.7"))
+        await other.__anext__()
+        await other.aclose()
+
+        await first.aclose()
+        retry = shed_auth_bursts(request_from("203.0.113.5"))
+        await retry.__anext__()
+        await retry.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_auth_client_address_trusts_only_the_configured_proxy_hops(monkeypatch: pytest.MonkeyPatch) -> None:
+    forwarded = [(b"x-forwarded-for", b"198.51.100.1, 203.0.113.5, 10.0.0.2")]
+    request = Request(
+        {"type": "http", "method": "POST", "path": "/auth/login", "headers": forwarded, "client": ("10.0.0.9", 1)}
+    )
+
+    assertions.assertEqual(client_address(request), "10.0.0.9")
+    monkeypatch.setattr("app.config.settings.auth_trusted_proxy_hops", 2)
+    assertions.assertEqual(client_address(request), "203.0.113.5")
+    monkeypatch.setattr("app.config.settings.auth_trusted_proxy_hops", 4)
+    assertions.assertEqual(client_address(request), "10.0.0.9")
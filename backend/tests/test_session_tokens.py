@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.services.session_tokens import get_sweeper_stats, sweep_expired_session_tokens
+
+from .utils.auth import UNUSED_PASSWORD_HASH
+
+assertions = TestCase()
+
+
+def test_sweeper_deletes_only_expired_tokens_in_batches() -> None:
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    kept = {"live": now + timedelta(hours=1), "no-expiry": None}
+    with sessionmaker(bind=engine, future=True)() as db:
+        user = models.User(email="sweep@example.com", password_hash=UNUSED_PASSWORD_HASH)
+        db.add(user)
+        db.flush()
+        for index in range(5):
+            db.add(models.SessionToken(token=f"expired-{index}", user_id=user.id, expires_at=now - timedelta(hours=1)))
+        for value, expires_at in kept.items():
+            db.add(models.SessionToken(token=value, user_id=user.id, expires_at=expires_at))
+        db.commit()
+
+    reclaimed_before = get_sweeper_stats().reclaimed
+    result = sweep_expired_session_tokens(engine, batch_size=2, now=now)
+
+    assertions.assertEqual((result.deleted, result.batches), (5, 3))
+    assertions.assertEqual(get_sweeper_stats().reclaimed - reclaimed_before, 5)
+    with sessionmaker(bind=engine, future=True)() as db:
+        remaining = {token.token for token in db.query(models.SessionToken)}
+    assertions.assertEqual(remaining, set(kept))
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("session_tokens")}
+    assertions.assertTrue({"ix_session_tokens_expires_at", "ix_session_tokens_user_id"} <= index_names)
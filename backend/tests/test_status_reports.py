@@ -2,13 +2,19 @@ from __future__ import annotations
 
 from unittest import TestCase
 
+import pytest
 from fastapi.testclient import TestClient
 
 from app import models, schemas
 from app.main import app
-from app.services.gemini import get_gemini_client
+from app.services.gemini import GeminiError, get_gemini_client
+from app.services.status_report_jobs import (
+    drain_status_report_jobs,
+    start_status_report_workers,
+    stop_status_report_workers,
+)
 
-from .conftest import TestingSessionLocal
+from .conftest import TestingSessionLocal, engine
 from .utils.auth import register_user
 
 assertions = TestCase()
@@ -70,9 +76,118 @@ def test_status_report_submit_retains_record(client: TestClient) -> None:
     finally:
         app.dependency_overrides.pop(get_gemini_client, None)
 
-    assertions.assertEqual(submitted.status_code, 200, submitted.text)
+    assertions.assertEqual(submitted.status_code, 202, submitted.text)
+    assertions.assertEqual(submitted.json()["status"], schemas.StatusReportStatus.PROCESSING.value)
 
     with TestingSessionLocal() as db:
         report = db.query(models.StatusReport).filter(models.StatusReport.id == report_id).one_or_none()
         assertions.assertIsNotNone(report)
         assertions.assertEqual(report.status, schemas.StatusReportStatus.COMPLETED.value)
+
+
+def _create_report(client: TestClient, headers: dict[str, str]) -> str:
+    created = client.post(
+        "/status-reports",
+        json={"sections": [{"title": "Summary", "body": "Blocked on vendor review."}]},
+        headers=headers,
+    )
+    assertions.assertEqual(created.status_code, 201, created.text)
+    return created.json()["id"]
+
+
+def test_status_report_job_reports_failure_and_events(client: TestClient) -> None:
+    headers = _register_and_login(client, "status-report-job@example.com")
+    report_id = _create_report(client, headers)
+
+    class FailingGemini:
+        def analyze(self, request: schemas.AnalysisRequest, **_: object) -> schemas.AnalysisResponse:
+            raise GeminiError("upstream unavailable")
+
+    app.dependency_overrides[get_gemini_client] = lambda: FailingGemini()
+    try:
+        submitted = client.post(f"/status-reports/{report_id}/submit", headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_gemini_client, None)
+    assertions.assertEqual(submitted.status_code, 202, submitted.text)
+
+    job = client.get(f"/status-reports/{report_id}/job", params={"wait": 1}, headers=headers)
+    assertions.assertEqual(job.status_code, 200, job.text)
+    body = job.json()
+    assertions.assertEqual(body["status"], "failed")
+    assertions.assertEqual(body["report_status"], schemas.StatusReportStatus.FAILED.value)
+    assertions.assertEqual(body["error"], "upstream unavailable")
+    assertions.assertEqual(body["attempts"], 1)
+
+    detail = client.get(f"/status-reports/{report_id}", headers=headers).json()
+    event_types = [event["event_type"] for event in detail["events"]]
+    assertions.assertEqual(
+        event_types[-3:],
+        ["submitted", "analysis_started", "analysis_failed"],
+    )
+
+
+def test_status_report_jobs_can_be_drained_in_batch(client: TestClient) -> None:
+    headers = _register_and_login(client, "status-report-batch@example.com")
+    report_ids = [_create_report(client, headers) for _ in range(2)]
+
+    with TestingSessionLocal() as db:
+        owner = db.query(models.User).filter(models.User.email == "status-report-batch@example.com").one()
+        for report_id in report_ids:
+            db.add(models.StatusReportJob(report_id=report_id, owner_id=owner.id))
+            report = db.get(models.StatusReport, report_id)
+            report.status = schemas.StatusReportStatus.PROCESSING.value
+        db.commit()
+
+    class StubGemini:
+        def analyze(self, request: schemas.AnalysisRequest, **_: object) -> schemas.AnalysisResponse:
+            return schemas.AnalysisResponse(model="batch-model", proposals=[])
+
+    processed = drain_status_report_jobs(engine, analyzer_factory=lambda _db: StubGemini())
+    assertions.assertEqual(processed, 2)
+    assertions.assertEqual(drain_status_report_jobs(engine, analyzer_factory=lambda _db: StubGemini()), 0)
+
+    with TestingSessionLocal() as db:
+        statuses = {
+            report.status for report in db.query(models.StatusReport).filter(models.StatusReport.id.in_(report_ids))
+        }
+        jobs = db.query(models.StatusReportJob).all()
+    assertions.assertEqual(statuses, {schemas.StatusReportStatus.COMPLETED.value})
+    assertions.assertTrue(all(job.status == "completed" and job.finished_at is not None for job in jobs))
+
+
+def test_status_report_worker_holds_no_connection_during_analysis(client: TestClient) -> None:
+    headers = _register_and_login(client, "status-report-connection@example.com")
+    report_id = _create_report(client, headers)
+
+    with TestingSessionLocal() as db:
+        owner = db.query(models.User).filter(models.User.email == "status-report-connection@example.com").one()
+        db.add(models.StatusReportJob(report_id=report_id, owner_id=owner.id))
+        db.get(models.StatusReport, report_id).status = schemas.StatusReportStatus.PROCESSING.value
+        db.commit()
+
+    checked_out: list[int] = []
+
+    class StubGemini:
+        def analyze(self, request: schemas.AnalysisRequest, **_: object) -> schemas.AnalysisResponse:
+            checked_out.append(engine.pool.checkedout())
+            return schemas.AnalysisResponse(model="idle-model", proposals=[])
+
+    assertions.assertEqual(drain_status_report_jobs(engine, analyzer_factory=lambda _db: StubGemini()), 1)
+    assertions.assertEqual(checked_out, [0])
+    with TestingSessionLocal() as db:
+        report = db.get(models.StatusReport, report_id)
+        assertions.assertEqual(report.status, schemas.StatusReportStatus.COMPLETED.value)
+        assertions.assertEqual(report.analysis_model, "idle-model")
+
+
+@pytest.mark.parametrize(("deployment_mode", "started"), [("serverless", False), ("server", True)])
+def test_worker_pool_is_opt_in_for_serverless(
+    monkeypatch: pytest.MonkeyPatch, deployment_mode: str, started: bool
+) -> None:
+    monkeypatch.setattr("app.config.settings.deployment_mode", deployment_mode)
+    monkeypatch.setattr("app.config.settings.status_report_worker_count", None)
+    try:
+        pool = start_status_report_workers(engine)
+        assertions.assertEqual(pool is not None and pool.running, started)
+    finally:
+        stop_status_report_workers()
@@ -9,6 +9,10 @@ from app.auth import normalize_email
 
 from ..conftest import TestingSessionLocal
 
+# Stored on users that are created directly in the database and never log in.
+UNUSED_PASSWORD_HASH = "unused"  # noqa: S105 - placeholder, never verified
+
+
 def login_user(client: TestClient, *, email: str, password: str) -> dict:
     response = client.post("/auth/login", json={"email": email, "password": password})
     assert response.status_code == 200, response.text
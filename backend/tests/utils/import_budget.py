@@ -0,0 +1,73 @@
+"""Import-time profiling for cold-start budgets.
+
+Runs ``python -X importtime`` in a fresh interpreter and parses its report.
+From the backend directory, ``python -m tests.utils.import_budget`` prints the
+slowest packages and modules for ``import app.main``.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(target: str = "app.main") -> list[ImportTiming]:
+    """Import ``target`` in a new interpreter and return one timing per module it loaded."""
+
+    completed = subprocess.run(  # noqa: S603 - runs this interpreter with a fixed argument list
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: list[ImportTiming] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        if not self_us.isdigit():
+            continue  # header row
+        timings.append(ImportTiming(module=module, self_us=int(self_us), cumulative_us=int(cumulative_us)))
+    return timings
+
+
+def cumulative_ms(timings: list[ImportTiming], module: str) -> float:
+    return next(timing.cumulative_us for timing in timings if timing.module == module) / 1000.0
+
+
+def self_ms_by_package(timings: list[ImportTiming]) -> Counter[str]:
+    """Total self time per top-level package, so one slow dependency shows up as one entry."""
+
+    totals: Counter[str] = Counter()
+    for timing in timings:
+        totals[timing.module.split(".", 1)[0]] += timing.self_us / 1000.0
+    return totals
+
+
+def main(argv: list[str] | None = None) -> None:
+    target = (argv or sys.argv[1:] or ["app.main"])[0]
+    timings = profile_imports(target)
+    print(f"import {target}: {cumulative_ms(timings, target):.1f} ms")
+    print("\nslowest packages (self time):")
+    for package, elapsed in self_ms_by_package(timings).most_common(15):
+        print(f"  {elapsed:8.1f} ms  {package}")
+    print("\nslowest modules (self time):")
+    for timing in sorted(timings, key=lambda item: item.self_us, reverse=True)[:15]:
+        print(f"  {timing.self_us / 1000.0:8.1f} ms  {timing.module}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual profiling entry point
+    main()
@@ -0,0 +1,32 @@
+"""Opt-in statement budgets for endpoint tests."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.utils.sql_metrics import SqlMetrics, capture_sql
+
+from ..conftest import engine
+
+
+@contextmanager
+def statement_budget(max_statements: int, *, max_repeats: int | None = None) -> Iterator[SqlMetrics]:
+    """Fail if the block runs more than ``max_statements`` SQL statements against the test database.
+
+    ``max_repeats`` additionally caps how often one statement fingerprint may
+    repeat, which catches N+1 loops whose total still fits the budget.
+    """
+
+    with capture_sql(engine) as metrics:
+        yield metrics
+
+    repeated = metrics.repeated(2)
+    detail = "\n".join(f"  {count}x {statement}" for statement, count in repeated[:5])
+    assert metrics.statement_count <= max_statements, (
+        f"Expected at most {max_statements} SQL statements, got {metrics.statement_count}.\n"
+        f"Most repeated:\n{detail}"
+    )
+    if max_repeats is not None and repeated:
+        statement, count = repeated[0]
+        assert count <= max_repeats, f"Statement repeated {count}x (limit {max_repeats}): {statement}"
@@ -0,0 +1,180 @@
+from datetime import date
+from unittest import TestCase
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+from app.utils import quota_engine
+from app.utils.quota_engine import SharedCounterStore
+from app.utils.quota_ledger import QuotaCounter, load_persisted_count
+from app.utils.quotas import AI_QUOTA_ANALYSIS, get_daily_usage, reserve_ai_quota, reserve_daily_quota
+from app.utils.sql_metrics import capture_sql
+
+from .auth import UNUSED_PASSWORD_HASH
+
+assertions = TestCase()
+
+
+@pytest.fixture()
+def quota_db(monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+    with session_factory() as db:
+        user = models.User(email="quota-engine@example.com", password_hash=UNUSED_PASSWORD_HASH)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    monkeypatch.setattr("app.config.settings.quota_engine_mode", "memory")
+    monkeypatch.setattr("app.config.settings.quota_flush_interval_seconds", 3600)
+    flusher = quota_engine.start_quota_flusher(engine)
+    assert flusher is not None
+    try:
+        yield engine, session_factory, user_id, flusher
+    finally:
+        quota_engine.stop_quota_flusher()
+
+
+def test_memory_mode_reserves_without_writes_until_flush(quota_db) -> None:
+    engine, session_factory, user_id, flusher = quota_db
+    today = date.today()
+    counter = QuotaCounter.for_model(
+        models.DailyAiQuota, owner_id=user_id, quota_day=today, quota_key=AI_QUOTA_ANALYSIS
+    )
+
+    with session_factory() as db:
+        with capture_sql(engine) as metrics:
+            granted = [
+                reserve_ai_quota(db, owner_id=user_id, quota_day=today, limit=3, quota_key=AI_QUOTA_ANALYSIS)
+                for _ in range(5)
+            ]
+        assertions.assertEqual(granted, [True, True, True, False, False])
+        # Only the seed read touches the database.
+        assertions.assertEqual(metrics.statement_count, 1)
+        assertions.assertEqual(load_persisted_count(db, counter), 0)
+        db.commit()
+
+    assertions.assertEqual(flusher.flush(), 1)
+    with session_factory() as db:
+        assertions.assertEqual(load_persisted_count(db, counter), 3)
+        assertions.assertFalse(
+            reserve_ai_quota(db, owner_id=user_id, quota_day=today, limit=3, quota_key=AI_QUOTA_ANALYSIS)
+        )
+
+
+def test_memory_mode_reports_unflushed_usage_and_persists_on_stop(quota_db) -> None:
+    _, session_factory, user_id, _ = quota_db
+    today = date.today()
+
+    with session_factory() as db:
+        db.add(models.DailyEvaluationQuota(owner_id=user_id, quota_date=today, executed_count=1))
+        db.commit()
+        for _ in range(2):
+            assertions.assertTrue(
+                reserve_daily_quota(
+                    db,
+                    owner_id=user_id,
+                    quota_day=today,
+                    limit=5,
+                    quota_model=models.DailyEvaluationQuota,
+                )
+            )
+        usage = get_daily_usage(db, quota_model=models.DailyEvaluationQuota, owner_id=user_id, quota_day=today)
+        assertions.assertEqual(usage, 3)
+        db.commit()
+
+    quota_engine.stop_quota_flusher()
+    with session_factory() as db:
+        row = db.query(models.DailyEvaluationQuota).filter_by(owner_id=user_id).one()
+        assertions.assertEqual(row.executed_count, 3)
+
+
+def test_shared_store_enforces_one_limit_across_processes(tmp_path) -> None:
+    path = str(tmp_path / "counters.sqlite3")
+    first, second = SharedCounterStore(path), SharedCounterStore(path)
+    counter = QuotaCounter("daily_ai_quotas", "user-1", date(2024, 1, 1), AI_QUOTA_ANALYSIS)
+    assertions.assertIsNone(first.try_reserve(counter, 4))
+    # The second seed loses to the row the first one created.
+    granted = [store.try_reserve(counter, 4, seed=seed) for store, seed in ((first, 1), (second, 0))]
+    granted += [store.try_reserve(counter, 4) for store in (first, second)]
+
+    assertions.assertEqual(granted, [True, True, True, False])
+    assertions.assertEqual(second.take_pending(), {counter: 3})
+    assertions.assertEqual(first.usage(counter), 4)
+    # Idle for a whole flush cycle: evicted, to be reseeded from the database.
+    assertions.assertEqual(first.take_pending(), {})
+    assertions.assertIsNone(first.usage(counter))
+
+
+def test_reservations_are_released_when_the_transaction_does_not_commit(quota_db) -> None:
+    _, session_factory, user_id, flusher = quota_db
+    today = date.today()
+    counter = QuotaCounter.for_model(
+        models.DailyAiQuota, owner_id=user_id, quota_day=today, quota_key=AI_QUOTA_ANALYSIS
+    )
+
+    def reserve(db) -> bool:
+        return reserve_ai_quota(db, owner_id=user_id, quota_day=today, limit=2, quota_key=AI_QUOTA_ANALYSIS)
+
+    with session_factory() as db:
+        assertions.assertTrue(reserve(db))
+        db.rollback()
+        assertions.assertTrue(reserve(db))
+        db.commit()
+    with session_factory() as db:
+        assertions.assertTrue(reserve(db))
+        # Flushed and evicted before the request gave up: the release is written back.
+        flusher.flush()
+        flusher.flush()
+    assertions.assertEqual(quota_engine.buffered_usage(counter), 1)
+
+    flusher.flush()
+    with session_factory() as db:
+        assertions.assertEqual(load_persisted_count(db, counter), 1)
+        assertions.assertEqual([reserve(db), reserve(db)], [True, False])
+
+
+@pytest.mark.parametrize("shared", [False, True], ids=["memory", "shared"])
+def test_failed_flush_of_an_evicted_counter_keeps_its_increments(
+    quota_db, tmp_path, monkeypatch: pytest.MonkeyPatch, shared: bool
+) -> None:
+    _, session_factory, user_id, flusher = quota_db
+    if shared:
+        flusher.store = SharedCounterStore(str(tmp_path / "counters.sqlite3"))
+    today = date.today()
+    counter = QuotaCounter.for_model(
+        models.DailyAiQuota, owner_id=user_id, quota_day=today, quota_key=AI_QUOTA_ANALYSIS
+    )
+
+    def reserve(db) -> bool:
+        return reserve_ai_quota(db, owner_id=user_id, quota_day=today, limit=4, quota_key=AI_QUOTA_ANALYSIS)
+
+    with session_factory() as db:
+        assertions.assertEqual([reserve(db), reserve(db)], [True, True])
+        db.commit()
+    flusher.flush()
+    with session_factory() as db:
+        assertions.assertTrue(reserve(db))
+        db.commit()
+
+    def evict_then_fail(db, failed: QuotaCounter, delta: int) -> None:
+        flusher.store.discard(failed)
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(quota_engine, "add_to_persisted_count", evict_then_fail)
+        with pytest.raises(RuntimeError):
+            flusher.flush()
+    assertions.assertIsNone(quota_engine.buffered_usage(counter))
+
+    with session_factory() as db:
+        # Reseeded with the 2 persisted slots; the handed-back one is still pending.
+        assertions.assertEqual([reserve(db), reserve(db)], [True, False])
+        db.commit()
+    flusher.flush()
+    with session_factory() as db:
+        assertions.assertEqual(load_persisted_count(db, counter), 4)
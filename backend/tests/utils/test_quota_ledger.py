@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest import TestCase
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.utils.quota_ledger import QuotaCounter, load_persisted_count, reserve_slot
+from app.utils.sql_metrics import capture_sql
+
+from .auth import UNUSED_PASSWORD_HASH
+
+assertions = TestCase()
+
+
+def test_reservations_take_one_statement_each_under_contention(tmp_path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'ledger.db'}", connect_args={"check_same_thread": False, "timeout": 30}, future=True
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+    with session_factory() as db:
+        user = models.User(email="ledger@example.com", password_hash=UNUSED_PASSWORD_HASH)
+        db.add(user)
+        db.commit()
+        counter = QuotaCounter.for_model(
+            models.DailyAiQuota, owner_id=user.id, quota_day=date.today(), quota_key="analysis"
+        )
+
+    def reserve(_: int) -> bool:
+        with session_factory() as db:
+            granted = reserve_slot(db, counter, 10)
+            db.commit()
+            return granted
+
+    with capture_sql(engine) as metrics, ThreadPoolExecutor(max_workers=8) as pool:
+        granted = list(pool.map(reserve, range(40)))
+
+    assertions.assertEqual(sum(granted), 10)
+    assertions.assertEqual(metrics.statement_count, 40)
+    with session_factory() as db:
+        assertions.assertEqual(load_persisted_count(db, counter), 10)
+        assertions.assertTrue(reserve_slot(db, counter, 0))
+
+
+def test_reserve_slot_keeps_pending_work_in_the_session() -> None:
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, future=True)() as db:
+        user = models.User(email="pending@example.com", password_hash=UNUSED_PASSWORD_HASH)
+        db.add(user)
+        db.flush()
+        counter = QuotaCounter.for_model(models.DailyCardQuota, owner_id=user.id, quota_day=date.today())
+
+        assertions.assertTrue(reserve_slot(db, counter, 1))
+        assertions.assertFalse(reserve_slot(db, counter, 1))
+        db.commit()
+
+        assertions.assertEqual(db.query(models.User).count(), 1)
+        assertions.assertEqual(load_persisted_count(db, counter), 1)
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.utils.quotas import (
+    DEFAULT_CARD_DAILY_LIMIT,
+    get_card_daily_limit,
+    get_effective_limits,
+    invalidate_effective_limits_cache,
+)
+from app.utils.sql_metrics import capture_sql
+
+from .auth import UNUSED_PASSWORD_HASH
+
+assertions = TestCase()
+
+
+def test_effective_limits_are_cached_until_quota_rows_change() -> None:
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+    invalidate_effective_limits_cache()
+
+    with session_factory() as db:
+        user = models.User(email="cache@example.com", password_hash=UNUSED_PASSWORD_HASH)
+        db.add(user)
+        db.commit()
+
+        # The first lookup creates the defaults row, which invalidates on commit.
+        assertions.assertEqual(get_card_daily_limit(db, user.id), DEFAULT_CARD_DAILY_LIMIT)
+        db.commit()
+        get_card_daily_limit(db, user.id)
+        with capture_sql(engine) as metrics:
+            assertions.assertEqual(get_effective_limits(db, user.id).card_daily_limit, DEFAULT_CARD_DAILY_LIMIT)
+        assertions.assertEqual(metrics.statement_count, 0)
+
+        db.add(models.UserQuotaOverride(user_id=user.id, card_daily_limit=3))
+        db.commit()
+        assertions.assertEqual(get_card_daily_limit(db, user.id), 3)
+
+        db.query(models.QuotaDefaults).one().analysis_daily_limit = 42
+        db.commit()
+        assertions.assertEqual(get_effective_limits(db, user.id).analysis_daily_limit, 42)
@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from sqlalchemy import create_engine, text
+
+from app.utils.sql_metrics import fingerprint, instrument_engine, track_sql
+
+assertions = TestCase()
+
+
+def test_fingerprint_collapses_literals_and_in_lists() -> None:
+    first = fingerprint("SELECT * FROM cards WHERE id IN (?, ?, ?) AND title = 'a'  LIMIT 5")
+    second = fingerprint("SELECT * FROM cards\nWHERE id IN (?, ?) AND title = 'b' LIMIT 10")
+
+    assertions.assertEqual(first, second)
+    assertions.assertEqual(first, "SELECT * FROM cards WHERE id IN (?) AND title = ? LIMIT ?")
+
+
+def test_track_sql_counts_only_statements_inside_the_context() -> None:
+    engine = instrument_engine(create_engine("sqlite://"))
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with track_sql() as metrics:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+        connection.execute(text("SELECT 2"))
+
+    assertions.assertEqual(metrics.statement_count, 3)
+    assertions.assertEqual(metrics.repeated(3), [("SELECT ?", 3)])
+    assertions.assertTrue(metrics.server_timing().endswith('desc="3 statements"'))